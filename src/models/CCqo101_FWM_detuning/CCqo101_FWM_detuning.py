@@ -4,7 +4,9 @@ If a non-linear medium is impinged by two pump photons with angular
 frequencies omega_0_1 and omega_0_2 a pair of photons may be generated, one
 called the signal with frequency omega_1 and another called the idler with
 frequency omega_2.  This method computes the detuning (omega_detuned)
-between the input and output frequencies.
+between the input and output frequencies.  The corresponding wavevector
+mismatch (delta_k) for a waveguide dispersion model is available through
+calcqo101_phase_mismatch.
 
 Command-line examples
 =====================
@@ -28,6 +30,13 @@ Compute detuning parameter using all calculation parameters::
 Same calculation, but showing that unambiguous abbreviations are permissible::
   python CCqo101_FWM_detuning.py --pump1 1.22e15 --sig 1.92e15 --pump2 1.00e15 --idl 2.00e15
 
+Batch calculations
+------------------
+Compute one detuning per record of a CSV file (columns named as in paramDefns)::
+  python CCqo101_FWM_detuning.py --batch params.csv --batch-output detuning.csv
+Stream JSONL records through stdin/stdout with validation::
+  cat params.jsonl | python CCqo101_FWM_detuning.py --batch - --validate
+
 Calculations with options
 -------------------------
 Validate parameters (error for negative input)::
@@ -49,7 +58,8 @@ paramDefns : dict
 
 DEPENDENCIES
 ============
-Module: os, sys, logging
+Module: os, sys, logging, numpy
+        batch_io (common; batch records only)
 Command-line extras: argparse, traceback, pprint
 
 DEVELOPMENT METADATA
@@ -70,10 +80,25 @@ HISTORY
     * Fixed version (that's going to be a pain!)
 1.0.3 [24 Nov 2015 : Timothy C. Burt]
     * Made doctest-ready docstrings.  Format updates to docstrings in general.
+1.1.0 [18 Oct 2026]
+    * Added DetuningIndex for repeated detuning tolerance queries over a
+      fixed (but extendable) set of resonances.
+1.2.0 [18 Oct 2026]
+    * Added DispersionModel and calcqo101_phase_mismatch for the wavevector
+      mismatch of the same frequency sets.
+1.3.0 [18 Oct 2026]
+    * Array-aware validateParameters; read_batches, write_records and
+      calcqo101_batch for --batch mode over JSONL/CSV records in blocks.
+1.3.1 [18 Oct 2026]
+    * read_batches, write_records and batchFormats come from the shared
+      common/batch_io module; JSONL output is one json.dumps per record.
+1.3.2 [18 Oct 2026]
+    * DispersionModel stays within max_cache_size, and new values are
+      merged into its cache in batches instead of on every call.
 
 """
 
-__version__ = '1.0.3'
+__version__ = '1.3.2'
 
 __copyright__ = "Timothy C. Burt"
 __author__ = "TC Burt"
@@ -89,6 +114,13 @@ import traceback
 import logging
 import numpy as np
 
+# Batch record I/O shared by the models with a --batch mode
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['common']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+from batch_io import batchFormats, read_batches, write_records
+
 lgr = logging.getLogger('__main__')
 
 paramDefns = {
@@ -131,6 +163,14 @@ paramDefns = {
         'datatype':'float',
         'units':'rad s^{-1}',
         'flow':'output'
+        },
+    'wavevecMismatch':{
+        'desc':'wavevector (phase) mismatch from a dispersion model',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad m^{-1}',
+        'flow':'output'
         }
 }
 
@@ -176,6 +216,14 @@ def validateParameters(**kwargs):
       Expected signal >= 0
       Received signal = -3.0
 
+    Validate arrays of parameter sets (INVALID in the second set)
+    >>> validateParameters(pump1=[1.0, 2.0], signal=[3.0, -3.0])
+    Traceback (most recent call last):
+        ...
+    ValueError: Range check error:
+      Expected signal >= 0
+      Received signal < 0 at indices [1]
+
     """
 
     from collections import OrderedDict
@@ -202,11 +250,17 @@ def validateParameters(**kwargs):
     # Preserve order of the checking for consistent behavior of message
     checkGEzero = OrderedDict([("pump1", pump1), ("pump2", pump2), ("signal", signal), ("idler", idler)])
     for k,v in checkGEzero.items():
-        if v and (v < 0):
-            #if err: eMsg+= os.linesep
+        if v is None:
+            continue
+        a = np.asarray(v)
+        if np.any(a < 0):
+            if err: eMsg+= os.linesep
             eMsg+= "Range check error:" + os.linesep
             eMsg+= "  Expected {} >= 0".format(k) + os.linesep
-            eMsg+= "  Received {} = {}".format(k,v)
+            if a.ndim == 0:
+                eMsg+= "  Received {} = {}".format(k,v)
+            else:
+                eMsg+= "  Received {} < 0 at indices {}".format(k, np.flatnonzero(a < 0))
             err=True
 
     # Remove trailing newline
@@ -361,6 +415,368 @@ def calcqo101_FWM_detuning(pump1, signal, pump2 = None, idler = None):
 
     return detuning
 
+def calcqo101_batch(records, validate=False):
+    """Detuning for a block of parameter records, computed as arrays.
+
+    Parameters
+    ----------
+    records : list of dicts
+        Each with pump1 and signal and optionally pump2 and idler
+    validate : boolean
+        Apply validateParameters to the block (Default=False)
+
+    Returns
+    -------
+    detuning : float array
+        One value per record, in order
+
+    Examples
+    --------
+    >>> calcqo101_batch([{'pump1': 100, 'signal': 110},
+    ...                  {'pump1': 100, 'signal': 110, 'pump2': 230, 'idler': 250}]).tolist()
+    [20.0, 30.0]
+
+    """
+    try:
+        pump1 = np.array([r['pump1'] for r in records], dtype=float)
+        signal = np.array([r['signal'] for r in records], dtype=float)
+    except KeyError as e:
+        raise ValueError('Record without required parameter {}'.format(e))
+    pump2 = np.array([r.get('pump2', r['pump1']) for r in records], dtype=float)
+    idler = np.array([r.get('idler', r['signal']) for r in records], dtype=float)
+    if validate:
+        validateParameters(pump1=pump1, pump2=pump2, signal=signal, idler=idler)
+    return calcqo101_FWM_detuning(pump1, signal, pump2=pump2, idler=idler)
+
+class DetuningIndex(object):
+
+    """Sorted index of resonance pair sums for detuning tolerance queries.
+
+    The index is built once over the sum frequencies of every unordered
+    pair of resonances (signal index <= idler index, degenerate pairs
+    included).  A query for the pairs whose detuning against a pump pair
+    lies within +/- tolerance is then two binary searches into the sorted
+    sums, rather than a rescan of all resonances.  New resonances are
+    merged into the sorted sums without rebuilding the index.
+
+    Parameters
+    ----------
+    resonances : float (scalar or list/tuple/array)
+        Resonance angular frequencies used as signal and idler
+        candidates. (Default=None, an empty index)
+
+    Attributes
+    ----------
+    resonances : float array
+        All resonance angular frequencies in insertion order
+    sums : float array
+        Sorted pair sum frequencies (signal + idler)
+    signal_idx, idler_idx : integer arrays
+        Indices into resonances of each pair, in the order of sums
+
+    Examples
+    --------
+    Build an index over four resonances
+    >>> idx = DetuningIndex([100., 110., 120., 130.])
+    >>> len(idx)
+    10
+
+    Pairs with zero detuning from a degenerate pump at 115
+    >>> s, i = idx.query(115.)
+    >>> list(zip(s.tolist(), i.tolist()))
+    [(100.0, 130.0), (110.0, 120.0)]
+
+    Tolerance query with explicit second pump (count only)
+    >>> idx.count(100., pump2=130., tolerance=10.).tolist()
+    6
+
+    Insert a newly measured resonance (its pairs take the larger index as idler)
+    >>> idx.insert(105.)
+    >>> len(idx)
+    15
+    >>> s, i = idx.query(115., tolerance=5.)
+    >>> list(zip(s.tolist(), i.tolist()))
+    [(120.0, 105.0), (100.0, 130.0), (110.0, 120.0), (130.0, 105.0)]
+
+    """
+
+    def __init__(self, resonances=None):
+        self.resonances = np.empty(0, dtype=float)
+        self.sums = np.empty(0, dtype=float)
+        self.signal_idx = np.empty(0, dtype=np.intp)
+        self.idler_idx = np.empty(0, dtype=np.intp)
+        if resonances is not None:
+            self.insert(resonances)
+
+    def __len__(self):
+        return self.sums.size
+
+    def insert(self, resonances):
+        """Merge new resonances (and all pairs they form) into the index.
+
+        Only the pairs that involve a new resonance are computed; they are
+        sorted among themselves and merged into the existing sorted sums.
+        """
+        new = np.atleast_1d(np.asarray(resonances, dtype=float)).ravel()
+        if new.size == 0:
+            return
+        nOld = self.resonances.size
+        allRes = np.concatenate((self.resonances, new))
+        newIdx = np.arange(nOld, allRes.size)
+
+        # Pairs of an existing resonance with a new one
+        oldI, newJ = np.meshgrid(np.arange(nOld), newIdx, indexing='ij')
+        # Pairs among the new resonances (upper triangle, diagonal included)
+        triI, triJ = np.triu_indices(new.size)
+        sIdx = np.concatenate((oldI.ravel(), triI + nOld))
+        iIdx = np.concatenate((newJ.ravel(), triJ + nOld))
+        sums = allRes[sIdx] + allRes[iIdx]
+
+        order = np.argsort(sums, kind='mergesort')
+        sums = sums[order]
+        pos = np.searchsorted(self.sums, sums, side='right')
+
+        self.sums = np.insert(self.sums, pos, sums)
+        self.signal_idx = np.insert(self.signal_idx, pos, sIdx[order])
+        self.idler_idx = np.insert(self.idler_idx, pos, iIdx[order])
+        self.resonances = allRes
+
+        lgr.debug('DetuningIndex: inserted {} resonances, {} pairs total'.format(
+            new.size, self.sums.size))
+
+    def bounds(self, pump1, pump2=None, tolerance=0.0):
+        """Return the [lo, hi) positions in sums within tolerance of each pump pair.
+
+        Accepts scalar or array pump frequencies (numpy broadcasting).
+        """
+        if pump2 is None: pump2 = pump1
+        pumpSum = np.asarray(pump1, dtype=float) + np.asarray(pump2, dtype=float)
+        lo = np.searchsorted(self.sums, pumpSum - tolerance, side='left')
+        hi = np.searchsorted(self.sums, pumpSum + tolerance, side='right')
+        return lo, hi
+
+    def count(self, pump1, pump2=None, tolerance=0.0):
+        """Number of signal/idler pairs with |detuning| <= tolerance."""
+        lo, hi = self.bounds(pump1, pump2, tolerance)
+        return hi - lo
+
+    def query(self, pump1, pump2=None, tolerance=0.0, return_indices=False):
+        """Signal/idler pairs with |detuning| <= tolerance for one pump pair.
+
+        Pairs are returned in order of increasing sum frequency, as
+        frequencies or (return_indices=True) as indices into resonances.
+        """
+        lo, hi = self.bounds(float(pump1), pump2 if pump2 is None else float(pump2),
+                             tolerance)
+        sIdx = self.signal_idx[lo:hi]
+        iIdx = self.idler_idx[lo:hi]
+        if return_indices:
+            return sIdx, iIdx
+        return self.resonances[sIdx], self.resonances[iIdx]
+
+    def save(self, fname):
+        """Write the index to an .npz file."""
+        np.savez(fname,
+                 resonances=self.resonances,
+                 sums=self.sums,
+                 signal_idx=self.signal_idx,
+                 idler_idx=self.idler_idx)
+
+    @classmethod
+    def load(cls, fname):
+        """Read an index written by save()."""
+        data = np.load(fname)
+        idx = cls()
+        idx.resonances = data['resonances']
+        idx.sums = data['sums']
+        idx.signal_idx = data['signal_idx']
+        idx.idler_idx = data['idler_idx']
+        data.close()
+        return idx
+
+class DispersionModel(object):
+
+    """Waveguide dispersion k(omega) as a Taylor polynomial with a value cache.
+
+    The propagation constant is expanded about a reference angular
+    frequency omega0,
+      k(omega) = sum_n beta[n] (omega - omega0)^n / n!
+    so that beta = [k0, 1/v_g, GVD, TOD, ...].  Evaluated values are kept
+    in a sorted cache; a call evaluates the polynomial only for the unique
+    frequencies that are not already cached and gathers all other values
+    by index.  New values collect in a small sorted batch that is merged
+    into the cache once it holds more than about sqrt(cache size) values,
+    so a call with few new frequencies does not copy the whole cache.
+
+    Parameters
+    ----------
+    beta : float (list/tuple/array)
+        Taylor coefficients beta_0, beta_1, ... [rad m^{-1} (rad s^{-1})^{-n}]
+    omega0 : float
+        Reference angular frequency of the expansion [rad s^{-1}]
+    max_cache_size : integer
+        Bound on the number of cached frequencies; the cache is cleared
+        before adding values that would exceed it, and a call with more
+        new frequencies than this is not cached. (Default=10000000)
+
+    Attributes
+    ----------
+    evaluations : integer
+        Total number of frequencies at which the polynomial was evaluated
+
+    Examples
+    --------
+    Linear dispersion k = 2 + 0.5 (omega - 10)
+    >>> disp = DispersionModel([2.0, 0.5], omega0=10.0)
+    >>> disp.wavevec([10.0, 12.0, 10.0]).tolist()
+    [2.0, 3.0, 2.0]
+
+    Repeated frequencies are evaluated once
+    >>> disp.evaluations
+    2
+    >>> disp.wavevec([12.0, 14.0]).tolist()
+    [3.0, 4.0]
+    >>> disp.evaluations
+    3
+
+    """
+
+    def __init__(self, beta, omega0=0.0, max_cache_size=10000000):
+        beta = np.atleast_1d(np.asarray(beta, dtype=float))
+        # Horner coefficients (highest order first) with the 1/n! factors
+        factorials = np.cumprod(np.concatenate(([1.0], np.arange(1.0, beta.size))))
+        self.beta = beta
+        self.omega0 = float(omega0)
+        self.max_cache_size = max_cache_size
+        self._coeffs = (beta / factorials)[::-1]
+        self.clear()
+
+    def clear(self):
+        """Empty the value cache."""
+        self._empty()
+        self.evaluations = 0
+
+    def _empty(self):
+        self._omega = np.empty(0, dtype=float)
+        self._k = np.empty(0, dtype=float)
+        self._newOmega = np.empty(0, dtype=float)
+        self._newK = np.empty(0, dtype=float)
+
+    def _store(self, omega, k):
+        """Add sorted, uncached (omega, k) to the batch, merging it when large."""
+        if omega.size > self.max_cache_size:
+            return
+        if self._omega.size + self._newOmega.size + omega.size > self.max_cache_size:
+            lgr.debug('DispersionModel: cache limit reached, clearing')
+            self._empty()
+        at = np.searchsorted(self._newOmega, omega)
+        self._newOmega = np.insert(self._newOmega, at, omega)
+        self._newK = np.insert(self._newK, at, k)
+        if self._newOmega.size > max(1024, int(np.sqrt(self._omega.size))):
+            at = np.searchsorted(self._omega, self._newOmega)
+            self._omega = np.insert(self._omega, at, self._newOmega)
+            self._k = np.insert(self._k, at, self._newK)
+            self._newOmega = self._newK = np.empty(0, dtype=float)
+
+    def evaluate(self, omega):
+        """Evaluate the dispersion polynomial without the cache."""
+        return np.polyval(self._coeffs, np.asarray(omega, dtype=float) - self.omega0)
+
+    def wavevec(self, omega):
+        """Propagation constant at each angular frequency (any shape)."""
+        omega = np.asarray(omega, dtype=float)
+        uniq, inverse = np.unique(omega, return_inverse=True)
+
+        kUniq = np.empty(uniq.size, dtype=float)
+        found = np.zeros(uniq.size, dtype=bool)
+        for cached, k in ((self._omega, self._k), (self._newOmega, self._newK)):
+            pos = np.searchsorted(cached, uniq)
+            hit = pos < cached.size
+            hit[hit] = cached[pos[hit]] == uniq[hit]
+            kUniq[hit] = k[pos[hit]]
+            found |= hit
+
+        if not found.all():
+            miss = uniq[~found]
+            kUniq[~found] = self.evaluate(miss)
+            self.evaluations += miss.size
+            self._store(miss, kUniq[~found])
+
+        return kUniq[inverse].reshape(omega.shape)
+
+def calcqo101_phase_mismatch(pump1, signal, pump2 = None, idler = None, dispersion = None):
+
+    """Calculate the four-wave mixing wavevector mismatch from a dispersion model.
+
+    The mismatch follows the same output-minus-input convention as the
+    frequency detuning
+      delta_k = (k(signal) + k(idler)) - (k(pump1) + k(pump2))
+    All four frequency sets are passed to the dispersion model in a single
+    call, so each distinct frequency is evaluated once no matter how many
+    candidates (or which roles) it appears in.
+
+    Parameters
+    ----------
+    pump1 : float (scalar or array)
+        Input pump 1 angular frequency
+    signal : float (scalar or array)
+        Output 1 signal angular frequency
+
+    Keywords
+    --------
+    pump2 : float (scalar or array)
+        Input pump 2 angular frequency (set to pump1 value if not specified)
+    idler : float (scalar or array)
+        Output 2 idler angular frequency (set to signal value if not specified)
+    dispersion : DispersionModel
+        Waveguide dispersion model (required)
+
+    Returns
+    -------
+    mismatch : float (scalar or array)
+        Wavevector mismatch with the broadcast shape of the inputs
+
+    See Also
+    --------
+    DispersionModel, calcqo101_FWM_detuning
+
+    Exceptions
+    ----------
+    ValueError (no dispersion model)
+
+    Examples
+    --------
+    Quadratic dispersion about the degenerate pump
+    >>> disp = DispersionModel([0.0, 1.0, 2.0], omega0=100.)
+    >>> calcqo101_phase_mismatch(100., [110., 120.], dispersion=disp).tolist()
+    [220.0, 840.0]
+
+    Linear dispersion gives a mismatch proportional to the detuning
+    >>> lin = DispersionModel([5.0, 0.5])
+    >>> float(calcqo101_phase_mismatch(100, 110, pump2=230, idler=250, dispersion=lin))
+    15.0
+
+    """
+
+    if dispersion is None:
+        m = 'A DispersionModel is required for the phase mismatch' + os.linesep
+        lgr.error(m)
+        raise ValueError(m)
+
+    # Set optional arguments if necessary
+    if pump2 is None: pump2 = pump1
+    if idler is None: idler = signal
+
+    # Gather all four frequency sets into one array for a single lookup
+    freqs = np.array(np.broadcast_arrays(
+        *[np.asarray(f, dtype=float) for f in (pump1, pump2, signal, idler)]))
+    k = dispersion.wavevec(freqs)
+
+    # Calculate
+    mismatch = (k[2] + k[3]) - (k[0] + k[1])
+
+    return mismatch
+
 if '__main__' == __name__:
 
     import argparse
@@ -389,16 +805,16 @@ if '__main__' == __name__:
 
     reqArgs.add_argument(
         '--pump1', 
-        type=float, required=True,
+        type=float, required=False,
         dest='pump1', action='store',
-        help="Pump 1 angular frequency [rad s^{-1}]",
+        help="Pump 1 angular frequency [rad s^{-1}] (not with --batch)",
         metavar='omega_0_1'
         )
     reqArgs.add_argument(
         '--signal', 
-        type=float, required=True,
+        type=float, required=False,
         dest='signal', action='store',
-        help="Output 1 signal angular frequency [rad s^{-1}]",
+        help="Output 1 signal angular frequency [rad s^{-1}] (not with --batch)",
         metavar='omega_1'
         )
     optArgs.add_argument(
@@ -416,6 +832,34 @@ if '__main__' == __name__:
         metavar='omega_2'
         )
 
+    optArgs.add_argument(
+        '--batch',
+        default=None,
+        dest='batch', action='store',
+        help="Read parameter records (JSONL or CSV with paramDefns names) from this file, or '-' for stdin, and write one angFreqDetuning per record in the same order and format",
+        metavar='fname'
+        )
+    optArgs.add_argument(
+        '--batch-format',
+        choices=emr.batchFormats, default=None,
+        dest='batch_format', action='store',
+        help="Batch record format (default: csv for .csv files, otherwise jsonl)"
+        )
+    optArgs.add_argument(
+        '--batch-output',
+        default='-',
+        dest='batch_output', action='store',
+        help="File for batch results, or '-' for stdout",
+        metavar='fname'
+        )
+    optArgs.add_argument(
+        '--block-size',
+        type=int, default=65536,
+        dest='block_size', action='store',
+        help="Batch records validated and computed together",
+        metavar='N'
+        )
+
     optArgs.add_argument(
         '--validate', 
         dest='validate', action='store_true',
@@ -463,11 +907,13 @@ if '__main__' == __name__:
     # Parse options and instantiate object
     # ====================================
     args = argp.parse_args()
+    if args.batch is None and not (hasattr(args, "pump1") and hasattr(args, "signal")):
+        argp.error('--pump1 and --signal are required without --batch')
 
     # Set defaults for the optional frequencies
-    if not hasattr(args, "pump2"): 
+    if args.batch is None and not hasattr(args, "pump2"): 
         args.pump2 = args.pump1
-    if not hasattr(args, "idler"): 
+    if args.batch is None and not hasattr(args, "idler"): 
         args.idler = args.signal
 
     # Initialize logging
@@ -481,13 +927,47 @@ if '__main__' == __name__:
     appl_setupLog(logLevel, args.log_entry_format, args.log_file)
     lgr.debug('Inputs and Defaults:' +os.linesep + pp.pformat(args.__dict__))
 
+    # Act
+    if args.batch is not None:
+        fmt = args.batch_format
+        if fmt is None:
+            fmt = 'csv' if args.batch.lower().endswith('.csv') else 'jsonl'
+        inStream = sys.stdin if args.batch == '-' else open(args.batch)
+        outStream = sys.stdout if args.batch_output == '-' else open(args.batch_output, 'w')
+        try:
+            header, blocks = emr.read_batches(inStream, fmt, args.block_size)
+            count = 0
+            for block in blocks:
+                try:
+                    detuning = emr.calcqo101_batch(block, validate=args.validate)
+                except ValueError as e:
+                    lgr.error('Invalid records {}-{} for CCqo101_FWM_detuning.'.format(
+                        count, count + len(block) - 1))
+                    raise
+                emr.write_records(outStream, fmt,
+                                  [{'angFreqDetuning': d} for d in detuning.tolist()],
+                                  ['angFreqDetuning'], header=(count == 0))
+                outStream.flush()
+                count += len(block)
+            lgr.info('CCqo101_FWM_detuning batch: {} records'.format(count))
+        except Exception:
+            ex_type, ex, tb = sys.exc_info()
+            sys.stderr.write('{}{}{}{}'.format(ex_type, os.linesep, ex, os.linesep))
+            lgr.error('<TRACEBACK>')
+            traceback.print_tb(tb)
+            lgr.error('</TRACEBACK>')
+            sys.exit(1)
+        finally:
+            if inStream is not sys.stdin: inStream.close()
+            if outStream is not sys.stdout: outStream.close()
+        sys.exit(0)
+
     # Obtain inputs
     pump1  = args.pump1
     pump2  = args.pump2
     signal = args.signal
     idler  = args.idler
 
-    # Act
     try:
 
         if args.validate:
@@ -0,0 +1,130 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+import CCqo101_FWM_detuning
+
+class TestDetuningIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.resonances = np.random.RandomState(101).uniform(1.0e15, 2.0e15, 200)
+        self.pump = 1.5e15
+        self.tolerance = 2.0e12
+
+    def bruteForceCount(self, resonances):
+        I, J = np.triu_indices(resonances.size)
+        detuning = CCqo101_FWM_detuning.calcqo101_FWM_detuning(
+            self.pump, resonances[I], idler=resonances[J])
+        return np.sum(np.abs(detuning) <= self.tolerance)
+
+    def test_query_matches_brute_force(self):
+        idx = CCqo101_FWM_detuning.DetuningIndex(self.resonances)
+        signal, idler = idx.query(self.pump, tolerance=self.tolerance)
+        self.assertEqual(signal.size, self.bruteForceCount(self.resonances))
+        detuning = CCqo101_FWM_detuning.calcqo101_FWM_detuning(
+            self.pump, signal, idler=idler)
+        self.assertTrue(np.all(np.abs(detuning) <= self.tolerance))
+
+    def test_incremental_insert_sorted(self):
+        idx = CCqo101_FWM_detuning.DetuningIndex(self.resonances[:120])
+        idx.insert(self.resonances[120:])
+        full = CCqo101_FWM_detuning.DetuningIndex(self.resonances)
+        self.assertTrue(np.all(np.diff(idx.sums) >= 0))
+        self.assertTrue(np.allclose(idx.sums, full.sums))
+        self.assertEqual(idx.count(self.pump, tolerance=self.tolerance),
+                         self.bruteForceCount(self.resonances))
+
+    def test_save_load(self):
+        idx = CCqo101_FWM_detuning.DetuningIndex(self.resonances)
+        fname = os.path.join(tempfile.mkdtemp(), 'index.npz')
+        idx.save(fname)
+        loaded = CCqo101_FWM_detuning.DetuningIndex.load(fname)
+        self.assertListEqual(loaded.sums.tolist(), idx.sums.tolist())
+        self.assertListEqual(loaded.signal_idx.tolist(), idx.signal_idx.tolist())
+        os.remove(fname)
+
+class TestPhaseMismatch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(27)
+        self.comb = 1.2e15 + 1.0e11*np.arange(50)
+        self.quads = self.comb[rng.randint(0, self.comb.size, size=(4, 1000))]
+        self.beta = [5.0e6, 7.0e-9, 1.0e-25, -3.0e-40]
+        self.omega0 = 1.2e15
+
+    def test_matches_direct_evaluation(self):
+        disp = CCqo101_FWM_detuning.DispersionModel(self.beta, self.omega0)
+        p1, p2, s, i = self.quads
+        mismatch = CCqo101_FWM_detuning.calcqo101_phase_mismatch(
+            p1, s, pump2=p2, idler=i, dispersion=disp)
+        k = disp.evaluate
+        expected = (k(s) + k(i)) - (k(p1) + k(p2))
+        self.assertTrue(np.allclose(mismatch, expected, rtol=0, atol=1e-9*np.abs(expected).max()))
+
+    def test_each_frequency_evaluated_once(self):
+        disp = CCqo101_FWM_detuning.DispersionModel(self.beta, self.omega0)
+        p1, p2, s, i = self.quads
+        CCqo101_FWM_detuning.calcqo101_phase_mismatch(p1, s, pump2=p2, idler=i, dispersion=disp)
+        CCqo101_FWM_detuning.calcqo101_phase_mismatch(p2, i, pump2=p1, idler=s, dispersion=disp)
+        self.assertEqual(disp.evaluations, np.unique(self.quads).size)
+
+    def test_cache_bound_and_batched_merge(self):
+        disp = CCqo101_FWM_detuning.DispersionModel(self.beta, self.omega0, max_cache_size=3000)
+        rng = np.random.RandomState(3)
+        omega = self.omega0 + 1.0e12*rng.uniform(-1.0, 1.0, size=4000)
+        for chunk in np.array_split(omega[:2000], 400):
+            self.assertTrue(np.array_equal(disp.wavevec(chunk), disp.evaluate(chunk)))
+        # Small calls gather in the batch; past the batch limit it is merged
+        self.assertEqual((disp._omega.size, disp._newOmega.size), (1025, 975))
+        self.assertTrue(np.all(np.diff(disp._omega) > 0) and np.all(np.diff(disp._newOmega) > 0))
+        self.assertTrue(np.array_equal(disp.wavevec(omega[:2000]), disp.evaluate(omega[:2000])))
+        self.assertEqual(disp.evaluations, 2000)
+        # More new frequencies than the bound: computed, not cached
+        fresh = omega + 0.5
+        self.assertTrue(np.array_equal(disp.wavevec(fresh), disp.evaluate(fresh)))
+        self.assertEqual((disp.evaluations, disp._omega.size + disp._newOmega.size), (6000, 2000))
+        # Values that would overflow the bound replace the cache
+        disp.wavevec(omega[1000:3500])
+        self.assertEqual((disp.evaluations, disp._omega.size + disp._newOmega.size), (7500, 1500))
+
+    def test_requires_dispersion(self):
+        self.assertRaises(ValueError,
+                          CCqo101_FWM_detuning.calcqo101_phase_mismatch, 1.0, 2.0)
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(49)
+        self.quads = rng.uniform(1.0e15, 2.0e15, size=(10, 4))
+
+    def test_jsonl_blocks_match_single_calls(self):
+        text = u''.join(u'{{"pump1": {!r}, "signal": {!r}, "pump2": {!r}, "idler": {!r}}}\n'.format(
+            *q) for q in self.quads.tolist())
+        header, blocks = CCqo101_FWM_detuning.read_batches(io.StringIO(text), 'jsonl', 3)
+        detuning = np.concatenate([CCqo101_FWM_detuning.calcqo101_batch(b) for b in blocks])
+        expected = [CCqo101_FWM_detuning.calcqo101_FWM_detuning(p1, s, pump2=p2, idler=i)
+                    for p1, s, p2, i in self.quads]
+        self.assertEqual(detuning.tolist(), expected)
+
+    def test_csv_round_trip_and_defaults(self):
+        text = u'pump1,signal,pump2\n100,110,\n100,110,90\n'
+        header, blocks = CCqo101_FWM_detuning.read_batches(io.StringIO(text), 'csv')
+        detuning = CCqo101_FWM_detuning.calcqo101_batch(next(blocks))
+        out = io.StringIO() if bytes is not str else io.BytesIO()
+        CCqo101_FWM_detuning.write_records(out, 'csv', [{'angFreqDetuning': d}
+                                                       for d in detuning.tolist()],
+                                           ['angFreqDetuning'], header=True)
+        self.assertEqual(out.getvalue(), 'angFreqDetuning\n20.0\n30.0\n')
+
+    def test_validate_reports_bad_record(self):
+        records = [{'pump1': 1.0, 'signal': 2.0}, {'pump1': -1.0, 'signal': 2.0}]
+        with self.assertRaises(ValueError) as cm:
+            CCqo101_FWM_detuning.calcqo101_batch(records, validate=True)
+        self.assertIn('indices [1]', str(cm.exception))
+
+suite = unittest.TestSuite([
+    unittest.TestLoader().loadTestsFromTestCase(TestDetuningIndex),
+    unittest.TestLoader().loadTestsFromTestCase(TestPhaseMismatch),
+    unittest.TestLoader().loadTestsFromTestCase(TestBatch)])
+unittest.TextTestRunner(verbosity=2).run(suite)
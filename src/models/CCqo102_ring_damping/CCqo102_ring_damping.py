@@ -33,6 +33,13 @@ Multi-channel damping, each with its own velocity::
   python CCqo102_ring_damping.py --coup 12.0 20.0 --vel 3.0 4.0
 
 
+Batch calculations
+------------------
+Damping of every ring in a CSV file (couplings[i] columns per channel)::
+  python CCqo102_ring_damping.py --batch rings.csv --batch-output damping.csv
+Stream JSONL records through stdin/stdout with validation::
+  cat rings.jsonl | python CCqo102_ring_damping.py --batch - --validate
+
 Calculations with options
 -------------------------
 Display debugging information::
@@ -55,7 +62,8 @@ paramDefns : dict
 
 DEPENDENCIES
 ============
-Module: os, sys, logging
+Module: os, sys, logging, numpy
+        batch_io (common; batch records only)
 Command-line extras: argparse, traceback, pprint
 
 DEVELOPMENT METADATA
@@ -68,10 +76,22 @@ HISTORY
 =======
 1.0b1 [02 Nov 2015 : Timothy C. Burt] 
     * Genesis with blemishes
+1.1b1 [18 Oct 2026]
+    * calc_ring_damping: optional axis for summing channels, so stacks
+      of designs (e.g. designs x channels) are damped in one call
+1.2b1 [18 Oct 2026]
+    * Array-aware validateParameters; read_batches, write_records and
+      calc_ring_damping_records for --batch mode over JSONL/CSV records
+1.2b2 [18 Oct 2026]
+    * read_batches, write_records and batchFormats come from the shared
+      common/batch_io module; JSONL output is one json.dumps per record
+1.2b3 [18 Oct 2026]
+    * calc_ring_damping_records: a single coupling applies to every
+      velocity channel, as in calc_ring_damping and the single-record CLI
 
 """
 
-__version__ = '1.0b1'
+__version__ = '1.2b3'
 
 __copyright__ = "Copyright 2015, Timothy C. Burt"
 __author__ = "Timothy C. Burt"
@@ -87,6 +107,13 @@ import traceback
 import logging
 import numpy as np
 
+# Batch record I/O shared by the models with a --batch mode
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['common']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+from batch_io import batchFormats, read_batches, write_records
+
 lgr = logging.getLogger('__main__')
 
 paramDefns = {
@@ -184,6 +211,15 @@ def validateParameters(**kwargs):
     Bad velocities indices: [0 1]
     Bad velocities values:  [-9 -8]
 
+    Validating a stack of designs, channels along the last axis (INVALID:
+    indices are the rows with a negative value)
+    >>> validateParameters(couplings = [[1,2],[3,-4],[-5,-6]], velocities = [1,2])
+    Traceback (most recent call last):
+        ...
+    ValueError: All coupling values must be >=0
+    Bad couplings indices: [1 2]
+    Bad couplings values:  [-4 -5 -6]
+
     Validating all inputs (INVALID: incompatible shapes)
     >>> validateParameters(velocities = [4,5,6,7], couplings = [1,2,3])
     Traceback (most recent call last):
@@ -217,32 +253,29 @@ def validateParameters(**kwargs):
 
     # couplings
     # =========
-    if _couplings:
-        # Ensure couplings container is an iterable array
-        if not isinstance(_couplings, list):
-            _couplings = [_couplings]
-        _couplings = np.asarray(_couplings)
+    if _couplings is not None:
+        # Ensure couplings container is an iterable array (rows of
+        # channels for stacks of designs)
+        _couplings = np.atleast_1d(np.asarray(_couplings))
         # range-check: _couplings >= 0
-        if any(C < 0 for C in _couplings):
+        if np.any(_couplings < 0):
             badIdx = np.where(_couplings < 0)
             eMsg+= "All coupling values must be >=0" + os.linesep
-            eMsg+= "Bad couplings indices: {}".format(badIdx[0]) + os.linesep
+            eMsg+= "Bad couplings indices: {}".format(np.unique(badIdx[0])) + os.linesep
             eMsg+= "Bad couplings values:  {}".format(_couplings[badIdx])
             err=True
 
     # velocities
     # =========
-    if _velocities:
+    if _velocities is not None:
         # Ensure velocities container is an iterable array
-        if not isinstance(_velocities, list):
-            _velocities = [_velocities]
-        _velocities = np.asarray(_velocities)
+        _velocities = np.atleast_1d(np.asarray(_velocities))
         # range-check: _velocities >= 0
-        if any(v < 0 for v in _velocities):
+        if np.any(_velocities < 0):
             if err: eMsg+= os.linesep
             badIdx = np.where(_velocities < 0)
             eMsg+= "All velocity values must be >=0" + os.linesep
-            eMsg+= "Bad velocities indices: {}".format(badIdx[0]) + os.linesep
+            eMsg+= "Bad velocities indices: {}".format(np.unique(badIdx[0])) + os.linesep
             eMsg+= "Bad velocities values:  {}".format(_velocities[badIdx])
             err=True
 
@@ -349,7 +382,7 @@ def appl_setupLog(level=logging.WARNING,
     lgr.addHandler(ch)
     if logFile is not None: lgr.addHandler(fh)
 
-def calc_ring_damping(couplings, velocities):
+def calc_ring_damping(couplings, velocities, axis=None):
 
     """Obtain a total ring damping parameter from coupling and velocity information.
 
@@ -372,11 +405,15 @@ def calc_ring_damping(couplings, velocities):
         describes a different channel in an order that corresponds to the
         array of couplings.
 
+    axis : integer or None
+        Axis of the broadcast inputs that indexes channels.  None (the
+        default) sums over all values.
+
     Returns
     -------
     damping, path_losses
 
-    damping : float
+    damping : float (or array when axis is given)
         Total damping coefficient
 
     path_losses: float (scalar or array)
@@ -406,6 +443,10 @@ def calc_ring_damping(couplings, velocities):
     >>> calc_ring_damping([12.0, 20.0], 2.0)
     (136.0, array([  36.,  100.]))
 
+    >>> # Several designs at once, channels along the last axis
+    >>> calc_ring_damping([[12.0, 20.0], [6.0, 4.0]], [3.0, 4.0], axis=-1)[0].tolist()
+    [74.0, 8.0]
+
     """
 
     import numpy as np
@@ -417,7 +458,7 @@ def calc_ring_damping(couplings, velocities):
     # Compute each path loss 
     path_losses = np.absolute(couplings)**2 / (2.0 * velocities)
     # Compute total damping coefficient
-    damping = np.sum(path_losses)
+    damping = np.sum(path_losses, axis=axis)
 
     return damping, path_losses
 
@@ -428,6 +469,90 @@ def calc_ring_damping(couplings, velocities):
 
 
 
+def calc_ring_damping_records(records, validate=False):
+    """Ring damping for a block of parameter records, computed as arrays.
+
+    Records may have different numbers of channels; shorter ones are
+    padded with zero-coupling channels so the block is damped in one
+    call of calc_ring_damping along the last axis.  Blocks whose records
+    all have the same shape are converted to arrays directly.
+
+    Parameters
+    ----------
+    records : list of dicts
+        Each with couplings and velocities (scalars or lists; a single
+        coupling or velocity applies to every channel of the record, as
+        in calc_ring_damping)
+    validate : boolean
+        Apply validateParameters to the block (Default=False)
+
+    Returns
+    -------
+    damping, path_losses
+
+    damping : float array
+        Total damping of each record, in order
+    path_losses : list of lists
+        Damping of each channel of each record
+
+    Examples
+    --------
+    >>> damping, path_losses = calc_ring_damping_records(
+    ...     [{'couplings': [12.0, 20.0], 'velocities': [3.0, 4.0]},
+    ...      {'couplings': 12.0, 'velocities': 3.0}])
+    >>> damping.tolist(), path_losses
+    ([74.0, 24.0], [[24.0, 50.0], [24.0]])
+    >>> calc_ring_damping_records([{'couplings': 12.0, 'velocities': [3.0, 4.0]}])[1]
+    [[24.0, 18.0]]
+
+    """
+    try:
+        couplings = np.array([r['couplings'] for r in records], dtype=float)
+        velocities = np.array([r['velocities'] for r in records], dtype=float)
+    except KeyError as e:
+        raise ValueError('Record without required parameter {}'.format(e))
+    except ValueError:
+        # Records of different shapes
+        couplings = velocities = None
+    if couplings is not None and couplings.ndim <= 2 and velocities.ndim <= 2:
+        couplings = couplings.reshape(len(records), -1)
+        velocities = velocities.reshape(len(records), -1)
+        channels = sorted((couplings.shape[1], velocities.shape[1]))
+        if channels[0] in (1, channels[1]):
+            if validate:
+                validateParameters(couplings=couplings, velocities=velocities)
+            damping, path_losses = calc_ring_damping(couplings, velocities, axis=-1)
+            return damping, path_losses.tolist()
+
+    couplings = []
+    velocities = []
+    try:
+        for i, r in enumerate(records):
+            c = r['couplings'] if isinstance(r['couplings'], list) else [r['couplings']]
+            v = r['velocities'] if isinstance(r['velocities'], list) else [r['velocities']]
+            if len(c) == 1:
+                c = c*len(v)
+            elif len(v) == 1:
+                v = v*len(c)
+            if len(v) != len(c):
+                raise ValueError('Record {}: {} couplings but {} velocities'.format(
+                    i, len(c), len(v)))
+            couplings.append(c)
+            velocities.append(v)
+    except KeyError as e:
+        raise ValueError('Record without required parameter {}'.format(e))
+    counts = [len(c) for c in couplings]
+    width = max(counts) if counts else 0
+    if min(counts or [0]) < width:
+        couplings = [c + [0.0]*(width - len(c)) for c in couplings]
+        velocities = [v + [1.0]*(width - len(v)) for v in velocities]
+    couplings = np.array(couplings, dtype=float).reshape(len(counts), width)
+    velocities = np.array(velocities, dtype=float).reshape(len(counts), width)
+    if validate:
+        validateParameters(couplings=couplings, velocities=velocities)
+    damping, path_losses = calc_ring_damping(couplings, velocities, axis=-1)
+    return damping, [p[:n] for p, n in zip(path_losses.tolist(), counts)]
+
 # Command-line main
 if '__main__' == __name__:
 
@@ -456,22 +581,50 @@ if '__main__' == __name__:
 
     reqArgs.add_argument(
         '--couplings', 
-        type=float, required=True,
+        type=float, required=False,
         nargs='+',
         dest='couplings', action='store',
-        help="couplings [(rad s^{-1})^{-1/2}]",
+        help="couplings [(rad s^{-1})^{-1/2}] (not with --batch)",
         metavar='C'
         )
 
     reqArgs.add_argument(
         '--velocities', 
-        type=float, required=True,
+        type=float, required=False,
         nargs='+',
         dest='velocities', action='store',
-        help="velocities [rad s^{-1}]",
+        help="velocities [rad s^{-1}] (not with --batch)",
         metavar='V'
         )
 
+    optArgs.add_argument(
+        '--batch',
+        default=None,
+        dest='batch', action='store',
+        help="Read parameter records (JSONL or CSV with paramDefns names; couplings[i] columns for several channels) from this file, or '-' for stdin, and write damping and path_losses per record in the same order and format",
+        metavar='fname'
+        )
+    optArgs.add_argument(
+        '--batch-format',
+        choices=emr.batchFormats, default=None,
+        dest='batch_format', action='store',
+        help="Batch record format (default: csv for .csv files, otherwise jsonl)"
+        )
+    optArgs.add_argument(
+        '--batch-output',
+        default='-',
+        dest='batch_output', action='store',
+        help="File for batch results, or '-' for stdout",
+        metavar='fname'
+        )
+    optArgs.add_argument(
+        '--block-size',
+        type=int, default=65536,
+        dest='block_size', action='store',
+        help="Batch records validated and computed together",
+        metavar='N'
+        )
+
     optArgs.add_argument(
         '--validate', 
         dest='validate', action='store_true',
@@ -520,6 +673,8 @@ if '__main__' == __name__:
     # Parse options and instantiate object
     # ====================================
     args = argp.parse_args()
+    if args.batch is None and not (hasattr(args, 'couplings') and hasattr(args, 'velocities')):
+        argp.error('--couplings and --velocities are required without --batch')
 
     # Initialize logging
     logLevel = logging.CRITICAL
@@ -533,6 +688,46 @@ if '__main__' == __name__:
     lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__)) 
 
     # Act
+    if args.batch is not None:
+        fmt = args.batch_format
+        if fmt is None:
+            fmt = 'csv' if args.batch.lower().endswith('.csv') else 'jsonl'
+        inStream = sys.stdin if args.batch == '-' else open(args.batch)
+        outStream = sys.stdout if args.batch_output == '-' else open(args.batch_output, 'w')
+        try:
+            header, blocks = emr.read_batches(inStream, fmt, args.block_size)
+            names = ['damping', 'path_losses']
+            if header is not None:
+                channels = max(len([n for n in header if n.split('[')[0] == 'couplings']), 1)
+                names = ['damping'] + ['path_losses[{}]'.format(i) for i in range(channels)]
+            count = 0
+            for block in blocks:
+                try:
+                    damping, path_losses = emr.calc_ring_damping_records(
+                        block, validate=args.validate)
+                except ValueError as e:
+                    lgr.error('Invalid records {}-{} for CCqo102_ring_damping.'.format(
+                        count, count + len(block) - 1))
+                    raise
+                emr.write_records(outStream, fmt,
+                                  [{'damping': d, 'path_losses': p}
+                                   for d, p in zip(damping.tolist(), path_losses)],
+                                  names, header=(count == 0))
+                outStream.flush()
+                count += len(block)
+            lgr.info('CCqo102_ring_damping batch: {} records'.format(count))
+        except Exception:
+            ex_type, ex, tb = sys.exc_info()
+            sys.stderr.write('{}{}{}{}'.format(ex_type, os.linesep, ex, os.linesep))
+            lgr.error('<TRACEBACK>')
+            traceback.print_tb(tb)
+            lgr.error('</TRACEBACK>')
+            sys.exit(1)
+        finally:
+            if inStream is not sys.stdin: inStream.close()
+            if outStream is not sys.stdout: outStream.close()
+        sys.exit(0)
+
     try:
 
         if args.validate:
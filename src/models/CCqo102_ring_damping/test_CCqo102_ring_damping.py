@@ -1,3 +1,4 @@
+import io
 import unittest
 import CCqo102_ring_damping
 
@@ -48,5 +49,63 @@ class TestCCqo102(unittest.TestCase):
                                                                         self.velocities)
         self.assertListEqual(path_losses.tolist(), [24., 50.])
 
+    def test_designs_axis(self):
+        couplings = [self.couplings, [6.0, 4.0], [0.0, 0.0]]
+        [damping, path_losses] = CCqo102_ring_damping.calc_ring_damping(couplings,
+                                                                        self.velocities,
+                                                                        axis=-1)
+        self.assertListEqual(damping.tolist(), [74., 8., 0.])
+        self.assertListEqual(path_losses.tolist(), [[24., 50.], [6., 2.], [0., 0.]])
+        [damping, path_losses] = CCqo102_ring_damping.calc_ring_damping(couplings,
+                                                                        self.velocities,
+                                                                        axis=0)
+        self.assertListEqual(damping.tolist(), [30., 52.])
+
+    def test_records_padded_channels(self):
+        records = [{'couplings': self.couplings, 'velocities': self.velocities},
+                   {'couplings': self.couplings[0], 'velocities': self.velocities[0]},
+                   {'couplings': self.couplings, 'velocities': 2.0}]
+        damping, path_losses = CCqo102_ring_damping.calc_ring_damping_records(records)
+        self.assertListEqual(damping.tolist(), [74., 24., 136.])
+        self.assertListEqual(path_losses, [[24., 50.], [24.], [36., 100.]])
+
+    def test_records_single_coupling(self):
+        single = CCqo102_ring_damping.calc_ring_damping(self.couplings[0], self.velocities)
+        uniform = [{'couplings': self.couplings[0], 'velocities': self.velocities}]*2
+        mixed = uniform[:1] + [{'couplings': self.couplings, 'velocities': 2.0},
+                               {'couplings': [1.0], 'velocities': [1.0, 2.0, 4.0]}]
+        damping, path_losses = CCqo102_ring_damping.calc_ring_damping_records(uniform)
+        self.assertListEqual(damping.tolist(), [single[0]]*2)
+        self.assertListEqual(path_losses, [single[1].tolist()]*2)
+        damping, path_losses = CCqo102_ring_damping.calc_ring_damping_records(mixed)
+        self.assertListEqual(damping.tolist(), [42., 136., 0.875])
+        self.assertListEqual(path_losses[2], [0.5, 0.25, 0.125])
+
+    def test_records_validate_stack(self):
+        records = [{'couplings': self.couplings, 'velocities': self.velocities},
+                   {'couplings': [1.0, -1.0], 'velocities': self.velocities}]
+        self.assertRaises(ValueError, CCqo102_ring_damping.calc_ring_damping_records,
+                          records, True)
+
+    def test_jsonl_round_trip(self):
+        records = [{'couplings': self.couplings, 'velocities': [{'a': 1.0}, {'b': 2.0}]},
+                   {'couplings': [], 'velocities': 3.0}, {}]
+        out = io.StringIO() if bytes is not str else io.BytesIO()
+        CCqo102_ring_damping.write_records(out, 'jsonl', records, ['couplings'])
+        self.assertEqual(out.getvalue().count('\n'), 3)
+        out.seek(0)
+        header, blocks = CCqo102_ring_damping.read_batches(out, 'jsonl', block_size=2)
+        self.assertEqual([r for block in blocks for r in block], records)
+
+    def test_jsonl_one_record_per_line(self):
+        text = (u'{"couplings": 12.0, "velocities": 3.0}\n'
+                u'{"couplings": 12.0, "velocities": 3.0},{"couplings": 1.0, "velocities": 1.0}\n')
+        header, blocks = CCqo102_ring_damping.read_batches(io.StringIO(text), 'jsonl')
+        with self.assertRaises(ValueError) as cm:
+            list(blocks)
+        self.assertTrue(str(cm.exception).startswith('line 2: '))
+        header, blocks = CCqo102_ring_damping.read_batches(io.StringIO(u'[1, 2]\n'), 'jsonl')
+        self.assertRaises(ValueError, next, blocks)
+
 suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo102)
 unittest.TextTestRunner(verbosity=2).run(suite)
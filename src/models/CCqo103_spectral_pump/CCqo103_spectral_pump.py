@@ -37,7 +37,8 @@ paramDefns : dict
 
 DEPENDENCIES
 ============
-Module: os, sys, logging
+Module: os, sys, logging, numpy
+        scipy.special (gaussian pump linewidth only)
 Command-line extras: argparse, traceback, pprint
 
 DEVELOPMENT METADATA
@@ -58,10 +59,45 @@ HISTORY
     * Initial beginnings
 1.0b1 [2016-07-22 : Timothy C. Burt] 
     * Working version with liens on documentation and doctest
+1.0b2 [2026-10-18]
+    * Check finite inputs per column in getInputs (structured arrays no
+      longer cast to float)
+1.1b1 [2026-10-18]
+    * RingResponseTable: tabulated normalized ring response with
+      bilinear lookup, per-cell error bounds, memory-mapped persistence
+      and a latency benchmark (--lookup-table, --table-latency)
+1.2b1 [2026-10-18]
+    * calcqo103_transmission: through- and drop-port transmission of
+      device stacks on a shared grid; ring_denominator shared with
+      calcqo103_spectral_pump (--transmission, --drop-coupling)
+1.3b1 [2026-10-18]
+    * calcqo103_pump_linewidth: closed-form average of the ring response
+      over Gaussian (Faddeeva) or Lorentzian pump jitter
+      (--pump-linewidth, --lineshape)
+1.4b1 [2026-10-18]
+    * PumpSpectrum: gaussian, sech2, lorentzian and tophat pumps by
+      center, width and power; pump_input may be a callable and
+      iter_spectral_pump evaluates the grid chunk by chunk; getInputs
+      pump_column=False (--pump-shape, --pump-center, --pump-width,
+      --pump-power)
+1.5b1 [2026-10-18]
+    * RingResponseSeries and calcqo103_time_series: per-sample metrics
+      of a drifting (damping, detuning) series, recomputing spectra only
+      beyond a tolerance and reusing a ring buffer of recent spectra
+      (--time-series, --series-tolerance, --series-buffer,
+      --series-output)
+1.5b2 [2026-10-18]
+    * Remove RingResponseTable, table_latency and --lookup-table /
+      --table-latency: a bilinear lookup was about 5x slower than the
+      single complex division of calcqo103_spectral_pump, which is the
+      fast path for repeated ring responses
+1.5b3 [2026-10-18]
+    * --pump-linewidth, --transmission and --time-series are mutually
+      exclusive on the command line
 
 """
 
-__version__ = '0.8b1'
+__version__ = '1.5b3'
 
 __copyright__ = "Copyright Timothy C. Burt, 2016"
 __author__ = "Timothy C. Burt"
@@ -324,8 +360,12 @@ def appl_setupLog(level=logging.WARNING,
     lgr.addHandler(ch)
     if logFile is not None: lgr.addHandler(fh)
 
-def getInputs(infile, delim=',', num_header_rows=2):
+def getInputs(infile, delim=',', num_header_rows=2, pump_column=True):
     """Extract inputs from file
+
+    With pump_column=False the pump_input column may be omitted (it is
+    ignored if present) and None is returned in its place, for pumps
+    generated by PumpSpectrum.
     """
     if lgr.getEffectiveLevel() == logging.DEBUG:
         m =''
@@ -333,6 +373,7 @@ def getInputs(infile, delim=',', num_header_rows=2):
         m+='  infile = {}'.format(infile) + os.linesep
         m+='  delim = {}'.format(delim) + os.linesep
         m+='  num_header_rows = {}'.format(num_header_rows) + os.linesep
+        m+='  pump_column = {}'.format(pump_column) + os.linesep
         lgr.debug(m)
     # Set up expected order of column headings
     colHeadings = [
@@ -342,6 +383,7 @@ def getInputs(infile, delim=',', num_header_rows=2):
         'damping',
         'pump_input'
     ]
+    if not pump_column: colHeadings = colHeadings[:-1]
     # Account for no header rows
     if num_header_rows == 0:
         inArr = np.genfromtxt(infile,
@@ -356,7 +398,8 @@ def getInputs(infile, delim=',', num_header_rows=2):
         )
         # Check that the names are consistent
         # Note: The set(A)==set(B) construct does not fail for duplicates
-        if not set(colHeadings) == set(inArr.dtype.names):
+        if not set(inArr.dtype.names) - set(['pump_input']) == set(colHeadings) - set(['pump_input']) \
+           or (pump_column and 'pump_input' not in inArr.dtype.names):
             m =''
             m+='Received name headings = {}'.format(inArr.dtype.names)
             m+=os.linesep
@@ -375,10 +418,10 @@ def getInputs(infile, delim=',', num_header_rows=2):
     couplings = inArr['couplings']
     velocities = inArr['velocities']
     damping = inArr['damping']
-    pump_input = inArr['pump_input']
+    pump_input = inArr['pump_input'] if pump_column else None
 
             
-    if not np.all(np.isfinite(inArr.astype(float))):
+    if not all(np.all(np.isfinite(inArr[name])) for name in inArr.dtype.names):
         m =''
         m+='Received invalid entries in {}'.format(infile) + os.linesep
         m+='Expected all entries populated and finite in {}'.format(infile) + os.linesep
@@ -391,6 +434,25 @@ def getInputs(infile, delim=',', num_header_rows=2):
 
     
     
+def ring_denominator(wavevec, velocities, ring_damping):
+    """Denominator G - 1j*k*v shared by the ring response and transmission.
+
+    Raises ValueError where it vanishes.
+
+    Examples
+    --------
+    >>> ring_denominator(np.array([0.0, 1.0]), 2.0, 3.0).tolist()
+    [(3+0j), (3-2j)]
+
+    """
+    denom = (-1j*np.asarray(wavevec)*velocities + ring_damping)
+    if np.any(denom == 0):
+        m =''
+        m+='Division by zero for -1J*wavevec*velocity+damping' + os.linesep
+        lgr.error(m)
+        raise ValueError(m)
+    return denom
+
 def calcqo103_spectral_pump(
         wavevec,
         couplings_pump,
@@ -427,8 +489,9 @@ def calcqo103_spectral_pump(
     ring_damping_pump : float array
         Spectral damping of the pump by the ring
 
-    pump_input : complex array
-        Spectral pump used for the input channel
+    pump_input : complex array or callable
+        Spectral pump used for the input channel, or a function of
+        wavevec returning it (e.g. a PumpSpectrum), evaluated here
 
     Returns
     -------
@@ -492,18 +555,10 @@ def calcqo103_spectral_pump(
     g = np.array(couplings_pump)
     v = np.array(velocities_pump)
     G = np.array(ring_damping_pump)
-    a = np.array(pump_input)
+    a = pump_input(k) if callable(pump_input) else np.array(pump_input)
 
-    # Check internal calculation for /0
-    denom = (-1j*k*v+G)
-    if np.any(denom == 0):
-        m =''
-        m+='Division by zero for -1J*wavevec*velocity+damping' + os.linesep
-        lgr.error(m)
-        raise ValueError(m)
-    
     # Ring response (rr)
-    rr = -1j*np.conj(g) / denom
+    rr = -1j*np.conj(g) / ring_denominator(k, v, G)
     ring_response = rr
 
     # pump in the ring (b)
@@ -519,7 +574,466 @@ def calcqo103_spectral_pump(
         lgr.debug(m)
 
     return pump_ring, ring_response
-    
+
+class PumpSpectrum(object):
+    """Parametric pump amplitude evaluated on demand, in place of a pump_input column.
+
+    The pump intensity |pump_input|^2 has full width at half maximum
+    'width' about 'center' and integrates over wavevec to 'power':
+      gaussian    exp(-x^2/(2 s^2))/(s sqrt(2 pi)),   s = width/(2 sqrt(2 ln 2))
+      sech2       sech^2(x/T)/(2T),                   T = width/(2 arccosh(sqrt(2)))
+      lorentzian  (c/pi)/(c^2 + x^2),                 c = width/2
+      tophat      1/width for |x| <= width/2
+    with x = wavevec - center.  Instances are callables returning the
+    (real, non-negative) amplitude, so calcqo103_spectral_pump and
+    iter_spectral_pump evaluate the pump only on the grid points at hand.
+
+    Examples
+    --------
+    >>> k = np.linspace(-40.0, 40.0, 160001)
+    >>> for shape in PumpSpectrum.shapes:
+    ...     pump = PumpSpectrum(shape, center=1.0, width=2.0, power=3.0)
+    ...     I = pump.intensity(k)
+    ...     half = k[I >= 0.5*I.max()]
+    ...     print('{} {} {}'.format(shape, round(np.trapz(I, k), 2), round(half[-1] - half[0], 3)))
+    gaussian 3.0 2.0
+    sech2 3.0 2.0
+    lorentzian 2.95 2.0
+    tophat 3.0 2.0
+
+    """
+
+    shapes = ('gaussian', 'sech2', 'lorentzian', 'tophat')
+
+    def __init__(self, shape='gaussian', center=0.0, width=1.0, power=1.0):
+        if shape not in self.shapes:
+            m = 'Unknown pump shape {}; expected one of {}'.format(shape, self.shapes)
+            lgr.error(m)
+            raise ValueError(m)
+        if not width > 0:
+            m = 'Received pump width = {}; expected width > 0'.format(width)
+            lgr.error(m)
+            raise ValueError(m)
+        self.shape = shape
+        self.center = center
+        self.width = width
+        self.power = power
+
+    def __repr__(self):
+        return 'PumpSpectrum({!r}, center={}, width={}, power={})'.format(
+            self.shape, self.center, self.width, self.power)
+
+    def intensity(self, wavevec):
+        """Pump intensity |pump_input|^2 on wavevec."""
+        x = np.asarray(wavevec, dtype=float) - self.center
+        w = float(self.width)
+        if self.shape == 'gaussian':
+            s = w/(2.0*np.sqrt(2.0*np.log(2.0)))
+            profile = np.exp(-0.5*(x/s)**2)/(s*np.sqrt(2.0*np.pi))
+        elif self.shape == 'sech2':
+            T = w/(2.0*np.arccosh(np.sqrt(2.0)))
+            # sech^2(u) = 4 e^(-2|u|)/(1 + e^(-2|u|))^2, without overflow
+            e = np.exp(-2.0*np.abs(x/T))
+            profile = 4.0*e/(1.0 + e)**2/(2.0*T)
+        elif self.shape == 'lorentzian':
+            c = 0.5*w
+            profile = c/np.pi/(c**2 + x**2)
+        else:
+            profile = (np.abs(x) <= 0.5*w)/w
+        return self.power*profile
+
+    def __call__(self, wavevec):
+        return np.sqrt(self.intensity(wavevec))
+
+def iter_spectral_pump(wavevec, couplings_pump, velocities_pump, ring_damping_pump, pump_input,
+                       chunk_size=2**20):
+    """Evaluate calcqo103_spectral_pump over a 1-D grid one chunk at a time.
+
+    Parameters that are arrays as long as wavevec are sliced with it;
+    others (scalars, a callable pump_input) apply to every chunk, so a
+    PumpSpectrum is evaluated only on the chunk at hand.
+
+    Yields
+    ------
+    (start, stop, pump_ring, ring_response) for wavevec[start:stop]
+
+    Examples
+    --------
+    Pump power in the ring for a sweep of pump widths, with no stored
+    pump; a narrow pump approaches |rr|^2 = 4 on resonance
+    >>> k = np.linspace(-20.0, 20.0, 40001)
+    >>> dk = k[1] - k[0]
+    >>> for width in [0.1, 1.0, 10.0]:
+    ...     pump = PumpSpectrum('sech2', width=width)
+    ...     total = sum(np.sum(np.abs(b)**2)*dk for _, _, b, _ in
+    ...                 iter_spectral_pump(k, 1.0, 1.0, 0.5, pump, chunk_size=5000))
+    ...     print(round(total, 3))
+    3.959
+    2.681
+    0.505
+
+    >>> b = calcqo103_spectral_pump(k, 1.0, 1.0, 0.5, PumpSpectrum('tophat', width=3.0))[0]
+    >>> parts = [p for _, _, p, _ in iter_spectral_pump(k, 1.0, 1.0, 0.5, PumpSpectrum('tophat', width=3.0), 7000)]
+    >>> np.array_equal(np.concatenate(parts), b)
+    True
+
+    """
+    n = len(wavevec)
+
+    def piece(x, start, stop):
+        if callable(x) or np.ndim(x) == 0 or np.shape(x)[0] != n:
+            return x
+        return np.asarray(x[start:stop])
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        pump_ring, ring_response = calcqo103_spectral_pump(
+            np.asarray(wavevec[start:stop], dtype=float),
+            piece(couplings_pump, start, stop),
+            piece(velocities_pump, start, stop),
+            piece(ring_damping_pump, start, stop),
+            piece(pump_input, start, stop))
+        yield start, stop, pump_ring, ring_response
+
+def calcqo103_transmission(wavevec, couplings_pump, velocities_pump, ring_damping_pump,
+                           couplings_drop=0.0, velocities_drop=None, shared_grid=True):
+    """Through- and drop-port complex transmission of stacks of rings.
+
+    The ring response rr = -1j*conj(g_p)/(G - 1j*k*v_p) is computed once
+    (one shared denominator) and mapped to the bus waveguides,
+      through = 1 - 1j*g_p*rr/v_p
+      drop    = -1j*g_d*rr/sqrt(v_p*v_d),
+    so that |through|^2 + |drop|^2 = 1 when the couplers are the only
+    damping, G = |g_p|^2/(2 v_p) + |g_d|^2/(2 v_d) (CCqo102_ring_damping).
+    ring_damping_pump is the total damping, including the drop coupler.
+
+    Parameters
+    ----------
+    wavevec : float array
+        Spectral grid
+    couplings_pump, velocities_pump, ring_damping_pump : arrays
+        Bus (pump) coupler, velocity and total damping of each device
+    couplings_drop : complex array
+        Drop coupler of each device (Default=0.0, no drop port)
+    velocities_drop : float array or None
+        Drop-channel velocity (Default=None, velocities_pump)
+    shared_grid : boolean
+        True: device parameters broadcast to a stack shape S and every
+        device is evaluated on the whole grid, giving shape
+        S + wavevec.shape.  False: all inputs broadcast element by
+        element, as in calcqo103_spectral_pump (Default=True)
+
+    Returns
+    -------
+    (through, drop, ring_response)
+
+    through, drop, ring_response : complex arrays
+
+    Examples
+    --------
+    Critically coupled all-pass ring (bus damping equals intrinsic 0.5)
+    has no through transmission on resonance
+    >>> t, d, rr = calcqo103_transmission([-1.0, 0.0, 1.0], 1.0, 1.0, 1.0)
+    >>> abs(t[1]) < 1e-12, np.allclose(np.abs(t[[0, 2]])**2, 0.5)
+    (True, True)
+
+    A stack of three lossless add-drop rings on a shared grid
+    >>> k = np.linspace(-2.0, 2.0, 5)
+    >>> gp = np.array([1.0, 1.5, 2.0]); gd = np.array([1.0, 0.5, 2.0])
+    >>> t, d, rr = calcqo103_transmission(k, gp, 1.0, gp**2/2 + gd**2/2, gd)
+    >>> t.shape, np.allclose(np.abs(t)**2 + np.abs(d)**2, 1.0)
+    ((3, 5), True)
+    >>> np.allclose(rr, calcqo103_spectral_pump(k, gp[:, None], 1.0, (gp**2/2 + gd**2/2)[:, None], 1.0)[1])
+    True
+
+    """
+
+    k = np.asarray(wavevec, dtype=float)
+    gp = np.asarray(couplings_pump)
+    vp = np.asarray(velocities_pump, dtype=float)
+    G = np.asarray(ring_damping_pump)
+    gd = np.asarray(couplings_drop)
+    vd = vp if velocities_drop is None else np.asarray(velocities_drop, dtype=float)
+    if shared_grid:
+        # Trailing grid axes on every device parameter
+        expand = (Ellipsis,) + (None,)*k.ndim
+        gp, vp, G, gd, vd = [x[expand] for x in (gp, vp, G, gd, vd)]
+
+    rr = -1j*np.conj(gp) / ring_denominator(k, vp, G)
+    through = 1.0 - 1j*gp*rr/vp
+    drop = -1j*gd*rr/np.sqrt(vp*vd)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        m =''
+        m+='transmission for {} devices on {} grid points'.format(
+            int(np.prod(through.shape[:through.ndim - k.ndim])) if shared_grid else 1,
+            k.size) + os.linesep
+        lgr.debug(m)
+
+    return through, drop, rr
+
+def calcqo103_pump_linewidth(wavevec, couplings_pump, velocities_pump, ring_damping_pump,
+                             pump_linewidth, lineshape='gaussian', pump_input=1.0):
+    """Ring response averaged over the frequency jitter of a finite-linewidth pump.
+
+    A pump whose frequency wanders by d (in the units of wavevec*velocity)
+    with lineshape p(d) sees the ring response averaged over p,
+      <rr>(k) = integral p(d) rr(k + d/v) dd,
+    which is closed-form for the ring Lorentzian:
+      lorentzian (half width gamma):  G -> G + gamma in rr
+      gaussian (rms width sigma):
+        <rr> = -1j*conj(g) * sqrt(pi/2)/sigma * w((k*v + 1j*G)/(sigma*sqrt(2)))
+    with w the Faddeeva function (scipy.special.wofz).  The incoherent
+    average of |rr|^2 (the Voigt profile for a Gaussian pump) follows as
+      <|rr|^2> = |g|^2/G * Re(<1/(G - 1j*k*v)>).
+    Every grid point is evaluated directly, with no oversampled pump.
+
+    Parameters
+    ----------
+    wavevec, couplings_pump, velocities_pump, ring_damping_pump
+        As in calcqo103_spectral_pump (broadcast together)
+    pump_linewidth : float array
+        sigma (gaussian) or gamma (lorentzian); 0 gives the bare response
+    lineshape : string
+        'gaussian' or 'lorentzian' (Default='gaussian')
+    pump_input : complex array or callable
+        Mean pump amplitude, or a function of wavevec (Default=1.0)
+
+    Returns
+    -------
+    (pump_ring, ring_response, ring_power)
+
+    pump_ring : complex array
+        <rr>*pump_input
+    ring_response : complex array
+        <rr>
+    ring_power : float array
+        <|rr|^2>
+
+    Examples
+    --------
+    Agrees with an explicit average over finely sampled pump jitter
+    >>> d = np.linspace(-12.0, 12.0, 240001)
+    >>> rrJ = calcqo103_spectral_pump(0.7 + d/2.0, 1.5, 2.0, 0.6, 1.0)[1]
+    >>> b, rr, P = calcqo103_pump_linewidth(0.7, 1.5, 2.0, 0.6, 1.0, 'gaussian')
+    >>> p = np.exp(-d**2/2)/np.sqrt(2*np.pi)
+    >>> np.allclose([rr, P], [np.trapz(p*rrJ, d), np.trapz(p*abs(rrJ)**2, d)], rtol=1e-6)
+    True
+
+    Lorentzian tails beyond the sampled jitter limit that average to 2%
+    >>> b, rr, P = calcqo103_pump_linewidth(0.7, 1.5, 2.0, 0.6, 0.8, 'lorentzian')
+    >>> p = 0.8/np.pi/(0.8**2 + d**2)
+    >>> np.allclose([rr, P], [np.trapz(p*rrJ, d), np.trapz(p*abs(rrJ)**2, d)], rtol=2e-2)
+    True
+
+    A vanishing linewidth recovers the bare ring response
+    >>> k = np.array([-1.0, 0.0, 2.0])
+    >>> np.allclose(calcqo103_pump_linewidth(k, 1.5, 2.0, 0.6, 0.0)[1],
+    ...             calcqo103_spectral_pump(k, 1.5, 2.0, 0.6, 1.0)[1])
+    True
+
+    """
+
+    k = np.asarray(wavevec, dtype=float)
+    g = np.asarray(couplings_pump)
+    v = np.asarray(velocities_pump, dtype=float)
+    G = np.asarray(ring_damping_pump, dtype=float)
+    width = np.asarray(pump_linewidth, dtype=float)
+
+    if lineshape == 'lorentzian':
+        mean = 1.0 / ring_denominator(k, v, G + width)
+    elif lineshape == 'gaussian':
+        from scipy.special import wofz
+        kv, G, width = np.broadcast_arrays(k*v, G, width)
+        mean = np.empty(kv.shape, dtype=complex)
+        bare = (width == 0)
+        mean[bare] = 1.0 / ring_denominator(kv[bare], 1.0, G[bare])
+        s = width[~bare]*np.sqrt(2.0)
+        mean[~bare] = np.sqrt(np.pi)/s * wofz((kv[~bare] + 1j*G[~bare])/s)
+    else:
+        m = 'Unknown lineshape {}; expected gaussian or lorentzian'.format(lineshape)
+        lgr.error(m)
+        raise ValueError(m)
+
+    ring_response = -1j*np.conj(g)*mean
+    ring_power = np.abs(g)**2/G*mean.real
+    pump_ring = ring_response*(pump_input(k) if callable(pump_input) else pump_input)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        m =''
+        m+='{} pump linewidth {}: averaged ring response ='.format(lineshape, pump_linewidth) + os.linesep
+        m+='{}'.format(ring_response)
+        lgr.debug(m)
+
+    return pump_ring, ring_response, ring_power
+
+seriesColumns = ['time', 'damping', 'detuning', 'pump_power', 'peak_power', 'peak_wavevec',
+                 'recomputed']
+
+class RingResponseSeries(object):
+    """Ring response for drifting (damping, detuning) states, recomputed only on change.
+
+    A state with ring damping G and resonance detuning d (in units of
+    wavevec*velocity) has the spectrum of calcqo103_spectral_pump at
+    wavevec - d/v.  The most recent computed spectra, their states and
+    scalar metrics are kept in a ring buffer of 'buffer_size' slots.  A
+    new state reuses a buffered spectrum when
+      |G - G_s| <= rtol*G_s  and  |d - d_s| <= rtol*G_s,
+    which keeps the relative error of rr below about 2*rtol; otherwise
+    the spectrum is computed into the oldest slot.  The slot used last is
+    tried first with scalar arithmetic, so slowly drifting states cost
+    about a microsecond per update.
+
+    Parameters
+    ----------
+    wavevec, couplings_pump, velocities_pump
+        As in calcqo103_spectral_pump
+    pump_input : complex array or callable
+        Pump on wavevec (Default=1.0)
+    rtol : float
+        Tolerance relative to the damping (Default=1e-3)
+    buffer_size : integer
+        Spectra kept (Default=16)
+
+    Attributes
+    ----------
+    spectra : complex array (buffer_size x M)
+        Buffered ring responses
+    states : float array (buffer_size x 2)
+        (damping, detuning) of each slot; NaN for empty slots
+    metrics : float array (buffer_size x 3)
+        pump_power (integral of |pump_ring|^2 over wavevec), peak_power
+        (max |rr|^2) and peak_wavevec of each slot
+    computed, reused : integers
+        Counts of updates that computed or reused a spectrum
+
+    """
+
+    def __init__(self, wavevec, couplings_pump, velocities_pump, pump_input=1.0, rtol=1.0e-3,
+                 buffer_size=16):
+        self.wavevec = np.asarray(wavevec, dtype=float)
+        self.couplings = np.asarray(couplings_pump)
+        self.velocities = np.asarray(velocities_pump, dtype=float)
+        pump = pump_input(self.wavevec) if callable(pump_input) else pump_input
+        self.pump = np.broadcast_to(np.asarray(pump), self.wavevec.shape)
+        self.rtol = rtol
+        self.spectra = np.zeros((buffer_size, self.wavevec.size), dtype=complex)
+        self.states = np.full((buffer_size, 2), np.nan)
+        self.metrics = np.zeros((buffer_size, 3))
+        self.head = 0
+        self.last = -1
+        self.computed = 0
+        self.reused = 0
+
+    def lookup(self, damping, detuning):
+        """Slot of the closest buffered state within tolerance, or -1."""
+        G, d = self.states[:, 0], self.states[:, 1]
+        with np.errstate(invalid='ignore'):
+            dist = np.abs(G - damping) + np.abs(d - detuning)
+            ok = (np.abs(G - damping) <= self.rtol*G) & (np.abs(d - detuning) <= self.rtol*G)
+        if not ok.any():
+            return -1
+        return int(np.argmin(np.where(ok, dist, np.inf)))
+
+    def update(self, damping, detuning=0.0):
+        """Slot holding the spectrum for this state, computing it if needed."""
+        if self.last >= 0:
+            G, d = self._last
+            if abs(G - damping) <= self.rtol*G and abs(d - detuning) <= self.rtol*G:
+                self.reused += 1
+                return self.last
+        slot = self.lookup(damping, detuning)
+        if slot >= 0:
+            self.reused += 1
+            self.last, self._last = slot, tuple(self.states[slot])
+            return slot
+        slot = self.head
+        self.head = (self.head + 1) % len(self.spectra)
+        rr = calcqo103_spectral_pump(self.wavevec - detuning/self.velocities, self.couplings,
+                                     self.velocities, damping, 1.0)[1]
+        power = np.abs(rr)**2
+        peak = int(np.argmax(power))
+        self.spectra[slot] = rr
+        self.states[slot] = damping, detuning
+        self.last, self._last = slot, (float(damping), float(detuning))
+        self.metrics[slot] = (np.trapz(power*np.abs(self.pump)**2, self.wavevec),
+                              power[peak], self.wavevec[peak])
+        self.computed += 1
+        return slot
+
+def calcqo103_time_series(wavevec, couplings_pump, velocities_pump, times, ring_damping, detuning=0.0,
+                          pump_input=1.0, rtol=1.0e-3, buffer_size=16):
+    """Per-sample spectral metrics of a drifting ring, computing spectra only on change.
+
+    Parameters
+    ----------
+    wavevec, couplings_pump, velocities_pump
+        Spectral grid and its parameters, as in calcqo103_spectral_pump
+    times, ring_damping, detuning : float arrays (T)
+        States of the time series (detuning may be a scalar)
+    pump_input, rtol, buffer_size
+        See RingResponseSeries
+
+    Returns
+    -------
+    (table, series)
+
+    table : numpy record array (T)
+        Columns seriesColumns; 'recomputed' marks samples whose
+        spectrum was computed rather than taken from the buffer
+    series : RingResponseSeries
+        The buffer after the last sample
+
+    Examples
+    --------
+    A slow damping drift with a small oscillating detuning
+    >>> k = np.linspace(-5.0, 5.0, 20001)
+    >>> t = np.linspace(0.0, 1.0, 5000)
+    >>> G = 0.5 + 0.01*t
+    >>> d = 0.0002*np.sin(40*t)
+    >>> table, series = calcqo103_time_series(k, 1.0, 1.0, t, G, d, rtol=1e-3)
+    >>> int(table['recomputed'].sum()) < 100, series.computed + series.reused
+    (True, 5000)
+    >>> exact = np.abs(calcqo103_spectral_pump(k - d[-1], 1.0, 1.0, G[-1], 1.0)[1])**2
+    >>> bool(abs(table['peak_power'][-1]/exact.max() - 1) < 2e-3)
+    True
+
+    """
+    times = np.asarray(times, dtype=float)
+    G, d = np.broadcast_arrays(np.asarray(ring_damping, dtype=float),
+                               np.asarray(detuning, dtype=float))
+    G, d = np.broadcast_to(G, times.shape), np.broadcast_to(d, times.shape)
+    series = RingResponseSeries(wavevec, couplings_pump, velocities_pump, pump_input, rtol,
+                                buffer_size)
+    table = np.zeros(times.size, dtype=[(name, '?' if name == 'recomputed' else 'f8')
+                                        for name in seriesColumns])
+    metrics = np.empty((times.size, 3))
+    recomputed = table['recomputed']
+    for i in range(times.size):
+        before = series.computed
+        # Copy the slot metrics now; the slot may be overwritten later
+        metrics[i] = series.metrics[series.update(G[i], d[i])]
+        recomputed[i] = series.computed > before
+    table['pump_power'] = metrics[:, 0]
+    table['peak_power'] = metrics[:, 1]
+    table['peak_wavevec'] = metrics[:, 2]
+    table['time'] = times
+    table['damping'] = G
+    table['detuning'] = d
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        m =''
+        m+='time series: {} samples, {} spectra computed, {} reused'.format(
+            times.size, series.computed, series.reused) + os.linesep
+        lgr.debug(m)
+
+    return table.view(np.recarray), series
+
+def write_time_series(filename, table):
+    """Write a calcqo103_time_series table to CSV."""
+    np.savetxt(filename, np.column_stack([table[name] for name in seriesColumns]),
+               delimiter=',', header=','.join(seriesColumns), comments='',
+               fmt=['%.9g']*(len(seriesColumns) - 1) + ['%d'])
 
 if '__main__' == __name__:
 
@@ -557,6 +1071,109 @@ if '__main__' == __name__:
         metavar='nHdr'
         )
 
+    argp.add_argument(
+        '--pump-shape',
+        choices=['gaussian', 'sech2', 'lorentzian', 'tophat'], required=False,
+        dest='pump_shape', action='store',
+        default=None,
+        help="Generate the pump from this shape instead of the pump_input column (which may then be omitted)"
+        )
+    argp.add_argument(
+        '--pump-center',
+        type=float, required=False,
+        dest='pump_center', action='store',
+        default=0.0,
+        help="Center of the generated pump (wavevec units)",
+        metavar='k0'
+        )
+    argp.add_argument(
+        '--pump-width',
+        type=float, required=False,
+        dest='pump_width', action='store',
+        default=1.0,
+        help="Intensity FWHM of the generated pump (wavevec units)",
+        metavar='width'
+        )
+    argp.add_argument(
+        '--pump-power',
+        type=float, required=False,
+        dest='pump_power', action='store',
+        default=1.0,
+        help="Integrated intensity of the generated pump",
+        metavar='power'
+        )
+    # Calculation modes, one per run
+    modes = argp.add_mutually_exclusive_group()
+    modes.add_argument(
+        '--pump-linewidth',
+        type=float, required=False,
+        dest='pump_linewidth', action='store',
+        default=0.0,
+        help="Average the ring response over pump frequency jitter of this width (rms for gaussian, half width for lorentzian, in units of wavevec*velocity)",
+        metavar='width'
+        )
+    argp.add_argument(
+        '--lineshape',
+        choices=['gaussian', 'lorentzian'], required=False,
+        dest='lineshape', action='store',
+        default='gaussian',
+        help="Pump lineshape for --pump-linewidth"
+        )
+    modes.add_argument(
+        '--transmission',
+        dest='transmission', action='store_true',
+        default=False,
+        help="Report through- and drop-port transmission for each input row (damping is the total ring damping)"
+        )
+    argp.add_argument(
+        '--drop-coupling',
+        type=float, required=False,
+        dest='drop_coupling', action='store',
+        default=0.0,
+        help="Drop-port coupling constant (with --transmission)",
+        metavar='gDrop'
+        )
+    argp.add_argument(
+        '--drop-velocity',
+        type=float, required=False,
+        dest='drop_velocity', action='store',
+        default=None,
+        help="Drop-channel velocity (with --transmission; default: pump velocity)",
+        metavar='vDrop'
+        )
+    modes.add_argument(
+        '--time-series',
+        required=False,
+        dest='time_series', action='store',
+        default=None,
+        help="CSV file with header time,damping,detuning; report per-sample metrics of the ring response instead of the spectrum (the damping column of the inputs is ignored)",
+        metavar='seriesFilename'
+        )
+    argp.add_argument(
+        '--series-tolerance',
+        type=float, required=False,
+        dest='series_tolerance', action='store',
+        default=1.0e-3,
+        help="Reuse a buffered spectrum while damping and detuning change by less than this fraction of the damping",
+        metavar='rtol'
+        )
+    argp.add_argument(
+        '--series-buffer',
+        type=int, required=False,
+        dest='series_buffer', action='store',
+        default=16,
+        help="Number of spectra kept for reuse (with --time-series)",
+        metavar='N'
+        )
+    argp.add_argument(
+        '--series-output',
+        required=False,
+        dest='series_output', action='store',
+        default=None,
+        help="CSV file for the per-sample metrics (with --time-series)",
+        metavar='outFilename'
+        )
+
     argp.add_argument(
         '--validate', 
         dest='validate', action='store_true',
@@ -616,7 +1233,13 @@ if '__main__' == __name__:
          damping,
          pump_input
         ] = emr.getInputs(args.spectral_inputs,
-                          num_header_rows=args.num_header_rows)
+                          num_header_rows=args.num_header_rows,
+                          pump_column=args.pump_shape is None)
+        pump = pump_input
+        if args.pump_shape is not None:
+            pump = emr.PumpSpectrum(args.pump_shape, args.pump_center, args.pump_width,
+                                    args.pump_power)
+            pump_input = pump(wavevec)
         if args.validate:
             try:
                 emr.validateParameters(
@@ -639,18 +1262,51 @@ if '__main__' == __name__:
                 lgr.error(msg)
                 raise
 
-        pump_ring, ring_response = emr.calcqo103_spectral_pump(
-            wavevec = wavevec,
-            couplings_pump = couplings,
-            velocities_pump = velocities,
-            ring_damping_pump = damping,
-            pump_input = pump_input
-        )
-        msg = ''
-        msg += ' CCqo103_spectral_pump outputs' + os.linesep
-        msg += '  pump in ring = {}'.format(pump_ring) + os.linesep
-        msg += '  ring response= {}'.format(ring_response)
-        if lgr.getEffectiveLevel() > logging.INFO: print(pump_ring)
+        if args.time_series is not None:
+            states = np.genfromtxt(args.time_series, delimiter=',', names=True)
+            table, series = emr.calcqo103_time_series(
+                wavevec, couplings, velocities,
+                states['time'], states['damping'], states['detuning'],
+                pump_input = pump,
+                rtol = args.series_tolerance,
+                buffer_size = args.series_buffer)
+            if args.series_output is not None:
+                emr.write_time_series(args.series_output, table)
+            msg = ''
+            msg += ' CCqo103_spectral_pump time series' + os.linesep
+            msg += '  samples = {}, spectra computed = {}'.format(table.size, series.computed) + os.linesep
+            msg += '  pump power = {}'.format(table.pump_power)
+            result = table.pump_power
+        else:
+            if args.pump_linewidth:
+                pump_ring, ring_response = emr.calcqo103_pump_linewidth(
+                    wavevec, couplings, velocities, damping,
+                    pump_linewidth = args.pump_linewidth,
+                    lineshape = args.lineshape,
+                    pump_input = pump)[:2]
+            else:
+                pump_ring, ring_response = emr.calcqo103_spectral_pump(
+                    wavevec = wavevec,
+                    couplings_pump = couplings,
+                    velocities_pump = velocities,
+                    ring_damping_pump = damping,
+                    pump_input = pump
+                )
+            msg = ''
+            msg += ' CCqo103_spectral_pump outputs' + os.linesep
+            msg += '  pump in ring = {}'.format(pump_ring) + os.linesep
+            msg += '  ring response= {}'.format(ring_response)
+            result = pump_ring
+            if args.transmission:
+                through, drop = emr.calcqo103_transmission(
+                    wavevec, couplings, velocities, damping,
+                    couplings_drop = args.drop_coupling,
+                    velocities_drop = args.drop_velocity,
+                    shared_grid = False)[:2]
+                msg += os.linesep + '  through = {}'.format(through)
+                msg += os.linesep + '  drop = {}'.format(drop)
+                result = np.vstack((through, drop))
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
         else: lgr.info(msg)
 
     except Exception:
@@ -0,0 +1,158 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+import CCqo103_spectral_pump
+
+modelDir = os.path.dirname(os.path.abspath(CCqo103_spectral_pump.__file__))
+
+class TestCCqo103(unittest.TestCase):
+
+    def setUp(self):
+        self.k = np.linspace(-3.0, 3.0, 61)
+        self.gp = np.array([1.0, 1.5j, 0.8 - 0.6j])
+        self.gd = np.array([0.5, 2.0, 0.0])
+        self.vp = np.array([1.0, 2.0, 0.5])
+        self.vd = np.array([1.5, 0.7, 1.0])
+        # Ring damping equal to the coupler losses alone, i.e. no intrinsic loss
+        self.G = np.abs(self.gp)**2/(2*self.vp) + np.abs(self.gd)**2/(2*self.vd)
+
+    def test_lossless_add_drop_conserves_power(self):
+        t, d, rr = CCqo103_spectral_pump.calcqo103_transmission(
+            self.k, self.gp, self.vp, self.G, self.gd, self.vd)
+        self.assertEqual(t.shape, (3, 61))
+        self.assertTrue(np.allclose(np.abs(t)**2 + np.abs(d)**2, 1.0))
+        self.assertTrue(np.all(d[2] == 0))
+
+    def test_intrinsic_loss_absorbs(self):
+        t, d, rr = CCqo103_spectral_pump.calcqo103_transmission(
+            self.k, self.gp, self.vp, self.G + 0.3, self.gd, self.vd)
+        absorbed = 1.0 - np.abs(t)**2 - np.abs(d)**2
+        self.assertTrue(np.all((absorbed > 0) & (absorbed < 1)))
+
+    def test_critical_coupling(self):
+        # All-pass without intrinsic loss, full extinction on resonance when it matches
+        t, d, rr = CCqo103_spectral_pump.calcqo103_transmission(self.k, 1.0, 2.0, 0.25)
+        self.assertTrue(np.allclose(np.abs(t), 1.0))
+        t, d, rr = CCqo103_spectral_pump.calcqo103_transmission(self.k, 1.0, 2.0, 0.5)
+        self.assertTrue(abs(t[30]) < 1e-12)
+
+    def test_shared_grid_matches_elementwise(self):
+        shared = CCqo103_spectral_pump.calcqo103_transmission(
+            self.k, self.gp, self.vp, self.G, self.gd, self.vd)
+        col = lambda x: x[:, None]
+        elementwise = CCqo103_spectral_pump.calcqo103_transmission(
+            self.k[None, :], col(self.gp), col(self.vp), col(self.G), col(self.gd),
+            col(self.vd), shared_grid=False)
+        for a, b in zip(shared, elementwise):
+            self.assertTrue(np.allclose(a, b))
+
+    def test_zero_denominator(self):
+        self.assertRaises(ValueError, CCqo103_spectral_pump.calcqo103_transmission,
+                          [0.0, 1.0], 1.0, 1.0, 0.0)
+
+    def test_linewidth_mixed_zero_widths(self):
+        widths = np.array([0.0, 0.4, 0.0, 1.2])
+        b, rr, P = CCqo103_spectral_pump.calcqo103_pump_linewidth(
+            self.k[:, None], 1.5, 2.0, 0.6, widths)
+        bare = CCqo103_spectral_pump.calcqo103_spectral_pump(self.k, 1.5, 2.0, 0.6, 1.0)[1]
+        self.assertEqual(rr.shape, (61, 4))
+        self.assertTrue(np.allclose(rr[:, 0], bare) and np.allclose(rr[:, 2], bare))
+        self.assertTrue(np.allclose(P[:, 0], np.abs(bare)**2))
+        # Averaging over jitter broadens the line and lowers its peak
+        self.assertTrue(np.all(np.diff(P[30, [0, 1, 3]]) < 0))
+
+    def test_linewidth_lorentzian_and_area(self):
+        k = np.linspace(-400.0, 400.0, 400001)
+        b, rr, P = CCqo103_spectral_pump.calcqo103_pump_linewidth(
+            k, 1.5, 2.0, 0.6, 0.3, 'lorentzian', pump_input=lambda k: 2.0*np.ones_like(k))
+        self.assertTrue(np.allclose(rr, CCqo103_spectral_pump.calcqo103_spectral_pump(
+            k, 1.5, 2.0, 0.9, 1.0)[1]))
+        self.assertTrue(np.allclose(b, 2.0*rr))
+        # Jitter redistributes ring power over wave vector without changing its total
+        for shape in ('lorentzian', 'gaussian'):
+            P = CCqo103_spectral_pump.calcqo103_pump_linewidth(k, 1.5, 2.0, 0.6, 0.3, shape)[2]
+            self.assertTrue(abs(np.trapz(P, k)/(np.pi*1.5**2/(0.6*2.0)) - 1.0) < 2e-3)
+
+    def test_linewidth_unknown_lineshape(self):
+        self.assertRaises(ValueError, CCqo103_spectral_pump.calcqo103_pump_linewidth,
+                          self.k, 1.5, 2.0, 0.6, 0.3, 'voigt')
+
+    def test_pump_spectrum(self):
+        k = np.linspace(-60.0, 60.0, 240001)
+        for shape in ('gaussian', 'sech2', 'tophat'):
+            pump = CCqo103_spectral_pump.PumpSpectrum(shape, center=-2.0, width=0.5, power=4.0)
+            # The tophat edges cost up to one grid step of its height
+            self.assertTrue(abs(np.trapz(pump(k)**2, k) - 4.0) < 1e-2)
+            self.assertTrue(np.allclose(
+                CCqo103_spectral_pump.calcqo103_spectral_pump(k[::1000], 1.5, 2.0, 0.6, pump)[0],
+                CCqo103_spectral_pump.calcqo103_spectral_pump(k[::1000], 1.5, 2.0, 0.6,
+                                                               pump(k[::1000]))[0]))
+        self.assertRaises(ValueError, CCqo103_spectral_pump.PumpSpectrum, 'square')
+        self.assertRaises(ValueError, CCqo103_spectral_pump.PumpSpectrum, 'gaussian', width=0.0)
+
+    def test_command_line_modes_exclusive(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            base = [sys.executable, os.path.join(modelDir, 'CCqo103_spectral_pump.py'),
+                    '--spectral-inputs', os.path.join(modelDir, 'inputs-00.csv'),
+                    '--log-file', os.path.join(tmp, 'cli.log')]
+            for modes in (['--transmission', '--pump-linewidth', '0.3'],
+                          ['--time-series', 'series.csv', '--transmission'],
+                          ['--pump-linewidth', '0.3', '--time-series', 'series.csv']):
+                run = subprocess.Popen(base + modes, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, cwd=tmp)
+                err = run.communicate()[1].decode()
+                self.assertEqual(run.returncode, 2)
+                self.assertTrue('not allowed with' in err)
+            out = subprocess.check_output(base + ['--transmission'], cwd=tmp)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertTrue(out.decode().startswith('[['))
+
+    def test_series_buffer_wraparound(self):
+        series = CCqo103_spectral_pump.RingResponseSeries(self.k, 1.0, 1.0, buffer_size=3)
+        self.assertEqual([series.update(G) for G in (1.0, 2.0, 3.0, 4.0)], [0, 1, 2, 0])
+        self.assertEqual(series.head, 1)
+        self.assertEqual(series.states[:, 0].tolist(), [4.0, 2.0, 3.0])
+        # The evicted state is computed again into the next oldest slot
+        self.assertEqual(series.update(1.0), 1)
+        self.assertEqual(series.update(3.0), 2)
+        self.assertEqual((series.computed, series.reused, series.head), (5, 1, 2))
+        self.assertTrue(np.allclose(series.spectra[1], CCqo103_spectral_pump.calcqo103_spectral_pump(
+            self.k, 1.0, 1.0, 1.0, 1.0)[1]))
+
+    def test_series_tolerance(self):
+        series = CCqo103_spectral_pump.RingResponseSeries(self.k, 1.0, 1.0, rtol=1e-3)
+        states = [(1.0, 0.0), (1.0009, 0.0), (1.0, 0.0009), (1.0011, 0.0), (1.0, 0.0011),
+                  (0.9995, -0.0005), (1.0, 0.0)]
+        slots = [series.update(G, d) for G, d in states]
+        self.assertEqual(slots, [0, 0, 0, 1, 2, 0, 0])
+        self.assertEqual((series.computed, series.reused), (3, 4))
+        self.assertTrue(np.allclose(series.states[:3], [[1.0, 0.0], [1.0011, 0.0], [1.0, 0.0011]]))
+        self.assertEqual(series.lookup(2.0, 0.0), -1)
+
+    def test_time_series_overwritten_slots(self):
+        G = np.array([1.0, 2.0, 4.0, 1.0, 1.0, 2.0])
+        table, series = CCqo103_spectral_pump.calcqo103_time_series(
+            self.k, 1.0, 1.0, np.arange(6.0), G, buffer_size=2)
+        self.assertEqual(table['recomputed'].tolist(), [True, True, True, True, False, True])
+        # Metrics are those of each sample's own state, not of the slot's final contents
+        self.assertTrue(np.allclose(table['peak_power'], 1.0/G**2))
+        self.assertTrue(np.allclose(table['peak_wavevec'], 0.0))
+        self.assertEqual(list(table.dtype.names), CCqo103_spectral_pump.seriesColumns)
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'series.csv')
+            CCqo103_spectral_pump.write_time_series(fname, table)
+            back = np.genfromtxt(fname, delimiter=',', names=True)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertTrue(np.allclose(back['pump_power'], table['pump_power'], rtol=1e-8))
+        self.assertEqual(back['recomputed'].tolist(), [1, 1, 1, 1, 0, 1])
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo103)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,827 @@
+"""Generate a ring resonance comb with thermal and Kerr power-dependent shifts
+
+A ring resonator supports a comb of resonances, omega_m = omega_0 + m*FSR +
+D2*m^2/2, that feed the frequencies of CCqo101_FWM_detuning.  Light stored
+in the ring shifts every resonance through the Kerr effect and through
+heating (thermo-optic effect).  For a pump of power P at detuning
+Delta0 = omega_pump - omega_res from its cold resonance, the intracavity
+energy U is fixed by the same Lorentzian response used in
+CCqo103_spectral_pump, evaluated at the shifted detuning,
+  U [(Delta0 + gamma U)^2 + G^2] = |g|^2 P
+where G is the ring damping and gamma the total shift per unit energy.
+This is a cubic in U with up to three real roots; the middle root of a
+bistable set is unstable.  This module solves the cubic in closed form for
+all (power, detuning) points at once and reports every stable branch.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo104_resonance_comb.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo104_resonance_comb
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo104_resonance_comb.py
+
+Calculations
+------------
+Cold comb of modes -2..2::
+  python CCqo104_resonance_comb.py --center-freq 1.2e15 --fsr 1.0e12 --modes -2 -1 0 1 2
+Pumped comb, thermal and Kerr shifts, three pump powers::
+  python CCqo104_resonance_comb.py --center-freq 1.2e15 --fsr 1.0e12 --modes -2 -1 0 1 2 --pump-freq 1.19999e15 --pump-power 0.001 0.01 0.1 --couplings 1.0e5 --damping 1.0e9 --kerr-shift 1.0e9 --thermal-shift 5.0e10 -vv
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Comb generator, vectorized cubic roots and bistability solver
+1.0b2 [2026-10-18]
+    * Clamp round-off of the zero-energy root (pump_power = 0)
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'modes':{
+        'desc':'relative azimuthal mode numbers of the comb',
+        'valrange':'(-inf, inf)',
+        'default': '0',
+        'datatype':'integer (M-element array)',
+        'units':'1',
+        'flow':'input'
+        },
+    'center_freq':{
+        'desc':'cold angular frequency of mode 0',
+        'valrange':'(0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'fsr':{
+        'desc':'free spectral range',
+        'valrange':'(0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'd2':{
+        'desc':'integrated dispersion (second order)',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'pump_freq':{
+        'desc':'pump laser angular frequency',
+        'valrange':'(0, inf)',
+        'default': '0.0',
+        'datatype':'float (scalar or array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'pump_power':{
+        'desc':'pump power in the input channel',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float (scalar or array)',
+        'units':'[pump_input]^2',
+        'flow':'input'
+        },
+    'couplings_pump':{
+        'desc':'coupling constant of the pump channel',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'complex',
+        'units':'rad^(1/2) m^(1/2) s^(-1)',
+        'flow':'input'
+        },
+    'ring_damping_pump':{
+        'desc':'ring damping of the pumped mode',
+        'valrange':'(0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'kerr_shift':{
+        'desc':'Kerr red shift of the pumped mode per intracavity energy',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1) [energy]^(-1)',
+        'flow':'input'
+        },
+    'thermal_shift':{
+        'desc':'thermal red shift per intracavity energy (steady state)',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1) [energy]^(-1)',
+        'flow':'input'
+        },
+    'energy':{
+        'desc':'intracavity energy of the pumped mode for each root branch',
+        'valrange':'[0, inf)',
+        'default': 'nan',
+        'datatype':'float (..., 3 array, nan where no branch)',
+        'units':'[energy]',
+        'flow':'intermediate output'
+        },
+    'stable':{
+        'desc':'stability of each root branch',
+        'valrange':'{False, True}',
+        'default': 'False',
+        'datatype':'boolean (..., 3 array)',
+        'units':'1',
+        'flow':'intermediate output'
+        },
+    'shifted_comb':{
+        'desc':'hot resonance angular frequencies for each root branch',
+        'valrange':'(0, inf)',
+        'default': 'nan',
+        'datatype':'float (..., 3, M array)',
+        'units':'rad s^(-1)',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * fsr > 0
+      * pump_power >= 0
+      * ring_damping_pump > 0
+      * kerr_shift, thermal_shift >= 0
+    Warning checks:
+      * modes not integer valued
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    See Also
+    --------
+    logging (lgr object is a precondition)
+
+    Examples
+    --------
+    Valid inputs
+    >>> validateParameters(fsr=1.0e12, pump_power=[0.0, 1.0], ring_damping_pump=1.0e9)
+
+    Invalid damping
+    >>> validateParameters(ring_damping_pump=[1.0, 0.0])
+    Traceback (most recent call last):
+        ...
+    ValueError: All ring_damping_pump values must be > 0
+    Bad ring_damping_pump indices: [1]
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    # range-check: strictly positive and non-negative parameters
+    checks = [('fsr', np.less_equal, '> 0'),
+              ('ring_damping_pump', np.less_equal, '> 0'),
+              ('pump_power', np.less, '>= 0'),
+              ('kerr_shift', np.less, '>= 0'),
+              ('thermal_shift', np.less, '>= 0')]
+    for name, isBad, expected in checks:
+        val = kwargs.get(name)
+        if val is None: continue
+        val = np.atleast_1d(np.asarray(val, dtype=float))
+        if np.any(isBad(val, 0)):
+            badIdx = np.where(isBad(val, 0))
+            eMsg += 'All {} values must be {}'.format(name, expected) + os.linesep
+            eMsg += 'Bad {} indices: {}'.format(name, badIdx[0]) + os.linesep
+            err = True
+
+    # modes are expected to be integers
+    modes = kwargs.get('modes')
+    if modes is not None:
+        modes = np.asarray(modes, dtype=float)
+        if np.any(modes != np.round(modes)):
+            wMsg += 'Received non-integer mode numbers: {}'.format(modes) + os.linesep
+            wrn = True
+
+    if err and wrn:
+        lgr.warn(wMsg)
+        lgr.error(eMsg)
+        raise ValueError(eMsg + wMsg)
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def calc_resonance_comb(modes, center_freq, fsr, d2=0.0):
+
+    """Cold resonance angular frequencies of a ring.
+
+    omega_m = center_freq + m*fsr + d2*m^2/2
+
+    Parameters
+    ----------
+    modes : integer (scalar or array)
+        Relative azimuthal mode numbers
+    center_freq : float
+        Angular frequency of mode 0
+    fsr : float
+        Free spectral range
+    d2 : float
+        Second-order integrated dispersion (Default=0.0)
+
+    Returns
+    -------
+    comb : float array
+        Resonance angular frequencies in the order of modes
+
+    Examples
+    --------
+    >>> calc_resonance_comb([-1, 0, 1, 2], 100.0, 10.0, d2=2.0).tolist()
+    [91.0, 100.0, 111.0, 124.0]
+
+    """
+
+    m = np.asarray(modes, dtype=float)
+    return center_freq + m*fsr + 0.5*d2*m**2
+
+def solve_cubic(a, b, c, d, polish=2):
+
+    """Real roots of a*x^3 + b*x^2 + c*x + d = 0 for arrays of coefficients.
+
+    Roots are obtained in closed form (trigonometric form when three real
+    roots exist, Cardano otherwise) and refined with Newton steps.  Points
+    with a == 0 fall back to the quadratic or linear solution.
+
+    Parameters
+    ----------
+    a, b, c, d : float (scalar or array)
+        Coefficients, broadcast together
+    polish : integer
+        Number of Newton refinement steps (Default=2)
+
+    Returns
+    -------
+    roots : float array (..., 3)
+        Real roots sorted ascending, padded with nan where fewer than
+        three real roots exist
+
+    Examples
+    --------
+    Three real roots, (x-1)(x-2)(x-3)
+    >>> solve_cubic(1.0, -6.0, 11.0, -6.0).round(12).tolist()
+    [1.0, 2.0, 3.0]
+
+    One real root, x^3 + x - 2 = (x-1)(x^2+x+2), and a linear equation
+    >>> solve_cubic([1.0, 0.0], [0.0, 0.0], [1.0, 2.0], [-2.0, -3.0]).round(12).tolist()
+    [[1.0, nan, nan], [1.5, nan, nan]]
+
+    """
+
+    a, b, c, d = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (a, b, c, d)])
+    roots = np.full(a.shape + (3,), np.nan)
+
+    cubic = a != 0
+    if np.any(cubic):
+        A = a[cubic]
+        B = b[cubic] / A
+        C = c[cubic] / A
+        D = d[cubic] / A
+        # Depressed cubic t^3 + p t + q = 0 with x = t - B/3
+        shift = -B / 3.0
+        p = C - B**2 / 3.0
+        q = 2.0*B**3/27.0 - B*C/3.0 + D
+        disc = (q/2.0)**2 + (p/3.0)**3
+
+        r = np.full(B.shape + (3,), np.nan)
+        three = disc < 0
+        if np.any(three):
+            pt = p[three]
+            qt = q[three]
+            amp = 2.0*np.sqrt(-pt/3.0)
+            arg = np.clip(3.0*qt/(pt*amp), -1.0, 1.0)
+            phi = np.arccos(arg) / 3.0
+            k = np.arange(3)
+            r[three] = amp[:, None]*np.cos(phi[:, None] - 2.0*np.pi*k/3.0) + shift[three][:, None]
+        one = ~three
+        if np.any(one):
+            sq = np.sqrt(disc[one])
+            qo = q[one]
+            r[one, 0] = np.cbrt(-qo/2.0 + sq) + np.cbrt(-qo/2.0 - sq) + shift[one]
+
+        # Newton refinement on the monic cubic
+        for _ in range(polish):
+            f = ((r + B[:, None])*r + C[:, None])*r + D[:, None]
+            fp = (3.0*r + 2.0*B[:, None])*r + C[:, None]
+            step = np.where(fp != 0, f/np.where(fp != 0, fp, 1.0), 0.0)
+            r = r - step
+        roots[cubic] = np.sort(r, axis=-1)
+
+    quad = (~cubic) & (b != 0)
+    if np.any(quad):
+        B = b[quad]
+        C = c[quad]
+        D = d[quad]
+        disc = C**2 - 4.0*B*D
+        real = disc >= 0
+        sq = np.sqrt(np.where(real, disc, 0.0))
+        # Numerically stable pair of quadratic roots
+        qq = -0.5*(C + np.where(C >= 0, sq, -sq))
+        r1 = np.where(qq != 0, qq/B, 0.0)
+        r2 = np.where(qq != 0, D/np.where(qq != 0, qq, 1.0), 0.0)
+        r = np.full(B.shape + (3,), np.nan)
+        r[real, 0] = np.minimum(r1, r2)[real]
+        r[real, 1] = np.maximum(r1, r2)[real]
+        roots[quad] = r
+
+    lin = (~cubic) & (b == 0) & (c != 0)
+    if np.any(lin):
+        roots[lin, 0] = -d[lin] / c[lin]
+
+    return roots
+
+def calcqo104_bistable_energy(pump_power, detuning, couplings_pump, ring_damping_pump,
+                              kerr_shift=0.0, thermal_shift=0.0):
+
+    """Self-consistent intracavity energy of a pumped mode with thermal/Kerr shifts.
+
+    The resonance red-shifts by gamma*U with gamma = kerr_shift +
+    thermal_shift, so the pump detuning seen by the ring is Delta0 +
+    gamma*U.  In the scaled variables u = gamma U / G, delta = Delta0 / G,
+    s = gamma |g|^2 P / G^3 the steady state is the monic cubic
+      u^3 + 2 delta u^2 + (delta^2 + 1) u - s = 0
+    solved for every point at once.  A branch is stable where the slope of
+    the input-output curve, 3u^2 + 4 delta u + delta^2 + 1, is positive.
+    With gamma = 0 the linear (CCqo103) result U = |g|^2 P / (G^2 + Delta0^2)
+    is returned on the first branch.
+
+    Parameters
+    ----------
+    NOTE ---
+        pump_power, detuning, couplings_pump and ring_damping_pump are
+        broadcast together, e.g. power[:, None] with detuning[None, :]
+        for a (power, detuning) grid.
+
+    pump_power : float (scalar or array)
+        Pump power in the input channel
+    detuning : float (scalar or array)
+        Cold detuning Delta0 = omega_pump - omega_res
+    couplings_pump : complex (scalar or array)
+        Coupling constant of the pump channel
+    ring_damping_pump : float (scalar or array)
+        Ring damping of the pumped mode
+    kerr_shift, thermal_shift : float
+        Red shift per unit intracavity energy (Default=0.0)
+
+    Returns
+    -------
+    (energy, stable)
+
+    energy : float array (..., 3)
+        Non-negative intracavity energy of each branch, sorted ascending,
+        nan where the branch does not exist
+    stable : boolean array (..., 3)
+        True for existing, stable branches
+
+    See Also
+    --------
+    solve_cubic, CCqo103_spectral_pump.calcqo103_spectral_pump
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    Bistable point with three branches (middle branch unstable)
+    >>> U, st = calcqo104_bistable_energy(4.0, -3.0, 1.0, 1.0, kerr_shift=1.0)
+    >>> U.round(6).tolist()
+    [0.585786, 2.0, 3.414214]
+    >>> st.tolist()
+    [True, False, True]
+
+    Without nonlinear shifts the Lorentzian response is recovered
+    >>> U, st = calcqo104_bistable_energy([1.0, 2.0], 1.0, 2.0, 1.0)
+    >>> U[:, 0].tolist(), st[:, 0].tolist()
+    ([2.0, 4.0], [True, True])
+
+    """
+
+    P = np.asarray(pump_power, dtype=float)
+    D0 = np.asarray(detuning, dtype=float)
+    g2 = np.absolute(np.asarray(couplings_pump))**2
+    G = np.asarray(ring_damping_pump, dtype=float)
+    gamma = float(kerr_shift) + float(thermal_shift)
+    P, D0, g2, G = np.broadcast_arrays(P, D0, g2, G)
+
+    if gamma == 0.0:
+        energy = np.full(P.shape + (3,), np.nan)
+        energy[..., 0] = g2*P / (G**2 + D0**2)
+        stable = np.zeros(energy.shape, dtype=bool)
+        stable[..., 0] = True
+        return energy, stable
+
+    delta = D0 / G
+    s = gamma*g2*P / G**3
+    u = solve_cubic(np.ones_like(delta), 2.0*delta, delta**2 + 1.0, -s)
+
+    # Physical branches carry non-negative energy.  The cubic has no root of
+    # the wrong sign, so such roots are round-off of u = 0 (e.g. P = 0) and
+    # are clamped when within a tolerance scaled to the size of the roots.
+    dl = delta[..., None]
+    tol = 16.0*np.finfo(float).eps*(1.0 + np.absolute(dl) + np.cbrt(np.absolute(s))[..., None])
+    with np.errstate(invalid='ignore'):
+        u = np.where(np.absolute(u) <= tol, 0.0, u)
+    slope = (3.0*u + 4.0*dl)*u + dl**2 + 1.0
+    with np.errstate(invalid='ignore'):
+        exists = np.isfinite(u) & (u*np.sign(gamma) >= 0)
+        stable = exists & (slope > 0)
+    energy = np.where(exists, u*G[..., None]/gamma, np.nan)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        m = ''
+        m += 'bistable points = {} of {}'.format(
+            np.count_nonzero(exists.sum(axis=-1) > 1), exists.shape[:-1]) + os.linesep
+        lgr.debug(m)
+
+    return energy, stable
+
+def calcqo104_resonance_comb(modes, center_freq, fsr, pump_freq=None, pump_power=0.0,
+                             couplings_pump=0.0, ring_damping_pump=1.0,
+                             d2=0.0, pump_mode=0,
+                             kerr_shift=0.0, thermal_shift=0.0, cross_kerr=2.0):
+
+    """Resonance comb of a pumped ring including thermal and Kerr shifts.
+
+    The cold comb is generated with calc_resonance_comb and the pumped
+    mode's energy U is solved on every branch with
+    calcqo104_bistable_energy.  The pumped mode shifts by
+    (kerr_shift + thermal_shift) U and every other mode by
+    (cross_kerr*kerr_shift + thermal_shift) U, cross-phase modulation
+    being twice as strong as self-phase modulation by default.
+
+    Parameters
+    ----------
+    modes : integer array (M elements)
+        Relative azimuthal mode numbers
+    center_freq, fsr, d2 : float
+        Comb parameters (see calc_resonance_comb)
+    pump_freq : float (scalar or array)
+        Pump laser angular frequency (Default=None, cold comb only)
+    pump_power : float (scalar or array)
+        Pump power, broadcast with pump_freq (Default=0.0)
+    couplings_pump, ring_damping_pump : float
+        Pump coupling and damping (see CCqo103_spectral_pump)
+    pump_mode : integer
+        Mode number that is pumped (Default=0)
+    kerr_shift, thermal_shift : float
+        Red shift of the pumped mode per unit energy (Default=0.0)
+    cross_kerr : float
+        Ratio of cross- to self-phase Kerr shift (Default=2.0)
+
+    Returns
+    -------
+    (shifted_comb, energy, stable)
+
+    shifted_comb : float array (..., 3, M)
+        Hot comb for each branch (nan where the branch does not exist).
+        Equal to the cold comb with shape (M,) when pump_freq is None.
+    energy, stable : arrays (..., 3)
+        See calcqo104_bistable_energy
+
+    Examples
+    --------
+    Cold comb
+    >>> comb, U, st = calcqo104_resonance_comb([0, 1], 100.0, 10.0)
+    >>> comb.tolist()
+    [100.0, 110.0]
+
+    Pumped comb on the bistable point of calcqo104_bistable_energy
+    >>> comb, U, st = calcqo104_resonance_comb([0, 1], 100.0, 10.0, pump_freq=97.0,
+    ...     pump_power=4.0, couplings_pump=1.0, ring_damping_pump=1.0, kerr_shift=1.0)
+    >>> comb.shape
+    (3, 2)
+    >>> comb[2].round(6).tolist()
+    [96.585786, 103.171573]
+
+    """
+
+    modes = np.atleast_1d(np.asarray(modes))
+    comb = calc_resonance_comb(modes, center_freq, fsr, d2)
+    if pump_freq is None:
+        return comb, None, None
+
+    coldPump = calc_resonance_comb(pump_mode, center_freq, fsr, d2)
+    detuning = np.asarray(pump_freq, dtype=float) - coldPump
+    energy, stable = calcqo104_bistable_energy(
+        pump_power, detuning, couplings_pump, ring_damping_pump,
+        kerr_shift, thermal_shift)
+
+    # Per-mode shift coefficient (self-phase for the pumped mode)
+    shiftCoef = np.where(modes == pump_mode,
+                         kerr_shift + thermal_shift,
+                         cross_kerr*kerr_shift + thermal_shift)
+    shifted_comb = comb - energy[..., None]*shiftCoef
+
+    return shifted_comb, energy, stable
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo104_resonance_comb as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Generate a pumped ring resonance comb with thermal and Kerr shifts',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--modes',
+        type=int, required=True, nargs='+',
+        dest='modes', action='store',
+        help="Relative mode numbers [1]",
+        metavar='m')
+    argp.add_argument(
+        '--center-freq',
+        type=float, required=True,
+        dest='center_freq', action='store',
+        help="Angular frequency of mode 0 [rad s^(-1)]",
+        metavar='omega0')
+    argp.add_argument(
+        '--fsr',
+        type=float, required=True,
+        dest='fsr', action='store',
+        help="Free spectral range [rad s^(-1)]",
+        metavar='FSR')
+    argp.add_argument(
+        '--d2',
+        type=float, default=0.0,
+        dest='d2', action='store',
+        help="Integrated dispersion [rad s^(-1)]",
+        metavar='D2')
+    argp.add_argument(
+        '--pump-freq',
+        type=float, default=None,
+        dest='pump_freq', action='store',
+        help="Pump angular frequency [rad s^(-1)]",
+        metavar='omegaP')
+    argp.add_argument(
+        '--pump-power',
+        type=float, default=[0.0], nargs='+',
+        dest='pump_power', action='store',
+        help="Pump power(s) [pump_input^2]",
+        metavar='P')
+    argp.add_argument(
+        '--pump-mode',
+        type=int, default=0,
+        dest='pump_mode', action='store',
+        help="Pumped mode number",
+        metavar='mP')
+    argp.add_argument(
+        '--couplings',
+        type=float, default=0.0,
+        dest='couplings', action='store',
+        help="Pump coupling [rad^(1/2) m^(1/2) s^(-1)]",
+        metavar='g')
+    argp.add_argument(
+        '--damping',
+        type=float, default=1.0,
+        dest='damping', action='store',
+        help="Ring damping of the pumped mode [rad s^(-1)]",
+        metavar='G')
+    argp.add_argument(
+        '--kerr-shift',
+        type=float, default=0.0,
+        dest='kerr_shift', action='store',
+        help="Kerr shift per intracavity energy",
+        metavar='gK')
+    argp.add_argument(
+        '--thermal-shift',
+        type=float, default=0.0,
+        dest='thermal_shift', action='store',
+        help="Thermal shift per intracavity energy",
+        metavar='gT')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo104_resonance_comb.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    modes = args.modes,
+                    fsr = args.fsr,
+                    pump_power = args.pump_power,
+                    ring_damping_pump = args.damping,
+                    kerr_shift = args.kerr_shift,
+                    thermal_shift = args.thermal_shift)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo104_resonance_comb.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo104_resonance_comb.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo104_resonance_comb.'
+                lgr.error(msg)
+                raise
+
+        shifted_comb, energy, stable = emr.calcqo104_resonance_comb(
+            args.modes, args.center_freq, args.fsr,
+            pump_freq = args.pump_freq,
+            pump_power = np.asarray(args.pump_power),
+            couplings_pump = args.couplings,
+            ring_damping_pump = args.damping,
+            d2 = args.d2,
+            pump_mode = args.pump_mode,
+            kerr_shift = args.kerr_shift,
+            thermal_shift = args.thermal_shift)
+        msg = ''
+        msg += ' CCqo104_resonance_comb outputs' + os.linesep
+        msg += '  shifted comb [rad s^(-1)] = {}'.format(shifted_comb) + os.linesep
+        msg += '  energy = {}'.format(energy) + os.linesep
+        msg += '  stable = {}'.format(stable)
+        if lgr.getEffectiveLevel() > logging.INFO: print(shifted_comb)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import CCqo104_resonance_comb
+
+class TestCCqo104(unittest.TestCase):
+
+    def setUp(self):
+        self.detuning = np.linspace(-20.0, 20.0, 401)
+
+    def test_zero_pump_power(self):
+        for shift in (1.0, -1.0):
+            U, st = CCqo104_resonance_comb.calcqo104_bistable_energy(
+                0.0, self.detuning, 1.0, 1.0, kerr_shift=shift)
+            self.assertTrue(np.all(U[:, 0] == 0.0))
+            self.assertTrue(np.all(st[:, 0]))
+            self.assertTrue(np.all(np.isnan(U[:, 1:])))
+
+    def test_zero_pump_power_cold_comb(self):
+        comb, U, st = CCqo104_resonance_comb.calcqo104_resonance_comb(
+            [-1, 0, 1], 1.2e15, 1.0e12, pump_freq=1.19999e15, pump_power=[0.0],
+            couplings_pump=1.0e5, ring_damping_pump=1.0e9,
+            kerr_shift=1.0e9, thermal_shift=5.0e10)
+        self.assertEqual(comb[0, 0].tolist(), [1.199e15, 1.2e15, 1.201e15])
+        self.assertEqual(st.tolist(), [[True, False, False]])
+
+    def test_bistable_window(self):
+        # Fold points of u((u + delta)^2 + 1) = s at delta = -3
+        delta = -3.0
+        uFold = np.roots([3.0, 4.0*delta, delta**2 + 1.0])
+        sLow, sHigh = sorted(u*((u + delta)**2 + 1.0) for u in uFold)
+        power = np.linspace(0.0, 2.0*sHigh, 2001)
+        U, st = CCqo104_resonance_comb.calcqo104_bistable_energy(
+            power, delta, 1.0, 1.0, kerr_shift=1.0)
+        branches = np.isfinite(U).sum(axis=-1)
+        inside = (power > sLow*(1 + 1e-9)) & (power < sHigh*(1 - 1e-9))
+        outside = (power < sLow*(1 - 1e-9)) | (power > sHigh*(1 + 1e-9))
+        self.assertTrue(np.all(branches[inside] == 3))
+        self.assertTrue(np.all(branches[outside] == 1))
+        self.assertEqual(st[inside].tolist(), [[True, False, True]]*inside.sum())
+        self.assertTrue(np.all(st[outside, 0]))
+        residual = U*((U + delta)**2 + 1.0) - power[:, None]
+        self.assertTrue(np.nanmax(np.abs(residual)) < 1e-9*sHigh)
+
+    def test_no_bistability_near_resonance(self):
+        U, st = CCqo104_resonance_comb.calcqo104_bistable_energy(
+            np.linspace(0.0, 100.0, 501), -1.7, 1.0, 1.0, kerr_shift=1.0)
+        self.assertTrue(np.all(np.isfinite(U[:, 0]) & st[:, 0]))
+        self.assertTrue(np.all(np.isnan(U[:, 1:])))
+
+    def test_linear_limit(self):
+        U, st = CCqo104_resonance_comb.calcqo104_bistable_energy(
+            [0.0, 1.0], self.detuning[:, None], 2.0, 1.0)
+        self.assertTrue(np.allclose(U[..., 0],
+                                    4.0*np.array([0.0, 1.0])/(1.0 + self.detuning[:, None]**2)))
+        self.assertTrue(np.all(st[..., 0]))
+
+    def test_degenerate_cubic(self):
+        roots = CCqo104_resonance_comb.solve_cubic(
+            [0.0, 0.0, 0.0, 1.0, 1.0], [1.0, 1.0, 0.0, 0.0, -3.0],
+            [-3.0, 0.0, 0.0, 0.0, 3.0], [2.0, 1.0, 1.0, 0.0, -1.0])
+        self.assertTrue(np.allclose(roots[0, :2], [1.0, 2.0]))
+        self.assertTrue(np.all(np.isnan(roots[1:3])))
+        self.assertTrue(np.allclose(roots[3:, 0], [0.0, 1.0], atol=1e-5))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo104)
+unittest.TextTestRunner(verbosity=2).run(suite)
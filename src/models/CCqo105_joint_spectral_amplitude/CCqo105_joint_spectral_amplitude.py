@@ -0,0 +1,675 @@
+"""Build the two-photon joint spectral amplitude (JSA) of ring-generated pairs
+
+Spontaneous four-wave mixing in a ring produces signal/idler pairs whose
+joint spectral amplitude is the product of the ring responses at the
+signal and idler frequencies and of the two-photon pump amplitude at the
+sum frequency (energy conservation of CCqo101_FWM_detuning, zero
+detuning),
+  JSA(omega_s, omega_i) = alpha(omega_s + omega_i) rr_s(omega_s) rr_i(omega_i)
+The ring responses rr come from CCqo103_spectral_pump and are computed
+once on each 1-D grid.  The 2-D grid is filled in row tiles whose working
+size stays under a memory budget, optionally straight into a memory-mapped
+.npy file, so grids far larger than memory can be produced.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo105_joint_spectral_amplitude.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo105_joint_spectral_amplitude
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo105_joint_spectral_amplitude.py
+
+Calculations
+------------
+JSA from a CCqo103 spectral-input file, written to a memory-mapped file::
+  python CCqo105_joint_spectral_amplitude.py --spectral-inputs ../CCqo103_spectral_pump/inputs-00.csv --output jsa.npy
+Same, with a 64 MiB working-memory budget::
+  python CCqo105_joint_spectral_amplitude.py --spectral-inputs ../CCqo103_spectral_pump/inputs-00.csv --output jsa.npy --memory-budget 64
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo103_spectral_pump
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Tiled JSA engine with memory budget and memmap output
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo103_spectral_pump as ccqo103
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'signal':{
+        'desc':'signal spectral grid (wavevec of CCqo103)',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float (Ns-element array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'idler':{
+        'desc':'idler spectral grid (wavevec of CCqo103)',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float (Ni-element array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'pump':{
+        'desc':'two-photon pump amplitude at the sum frequency',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'callable or (sum grid, values) tuple',
+        'units':'[pump_input]^2',
+        'flow':'input'
+        },
+    'couplings':{
+        'desc':'ring coupling constants (signal, and idler unless given)',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'complex (scalar or grid-size array)',
+        'units':'rad^(1/2) m^(1/2) s^(-1)',
+        'flow':'input'
+        },
+    'velocities':{
+        'desc':'spectral velocities (signal, and idler unless given)',
+        'valrange':'[0, inf)',
+        'default': '1.0',
+        'datatype':'float (scalar or grid-size array)',
+        'units':'m s^(-1)',
+        'flow':'input'
+        },
+    'ring_damping':{
+        'desc':'ring damping (signal, and idler unless given)',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float (scalar or grid-size array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'memory_budget':{
+        'desc':'working memory for one tile',
+        'valrange':'(0, inf)',
+        'default': '268435456',
+        'datatype':'integer',
+        'units':'bytes',
+        'flow':'input'
+        },
+    'jsa':{
+        'desc':'joint spectral amplitude',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'complex (Ns x Ni array or memmap)',
+        'units':'[pump] [ring_response]^2',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * signal, idler numeric and 1-D
+      * couplings, velocities, ring_damping >= 0
+      * memory_budget > 0
+    Warning checks:
+      * None
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    See Also
+    --------
+    CCqo103_spectral_pump.valArrayTests
+
+    Examples
+    --------
+    >>> validateParameters(signal=[1.0, 2.0], idler=[1.0, 2.0], memory_budget=1024)
+    >>> validateParameters(memory_budget=0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received memory_budget = 0
+    Expected memory_budget > 0
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    checks = [('signal', False), ('idler', False),
+              ('couplings', True), ('velocities', True), ('ring_damping', True)]
+    for name, errorNegative in checks:
+        val = kwargs.get(name)
+        if val is None: continue
+        e, m, w, wm = ccqo103.valArrayTests(
+            np.array(val), name, errorNegative=errorNegative, warnComplex=False)
+        err = err or e
+        eMsg += m
+
+    budget = kwargs.get('memory_budget')
+    if budget is not None and budget <= 0:
+        eMsg += 'Received memory_budget = {}'.format(budget) + os.linesep
+        eMsg += 'Expected memory_budget > 0' + os.linesep
+        err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def pump_sum_amplitude(wavevec, pump_ring):
+    """Two-photon pump amplitude on the sum-frequency grid.
+
+    Two pump photons drawn from the same spectrum give a sum-frequency
+    amplitude equal to the self-convolution of the pump spectrum.  The
+    convolution is done by FFT on the uniform grid wavevec.
+
+    Parameters
+    ----------
+    wavevec : float array (N elements, uniform spacing)
+        Pump spectral grid
+    pump_ring : complex array (N elements)
+        Pump spectrum, e.g. pump_ring from calcqo103_spectral_pump
+
+    Returns
+    -------
+    (sum_grid, alpha)
+
+    sum_grid : float array (2N-1 elements)
+        Sum frequencies 2*wavevec[0] + n*step
+    alpha : complex array (2N-1 elements)
+        Self-convolution of pump_ring times the grid step
+
+    Examples
+    --------
+    >>> s, a = pump_sum_amplitude([0.0, 1.0, 2.0], [1.0, 1.0, 1.0])
+    >>> s.tolist(), np.round(a.real, 12).tolist()
+    ([0.0, 1.0, 2.0, 3.0, 4.0], [1.0, 2.0, 3.0, 2.0, 1.0])
+
+    """
+    k = np.asarray(wavevec, dtype=float)
+    b = np.asarray(pump_ring, dtype=complex)
+    n = k.size
+    step = (k[-1] - k[0]) / (n - 1) if n > 1 else 1.0
+    nfft = 2*n - 1
+    alpha = np.fft.ifft(np.fft.fft(b, nfft)**2)[:nfft] * step
+    sum_grid = 2.0*k[0] + step*np.arange(nfft)
+    return sum_grid, alpha
+
+def _pumpEvaluator(pump):
+    """Return a callable evaluating the two-photon pump at sum frequencies."""
+    if callable(pump):
+        return pump
+    sumGrid, values = pump
+    sumGrid = np.asarray(sumGrid, dtype=float)
+    values = np.asarray(values, dtype=complex)
+
+    def tabulated(omegaSum):
+        re = np.interp(omegaSum, sumGrid, values.real, left=0.0, right=0.0)
+        im = np.interp(omegaSum, sumGrid, values.imag, left=0.0, right=0.0)
+        return re + 1j*im
+    return tabulated
+
+def _uniformStep(signal, idler):
+    """Common grid step if both grids are uniform with the same spacing, else None."""
+    if signal.size < 2 or idler.size < 2:
+        return None
+    ds = np.diff(signal)
+    di = np.diff(idler)
+    step = ds[0]
+    tol = 1e-9*abs(step)
+    if np.all(np.abs(ds - step) <= tol) and np.all(np.abs(di - step) <= tol):
+        return step
+    return None
+
+def tile_rows(num_cols, memory_budget, itemsize=16, work_arrays=3):
+    """Number of rows in a tile whose working arrays fit in memory_budget bytes.
+
+    Examples
+    --------
+    >>> tile_rows(1000, 16*1000*3*10)
+    10
+    >>> tile_rows(1000, 1)
+    1
+
+    """
+    return max(1, int(memory_budget // (num_cols*itemsize*work_arrays)))
+
+def calcqo105_ring_responses(signal, idler, couplings, velocities, ring_damping,
+                             couplings_idler=None, velocities_idler=None,
+                             ring_damping_idler=None):
+    """Signal and idler ring responses on their 1-D grids (CCqo103).
+
+    Idler parameters default to the signal parameters.
+
+    Returns
+    -------
+    (rr_signal, rr_idler) : complex arrays
+    """
+    if couplings_idler is None: couplings_idler = couplings
+    if velocities_idler is None: velocities_idler = velocities
+    if ring_damping_idler is None: ring_damping_idler = ring_damping
+    rrS = ccqo103.calcqo103_spectral_pump(signal, couplings, velocities, ring_damping, 1.0)[1]
+    rrI = ccqo103.calcqo103_spectral_pump(idler, couplings_idler, velocities_idler,
+                                          ring_damping_idler, 1.0)[1]
+    return (np.broadcast_to(rrS, np.shape(signal)).astype(complex),
+            np.broadcast_to(rrI, np.shape(idler)).astype(complex))
+
+def jsa_tiles(signal, idler, pump, couplings, velocities, ring_damping,
+              couplings_idler=None, velocities_idler=None, ring_damping_idler=None,
+              memory_budget=256*2**20):
+
+    """Generate the joint spectral amplitude in row tiles.
+
+    The ring responses are computed once on the 1-D grids.  When both grids
+    are uniform with a common step the pump is also evaluated once, on the
+    1-D sum grid, and gathered by index (row + column) for each tile;
+    otherwise it is evaluated on each tile's sum frequencies.
+
+    Parameters
+    ----------
+    (See calcqo105_joint_spectral_amplitude)
+
+    Yields
+    ------
+    (rows, tile)
+
+    rows : slice
+        Signal-grid rows covered by the tile
+    tile : complex array (rows x Ni)
+        JSA values for those rows
+
+    Examples
+    --------
+    >>> s = np.array([0.0, 1.0, 2.0])
+    >>> tiles = list(jsa_tiles(s, s, lambda w: np.ones_like(w), 1.0, 1.0, 1.0,
+    ...                        memory_budget=16*3*3))
+    >>> [t[0] for t in tiles]
+    [slice(0, 1, None), slice(1, 2, None), slice(2, 3, None)]
+
+    """
+
+    signal = np.atleast_1d(np.asarray(signal, dtype=float))
+    idler = np.atleast_1d(np.asarray(idler, dtype=float))
+    rrS, rrI = calcqo105_ring_responses(signal, idler, couplings, velocities, ring_damping,
+                                        couplings_idler, velocities_idler, ring_damping_idler)
+    pumpAt = _pumpEvaluator(pump)
+
+    step = _uniformStep(signal, idler)
+    if step is not None:
+        sumGrid = signal[0] + idler[0] + step*np.arange(signal.size + idler.size - 1)
+        alphaSum = np.asarray(pumpAt(sumGrid), dtype=complex)
+        colIdx = np.arange(idler.size)
+
+    nRows = tile_rows(idler.size, memory_budget)
+    lgr.debug('jsa_tiles: {} x {} grid, {} rows per tile, uniform={}'.format(
+        signal.size, idler.size, nRows, step is not None))
+
+    for r0 in range(0, signal.size, nRows):
+        rows = slice(r0, min(r0 + nRows, signal.size))
+        if step is not None:
+            alpha = alphaSum[np.arange(rows.start, rows.stop)[:, None] + colIdx]
+        else:
+            alpha = np.array(pumpAt(signal[rows, None] + idler[None, :]), dtype=complex)
+        alpha *= rrS[rows, None]
+        alpha *= rrI[None, :]
+        yield rows, alpha
+
+def calcqo105_joint_spectral_amplitude(signal, idler, pump, couplings,
+                                       velocities, ring_damping,
+                                       couplings_idler=None, velocities_idler=None,
+                                       ring_damping_idler=None,
+                                       memory_budget=256*2**20, out=None):
+
+    """Joint spectral amplitude of signal/idler pairs generated in a ring.
+
+    Parameters
+    ----------
+    signal : float array (Ns elements)
+        Signal spectral grid (wavevec of CCqo103_spectral_pump)
+    idler : float array (Ni elements)
+        Idler spectral grid
+    pump : callable or (sum_grid, values) tuple
+        Two-photon pump amplitude as a function of the sum frequency
+        signal + idler, or tabulated values that are linearly interpolated
+        (zero outside the table), e.g. from pump_sum_amplitude
+    couplings, velocities, ring_damping : float (scalar or Ns-element array)
+        Ring parameters of CCqo103_spectral_pump for the signal (with
+        velocities = 1 the grids are angular-frequency offsets)
+    couplings_idler, velocities_idler, ring_damping_idler : (Ni elements)
+        Ring parameters for the idler (Default=None, same as the signal)
+    memory_budget : integer
+        Bytes of working memory for one tile (Default=256 MiB)
+    out : None, string or array
+        Destination: None for an in-memory array, a filename for a
+        memory-mapped .npy file, or any writable (Ns x Ni) complex array
+
+    Returns
+    -------
+    jsa : complex array or memmap (Ns x Ni)
+
+    See Also
+    --------
+    jsa_tiles, pump_sum_amplitude, CCqo103_spectral_pump.calcqo103_spectral_pump
+
+    Exceptions
+    ----------
+    ValueError (out with the wrong shape)
+
+    Examples
+    --------
+    Constant pump, identical rings: the JSA is the outer product of ring responses
+    >>> k = np.array([-1.0, 0.0, 1.0])
+    >>> jsa = calcqo105_joint_spectral_amplitude(k, k, lambda w: np.ones_like(w), 1.0, 1.0, 1.0)
+    >>> rr = 1.0/(1.0 - 1j*k) * (-1j)
+    >>> np.allclose(jsa, np.outer(rr, rr))
+    True
+
+    Tabulated pump, small memory budget (one row per tile)
+    >>> sums, alpha = pump_sum_amplitude(k, np.exp(-k**2))
+    >>> jsa2 = calcqo105_joint_spectral_amplitude(k, k, (sums, alpha), 1.0, 1.0, 1.0,
+    ...                                           memory_budget=1)
+    >>> np.allclose(jsa2[0], alpha[0:3]*rr[0]*rr)
+    True
+
+    """
+
+    signal = np.atleast_1d(np.asarray(signal, dtype=float))
+    idler = np.atleast_1d(np.asarray(idler, dtype=float))
+    shape = (signal.size, idler.size)
+
+    if out is None:
+        jsa = np.empty(shape, dtype=complex)
+    elif not hasattr(out, 'shape'):
+        jsa = np.lib.format.open_memmap(out, mode='w+', dtype=complex, shape=shape)
+    else:
+        jsa = out
+        if tuple(jsa.shape) != shape:
+            m = ''
+            m += 'Received out shape = {}'.format(jsa.shape) + os.linesep
+            m += 'Expected out shape = {}'.format(shape) + os.linesep
+            lgr.error(m)
+            raise ValueError(m)
+
+    for rows, tile in jsa_tiles(signal, idler, pump, couplings, velocities, ring_damping,
+                                couplings_idler, velocities_idler, ring_damping_idler,
+                                memory_budget):
+        jsa[rows] = tile
+
+    if isinstance(jsa, np.memmap):
+        jsa.flush()
+
+    return jsa
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo105_joint_spectral_amplitude as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Build the joint spectral amplitude of ring-generated photon pairs',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--spectral-inputs',
+        type=str, required=True,
+        dest='spectral_inputs', action='store',
+        help="Spectral inputs in CSV file (CCqo103_spectral_pump format). The wavevec column is used for both signal and idler grids and the pump_ring self-convolution as the two-photon pump.",
+        metavar='specFile'
+        )
+    argp.add_argument(
+        '--num-header-rows',
+        type=int, required=False,
+        dest='num_header_rows', action='store',
+        default=2,
+        help="Number of header rows that are not data values (see CCqo103_spectral_pump).",
+        metavar='nHdr'
+        )
+    argp.add_argument(
+        '--output',
+        type=str, default=None,
+        dest='output', action='store',
+        help="Memory-mapped .npy file for the JSA (default: keep in memory and print)",
+        metavar='jsaFile'
+        )
+    argp.add_argument(
+        '--memory-budget',
+        type=float, default=256.0,
+        dest='memory_budget', action='store',
+        help="Working memory per tile [MiB]",
+        metavar='MiB'
+        )
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo105_joint_spectral_amplitude.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        [wavevec,
+         couplings,
+         velocities,
+         damping,
+         pump_input
+        ] = ccqo103.getInputs(args.spectral_inputs,
+                              num_header_rows=args.num_header_rows)
+        memory_budget = int(args.memory_budget*2**20)
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    signal = wavevec,
+                    idler = wavevec,
+                    couplings = couplings,
+                    velocities = velocities,
+                    ring_damping = damping,
+                    memory_budget = memory_budget)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo105_joint_spectral_amplitude.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo105_joint_spectral_amplitude.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo105_joint_spectral_amplitude.'
+                lgr.error(msg)
+                raise
+
+        pump_ring = ccqo103.calcqo103_spectral_pump(
+            wavevec, couplings, velocities, damping, pump_input)[0]
+        pump = emr.pump_sum_amplitude(wavevec, pump_ring)
+
+        jsa = emr.calcqo105_joint_spectral_amplitude(
+            wavevec, wavevec, pump, couplings, velocities, damping,
+            memory_budget = memory_budget,
+            out = args.output)
+        msg = ''
+        msg += ' CCqo105_joint_spectral_amplitude outputs' + os.linesep
+        msg += '  jsa shape = {}'.format(jsa.shape) + os.linesep
+        msg += '  jsa file  = {}'.format(args.output) + os.linesep
+        msg += '  jsa = {}'.format(jsa)
+        if lgr.getEffectiveLevel() > logging.INFO: print(jsa)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import CCqo105_joint_spectral_amplitude
+
+class TestCCqo105(unittest.TestCase):
+
+    def setUp(self):
+        self.signal = np.linspace(-6.0, 6.0, 241)
+        self.idler = self.signal + 1.0e-3*np.cos(np.arange(241))
+        self.pump = lambda w: np.exp(-w**2/8.0) + 0j
+        self.params = (0.8, 1.0, 0.5)
+
+    def direct(self, signal, idler):
+        rrS, rrI = CCqo105_joint_spectral_amplitude.calcqo105_ring_responses(
+            signal, idler, *self.params)
+        return self.pump(signal[:, None] + idler[None, :]) * np.outer(rrS, rrI)
+
+    def test_uniform_grid_tiled(self):
+        jsa = CCqo105_joint_spectral_amplitude.calcqo105_joint_spectral_amplitude(
+            self.signal, self.signal, self.pump, *self.params, memory_budget=16*241*3*7)
+        self.assertTrue(np.allclose(jsa, self.direct(self.signal, self.signal)))
+
+    def test_nonuniform_grid_tiled(self):
+        jsa = CCqo105_joint_spectral_amplitude.calcqo105_joint_spectral_amplitude(
+            self.signal, self.idler, self.pump, *self.params, memory_budget=1)
+        self.assertTrue(np.allclose(jsa, self.direct(self.signal, self.idler)))
+
+    def test_memmap_output(self):
+        fname = os.path.join(tempfile.mkdtemp(), 'jsa.npy')
+        CCqo105_joint_spectral_amplitude.calcqo105_joint_spectral_amplitude(
+            self.signal, self.idler, self.pump, *self.params, out=fname)
+        jsa = np.load(fname, mmap_mode='r')
+        self.assertEqual(jsa.shape, (241, 241))
+        self.assertTrue(np.allclose(jsa, self.direct(self.signal, self.idler)))
+        del jsa
+        os.remove(fname)
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo105)
+unittest.TextTestRunner(verbosity=2).run(suite)
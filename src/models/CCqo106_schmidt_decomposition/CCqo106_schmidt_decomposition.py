@@ -0,0 +1,623 @@
+"""Schmidt decomposition and spectral purity of a biphoton JSA
+
+The joint spectral amplitude (JSA) of a photon pair, e.g. from
+CCqo105_joint_spectral_amplitude, factorizes into Schmidt modes through its
+singular value decomposition, JSA = sum_j s_j u_j(omega_s) v_j(omega_i).
+With lambda_j = s_j^2 / sum s^2 the spectral purity is P = sum lambda_j^2
+and the Schmidt number is K = 1/P.  A dense SVD of a large JSA is O(n^3)
+and needs the whole matrix in memory, so this module uses a randomized
+range finder with power iterations.  The JSA is only touched in row
+blocks (an array, a memory-mapped .npy file, or a generator of tiles),
+each pass over it is a matrix product with a thin n x (k+p) matrix, and
+the Frobenius error of the rank-k result is obtained exactly from the same
+passes.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo106_schmidt_decomposition.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo106_schmidt_decomposition
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo106_schmidt_decomposition.py
+
+Calculations
+------------
+Leading 10 Schmidt modes of a JSA written by CCqo105::
+  python CCqo106_schmidt_decomposition.py --jsa jsa.npy --modes 10
+More accuracy (oversampling and power iterations) and a fixed seed::
+  python CCqo106_schmidt_decomposition.py --jsa jsa.npy --modes 10 --oversample 20 --power-iterations 3 --seed 7 -vv
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Streaming randomized truncated SVD, purity and Schmidt number bounds
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'jsa':{
+        'desc':'joint spectral amplitude (array, memmap, or tile generator)',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'complex (Ns x Ni)',
+        'units':'[jsa]',
+        'flow':'input'
+        },
+    'modes':{
+        'desc':'number of leading Schmidt modes',
+        'valrange':'[1, min(Ns, Ni)]',
+        'default': '10',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'oversample':{
+        'desc':'extra random probe vectors beyond modes',
+        'valrange':'[0, inf)',
+        'default': '10',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'power_iterations':{
+        'desc':'power (subspace) iterations of the range finder',
+        'valrange':'[0, inf)',
+        'default': '2',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'singular_values':{
+        'desc':'leading singular values s_j of the JSA',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float (modes-element array)',
+        'units':'[jsa]',
+        'flow':'intermediate output'
+        },
+    'error_bound':{
+        'desc':'Frobenius norm of JSA minus its rank-k approximation',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'[jsa]',
+        'flow':'intermediate output'
+        },
+    'purity':{
+        'desc':'spectral purity sum lambda_j^2 of the leading modes',
+        'valrange':'(0, 1]',
+        'default': '1.0',
+        'datatype':'float',
+        'units':'1',
+        'flow':'output'
+        },
+    'schmidt_number':{
+        'desc':'Schmidt number 1/purity',
+        'valrange':'[1, inf)',
+        'default': '1.0',
+        'datatype':'float',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * jsa is two-dimensional
+      * modes >= 1, oversample >= 0, power_iterations >= 0
+    Warning checks:
+      * modes + oversample exceeds the smaller JSA dimension
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(jsa=np.zeros((4, 5)), modes=2, oversample=1)
+    >>> validateParameters(modes=0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received modes = 0
+    Expected modes >= 1
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        if k == 'jsa' and hasattr(v, 'shape'): v = 'array of shape {}'.format(v.shape)
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    jsa = kwargs.get('jsa')
+    modes = kwargs.get('modes')
+    oversample = kwargs.get('oversample')
+    power_iterations = kwargs.get('power_iterations')
+
+    if jsa is not None and hasattr(jsa, 'shape') and len(jsa.shape) != 2:
+        eMsg += 'Received jsa dimensions: {}'.format(len(jsa.shape)) + os.linesep
+        eMsg += 'Expected jsa dimensions: 2' + os.linesep
+        err = True
+    for name, val, least in [('modes', modes, 1), ('oversample', oversample, 0),
+                             ('power_iterations', power_iterations, 0)]:
+        if val is not None and val < least:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= {}'.format(name, least) + os.linesep
+            err = True
+    if (jsa is not None and hasattr(jsa, 'shape') and modes is not None
+            and modes + (oversample or 0) > min(jsa.shape)):
+        wMsg += 'Received modes + oversample = {}'.format(modes + (oversample or 0)) + os.linesep
+        wMsg += 'Expected at most min(jsa shape) = {}'.format(min(jsa.shape)) + os.linesep
+        wrn = True
+
+    if err and wrn:
+        lgr.warn(wMsg)
+        lgr.error(eMsg)
+        raise ValueError(eMsg + wMsg)
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def iter_row_blocks(jsa, memory_budget=256*2**20):
+    """Iterate over (rows, block) pieces of a JSA.
+
+    jsa is either an array-like with shape and row slicing (numpy array,
+    memmap) or a callable returning a fresh iterator of (rows, tile)
+    pairs, such as lambda: CCqo105_joint_spectral_amplitude.jsa_tiles(...).
+    Array rows are read in blocks of at most memory_budget bytes.
+    """
+    if callable(jsa):
+        for rows, tile in jsa():
+            yield rows, tile
+        return
+    nRows, nCols = jsa.shape
+    itemsize = np.dtype(jsa.dtype).itemsize
+    step = max(1, int(memory_budget // (nCols*itemsize)))
+    for r0 in range(0, nRows, step):
+        rows = slice(r0, min(r0 + step, nRows))
+        yield rows, np.asarray(jsa[rows])
+
+def calcqo106_schmidt_decomposition(jsa, modes=10, oversample=10, power_iterations=2,
+                                    seed=None, memory_budget=256*2**20):
+
+    """Leading Schmidt modes of a JSA by streaming randomized truncated SVD.
+
+    A random n x l probe (l = modes + oversample) is multiplied through the
+    JSA, sharpened with power iterations, and orthonormalized to Q; then
+    B = Q^H JSA is decomposed densely (l x n).  Each product is a single
+    pass over the JSA row blocks, so the total cost is
+    O((2*power_iterations + 2) Ns Ni l) with memory O((Ns + Ni) l) beyond
+    one block.  Because ||JSA||_F is accumulated in the first pass, the
+    Frobenius error of the returned rank-k approximation,
+      err^2 = ||JSA||_F^2 - ||B||_F^2 + sum_{j>k} s_j(B)^2,
+    is exact rather than probabilistic.
+
+    Parameters
+    ----------
+    jsa : array, memmap, or callable
+        Ns x Ni JSA, or a callable returning an iterator of (rows, tile)
+        (see iter_row_blocks).  A callable is called once per pass.
+    modes : integer
+        Number k of leading modes returned (Default=10)
+    oversample : integer
+        Extra probe vectors p (Default=10)
+    power_iterations : integer
+        Power iterations q; more sharpen a slowly decaying spectrum
+        (Default=2)
+    seed : integer or None
+        Seed of the random probe (Default=None)
+    memory_budget : integer
+        Bytes per row block when jsa is an array (Default=256 MiB)
+
+    Returns
+    -------
+    (singular_values, signal_modes, idler_modes, error_bound, frobenius)
+
+    singular_values : float array (k)
+        Leading singular values s_j in descending order
+    signal_modes : complex array (Ns x k)
+        Left singular vectors (signal Schmidt modes)
+    idler_modes : complex array (k x Ni)
+        Right singular vectors (idler Schmidt modes), conjugate-transposed
+    error_bound : float
+        ||JSA - U diag(s) V^H||_F
+    frobenius : float
+        ||JSA||_F
+
+    See Also
+    --------
+    calcqo106_spectral_purity, iter_row_blocks
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    Rank-2 JSA is recovered exactly
+    >>> x = np.linspace(-3, 3, 60)
+    >>> jsa = 2.0*np.outer(np.exp(-x**2), np.exp(-x**2)) + np.outer(x*np.exp(-x**2), np.exp(-x**2/2))
+    >>> s, U, Vh, err, frob = calcqo106_schmidt_decomposition(jsa, modes=2, oversample=4, seed=1)
+    >>> np.allclose(s, np.linalg.svd(jsa, compute_uv=False)[:2])
+    True
+    >>> err < 1e-10*frob
+    True
+
+    """
+
+    rng = np.random.RandomState(seed)
+    nProbe = modes + oversample
+
+    def orth(a):
+        return np.linalg.qr(a)[0]
+
+    # Pass 1: Y = A Omega, and ||A||_F
+    omega = None
+    blocks = []
+    frob2 = 0.0
+    nCols = None
+    for rows, tile in iter_row_blocks(jsa, memory_budget):
+        if omega is None:
+            nCols = tile.shape[1]
+            omega = rng.standard_normal((nCols, min(nProbe, nCols)))
+        blocks.append(np.dot(tile, omega))
+        frob2 += np.vdot(tile, tile).real
+    Y = np.concatenate(blocks, axis=0)
+    nRows = Y.shape[0]
+    nProbe = min(nProbe, nRows, nCols)
+    Y = Y[:, :nProbe]
+
+    # Power iterations: Y = A (A^H Q)
+    for _ in range(power_iterations):
+        Q = orth(Y)
+        Z = np.zeros((nCols, nProbe), dtype=np.result_type(Q.dtype, complex))
+        for rows, tile in iter_row_blocks(jsa, memory_budget):
+            Z += np.dot(tile.conj().T, Q[rows])
+        Z = orth(Z)
+        blocks = []
+        for rows, tile in iter_row_blocks(jsa, memory_budget):
+            blocks.append(np.dot(tile, Z))
+        Y = np.concatenate(blocks, axis=0)
+
+    # Final pass: B = Q^H A
+    Q = orth(Y)
+    B = np.zeros((nProbe, nCols), dtype=np.result_type(Q.dtype, complex))
+    for rows, tile in iter_row_blocks(jsa, memory_budget):
+        B += np.dot(Q[rows].conj().T, tile)
+
+    Ub, s, Vh = np.linalg.svd(B, full_matrices=False)
+    k = min(modes, s.size)
+    resid2 = max(frob2 - np.sum(s**2), 0.0) + np.sum(s[k:]**2)
+    error_bound = np.sqrt(resid2)
+    frobenius = np.sqrt(frob2)
+
+    if lgr.getEffectiveLevel() <= logging.INFO:
+        m = ''
+        m += 'schmidt decomposition: {} x {} JSA, {} probes, {} power iterations'.format(
+            nRows, nCols, nProbe, power_iterations) + os.linesep
+        m += '  relative error bound = {}'.format(error_bound/frobenius if frobenius else 0.0)
+        lgr.info(m)
+
+    return s[:k], np.dot(Q, Ub[:, :k]), Vh[:k], error_bound, frobenius
+
+def calcqo106_spectral_purity(singular_values, frobenius, error_bound=0.0):
+
+    """Spectral purity and Schmidt number with bounds from a truncated SVD.
+
+    With N = ||JSA||_F and lambda_j = s_j^2/N^2 the purity estimate from
+    the leading modes is sum lambda_j^2.  Singular values of a projected
+    matrix never exceed the true ones, so this is a lower bound.  The true
+    leading values exceed s_j by at most the error bound e (Weyl), and the
+    unresolved tail holds at most e^2 of the norm, which gives the upper
+    bound [sum (s_j + e)^4 + e^4] / N^4.
+
+    Parameters
+    ----------
+    singular_values : float array
+        Leading singular values (calcqo106_schmidt_decomposition)
+    frobenius : float
+        Frobenius norm of the JSA
+    error_bound : float
+        Frobenius error of the truncation (Default=0.0, exact spectrum)
+
+    Returns
+    -------
+    (purity, schmidt_number, purity_bounds)
+
+    purity : float
+        Purity estimate from the leading modes
+    schmidt_number : float
+        1/purity
+    purity_bounds : (float, float)
+        Lower and upper bounds on the purity
+
+    Examples
+    --------
+    A separable JSA has unit purity
+    >>> calcqo106_spectral_purity([3.0], 3.0)
+    (1.0, 1.0, (1.0, 1.0))
+
+    Two equal modes
+    >>> p, K, (lo, hi) = calcqo106_spectral_purity([1.0, 1.0], np.sqrt(2.0))
+    >>> round(p, 12), round(K, 12)
+    (0.5, 2.0)
+
+    """
+
+    s = np.asarray(singular_values, dtype=float)
+    N2 = float(frobenius)**2
+    e = float(error_bound)
+    purity = float(np.sum(s**4) / N2**2)
+    upper = float(min(1.0, (np.sum((s + e)**4) + e**4) / N2**2))
+    schmidt_number = 1.0/purity if purity > 0 else np.inf
+    return purity, schmidt_number, (purity, upper)
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo106_schmidt_decomposition as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Schmidt decomposition and spectral purity of a JSA',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--jsa',
+        type=str, required=True,
+        dest='jsa', action='store',
+        help="JSA in a .npy file (opened memory-mapped)",
+        metavar='jsaFile')
+    argp.add_argument(
+        '--modes',
+        type=int, default=10,
+        dest='modes', action='store',
+        help="Number of leading Schmidt modes",
+        metavar='k')
+    argp.add_argument(
+        '--oversample',
+        type=int, default=10,
+        dest='oversample', action='store',
+        help="Extra random probe vectors",
+        metavar='p')
+    argp.add_argument(
+        '--power-iterations',
+        type=int, default=2,
+        dest='power_iterations', action='store',
+        help="Power iterations of the range finder",
+        metavar='q')
+    argp.add_argument(
+        '--seed',
+        type=int, default=None,
+        dest='seed', action='store',
+        help="Seed of the random probe",
+        metavar='seed')
+    argp.add_argument(
+        '--memory-budget',
+        type=float, default=256.0,
+        dest='memory_budget', action='store',
+        help="Memory per row block [MiB]",
+        metavar='MiB')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo106_schmidt_decomposition.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        jsa = np.load(args.jsa, mmap_mode='r')
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    jsa = jsa,
+                    modes = args.modes,
+                    oversample = args.oversample,
+                    power_iterations = args.power_iterations)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo106_schmidt_decomposition.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo106_schmidt_decomposition.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo106_schmidt_decomposition.'
+                lgr.error(msg)
+                raise
+
+        s, U, Vh, err, frob = emr.calcqo106_schmidt_decomposition(
+            jsa,
+            modes = args.modes,
+            oversample = args.oversample,
+            power_iterations = args.power_iterations,
+            seed = args.seed,
+            memory_budget = int(args.memory_budget*2**20))
+        purity, K, bounds = emr.calcqo106_spectral_purity(s, frob, err)
+        msg = ''
+        msg += ' CCqo106_schmidt_decomposition outputs' + os.linesep
+        msg += '  singular values = {}'.format(s) + os.linesep
+        msg += '  error bound (Frobenius) = {}'.format(err) + os.linesep
+        msg += '  purity = {} (bounds {})'.format(purity, bounds) + os.linesep
+        msg += '  Schmidt number = {}'.format(K)
+        if lgr.getEffectiveLevel() > logging.INFO: print(purity)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo106_schmidt_decomposition
+
+class TestCCqo106(unittest.TestCase):
+
+    def setUp(self):
+        ws = np.linspace(-4.0, 4.0, 90)
+        wi = np.linspace(-4.0, 4.0, 70)
+        pump = np.exp(-(ws[:, None] + wi[None, :])**2/4.0)
+        phase = np.exp(0.3j*(ws[:, None] - wi[None, :]))
+        self.jsa = pump*np.exp(-(ws[:, None] - wi[None, :])**2/2.0)*phase
+        self.exact = np.linalg.svd(self.jsa, compute_uv=False)
+
+    def test_matches_dense_svd(self):
+        s, U, Vh, err, frob = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            self.jsa, modes=6, oversample=10, power_iterations=2, seed=3)
+        self.assertTrue(np.allclose(s, self.exact[:6], rtol=1e-6))
+        self.assertTrue(np.allclose(frob, np.linalg.norm(self.jsa)))
+        approx = np.dot(U*s, Vh)
+        self.assertTrue(np.allclose(err, np.linalg.norm(self.jsa - approx), rtol=1e-4))
+        self.assertTrue(np.allclose(np.dot(U.conj().T, U), np.eye(6)))
+
+    def test_blocks_tiles_and_memmap_agree(self):
+        direct = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            self.jsa, modes=4, seed=5)
+        blocked = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            self.jsa, modes=4, seed=5, memory_budget=1)
+        tiles = lambda: ((slice(r, r + 7), self.jsa[r:r + 7]) for r in range(0, 90, 7))
+        tiled = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            tiles, modes=4, seed=5)
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'jsa.npy')
+            np.save(fname, self.jsa)
+            mapped = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+                np.load(fname, mmap_mode='r'), modes=4, seed=5, memory_budget=16*70*11)
+        finally:
+            shutil.rmtree(tmp)
+        for result in (blocked, tiled, mapped):
+            self.assertTrue(np.allclose(result[0], direct[0]))
+            self.assertTrue(np.allclose(result[3:], direct[3:]))
+
+    def test_more_modes_than_rows(self):
+        s, U, Vh, err, frob = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            self.jsa[:5], modes=10, seed=1)
+        self.assertEqual((s.size, U.shape, Vh.shape), (5, (5, 5), (5, 70)))
+        # The bound is a difference of squared norms, exact to sqrt(eps)
+        self.assertTrue(err < 1e-7*frob)
+
+    def test_purity_bounds(self):
+        s, U, Vh, err, frob = CCqo106_schmidt_decomposition.calcqo106_schmidt_decomposition(
+            self.jsa, modes=2, oversample=2, power_iterations=0, seed=2)
+        purity, K, (lower, upper) = CCqo106_schmidt_decomposition.calcqo106_spectral_purity(
+            s, frob, err)
+        exact = np.sum(self.exact**4)/np.sum(self.exact**2)**2
+        self.assertTrue(lower <= exact <= upper)
+        self.assertEqual(K, 1.0/purity)
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo106)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,592 @@
+"""Hong-Ou-Mandel coincidence dip of ring-generated photon pairs
+
+When the signal and idler photons of a pair meet on a balanced beam
+splitter after a relative delay tau, the coincidence probability is
+  P(tau) = 1/2 [1 - Re O(tau) / N]
+  O(tau) = sum_{s,i} conj(f(w_s, w_i)) f(w_i, w_s) exp(-1j (w_s - w_i) tau)
+with f the joint spectral amplitude (JSA) on a common uniform frequency
+grid and N = sum |f|^2.  The delay enters only through the difference
+frequency w_s - w_i, so the 2-D product is first reduced to a 1-D sum
+along each diagonal (constant difference index) in a single O(n^2) pass,
+and the whole dip curve then follows from one FFT of length ~2n.  Direct
+integration for M delays would instead cost O(M n^2).  The diagonal pass
+runs over row blocks under a memory budget, so memory-mapped JSAs from
+CCqo105_joint_spectral_amplitude are handled without loading them.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo107_hong_ou_mandel.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo107_hong_ou_mandel
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo107_hong_ou_mandel.py
+
+Calculations
+------------
+Dip curve of a JSA written by CCqo105 on a grid with step 1.0e9 rad/s::
+  python CCqo107_hong_ou_mandel.py --jsa jsa.npy --domega 1.0e9
+Finer delay sampling (zero padding) and output to a two-column text file::
+  python CCqo107_hong_ou_mandel.py --jsa jsa.npy --domega 1.0e9 --pad 8 --output hom.txt
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo105_joint_spectral_amplitude
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Diagonal reduction and FFT dip scan with tiled reduction
+1.0b2 [2026-10-18]
+    * Square tiles paired with their transposes in hom_diagonal_sums, so
+      a memory-mapped JSA is read once in contiguous row segments
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump', 'CCqo105_joint_spectral_amplitude']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo105_joint_spectral_amplitude as ccqo105
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'jsa':{
+        'desc':'joint spectral amplitude on a square grid',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'complex (N x N array or memmap)',
+        'units':'[jsa]',
+        'flow':'input'
+        },
+    'domega':{
+        'desc':'step of the common signal/idler frequency grid',
+        'valrange':'(0, inf)',
+        'default': '1.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'delays':{
+        'desc':'relative delays of signal and idler',
+        'valrange':'(-inf, inf)',
+        'default': 'None (FFT grid)',
+        'datatype':'float (M-element array)',
+        'units':'s',
+        'flow':'input/output'
+        },
+    'diagonal_sums':{
+        'desc':'sum of conj(f(s,i)) f(i,s) along each difference index',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'complex (2N-1 element array)',
+        'units':'[jsa]^2',
+        'flow':'intermediate output'
+        },
+    'coincidence':{
+        'desc':'coincidence probability',
+        'valrange':'[0, 1]',
+        'default': '0.5',
+        'datatype':'float (M-element array)',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * jsa is square and two-dimensional
+      * domega > 0
+      * pad >= 1
+    Warning checks:
+      * None
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(jsa=np.zeros((3, 3)), domega=1.0)
+    >>> validateParameters(jsa=np.zeros((3, 4)))
+    Traceback (most recent call last):
+        ...
+    ValueError: Received jsa shape: (3, 4)
+    Expected jsa shape: (N, N)
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        if k == 'jsa' and hasattr(v, 'shape'): v = 'array of shape {}'.format(v.shape)
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    jsa = kwargs.get('jsa')
+    if jsa is not None:
+        shape = tuple(jsa.shape)
+        if len(shape) != 2 or shape[0] != shape[1]:
+            eMsg += 'Received jsa shape: {}'.format(shape) + os.linesep
+            eMsg += 'Expected jsa shape: (N, N)' + os.linesep
+            err = True
+    domega = kwargs.get('domega')
+    if domega is not None and not domega > 0:
+        eMsg += 'Received domega = {}'.format(domega) + os.linesep
+        eMsg += 'Expected domega > 0' + os.linesep
+        err = True
+    pad = kwargs.get('pad')
+    if pad is not None and pad < 1:
+        eMsg += 'Received pad = {}'.format(pad) + os.linesep
+        eMsg += 'Expected pad >= 1' + os.linesep
+        err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def hom_diagonal_sums(jsa, memory_budget=256*2**20):
+    """Reduce conj(f(s,i)) f(i,s) to sums along each difference index s - i.
+
+    The JSA is read in square tiles.  Each tile f[A, C] is paired with its
+    transposed tile f[C, A] (the exchanged amplitude), so both reads are
+    contiguous row segments of a row-major memmap, every tile is read once,
+    and at most two tiles are held in memory at a time.  The pair (C, A)
+    contributes the conjugate of the (A, C) sums at negated differences.
+
+    Parameters
+    ----------
+    jsa : complex array or memmap (N x N)
+        JSA on a common uniform grid for signal and idler
+    memory_budget : integer
+        Bytes of working memory per block (Default=256 MiB)
+
+    Returns
+    -------
+    (diagonal_sums, norm)
+
+    diagonal_sums : complex array (2N-1)
+        Element d + N - 1 holds the sum over s - i = d
+    norm : float
+        sum |f|^2
+
+    Examples
+    --------
+    >>> f = np.array([[1.0, 2.0], [3.0, 4.0]])
+    >>> h, n = hom_diagonal_sums(f)
+    >>> h.real.tolist(), n
+    ([6.0, 17.0, 6.0], 30.0)
+
+    """
+    n = jsa.shape[0]
+    # Two tiles plus product and index arrays of the same size
+    side = max(1, int(np.sqrt(memory_budget // (16*5))))
+    hRe = np.zeros(2*n - 1)
+    hIm = np.zeros(2*n - 1)
+    norm = 0.0
+    idx = idxShape = None
+    for a0 in range(0, n, side):
+        a1 = min(a0 + side, n)
+        for c0 in range(a0, n, side):
+            c1 = min(c0 + side, n)
+            tile = np.asarray(jsa[a0:a1, c0:c1])
+            swapped = np.asarray(jsa[c0:c1, a0:a1]).T
+            g = np.conj(tile) * swapped
+            # Differences s - i in this tile span lo..lo+m-1; the offsets
+            # from lo depend only on the tile shape
+            lo = a0 - (c1 - 1)
+            m = a1 - c0 - lo
+            if idx is None or idxShape != g.shape:
+                idxShape = g.shape
+                idx = (np.arange(a1 - a0)[:, None] - np.arange(c1 - c0)[None, :]
+                       + (c1 - c0 - 1)).ravel()
+            sumRe = np.bincount(idx, weights=g.real.ravel(), minlength=m)
+            sumIm = np.bincount(idx, weights=g.imag.ravel(), minlength=m)
+            hRe[lo + n - 1:lo + n - 1 + m] += sumRe
+            hIm[lo + n - 1:lo + n - 1 + m] += sumIm
+            norm += np.vdot(tile, tile).real
+            if c0 != a0:
+                # Tile (C, A): conjugate sums at differences -hi..-lo
+                hRe[n - 1 - (lo + m - 1):n - lo] += sumRe[::-1]
+                hIm[n - 1 - (lo + m - 1):n - lo] -= sumIm[::-1]
+                norm += np.vdot(swapped, swapped).real
+    return hRe + 1j*hIm, norm
+
+def calcqo107_hong_ou_mandel(jsa, domega, delays=None, pad=4, memory_budget=256*2**20):
+
+    """Hong-Ou-Mandel coincidence probability over a whole delay scan.
+
+    Parameters
+    ----------
+    jsa : complex array or memmap (N x N)
+        JSA with signal along rows and idler along columns on the same
+        uniform grid (e.g. CCqo105 with signal == idler)
+    domega : float
+        Grid step [rad s^(-1)]
+    delays : float array or None
+        Delays at which to evaluate.  None (default) returns the FFT delay
+        grid, symmetric about zero with step 2*pi/(L*domega) where
+        L >= pad*(2N-1).  Explicit delays are evaluated by a direct sum
+        over the 2N-1 diagonal sums, O(M N).
+    pad : integer
+        Zero-padding factor of the FFT (Default=4)
+    memory_budget : integer
+        Bytes of working memory per block for the diagonal pass
+
+    Returns
+    -------
+    (delays, coincidence)
+
+    delays : float array
+        Delays [s]
+    coincidence : float array
+        Coincidence probability at each delay
+
+    See Also
+    --------
+    hom_diagonal_sums, calcqo107_hong_ou_mandel_ring
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    A symmetric JSA gives a full dip at zero delay and 1/2 far away
+    >>> x = np.linspace(-4, 4, 41)
+    >>> f = np.exp(-(x[:, None]**2 + x[None, :]**2)/2.0)
+    >>> tau, pc = calcqo107_hong_ou_mandel(f, x[1] - x[0])
+    >>> abs(pc[np.argmin(np.abs(tau))]) < 1e-12, round(pc[0], 6)
+    (True, 0.5)
+
+    Explicit delays agree with the FFT grid
+    >>> tau2, pc2 = calcqo107_hong_ou_mandel(f, x[1] - x[0], delays=tau[::50])
+    >>> np.allclose(pc2, pc[::50])
+    True
+
+    """
+
+    h, norm = hom_diagonal_sums(jsa, memory_budget)
+    n = jsa.shape[0]
+    d = np.arange(-(n - 1), n)
+
+    if delays is None:
+        L = int(pad)*(2*n - 1)
+        # Place difference index d at position d mod L and transform
+        buf = np.zeros(L, dtype=complex)
+        buf[d % L] = h
+        overlap = np.fft.fftshift(np.fft.fft(buf))
+        delays = 2.0*np.pi*np.fft.fftshift(np.fft.fftfreq(L)) / domega
+    else:
+        delays = np.asarray(delays, dtype=float)
+        overlap = np.empty(delays.shape, dtype=complex)
+        flat = delays.ravel()
+        out = overlap.reshape(-1)
+        chunk = max(1, int(memory_budget // (d.size*16*2)))
+        for m0 in range(0, flat.size, chunk):
+            tau = flat[m0:m0 + chunk]
+            out[m0:m0 + chunk] = np.dot(np.exp(-1j*domega*tau[:, None]*d[None, :]), h)
+
+    coincidence = 0.5*(1.0 - overlap.real/norm)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        m = ''
+        m += 'hong-ou-mandel: N = {}, {} delays, visibility = {}'.format(
+            n, delays.size, 1.0 - 2.0*coincidence.min()) + os.linesep
+        lgr.debug(m)
+
+    return delays, coincidence
+
+def calcqo107_hong_ou_mandel_ring(wavevec, pump, couplings, velocities, ring_damping,
+                                  delays=None, pad=4, memory_budget=256*2**20, jsa_file=None):
+
+    """HOM dip of pairs from a single ring, from CCqo103 ring parameters.
+
+    The JSA is built with CCqo105_joint_spectral_amplitude on the common
+    grid wavevec (signal == idler), in memory or in the memory-mapped file
+    jsa_file, and then scanned with calcqo107_hong_ou_mandel.
+
+    Parameters
+    ----------
+    wavevec : float array (N elements, uniform spacing)
+        Common signal/idler grid (angular frequency offsets)
+    pump : callable or (sum_grid, values)
+        Two-photon pump at the sum frequency (see CCqo105)
+    couplings, velocities, ring_damping : float (scalar or N-element array)
+        Ring parameters (see CCqo103_spectral_pump)
+    delays, pad, memory_budget
+        See calcqo107_hong_ou_mandel
+    jsa_file : string or None
+        Memory-mapped .npy file for the JSA (Default=None, in memory)
+
+    Returns
+    -------
+    (delays, coincidence)
+
+    Examples
+    --------
+    >>> k = np.linspace(-10, 10, 101)
+    >>> tau, pc = calcqo107_hong_ou_mandel_ring(k, lambda w: np.exp(-w**2/8.0), 1.0, 1.0, 1.0)
+    >>> abs(pc.min()) < 1e-12
+    True
+
+    """
+
+    wavevec = np.asarray(wavevec, dtype=float)
+    jsa = ccqo105.calcqo105_joint_spectral_amplitude(
+        wavevec, wavevec, pump, couplings, velocities, ring_damping,
+        memory_budget=memory_budget, out=jsa_file)
+    domega = (wavevec[-1] - wavevec[0]) / (wavevec.size - 1)
+    return calcqo107_hong_ou_mandel(jsa, domega, delays, pad, memory_budget)
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo107_hong_ou_mandel as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Hong-Ou-Mandel dip over delays from a joint spectral amplitude',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--jsa',
+        type=str, required=True,
+        dest='jsa', action='store',
+        help="Square JSA in a .npy file (opened memory-mapped)",
+        metavar='jsaFile')
+    argp.add_argument(
+        '--domega',
+        type=float, required=True,
+        dest='domega', action='store',
+        help="Grid step [rad s^(-1)]",
+        metavar='dw')
+    argp.add_argument(
+        '--pad',
+        type=int, default=4,
+        dest='pad', action='store',
+        help="Zero-padding factor of the delay FFT",
+        metavar='pad')
+    argp.add_argument(
+        '--memory-budget',
+        type=float, default=256.0,
+        dest='memory_budget', action='store',
+        help="Memory per block [MiB]",
+        metavar='MiB')
+    argp.add_argument(
+        '--output',
+        type=str, default=None,
+        dest='output', action='store',
+        help="Text file for (delay, coincidence) columns",
+        metavar='outFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo107_hong_ou_mandel.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        jsa = np.load(args.jsa, mmap_mode='r')
+
+        if args.validate:
+            try:
+                emr.validateParameters(jsa=jsa, domega=args.domega, pad=args.pad)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo107_hong_ou_mandel.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo107_hong_ou_mandel.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo107_hong_ou_mandel.'
+                lgr.error(msg)
+                raise
+
+        delays, coincidence = emr.calcqo107_hong_ou_mandel(
+            jsa, args.domega,
+            pad = args.pad,
+            memory_budget = int(args.memory_budget*2**20))
+        if args.output is not None:
+            np.savetxt(args.output, np.column_stack((delays, coincidence)),
+                       header='delay [s], coincidence probability [1]', delimiter=',')
+        msg = ''
+        msg += ' CCqo107_hong_ou_mandel outputs' + os.linesep
+        msg += '  delays [s] = {}'.format(delays) + os.linesep
+        msg += '  coincidence [1] = {}'.format(coincidence) + os.linesep
+        msg += '  visibility [1] = {}'.format(1.0 - 2.0*coincidence.min())
+        if lgr.getEffectiveLevel() > logging.INFO: print(coincidence)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo107_hong_ou_mandel
+
+class TestCCqo107(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(4)
+        self.n = 53
+        self.jsa = rng.standard_normal((self.n, self.n)) + 1j*rng.standard_normal((self.n, self.n))
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def direct(self, f):
+        g = np.conj(f) * f.T
+        return np.array([np.trace(g, offset=-d) for d in range(-(self.n - 1), self.n)])
+
+    def test_tiles_match_direct_sums(self):
+        # Tile sides 1, 2, 7, 10 (ragged edge) and one tile
+        for budget in (1, 16*5*4, 16*5*49, 16*5*100, 2**30):
+            h, norm = CCqo107_hong_ou_mandel.hom_diagonal_sums(self.jsa, budget)
+            self.assertTrue(np.allclose(h, self.direct(self.jsa)))
+            self.assertTrue(np.allclose(norm, np.sum(np.abs(self.jsa)**2)))
+
+    def test_memmap_matches_in_memory(self):
+        fname = os.path.join(self.tmp, 'jsa.npy')
+        np.save(fname, self.jsa)
+        mapped = np.load(fname, mmap_mode='r')
+        for budget in (16*5*49, 2**30):
+            h, norm = CCqo107_hong_ou_mandel.hom_diagonal_sums(mapped, budget)
+            hMem, normMem = CCqo107_hong_ou_mandel.hom_diagonal_sums(self.jsa, budget)
+            self.assertTrue(np.allclose(h, hMem) and np.allclose(norm, normMem))
+        tau, pc = CCqo107_hong_ou_mandel.calcqo107_hong_ou_mandel(
+            mapped, 0.1, memory_budget=16*5*49)
+        tauMem, pcMem = CCqo107_hong_ou_mandel.calcqo107_hong_ou_mandel(self.jsa, 0.1)
+        self.assertTrue(np.allclose(tau, tauMem) and np.allclose(pc, pcMem))
+        del mapped
+
+    def test_antisymmetric_jsa_bunches_to_one(self):
+        f = self.jsa - self.jsa.T
+        tau, pc = CCqo107_hong_ou_mandel.calcqo107_hong_ou_mandel(f, 0.1, delays=[0.0])
+        self.assertTrue(np.allclose(pc, 1.0))
+
+    def test_single_point(self):
+        h, norm = CCqo107_hong_ou_mandel.hom_diagonal_sums(np.array([[2.0 + 1.0j]]))
+        self.assertEqual((h.tolist(), norm), ([5.0 + 0.0j], 5.0))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo107)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,630 @@
+"""Franson interference of ring photon pairs with a ring interferometer
+
+Signal and idler each pass an unbalanced interferometer whose long arm
+is a second ring (response rr from CCqo103_spectral_pump) with extra
+delay T and phase.  Post-selecting the central coincidence peak keeps
+the short-short and long-long amplitudes,
+  A(w_s, w_i) = f(w_s, w_i) [1 + rr(w_s) rr(w_i) exp(1j((w_s + w_i) T + phi))] / 2
+so the coincidence probability is
+  P(T, phi) = [B + 2 Re(exp(1j phi) C(T))] / (4 N)
+  B    = sum |f|^2 (1 + |rr(w_s) rr(w_i)|^2)
+  C(T) = sum |f|^2 rr(w_s) rr(w_i) exp(1j (w_s + w_i) T)
+with N = sum |f|^2 and phi the total phase of both interferometers.
+The phase enters only through exp(1j phi), so B and C(T) are computed
+once and every phase follows by broadcasting.  The delay enters only
+through the sum frequency, so the weighted JSA is reduced along each
+anti-diagonal in one tiled O(n^2) pass and C(T) on the whole delay grid
+follows from a single FFT.  The interferometer ring responses are
+evaluated once per coupling setting, and a batch of settings shares the
+same pass over the JSA.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo108_franson_interference.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo108_franson_interference
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo108_franson_interference.py
+
+Execute unit tests
+  python test_CCqo108_franson_interference.py
+
+Calculations
+------------
+Fringes of a JSA from CCqo105 on the grid in signal.csv with an
+interferometer ring described by interferometer.csv (CCqo103 format)::
+  python CCqo108_franson_interference.py --jsa jsa.npy --signal-file signal.csv --interferometer-file interferometer.csv --phases 0 1.5708 3.1416
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo103_spectral_pump,
+        CCqo105_joint_spectral_amplitude
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Batched (coupling, delay, phase) fringes with anti-diagonal FFT
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump', 'CCqo105_joint_spectral_amplitude']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo103_spectral_pump as ccqo103
+import CCqo105_joint_spectral_amplitude as ccqo105
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'jsa':{
+        'desc':'joint spectral amplitude, signal along rows',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'complex (Ns x Ni array or memmap)',
+        'units':'[jsa]',
+        'flow':'input'
+        },
+    'couplings':{
+        'desc':'coupling constants of the interferometer ring',
+        'valrange':'[0, inf)',
+        'default': '1.0',
+        'datatype':'complex (scalar, N, K x 1 or K x N array)',
+        'units':'[wavevec]*[velocities]',
+        'flow':'input'
+        },
+    'velocities':{
+        'desc':'spectral velocities in the interferometer ring',
+        'valrange':'(0, inf)',
+        'default': '1.0',
+        'datatype':'float (scalar, N, K x 1 or K x N array)',
+        'units':'[velocities]',
+        'flow':'input'
+        },
+    'ring_damping':{
+        'desc':'spectral damping of the interferometer ring',
+        'valrange':'(0, inf)',
+        'default': '1.0',
+        'datatype':'float (scalar, N, K x 1 or K x N array)',
+        'units':'[wavevec]*[velocities]',
+        'flow':'input'
+        },
+    'phases':{
+        'desc':'total interferometer phase',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float (P-element array)',
+        'units':'rad',
+        'flow':'input'
+        },
+    'delays':{
+        'desc':'long-short path delay',
+        'valrange':'(-inf, inf)',
+        'default': 'None (FFT grid)',
+        'datatype':'float (M-element array)',
+        'units':'s',
+        'flow':'input/output'
+        },
+    'coincidence':{
+        'desc':'post-selected coincidence probability',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float (K x M x P array)',
+        'units':'1',
+        'flow':'output'
+        },
+    'visibility':{
+        'desc':'fringe visibility over phase at each delay',
+        'valrange':'[0, 1]',
+        'default': '0.0',
+        'datatype':'float (K x M array)',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * couplings, velocities, ring_damping >= 0
+      * signal and idler uniform with a common step
+      * jsa shape matches (signal.size, idler.size)
+    Warning checks:
+      * None
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(signal=[1.0, 2.0], idler=[3.0, 4.0, 5.0])
+    >>> validateParameters(signal=[1.0, 2.0], idler=[3.0, 5.0])
+    Traceback (most recent call last):
+        ...
+    ValueError: Expected signal and idler grids uniform with a common step
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        if k == 'jsa' and hasattr(v, 'shape'): v = 'array of shape {}'.format(v.shape)
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    for name in ['couplings', 'velocities', 'ring_damping']:
+        val = kwargs.get(name)
+        if val is None: continue
+        e, m, w, wm = ccqo103.valArrayTests(
+            np.array(val), name, errorNegative=True, warnComplex=False)
+        err = err or e
+        eMsg += m
+
+    signal = kwargs.get('signal')
+    idler = kwargs.get('idler')
+    if signal is not None and idler is not None:
+        signal = np.asarray(signal, dtype=float)
+        idler = np.asarray(idler, dtype=float)
+        if ccqo105._uniformStep(signal, idler) is None:
+            eMsg += 'Expected signal and idler grids uniform with a common step' + os.linesep
+            err = True
+        jsa = kwargs.get('jsa')
+        if jsa is not None and tuple(jsa.shape) != (signal.size, idler.size):
+            eMsg += 'Received jsa shape: {}'.format(tuple(jsa.shape)) + os.linesep
+            eMsg += 'Expected jsa shape: {}'.format((signal.size, idler.size)) + os.linesep
+            err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def interferometer_responses(grid, couplings, velocities, ring_damping):
+    """Interferometer ring responses on a grid for a batch of ring settings.
+
+    Parameters broadcast against grid; any leading dimensions form the
+    batch, which is flattened.
+
+    Returns
+    -------
+    (rr, batch_shape)
+
+    rr : complex array (K x N)
+    batch_shape : tuple
+        Leading shape of the broadcast parameters (K = prod(batch_shape))
+
+    Examples
+    --------
+    >>> rr, shape = interferometer_responses(np.zeros(3), [[1.0], [2.0]], 1.0, 1.0)
+    >>> rr.shape, shape
+    ((2, 3), (2,))
+
+    """
+    grid = np.asarray(grid, dtype=float)
+    rr = ccqo103.calcqo103_spectral_pump(grid, couplings, velocities, ring_damping, 1.0)[1]
+    shape = np.broadcast(rr, grid).shape
+    rr = np.broadcast_to(rr, shape).astype(complex)
+    return rr.reshape(-1, grid.size), shape[:-1]
+
+def franson_sums(jsa, rr_signal, rr_idler, memory_budget=256*2**20):
+    """Anti-diagonal sums of |f|^2 rr_s rr_i and the phase-independent term.
+
+    Parameters
+    ----------
+    jsa : complex array or memmap (Ns x Ni)
+    rr_signal : complex array (K x Ns)
+    rr_idler : complex array (K x Ni)
+    memory_budget : integer
+        Bytes of working memory per row block (Default=256 MiB)
+
+    Returns
+    -------
+    (sums, base, norm)
+
+    sums : complex array (K x (Ns+Ni-1))
+        Element m holds the sum over row + column = m
+    base : float array (K)
+        sum |f|^2 (1 + |rr_s rr_i|^2)
+    norm : float
+        sum |f|^2
+
+    Examples
+    --------
+    >>> f = np.ones((2, 2))
+    >>> s, b, n = franson_sums(f, np.ones((1, 2)), np.ones((1, 2)))
+    >>> s.real.tolist(), b.tolist(), n
+    ([[1.0, 2.0, 1.0]], [8.0], 4.0)
+
+    """
+    ns, ni = jsa.shape
+    K = rr_signal.shape[0]
+    L = ns + ni - 1
+    rowsPerBlock = ccqo105.tile_rows(ni, memory_budget, itemsize=16, work_arrays=3*K + 2)
+    sRe = np.zeros(K*L)
+    sIm = np.zeros(K*L)
+    base = np.zeros(K)
+    norm = 0.0
+    absI = np.abs(rr_idler)**2
+    cols = np.arange(ni)
+    offsets = (np.arange(K)*L)[:, None, None]
+    for a0 in range(0, ns, rowsPerBlock):
+        a1 = min(a0 + rowsPerBlock, ns)
+        P = np.abs(np.asarray(jsa[a0:a1, :]))**2
+        W = P[None, :, :] * rr_signal[:, a0:a1, None] * rr_idler[:, None, :]
+        idx = (offsets + np.arange(a0, a1)[None, :, None] + cols[None, None, :]).ravel()
+        sRe += np.bincount(idx, weights=W.real.ravel(), minlength=K*L)
+        sIm += np.bincount(idx, weights=W.imag.ravel(), minlength=K*L)
+        rowNorm = P.sum()
+        norm += rowNorm
+        # sum_a |rr_s[a]|^2 sum_b P[a,b] |rr_i[b]|^2 for every setting at once
+        base += rowNorm + np.sum(np.abs(rr_signal[:, a0:a1])**2 * P.dot(absI.T).T, axis=1)
+    return (sRe + 1j*sIm).reshape(K, L), base, norm
+
+def calcqo108_franson_interference(signal, idler, jsa, couplings, velocities, ring_damping,
+                                   phases=0.0, delays=None, pad=4, memory_budget=256*2**20):
+
+    """Franson coincidence fringes over a (ring setting, delay, phase) grid.
+
+    Parameters
+    ----------
+    signal, idler : float arrays (Ns, Ni)
+        Uniform signal and idler grids with a common step (angular
+        frequency).  Absolute frequencies give the carrier phase of the
+        delay; offsets from a reference absorb it into phases.
+    jsa : complex array or memmap (Ns x Ni)
+        Joint spectral amplitude (e.g. CCqo105)
+    couplings, velocities, ring_damping : float or complex arrays
+        Interferometer ring parameters (see CCqo103_spectral_pump).  They
+        broadcast against the grids; leading dimensions, e.g. a K x 1
+        column of couplings, form a batch of ring settings.
+    phases : float array (P)
+        Total interferometer phase [rad] (Default=0.0)
+    delays : float array or None
+        Long-short path delays.  None (default) returns the FFT delay grid
+        with step 2*pi/(L*dw), L >= pad*(Ns+Ni-1).  Explicit delays are
+        evaluated by a direct sum over the anti-diagonal sums.
+    pad : integer
+        Zero-padding factor of the FFT (Default=4)
+    memory_budget : integer
+        Bytes of working memory per row block
+
+    Returns
+    -------
+    (delays, coincidence, visibility)
+
+    delays : float array (M)
+    coincidence : float array (batch + (M, P))
+        Post-selected coincidence probability
+    visibility : float array (batch + (M,))
+        2|C(T)|/B, the fringe visibility over phase at each delay
+
+    See Also
+    --------
+    franson_sums, interferometer_responses
+
+    Exceptions
+    ----------
+    ValueError : grids not uniform with a common step
+
+    Examples
+    --------
+    A flat response rr = -1j (critical coupling, negligible dispersion)
+    gives full visibility at zero delay
+    >>> w = np.linspace(-2, 2, 21)
+    >>> f = np.exp(-(w[:, None] + w[None, :])**2)
+    >>> T, P, V = calcqo108_franson_interference(w, w, f, 1.0, 1.0e-12, 1.0,
+    ...                                          phases=[0.0, np.pi], delays=[0.0])
+    >>> np.allclose(P, [[0.0, 1.0]]), np.allclose(V, [1.0])
+    (True, True)
+
+    Two ring settings and an FFT delay grid
+    >>> T, P, V = calcqo108_franson_interference(w, w, f, [[0.5], [1.0]], 1.0, 1.0,
+    ...                                          phases=np.linspace(0, np.pi, 5))
+    >>> P.shape, V.shape
+    ((2, 164, 5), (2, 164))
+
+    """
+
+    signal = np.asarray(signal, dtype=float)
+    idler = np.asarray(idler, dtype=float)
+    dw = ccqo105._uniformStep(signal, idler)
+    if dw is None:
+        raise ValueError('Expected signal and idler grids uniform with a common step')
+
+    rrS, batchS = interferometer_responses(signal, couplings, velocities, ring_damping)
+    rrI, batchI = interferometer_responses(idler, couplings, velocities, ring_damping)
+    sums, base, norm = franson_sums(jsa, rrS, rrI, memory_budget)
+    K, L = sums.shape
+    m = np.arange(L)
+    sum0 = signal[0] + idler[0]
+
+    if delays is None:
+        nfft = int(pad)*L
+        # Positive exponent: inverse FFT scaled back by its length
+        corr = np.fft.ifft(sums, n=nfft, axis=1)*nfft
+        corr = np.fft.fftshift(corr, axes=1)
+        delays = 2.0*np.pi*np.fft.fftshift(np.fft.fftfreq(nfft)) / dw
+    else:
+        delays = np.asarray(delays, dtype=float).ravel()
+        corr = np.empty((K, delays.size), dtype=complex)
+        chunk = max(1, int(memory_budget // (L*16*2)))
+        for t0 in range(0, delays.size, chunk):
+            tau = delays[t0:t0 + chunk]
+            corr[:, t0:t0 + chunk] = np.dot(sums, np.exp(1j*dw*m[:, None]*tau[None, :]))
+    corr = corr * np.exp(1j*sum0*delays)[None, :]
+
+    phases = np.atleast_1d(np.asarray(phases, dtype=float))
+    fringe = np.real(np.exp(1j*phases)[None, None, :] * corr[:, :, None])
+    coincidence = (base[:, None, None] + 2.0*fringe) / (4.0*norm)
+    visibility = 2.0*np.abs(corr) / base[:, None]
+
+    batch = np.broadcast(np.empty(batchS), np.empty(batchI)).shape
+    coincidence = coincidence.reshape(batch + coincidence.shape[1:])
+    visibility = visibility.reshape(batch + visibility.shape[1:])
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'franson: {} ring settings, {} delays, {} phases'.format(
+            K, delays.size, phases.size) + os.linesep
+        lgr.debug(msg)
+
+    return delays, coincidence, visibility
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo108_franson_interference as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Franson interference fringes with a ring interferometer',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--jsa',
+        type=str, required=True,
+        dest='jsa', action='store',
+        help="Square JSA in a .npy file (opened memory-mapped)",
+        metavar='jsaFile')
+    argp.add_argument(
+        '--signal-file',
+        type=str, required=True,
+        dest='signal_file', action='store',
+        help="CSV (CCqo103 format) whose wavevec column is the signal and idler grid",
+        metavar='inFile')
+    argp.add_argument(
+        '--interferometer-file',
+        type=str, required=True,
+        dest='interferometer_file', action='store',
+        help="CSV (CCqo103 format) with the interferometer ring on the same grid",
+        metavar='inFile')
+    argp.add_argument(
+        '--phases',
+        type=float, nargs='+', default=[0.0],
+        dest='phases', action='store',
+        help="Total interferometer phases [rad]",
+        metavar='phi')
+    argp.add_argument(
+        '--pad',
+        type=int, default=4,
+        dest='pad', action='store',
+        help="Zero-padding factor of the delay FFT",
+        metavar='pad')
+    argp.add_argument(
+        '--memory-budget',
+        type=float, default=256.0,
+        dest='memory_budget', action='store',
+        help="Memory per block [MiB]",
+        metavar='MiB')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo108_franson_interference.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        jsa = np.load(args.jsa, mmap_mode='r')
+        grid = ccqo103.getInputs(args.signal_file)[0]
+        wavevec, couplings, velocities, damping, _ = ccqo103.getInputs(args.interferometer_file)
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    signal=grid, idler=grid, jsa=jsa,
+                    couplings=couplings, velocities=velocities, ring_damping=damping)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo108_franson_interference.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo108_franson_interference.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo108_franson_interference.'
+                lgr.error(msg)
+                raise
+
+        delays, coincidence, visibility = emr.calcqo108_franson_interference(
+            grid, grid, jsa, couplings, velocities, damping,
+            phases = args.phases,
+            pad = args.pad,
+            memory_budget = int(args.memory_budget*2**20))
+        msg = ''
+        msg += ' CCqo108_franson_interference outputs' + os.linesep
+        msg += '  delays [s] = {}'.format(delays) + os.linesep
+        msg += '  coincidence [1] = {}'.format(coincidence) + os.linesep
+        msg += '  visibility [1] = {}'.format(visibility)
+        if lgr.getEffectiveLevel() > logging.INFO: print(visibility)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import CCqo108_franson_interference
+
+class TestCCqo108(unittest.TestCase):
+
+    def setUp(self):
+        self.w = np.linspace(-3.0, 3.0, 31)
+        rng = np.random.RandomState(108)
+        self.jsa = rng.randn(31, 31) + 1j*rng.randn(31, 31)
+        self.couplings = np.array([[0.4], [0.9], [1.3]])
+        self.phases = np.linspace(0.0, 2.0*np.pi, 7)
+        self.delays = np.array([-2.0, -0.3, 0.0, 0.7, 5.0])
+
+    def direct(self, coupling, tau, phi):
+        rr = CCqo108_franson_interference.interferometer_responses(
+            self.w, coupling, 1.0, 0.8)[0][0]
+        amp = self.jsa * (1.0 + np.outer(rr, rr)*np.exp(
+            1j*((self.w[:, None] + self.w[None, :])*tau + phi))) / 2.0
+        return np.sum(np.abs(amp)**2) / np.sum(np.abs(self.jsa)**2)
+
+    def test_explicit_delays_match_direct(self):
+        T, P, V = CCqo108_franson_interference.calcqo108_franson_interference(
+            self.w, self.w, self.jsa, self.couplings, 1.0, 0.8,
+            phases=self.phases, delays=self.delays, memory_budget=1)
+        self.assertEqual(P.shape, (3, 5, 7))
+        for k in range(3):
+            for t in range(5):
+                for p in range(7):
+                    self.assertAlmostEqual(
+                        P[k, t, p], self.direct(self.couplings[k, 0], T[t], self.phases[p]))
+
+    def test_fft_grid_matches_explicit(self):
+        T, P, V = CCqo108_franson_interference.calcqo108_franson_interference(
+            self.w, self.w, self.jsa, self.couplings, 1.0, 0.8, phases=self.phases)
+        T2, P2, V2 = CCqo108_franson_interference.calcqo108_franson_interference(
+            self.w, self.w, self.jsa, self.couplings, 1.0, 0.8,
+            phases=self.phases, delays=T[::13])
+        self.assertTrue(np.allclose(P[:, ::13], P2))
+        self.assertTrue(np.allclose(V[:, ::13], V2))
+
+    def test_visibility_bounds_fringe(self):
+        T, P, V = CCqo108_franson_interference.calcqo108_franson_interference(
+            self.w, self.w, self.jsa, 0.9, 1.0, 0.8,
+            phases=np.linspace(0.0, 2.0*np.pi, 721), delays=[0.4])
+        vis = (P.max() - P.min()) / (P.max() + P.min())
+        self.assertAlmostEqual(vis, V[0], places=4)
+
+    def test_nonuniform_grid_rejected(self):
+        self.assertRaises(ValueError,
+                          CCqo108_franson_interference.calcqo108_franson_interference,
+                          self.w**3, self.w, self.jsa, 1.0, 1.0, 1.0)
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo108)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,667 @@
+"""Streaming sampler of photon-pair events from a joint spectral amplitude
+
+Synthetic (signal, idler) events for detector pipelines are drawn from
+the biphoton distribution |f(w_s, w_i)|^2 of a JSA, e.g. the ring/pump
+JSA of CCqo105_joint_spectral_amplitude.  The grid is indexed once:
+the cumulative distribution over all N_s*N_i cells is accumulated in
+row blocks, and a guide table with one entry per cell maps a uniform
+variate directly to the first candidate cell.  Drawing a sample then
+costs O(1) expected time (a table lookup and, on average, about one
+comparison), independent of the grid size.  Events are streamed from
+a generator one batch at a time, so only one batch of samples is ever
+held in memory, and each worker owns an independent RandomState seeded
+with (seed, worker).
+
+Time-domain events are drawn from the joint temporal amplitude, the 2-D
+FFT of the JSA.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo109_pair_sampler.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo109_pair_sampler
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo109_pair_sampler.py
+
+Calculations
+------------
+Ten million frequency pairs from a JSA written by CCqo105 on the grid of
+signal.csv, as comma-separated text::
+  python CCqo109_pair_sampler.py --jsa jsa.npy --signal-file signal.csv --num-samples 10000000 --seed 7 --output pairs.csv
+Worker 3 of a seeded pool, in the time domain::
+  python CCqo109_pair_sampler.py --jsa jsa.npy --signal-file signal.csv --num-samples 1000000 --seed 7 --worker 3 --domain time
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo106_schmidt_decomposition
+Command-line extras: argparse, traceback, pprint, CCqo103_spectral_pump
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Guide-table cumulative index and batched event generator
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump', 'CCqo106_schmidt_decomposition']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo106_schmidt_decomposition as ccqo106
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'jsa':{
+        'desc':'joint spectral amplitude, signal along rows',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'complex (Ns x Ni array, memmap, or tile callable)',
+        'units':'[jsa]',
+        'flow':'input'
+        },
+    'signal':{
+        'desc':'signal grid (cell centres)',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (Ns-element array)',
+        'units':'[wavevec]',
+        'flow':'input'
+        },
+    'idler':{
+        'desc':'idler grid (cell centres)',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (Ni-element array)',
+        'units':'[wavevec]',
+        'flow':'input'
+        },
+    'batch_size':{
+        'desc':'number of events per generated batch',
+        'valrange':'[1, inf)',
+        'default': '1000000',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'seed':{
+        'desc':'base seed shared by all workers',
+        'valrange':'[0, 2**32)',
+        'default': 'None',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'worker':{
+        'desc':'worker number selecting an independent stream',
+        'valrange':'[0, 2**32)',
+        'default': '0',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'events':{
+        'desc':'sampled (signal, idler) pairs',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (batch x 2 arrays)',
+        'units':'[wavevec] or [time]',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * batch_size >= 1
+      * seed, worker >= 0
+      * jsa shape matches (signal.size, idler.size)
+    Warning checks:
+      * None
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(batch_size=10, seed=1, worker=2)
+    >>> validateParameters(batch_size=0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received batch_size = 0
+    Expected batch_size >= 1
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        if k == 'jsa' and hasattr(v, 'shape'): v = 'array of shape {}'.format(v.shape)
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    batch = kwargs.get('batch_size')
+    if batch is not None and batch < 1:
+        eMsg += 'Received batch_size = {}'.format(batch) + os.linesep
+        eMsg += 'Expected batch_size >= 1' + os.linesep
+        err = True
+    for name in ['seed', 'worker']:
+        val = kwargs.get(name)
+        if val is not None and val < 0:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= 0'.format(name) + os.linesep
+            err = True
+    jsa = kwargs.get('jsa')
+    signal = kwargs.get('signal')
+    idler = kwargs.get('idler')
+    if hasattr(jsa, 'shape') and signal is not None and idler is not None:
+        expected = (np.size(signal), np.size(idler))
+        if tuple(jsa.shape) != expected:
+            eMsg += 'Received jsa shape: {}'.format(tuple(jsa.shape)) + os.linesep
+            eMsg += 'Expected jsa shape: {}'.format(expected) + os.linesep
+            err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def joint_temporal_amplitude(jsa, signal, idler):
+    """Joint temporal amplitude and its time grids (2-D FFT of the JSA).
+
+    The JSA is loaded into memory for the transform.
+
+    Returns
+    -------
+    (jta, t_signal, t_idler)
+
+    Examples
+    --------
+    >>> jta, ts, ti = joint_temporal_amplitude(np.ones((4, 2)), np.arange(4.0), np.arange(2.0))
+    >>> jta.shape, ts.tolist()
+    ((4, 2), [-3.141592653589793, -1.5707963267948966, 0.0, 1.5707963267948966])
+
+    """
+    if callable(jsa):
+        jsa = np.vstack([tile for rows, tile in ccqo106.iter_row_blocks(jsa)])
+    jta = np.fft.fftshift(np.fft.fft2(np.asarray(jsa)))
+    ts = 2.0*np.pi*np.fft.fftshift(np.fft.fftfreq(np.size(signal), signal[1] - signal[0]))
+    ti = 2.0*np.pi*np.fft.fftshift(np.fft.fftfreq(np.size(idler), idler[1] - idler[0]))
+    return jta, ts, ti
+
+class PairSampler(object):
+    """Cumulative index with a guide table over |JSA|^2 for O(1) sampling.
+
+    Attributes
+    ----------
+    signal, idler : float arrays
+        Cell centres of the grid
+    cdf : float array (Ns*Ni)
+        Normalized cumulative probability in row-major cell order
+    guide : integer array (Ns*Ni + 1)
+        guide[j] is the first cell with cdf > j/(Ns*Ni)
+    jitter : boolean
+        Spread events uniformly within their cell
+
+    Examples
+    --------
+    >>> ps = PairSampler([[0.0, 1.0], [3.0, 0.0]], [0.0, 1.0], [10.0, 20.0])
+    >>> s, i = next(ps.batches(200000, seed=1))
+    >>> round(np.mean(s == 1.0), 2), set(zip(s[:50], i[:50])) <= set([(0.0, 20.0), (1.0, 10.0)])
+    (0.9, True)
+
+    """
+
+    def __init__(self, jsa, signal, idler, jitter=False, memory_budget=256*2**20):
+        self.signal = np.asarray(signal, dtype=float)
+        self.idler = np.asarray(idler, dtype=float)
+        self.jitter = jitter
+        if not hasattr(jsa, 'shape') and not callable(jsa):
+            jsa = np.asarray(jsa)
+
+        # Running cumulative sum over row blocks
+        pieces = []
+        total = 0.0
+        for rows, tile in ccqo106.iter_row_blocks(jsa, memory_budget):
+            c = np.cumsum(np.abs(tile.ravel())**2)
+            c += total
+            total = c[-1]
+            pieces.append(c)
+        cdf = np.concatenate(pieces)
+        if cdf.size != self.signal.size*self.idler.size:
+            raise ValueError('Expected jsa shape {}'.format((self.signal.size, self.idler.size)))
+        if not total > 0:
+            raise ValueError('Expected a JSA with nonzero norm')
+        cdf /= total
+        cdf[-1] = 1.0
+        self.cdf = cdf
+        self.norm = total
+        n = cdf.size
+        self.guide = np.searchsorted(cdf, np.arange(n + 1) / float(n), side='right')
+        np.minimum(self.guide, n - 1, out=self.guide)
+
+    def __len__(self):
+        return self.cdf.size
+
+    def cells(self, u):
+        """Cell index for each uniform variate u in [0, 1).
+
+        Start at the guide entry and step forward; the expected number of
+        steps is below two.  Variates still unresolved after a few steps
+        (heavily skewed buckets) fall back to a binary search.
+        """
+        n = self.cdf.size
+        idx = self.guide[(u*n).astype(np.intp)]
+        for step in range(4):
+            behind = self.cdf[idx] <= u
+            if not behind.any():
+                return idx
+            idx[behind] += 1
+        behind = self.cdf[idx] <= u
+        if behind.any():
+            idx[behind] = np.searchsorted(self.cdf, u[behind], side='right')
+        return idx
+
+    def batches(self, batch_size=1000000, num_samples=None, seed=None, worker=0):
+        """Generate (signal, idler) event arrays of at most batch_size each.
+
+        Parameters
+        ----------
+        batch_size : integer
+            Events per batch (Default=1000000)
+        num_samples : integer or None
+            Total number of events; None streams forever (Default=None)
+        seed : integer or None
+            Base seed; None seeds from the operating system (Default=None)
+        worker : integer
+            Worker number; (seed, worker) selects an independent stream
+        """
+        if seed is None:
+            rng = np.random.RandomState()
+        else:
+            rng = np.random.RandomState([int(seed), int(worker)])
+        ni = self.idler.size
+        ds = self.signal[1] - self.signal[0] if self.signal.size > 1 else 0.0
+        di = self.idler[1] - self.idler[0] if ni > 1 else 0.0
+        remaining = num_samples
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            cell = self.cells(rng.random_sample(size))
+            s = self.signal[cell // ni]
+            i = self.idler[cell % ni]
+            if self.jitter:
+                s = s + ds*(rng.random_sample(size) - 0.5)
+                i = i + di*(rng.random_sample(size) - 0.5)
+            if remaining is not None: remaining -= size
+            yield s, i
+
+    def save(self, fname):
+        """Save the index to a .npz file."""
+        np.savez(fname, signal=self.signal, idler=self.idler, cdf=self.cdf,
+                 guide=self.guide, norm=self.norm, jitter=self.jitter)
+
+    @classmethod
+    def load(cls, fname):
+        """Load an index written by save()."""
+        data = np.load(fname)
+        obj = cls.__new__(cls)
+        obj.signal = data['signal']
+        obj.idler = data['idler']
+        obj.cdf = data['cdf']
+        obj.guide = data['guide']
+        obj.norm = float(data['norm'])
+        obj.jitter = bool(data['jitter'])
+        return obj
+
+def calcqo109_pair_sampler(jsa, signal, idler, batch_size=1000000, num_samples=None,
+                           seed=None, worker=0, domain='frequency', jitter=False,
+                           memory_budget=256*2**20):
+
+    """Stream photon-pair events drawn from |JSA|^2 (or |JTA|^2).
+
+    Parameters
+    ----------
+    jsa : array, memmap, or callable
+        Ns x Ni JSA, or a callable returning an iterator of (rows, tile)
+        such as lambda: CCqo105_joint_spectral_amplitude.jsa_tiles(...)
+    signal, idler : float arrays (Ns, Ni)
+        Grids of the JSA (uniform for domain='time' or jitter=True)
+    batch_size : integer
+        Events per yielded batch (Default=1000000)
+    num_samples : integer or None
+        Total events; None streams forever (Default=None)
+    seed, worker : integers
+        Independent stream per (seed, worker) (Default=None, 0)
+    domain : string
+        'frequency' samples (w_s, w_i); 'time' samples (t_s, t_i) from the
+        joint temporal amplitude (Default='frequency')
+    jitter : boolean
+        Spread events uniformly within their grid cell (Default=False)
+    memory_budget : integer
+        Bytes per row block while indexing the grid
+
+    Returns
+    -------
+    generator of (signal_events, idler_events)
+
+    See Also
+    --------
+    PairSampler, joint_temporal_amplitude
+
+    Exceptions
+    ----------
+    ValueError : unknown domain, jsa of wrong shape or zero norm
+
+    Examples
+    --------
+    >>> w = np.linspace(-3, 3, 61)
+    >>> f = np.exp(-(w[:, None] + w[None, :])**2 - (w[:, None] - w[None, :])**2/8.0)
+    >>> gen = calcqo109_pair_sampler(f, w, w, batch_size=50000, num_samples=120000, seed=5)
+    >>> [s.size for s, i in gen]
+    [50000, 50000, 20000]
+    >>> s, i = next(calcqo109_pair_sampler(f, w, w, batch_size=200000, seed=5))
+    >>> abs(np.mean(s + i)) < 0.01, np.corrcoef(s, i)[0, 1] < -0.7
+    (True, True)
+
+    """
+
+    if domain == 'time':
+        jsa, signal, idler = joint_temporal_amplitude(jsa, signal, idler)
+    elif domain != 'frequency':
+        raise ValueError("Expected domain 'frequency' or 'time', received {}".format(domain))
+    sampler = PairSampler(jsa, signal, idler, jitter=jitter, memory_budget=memory_budget)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'pair sampler: {} cells, seed {}, worker {}'.format(
+            len(sampler), seed, worker) + os.linesep
+        lgr.debug(msg)
+
+    return sampler.batches(batch_size, num_samples, seed, worker)
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo103_spectral_pump as ccqo103
+    import CCqo109_pair_sampler as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Stream photon-pair events sampled from a joint spectral amplitude',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--jsa',
+        type=str, required=True,
+        dest='jsa', action='store',
+        help="Square JSA in a .npy file (opened memory-mapped)",
+        metavar='jsaFile')
+    argp.add_argument(
+        '--signal-file',
+        type=str, required=True,
+        dest='signal_file', action='store',
+        help="CSV (CCqo103 format) whose wavevec column is the signal and idler grid",
+        metavar='inFile')
+    argp.add_argument(
+        '--num-samples',
+        type=int, default=1000000,
+        dest='num_samples', action='store',
+        help="Total number of events",
+        metavar='n')
+    argp.add_argument(
+        '--batch-size',
+        type=int, default=1000000,
+        dest='batch_size', action='store',
+        help="Events per batch",
+        metavar='n')
+    argp.add_argument(
+        '--seed',
+        type=int, default=None,
+        dest='seed', action='store',
+        help="Base seed",
+        metavar='seed')
+    argp.add_argument(
+        '--worker',
+        type=int, default=0,
+        dest='worker', action='store',
+        help="Worker number for an independent stream",
+        metavar='w')
+    argp.add_argument(
+        '--domain',
+        choices=['frequency', 'time'], default='frequency',
+        dest='domain', action='store',
+        help="Sample frequencies or times")
+    argp.add_argument(
+        '--jitter',
+        default=False,
+        dest='jitter', action='store_true',
+        help="Spread events uniformly within their grid cell")
+    argp.add_argument(
+        '--output',
+        type=str, default=None,
+        dest='output', action='store',
+        help="Text file for (signal, idler) events; default prints a summary",
+        metavar='outFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo109_pair_sampler.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        jsa = np.load(args.jsa, mmap_mode='r')
+        grid = ccqo103.getInputs(args.signal_file)[0]
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    jsa=jsa, signal=grid, idler=grid, batch_size=args.batch_size,
+                    seed=args.seed, worker=args.worker)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo109_pair_sampler.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo109_pair_sampler.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo109_pair_sampler.'
+                lgr.error(msg)
+                raise
+
+        gen = emr.calcqo109_pair_sampler(
+            jsa, grid, grid,
+            batch_size = args.batch_size,
+            num_samples = args.num_samples,
+            seed = args.seed,
+            worker = args.worker,
+            domain = args.domain,
+            jitter = args.jitter)
+        count = 0
+        sumS = sumI = 0.0
+        outFile = open(args.output, 'w') if args.output is not None else None
+        for s, i in gen:
+            count += s.size
+            sumS += s.sum()
+            sumI += i.sum()
+            if outFile is not None:
+                np.savetxt(outFile, np.column_stack((s, i)), delimiter=',')
+        if outFile is not None: outFile.close()
+        msg = ''
+        msg += ' CCqo109_pair_sampler outputs' + os.linesep
+        msg += '  events = {}'.format(count) + os.linesep
+        msg += '  mean signal = {}'.format(sumS/count) + os.linesep
+        msg += '  mean idler = {}'.format(sumI/count)
+        if lgr.getEffectiveLevel() > logging.INFO: print(count)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
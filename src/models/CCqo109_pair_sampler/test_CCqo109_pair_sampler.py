@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo109_pair_sampler
+
+class TestCCqo109(unittest.TestCase):
+
+    def setUp(self):
+        self.signal = np.linspace(-2.0, 2.0, 9)
+        self.idler = np.linspace(-3.0, 3.0, 13)
+        jsa = np.exp(-(self.signal[:, None] + self.idler[None, :])**2)
+        # Skewed distribution with empty rows and one dominant cell
+        jsa[2:5] = 0.0
+        jsa[7, 3] = 40.0
+        self.jsa = jsa
+
+    def test_cells_match_binary_search(self):
+        sampler = CCqo109_pair_sampler.PairSampler(self.jsa, self.signal, self.idler)
+        u = np.concatenate([np.random.RandomState(0).random_sample(100000),
+                            sampler.cdf[:-1], np.nextafter(sampler.cdf[:-1], 0.0), [0.0]])
+        u = u[u < 1.0]
+        self.assertEqual(sampler.cells(u).tolist(),
+                         np.searchsorted(sampler.cdf, u, side='right').tolist())
+
+    def test_frequencies_and_empty_cells(self):
+        gen = CCqo109_pair_sampler.calcqo109_pair_sampler(
+            self.jsa, self.signal, self.idler, batch_size=100000, num_samples=400000, seed=3)
+        counts = np.zeros(self.jsa.shape)
+        for s, i in gen:
+            rows = np.searchsorted(self.signal, s)
+            cols = np.searchsorted(self.idler, i)
+            np.add.at(counts, (rows, cols), 1)
+        self.assertEqual(counts[2:5].sum(), 0)
+        p = np.abs(self.jsa)**2/np.sum(np.abs(self.jsa)**2)
+        self.assertTrue(np.all(np.abs(counts/400000.0 - p) < 5*np.sqrt(p/400000.0) + 1e-9))
+
+    def draw(self, batch_size, **kwargs):
+        gen = CCqo109_pair_sampler.calcqo109_pair_sampler(
+            self.jsa, self.signal, self.idler, batch_size=batch_size, num_samples=1000,
+            seed=9, **kwargs)
+        return [s for s, i in gen]
+
+    def test_seed_worker_and_batch_sizes(self):
+        a = np.concatenate(self.draw(1000))
+        self.assertEqual(a.tolist(), np.concatenate(self.draw(1000)).tolist())
+        self.assertNotEqual(a.tolist(), np.concatenate(self.draw(1000, worker=1)).tolist())
+        self.assertEqual([s.size for s in self.draw(400)], [400, 400, 200])
+
+    def test_save_load_round_trip(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'index.npz')
+            sampler = CCqo109_pair_sampler.PairSampler(self.jsa, self.signal, self.idler,
+                                                       jitter=True)
+            sampler.save(fname)
+            loaded = CCqo109_pair_sampler.PairSampler.load(fname)
+        finally:
+            shutil.rmtree(tmp)
+        a = next(sampler.batches(5000, seed=2))
+        b = next(loaded.batches(5000, seed=2))
+        self.assertTrue(np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1]))
+        # Jittered events stay within half a cell of a grid point
+        self.assertTrue(np.all(np.abs(a[0] - np.round(a[0]*2.0)/2.0) <= 0.25))
+
+    def test_invalid_inputs(self):
+        self.assertRaises(ValueError, CCqo109_pair_sampler.PairSampler,
+                          np.zeros((9, 13)), self.signal, self.idler)
+        self.assertRaises(ValueError, CCqo109_pair_sampler.PairSampler,
+                          self.jsa[:, :12], self.signal, self.idler)
+        self.assertRaises(ValueError, CCqo109_pair_sampler.calcqo109_pair_sampler,
+                          self.jsa, self.signal, self.idler, domain='space')
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo109)
+unittest.TextTestRunner(verbosity=2).run(suite)
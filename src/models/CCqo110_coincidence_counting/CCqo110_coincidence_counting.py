@@ -0,0 +1,587 @@
+"""Coincidence counting and delay histograms from time-tagger streams
+
+Measured photon-pair data arrive as one sorted stream of int64 time tags
+per detector channel, often 10^8 or more tags per channel.  Tag files
+are memory-mapped, and a reference channel is walked in chunks.  For each
+chunk, every other channel is searched (numpy searchsorted) only within
+the slice of its stream that can fall in the coincidence window, so each
+file is read once, front to back, and memory stays bounded by the chunk
+size.  Every (reference, other) pair inside the window adds one count to
+a delay histogram.  The result also gives the accidental level expected
+from uncorrelated singles, so that histogram/accidentals is a normalized
+coincidence curve that can be compared directly with model curves:
+twice the HOM coincidence probability of CCqo107_hong_ou_mandel, or the
+Franson coincidence of CCqo108_franson_interference, against delay.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo110_coincidence_counting.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo110_coincidence_counting
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo110_coincidence_counting.py
+
+Calculations
+------------
+Histogram of ch2 relative to ch1 within +/-2000 tags in 10-tag bins, with
+1 ps tag resolution (raw little-endian int64 files or .npy files)::
+  python CCqo110_coincidence_counting.py ch1.bin ch2.bin --window 2000 --bin-width 10 --tag-resolution 1e-12
+Three channels with a 350-tag cable delay on the last one::
+  python CCqo110_coincidence_counting.py ch1.npy ch2.npy ch3.npy --window 2000 --offsets 0 350
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Chunked sorted-merge coincidence histograms over memory-mapped tags
+1.0b2 [2026-10-18]
+    * Only full delay bins: a partial last bin, which the accidentals
+      normalization treated as full, is no longer returned
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'channels':{
+        'desc':'sorted time tags of each detector channel',
+        'valrange':'[0, 2**63)',
+        'default': 'None',
+        'datatype':'int64 (list of arrays, memmaps, or tag files)',
+        'units':'tag',
+        'flow':'input'
+        },
+    'window':{
+        'desc':'half width of the coincidence window',
+        'valrange':'[0, inf)',
+        'default': '1000',
+        'datatype':'integer',
+        'units':'tag',
+        'flow':'input'
+        },
+    'bin_width':{
+        'desc':'width of a delay histogram bin',
+        'valrange':'[1, inf)',
+        'default': '1',
+        'datatype':'integer',
+        'units':'tag',
+        'flow':'input'
+        },
+    'offsets':{
+        'desc':'delay subtracted from each non-reference channel',
+        'valrange':'(-inf, inf)',
+        'default': '0',
+        'datatype':'integer (C-1 element array)',
+        'units':'tag',
+        'flow':'input'
+        },
+    'tag_resolution':{
+        'desc':'duration of one tag unit',
+        'valrange':'(0, inf)',
+        'default': '1.0e-12',
+        'datatype':'float',
+        'units':'s',
+        'flow':'input'
+        },
+    'histograms':{
+        'desc':'coincidence counts per delay bin and channel',
+        'valrange':'[0, inf)',
+        'default': '0',
+        'datatype':'int64 (C-1 x B array)',
+        'units':'1',
+        'flow':'output'
+        },
+    'accidentals':{
+        'desc':'expected counts per bin from uncorrelated singles',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float (C-1 element array)',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * window >= 0
+      * bin_width >= 1
+      * bin_width <= 2*window + 1 (at least one full bin)
+      * tag_resolution > 0
+      * one offset per non-reference channel
+    Warning checks:
+      * channel tags not sorted (checked on the first chunk)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(window=10, bin_width=2, tag_resolution=1e-12)
+    >>> validateParameters(bin_width=0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received bin_width = 0
+    Expected bin_width >= 1
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        if k == 'channels': v = '{} channels'.format(len(v))
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    for name, low, op in [('window', 0, '>='), ('bin_width', 1, '>=')]:
+        val = kwargs.get(name)
+        if val is not None and val < low:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} {} {}'.format(name, op, low) + os.linesep
+            err = True
+    window = kwargs.get('window')
+    width = kwargs.get('bin_width')
+    if window is not None and width is not None and width > 2*window + 1:
+        eMsg += 'Received bin_width = {} with window = {}'.format(width, window) + os.linesep
+        eMsg += 'Expected bin_width <= 2*window + 1' + os.linesep
+        err = True
+    res = kwargs.get('tag_resolution')
+    if res is not None and not res > 0:
+        eMsg += 'Received tag_resolution = {}'.format(res) + os.linesep
+        eMsg += 'Expected tag_resolution > 0' + os.linesep
+        err = True
+    channels = kwargs.get('channels')
+    offsets = kwargs.get('offsets')
+    if channels is not None and offsets is not None:
+        if np.size(offsets) not in (1, len(channels) - 1):
+            eMsg += 'Received {} offsets'.format(np.size(offsets)) + os.linesep
+            eMsg += 'Expected {} offsets'.format(len(channels) - 1) + os.linesep
+            err = True
+    if channels is not None:
+        for n, tags in enumerate(channels):
+            head = np.asarray(tags[:1000000])
+            if np.any(np.diff(head) < 0):
+                wMsg += 'Channel {} tags are not sorted'.format(n) + os.linesep
+                wrn = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def load_tags(tags):
+    """Memory-map a tag file, or pass an array through.
+
+    Files ending in .npy are opened with numpy.load(mmap_mode='r');
+    any other file is read as raw little-endian int64.
+    """
+    if hasattr(tags, 'shape'):
+        return tags
+    if str(tags).endswith('.npy'):
+        return np.load(tags, mmap_mode='r')
+    return np.memmap(tags, dtype='<i8', mode='r')
+
+def window_pairs(reference, other, window, offset=0):
+    """All (reference, other) index pairs with |other - offset - reference| <= window.
+
+    Parameters
+    ----------
+    reference : int64 array
+        Sorted reference tags
+    other : int64 array
+        Sorted tags covering at least the window around reference
+
+    Returns
+    -------
+    (ref_idx, other_idx) : integer arrays
+
+    Examples
+    --------
+    >>> r, o = window_pairs(np.array([10, 20]), np.array([8, 11, 19, 40]), 2)
+    >>> r.tolist(), o.tolist()
+    ([0, 0, 1], [0, 1, 2])
+
+    """
+    shifted = reference + offset
+    lo = np.searchsorted(other, shifted - window, side='left')
+    hi = np.searchsorted(other, shifted + window, side='right')
+    counts = hi - lo
+    total = int(counts.sum())
+    refIdx = np.repeat(np.arange(reference.size), counts)
+    # Position within each run of pairs, added to the run start
+    runStart = np.cumsum(counts) - counts
+    otherIdx = np.repeat(lo - runStart, counts) + np.arange(total)
+    return refIdx, otherIdx
+
+def calcqo110_coincidence_counting(channels, window, bin_width=1, offsets=0, reference=0,
+                                   tag_resolution=1.0e-12, chunk_size=2**22):
+
+    """Delay histograms of every channel against a reference in one pass.
+
+    Parameters
+    ----------
+    channels : list
+        Sorted int64 tag streams: arrays, memmaps, or file names (see
+        load_tags)
+    window : integer
+        Half width of the coincidence window [tag]
+    bin_width : integer
+        Histogram bin width [tag]; the 2*window+1 delays fill
+        (2*window+1)//bin_width full bins, and a remainder at the
+        positive end of the window is not counted (Default=1)
+    offsets : integer or C-1 element array
+        Delay subtracted from each non-reference channel [tag]
+        (Default=0)
+    reference : integer
+        Index of the reference channel (Default=0)
+    tag_resolution : float
+        Duration of one tag [s] (Default=1.0e-12)
+    chunk_size : integer
+        Reference tags per chunk (Default=2**22)
+
+    Returns
+    -------
+    (delays, histograms, accidentals, singles)
+
+    delays : float array (B)
+        Left edge of each delay bin [s]
+    histograms : int64 array (C-1 x B)
+        Coincidence counts per bin for each non-reference channel, in
+        channel order
+    accidentals : float array (C-1)
+        Expected counts per bin from uncorrelated singles,
+        N_ref N_other bin_width / T with T the common span of the streams
+    singles : int64 array (C)
+        Tags per channel
+
+    See Also
+    --------
+    window_pairs, load_tags
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    >>> a = np.array([100, 200, 300, 400])
+    >>> b = np.array([103, 198, 305, 396, 900])
+    >>> d, h, acc, n = calcqo110_coincidence_counting([a, b], window=5, bin_width=2,
+    ...                                               tag_resolution=1.0, chunk_size=3)
+    >>> d.tolist()
+    [-5.0, -3.0, -1.0, 1.0, 3.0]
+    >>> h.tolist(), n.tolist()
+    ([[1, 1, 0, 0, 1]], [4, 5])
+
+    """
+
+    channels = [load_tags(c) for c in channels]
+    window = int(window)
+    bin_width = int(bin_width)
+    others = [c for n, c in enumerate(channels) if n != reference]
+    offsets = np.broadcast_to(np.asarray(offsets, dtype=np.int64), (len(others),))
+    ref = channels[reference]
+    # Only full bins, so that every bin spans bin_width delays as accidentals assume
+    nbins = (2*window + 1) // bin_width
+    hist = np.zeros((len(others), nbins), dtype=np.int64)
+
+    # Start of the still-relevant part of each other stream
+    cursor = [0]*len(others)
+    for r0 in range(0, ref.size, chunk_size):
+        chunk = np.asarray(ref[r0:r0 + chunk_size], dtype=np.int64)
+        for n, other in enumerate(others):
+            off = int(offsets[n])
+            lo = cursor[n] + int(np.searchsorted(
+                other[cursor[n]:], chunk[0] + off - window, side='left'))
+            hi = lo + int(np.searchsorted(
+                other[lo:], chunk[-1] + off + window, side='right'))
+            cursor[n] = lo
+            sub = np.asarray(other[lo:hi], dtype=np.int64)
+            refIdx, otherIdx = window_pairs(chunk, sub, window, off)
+            delay = sub[otherIdx] - chunk[refIdx] - off
+            hist[n] += np.bincount((delay + window) // bin_width, minlength=nbins)[:nbins]
+
+    singles = np.array([c.size for c in channels], dtype=np.int64)
+    starts = [int(c[0]) for c in channels if c.size]
+    stops = [int(c[-1]) for c in channels if c.size]
+    span = float(min(stops) - max(starts)) if starts else 0.0
+    accidentals = np.zeros(len(others))
+    if span > 0:
+        accidentals = np.array([float(ref.size)*o.size*bin_width/span for o in others])
+    delays = (np.arange(nbins)*bin_width - window)*float(tag_resolution)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'coincidences: singles {}, in window {}'.format(
+            singles.tolist(), hist.sum(axis=1).tolist()) + os.linesep
+        lgr.debug(msg)
+
+    return delays, hist, accidentals, singles
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo110_coincidence_counting as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Coincidence delay histograms from time-tag files',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        'channels',
+        type=str, nargs='+',
+        help="Tag files (.npy or raw little-endian int64), reference first",
+        metavar='tagFile')
+    argp.add_argument(
+        '--window',
+        type=int, required=True,
+        dest='window', action='store',
+        help="Half width of the coincidence window [tag]",
+        metavar='W')
+    argp.add_argument(
+        '--bin-width',
+        type=int, default=1,
+        dest='bin_width', action='store',
+        help="Histogram bin width [tag]",
+        metavar='B')
+    argp.add_argument(
+        '--offsets',
+        type=int, nargs='+', default=[0],
+        dest='offsets', action='store',
+        help="Delay subtracted from each non-reference channel [tag]",
+        metavar='off')
+    argp.add_argument(
+        '--tag-resolution',
+        type=float, default=1.0e-12,
+        dest='tag_resolution', action='store',
+        help="Duration of one tag [s]",
+        metavar='sec')
+    argp.add_argument(
+        '--chunk-size',
+        type=int, default=2**22,
+        dest='chunk_size', action='store',
+        help="Reference tags per chunk",
+        metavar='n')
+    argp.add_argument(
+        '--output',
+        type=str, default=None,
+        dest='output', action='store',
+        help="Text file for delay and histogram columns",
+        metavar='outFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo110_coincidence_counting.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        channels = [emr.load_tags(f) for f in args.channels]
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    channels=channels, window=args.window, bin_width=args.bin_width,
+                    offsets=args.offsets, tag_resolution=args.tag_resolution)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo110_coincidence_counting.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo110_coincidence_counting.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo110_coincidence_counting.'
+                lgr.error(msg)
+                raise
+
+        delays, hist, accidentals, singles = emr.calcqo110_coincidence_counting(
+            channels, args.window,
+            bin_width = args.bin_width,
+            offsets = args.offsets,
+            tag_resolution = args.tag_resolution,
+            chunk_size = args.chunk_size)
+        if args.output is not None:
+            np.savetxt(args.output, np.column_stack((delays, hist.T)), delimiter=',',
+                       header='delay [s], coincidences per channel [1]')
+        msg = ''
+        msg += ' CCqo110_coincidence_counting outputs' + os.linesep
+        msg += '  singles [1] = {}'.format(singles) + os.linesep
+        msg += '  coincidences in window [1] = {}'.format(hist.sum(axis=1)) + os.linesep
+        msg += '  accidentals per bin [1] = {}'.format(accidentals)
+        if lgr.getEffectiveLevel() > logging.INFO: print(hist.sum(axis=1))
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo110_coincidence_counting
+
+class TestCCqo110(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.ref = np.sort(rng.randint(0, 10**6, 3000)).astype(np.int64)
+        # Correlated partner 40 tags late with jitter, plus background
+        partner = self.ref[::2] + 40 + rng.randint(-3, 4, self.ref[::2].size)
+        self.other = np.sort(np.concatenate([partner, rng.randint(0, 10**6, 2000)]))
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def direct(self, ref, other, window, bin_width, offset):
+        delay = (other[None, :] - ref[:, None] - offset).ravel()
+        delay = delay[np.abs(delay) <= window]
+        nbins = (2*window + 1)//bin_width
+        return np.bincount((delay + window) // bin_width, minlength=nbins)[:nbins]
+
+    def test_chunk_size_independent(self):
+        expected = self.direct(self.ref, self.other, 60, 4, 0)
+        for chunk_size in (1, 7, 1000, 2**22):
+            d, h, acc, n = CCqo110_coincidence_counting.calcqo110_coincidence_counting(
+                [self.ref, self.other], 60, bin_width=4, chunk_size=chunk_size)
+            self.assertEqual(h[0].tolist(), expected.tolist())
+        self.assertEqual(n.tolist(), [3000, 3500])
+        self.assertEqual(np.argmax(h[0]), (60 + 40)//4)
+
+    def test_offsets_and_reference(self):
+        d, h, acc, n = CCqo110_coincidence_counting.calcqo110_coincidence_counting(
+            [self.other, self.ref, self.ref], 10, offsets=[-40, 0], reference=0, chunk_size=100)
+        self.assertEqual(h[0].tolist(), self.direct(self.other, self.ref, 10, 1, -40).tolist())
+        self.assertEqual(h[1].tolist(), self.direct(self.other, self.ref, 10, 1, 0).tolist())
+        span = float(min(self.ref[-1], self.other[-1]) - max(self.ref[0], self.other[0]))
+        self.assertTrue(np.allclose(acc, 3500.0*3000/span))
+
+    def test_tag_files(self):
+        npy = os.path.join(self.tmp, 'ref.npy')
+        raw = os.path.join(self.tmp, 'other.bin')
+        np.save(npy, self.ref)
+        self.other.astype('<i8').tofile(raw)
+        d, h, acc, n = CCqo110_coincidence_counting.calcqo110_coincidence_counting(
+            [npy, raw], 60, bin_width=4, tag_resolution=1.0e-9, chunk_size=500)
+        self.assertEqual(h[0].tolist(), self.direct(self.ref, self.other, 60, 4, 0).tolist())
+        self.assertTrue(np.allclose(d[[0, -1]], [-60.0e-9, 56.0e-9]))
+
+    def test_full_bins_only(self):
+        # Uncorrelated streams: every bin expects the same accidental count
+        rng = np.random.RandomState(11)
+        a = np.sort(rng.randint(0, 10**7, 20000)).astype(np.int64)
+        b = np.sort(rng.randint(0, 10**7, 20000)).astype(np.int64)
+        d, h, acc, n = CCqo110_coincidence_counting.calcqo110_coincidence_counting(
+            [a, b], 2000, bin_width=10, chunk_size=3000)
+        self.assertEqual(h.shape, (1, 400))
+        self.assertTrue(np.isclose(d[-1], 1990*1.0e-12))
+        self.assertTrue(abs(h[0].mean()/acc[0] - 1.0) < 0.03)
+        self.assertTrue(h[0, -1] > 0.5*acc[0])
+        self.assertRaises(ValueError, CCqo110_coincidence_counting.validateParameters,
+                          window=2, bin_width=6)
+
+    def test_empty_channel(self):
+        d, h, acc, n = CCqo110_coincidence_counting.calcqo110_coincidence_counting(
+            [self.ref, np.array([], dtype=np.int64)], 5)
+        self.assertEqual((h.sum(), acc.tolist(), n.tolist()), (0, [0.0], [3000, 0]))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo110)
+unittest.TextTestRunner(verbosity=2).run(suite)
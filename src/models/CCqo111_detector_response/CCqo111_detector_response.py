@@ -0,0 +1,623 @@
+"""Detector timing jitter and histogram bin response of coincidence curves
+
+Model curves against delay (CCqo107_hong_ou_mandel, CCqo108_franson_
+interference) have to be blurred by the detectors' timing jitter and by
+the width of the time-tagger histogram bins (CCqo110_coincidence_
+counting) before they can be compared with measured histograms.  The
+response is a convolution with a unit-area kernel built from any of
+  * a Gaussian jitter of standard deviation sigma,
+  * a one-sided exponential tail of decay time tau (with the Gaussian,
+    the exponentially modified Gaussian of typical SPAD/SNSPD jitter),
+  * a measured instrument response sampled on the delay grid,
+  * a box of the histogram bin width.
+Direct convolution costs O(N M) for N curve samples and M kernel
+samples.  Here the curves are padded at the edges, transformed with a
+real FFT, multiplied by the kernel spectrum, and transformed back, for
+O((N + M) log(N + M)).  A kernel spectrum depends only on the kernel
+parameters, the grid step and the FFT length, so spectra are cached for
+each configuration.  Many curves (any leading array dimensions) are
+handled as one batch.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo111_detector_response.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo111_detector_response
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo111_detector_response.py
+
+Execute unit tests
+  python test_CCqo111_detector_response.py
+
+Calculations
+------------
+Blur a (delay, curve...) text file from CCqo107 with 25 ps rms jitter,
+a 40 ps tail and 10 ps histogram bins::
+  python CCqo111_detector_response.py hom.txt --sigma 25e-12 --tau 40e-12 --bin-width 10e-12 --output hom_measured.txt
+Use a measured instrument response sampled on the same delay step::
+  python CCqo111_detector_response.py hom.txt --measured irf.txt
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, hashlib, numpy
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * FFT convolution with cached kernel spectra and batched curves
+1.0b2 [2026-10-18]
+    * Kernel spectrum cache is a least recently used cache of at most
+      _MAX_KERNEL_SPECTRA entries
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'curves':{
+        'desc':'model curves sampled on a uniform delay grid',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (... x N array)',
+        'units':'[curve]',
+        'flow':'input'
+        },
+    'dt':{
+        'desc':'step of the delay grid',
+        'valrange':'(0, inf)',
+        'default': '1.0e-12',
+        'datatype':'float',
+        'units':'s',
+        'flow':'input'
+        },
+    'sigma':{
+        'desc':'rms Gaussian timing jitter',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'s',
+        'flow':'input'
+        },
+    'tau':{
+        'desc':'decay time of the exponential jitter tail',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'s',
+        'flow':'input'
+        },
+    'measured':{
+        'desc':'measured instrument response sampled with step dt',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (M-element array)',
+        'units':'1',
+        'flow':'input'
+        },
+    'bin_width':{
+        'desc':'width of the histogram bins',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'s',
+        'flow':'input'
+        },
+    'response':{
+        'desc':'curves convolved with the detector response',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (... x N array)',
+        'units':'[curve]',
+        'flow':'output'
+        }
+}
+
+# Truncation of the analytic kernels in units of sigma and tau
+_TRUNCATION = {'gaussian': 8.0, 'exponential': 20.0}
+
+# Kernel spectra keyed by kernel configuration, grid step and FFT length,
+# least recently used first
+_kernelSpectra = OrderedDict()
+_MAX_KERNEL_SPECTRA = 64
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * dt > 0
+      * sigma, tau, bin_width >= 0
+      * measured response has a positive sum
+    Warning checks:
+      * sigma or tau below half the grid step (kernel reduces to a delta)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(dt=1.0, sigma=2.0, tau=0.0, bin_width=1.0)
+    >>> validateParameters(dt=1.0, sigma=-2.0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received sigma = -2.0
+    Expected sigma >= 0
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    dt = kwargs.get('dt')
+    if dt is not None and not dt > 0:
+        eMsg += 'Received dt = {}'.format(dt) + os.linesep
+        eMsg += 'Expected dt > 0' + os.linesep
+        err = True
+    for name in ['sigma', 'tau', 'bin_width']:
+        val = kwargs.get(name)
+        if val is None: continue
+        if val < 0:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= 0'.format(name) + os.linesep
+            err = True
+        elif name != 'bin_width' and dt is not None and 0 < val < 0.5*dt:
+            wMsg += 'Received {} = {} below half the grid step {}'.format(name, val, dt) + os.linesep
+            wrn = True
+    measured = kwargs.get('measured')
+    if measured is not None and not np.sum(measured) > 0:
+        eMsg += 'Expected a measured response with positive sum' + os.linesep
+        err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def kernel_components(dt, sigma=0.0, tau=0.0, measured=None, measured_origin=None,
+                      bin_width=0.0):
+    """Unit-sum kernel components sampled with step dt.
+
+    Returns
+    -------
+    list of (kernel, origin)
+        origin is the index of zero delay in kernel
+
+    Examples
+    --------
+    >>> [(k.round(3).tolist(), c) for k, c in kernel_components(1.0, bin_width=2.0)]
+    [([0.25, 0.5, 0.25], 1)]
+    >>> kernel_components(1.0)
+    []
+
+    """
+    parts = []
+    if sigma > 0:
+        half = int(np.ceil(_TRUNCATION['gaussian']*sigma/dt))
+        t = np.arange(-half, half + 1)*dt
+        parts.append((np.exp(-0.5*(t/sigma)**2), half))
+    if tau > 0:
+        length = int(np.ceil(_TRUNCATION['exponential']*tau/dt)) + 1
+        parts.append((np.exp(-np.arange(length)*dt/tau), 0))
+    if measured is not None:
+        measured = np.asarray(measured, dtype=float)
+        origin = int(np.argmax(measured)) if measured_origin is None else int(measured_origin)
+        parts.append((measured, origin))
+    if bin_width > 0:
+        # Overlap of each sample cell with the centred bin, in samples
+        half = 0.5*bin_width/dt
+        K = int(np.ceil(half - 0.5))
+        k = np.arange(-K, K + 1)
+        w = np.minimum(k + 0.5, half) - np.maximum(k - 0.5, -half)
+        parts.append((np.clip(w, 0.0, None), K))
+    return [(k/k.sum(), c) for k, c in parts]
+
+def next_fast_len(n):
+    """Smallest 2^a 3^b 5^c >= n, a fast length for numpy's FFT.
+
+    Examples
+    --------
+    >>> next_fast_len(97), next_fast_len(1000)
+    (100, 1000)
+
+    """
+    best = 2**int(np.ceil(np.log2(max(n, 1))))
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            p = p35
+            while p < n: p *= 2
+            best = min(best, p)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+def _cacheKey(dt, sigma, tau, measured, measured_origin, bin_width, nfft):
+    if measured is not None:
+        measured = hashlib.sha1(np.ascontiguousarray(measured, dtype=float).tobytes()).hexdigest()
+    return (float(dt), float(sigma), float(tau), measured, measured_origin,
+            float(bin_width), int(nfft))
+
+def kernel_spectrum(components, nfft, key=None):
+    """Real FFT of the combined kernel, cached under key when given.
+
+    The cache keeps the _MAX_KERNEL_SPECTRA most recently used spectra.
+
+    Returns
+    -------
+    (spectrum, length, origin)
+        length and origin of the combined kernel in samples
+    """
+    if key is not None and key in _kernelSpectra:
+        entry = _kernelSpectra.pop(key)
+        _kernelSpectra[key] = entry
+        return entry
+    spectrum = np.ones(nfft//2 + 1, dtype=complex)
+    for k, c in components:
+        spectrum *= np.fft.rfft(k, nfft)
+    length = sum(k.size for k, c in components) - len(components) + 1
+    origin = sum(c for k, c in components)
+    entry = (spectrum, length, origin)
+    if key is not None:
+        _kernelSpectra[key] = entry
+        while len(_kernelSpectra) > _MAX_KERNEL_SPECTRA:
+            _kernelSpectra.popitem(last=False)
+    return entry
+
+def clear_kernel_cache():
+    """Discard all cached kernel spectra."""
+    _kernelSpectra.clear()
+
+def calcqo111_detector_response(curves, dt, sigma=0.0, tau=0.0, measured=None,
+                                measured_origin=None, bin_width=0.0, edge='edge',
+                                memory_budget=256*2**20):
+
+    """Convolve a batch of delay curves with the detector response.
+
+    Parameters
+    ----------
+    curves : float array (... x N)
+        Curves on a uniform delay grid along the last axis
+    dt : float
+        Delay grid step [s]
+    sigma : float
+        rms Gaussian jitter [s] (Default=0.0, none)
+    tau : float
+        Exponential tail decay time [s] (Default=0.0, none)
+    measured : float array or None
+        Measured instrument response with step dt (Default=None)
+    measured_origin : integer or None
+        Index of zero delay in measured (Default=None, its peak)
+    bin_width : float
+        Histogram bin width [s] (Default=0.0, none)
+    edge : string
+        How curves are extended beyond the grid: 'edge' repeats the end
+        values, 'reflect' mirrors, 'constant' pads with zeros
+        (Default='edge')
+    memory_budget : integer
+        Bytes of FFT work arrays per block of curves
+
+    Returns
+    -------
+    response : float array (... x N)
+
+    See Also
+    --------
+    kernel_components, kernel_spectrum
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    A step is smoothed symmetrically and flat regions keep their level
+    >>> x = np.repeat([0.0, 1.0], 50)
+    >>> y = calcqo111_detector_response(x, 1.0, sigma=3.0)
+    >>> abs(y[0]) < 1e-12, round(y[49] + y[50], 12), round(y[-1], 12)
+    (True, 1.0, 1.0)
+
+    Batches of curves give the same result as one at a time
+    >>> X = np.vstack([x, 1 - x, 0.5*x])
+    >>> Y = calcqo111_detector_response(X, 1.0, sigma=3.0, tau=2.0, bin_width=4.0)
+    >>> np.allclose(Y[1], calcqo111_detector_response(1 - x, 1.0, sigma=3.0, tau=2.0, bin_width=4.0))
+    True
+
+    """
+
+    curves = np.asarray(curves, dtype=float)
+    components = kernel_components(dt, sigma, tau, measured, measured_origin, bin_width)
+    if not components:
+        return curves.copy()
+
+    n = curves.shape[-1]
+    length = sum(k.size for k, c in components) - len(components) + 1
+    nfft = next_fast_len(n + 2*length - 2)
+    key = _cacheKey(dt, sigma, tau, measured, measured_origin, bin_width, nfft)
+    spectrum, length, origin = kernel_spectrum(components, nfft, key)
+
+    flat = curves.reshape(-1, n)
+    out = np.empty_like(flat)
+    padding = ((0, 0), (length - 1 - origin, origin))
+    rows = max(1, int(memory_budget // (nfft*8*4)))
+    for r0 in range(0, flat.shape[0], rows):
+        block = np.pad(flat[r0:r0 + rows], padding, mode=edge)
+        full = np.fft.irfft(np.fft.rfft(block, nfft, axis=1)*spectrum, nfft, axis=1)
+        out[r0:r0 + rows] = full[:, length - 1:length - 1 + n]
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'detector response: {} curves of {} samples, kernel {} samples, nfft {}'.format(
+            flat.shape[0], n, length, nfft) + os.linesep
+        lgr.debug(msg)
+
+    return out.reshape(curves.shape)
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo111_detector_response as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Convolve delay curves with detector jitter and bin response',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        'curve_file',
+        type=str,
+        help="Comma-separated text: uniform delay column then one column per curve",
+        metavar='inFile')
+    argp.add_argument(
+        '--sigma',
+        type=float, default=0.0,
+        dest='sigma', action='store',
+        help="rms Gaussian jitter [s]",
+        metavar='sec')
+    argp.add_argument(
+        '--tau',
+        type=float, default=0.0,
+        dest='tau', action='store',
+        help="Exponential tail decay time [s]",
+        metavar='sec')
+    argp.add_argument(
+        '--measured',
+        type=str, default=None,
+        dest='measured', action='store',
+        help="Text file with a measured response sampled on the delay step",
+        metavar='irfFile')
+    argp.add_argument(
+        '--bin-width',
+        type=float, default=0.0,
+        dest='bin_width', action='store',
+        help="Histogram bin width [s]",
+        metavar='sec')
+    argp.add_argument(
+        '--edge',
+        choices=['edge', 'reflect', 'constant'], default='edge',
+        dest='edge', action='store',
+        help="Extension of curves beyond the delay grid")
+    argp.add_argument(
+        '--output',
+        type=str, default=None,
+        dest='output', action='store',
+        help="Text file for the convolved curves",
+        metavar='outFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo111_detector_response.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        data = np.loadtxt(args.curve_file, delimiter=',', ndmin=2)
+        delays = data[:, 0]
+        curves = data[:, 1:].T
+        dt = (delays[-1] - delays[0]) / (delays.size - 1)
+        measured = np.loadtxt(args.measured) if args.measured is not None else None
+
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    dt=dt, sigma=args.sigma, tau=args.tau,
+                    measured=measured, bin_width=args.bin_width)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo111_detector_response.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo111_detector_response.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo111_detector_response.'
+                lgr.error(msg)
+                raise
+
+        response = emr.calcqo111_detector_response(
+            curves, dt,
+            sigma = args.sigma,
+            tau = args.tau,
+            measured = measured,
+            bin_width = args.bin_width,
+            edge = args.edge)
+        if args.output is not None:
+            np.savetxt(args.output, np.column_stack((delays, response.T)), delimiter=',')
+        msg = ''
+        msg += ' CCqo111_detector_response outputs' + os.linesep
+        msg += '  response = {}'.format(response)
+        if lgr.getEffectiveLevel() > logging.INFO: print(response)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
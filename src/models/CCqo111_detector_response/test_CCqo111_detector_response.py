@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import CCqo111_detector_response
+
+class TestCCqo111(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(111)
+        self.curves = rng.rand(4, 3, 500)
+        self.measured = np.abs(rng.randn(37))
+        self.options = dict(sigma=2.5, tau=4.0, measured=self.measured,
+                            measured_origin=5, bin_width=3.0)
+
+    def direct(self, curve, dt, options, mode='edge'):
+        components = CCqo111_detector_response.kernel_components(dt, **options)
+        kernel = np.array([1.0])
+        origin = 0
+        for k, c in components:
+            kernel = np.convolve(kernel, k)
+            origin += c
+        padded = np.pad(curve, (kernel.size - 1 - origin, origin), mode=mode)
+        return np.convolve(padded, kernel, mode='valid')
+
+    def test_matches_direct_convolution(self):
+        response = CCqo111_detector_response.calcqo111_detector_response(
+            self.curves, 1.0, memory_budget=1, **self.options)
+        self.assertEqual(response.shape, self.curves.shape)
+        for idx in np.ndindex(self.curves.shape[:-1]):
+            expected = self.direct(self.curves[idx], 1.0, self.options)
+            self.assertTrue(np.allclose(response[idx], expected))
+
+    def test_reflect_edges(self):
+        options = dict(sigma=6.0)
+        response = CCqo111_detector_response.calcqo111_detector_response(
+            self.curves[0], 1.0, edge='reflect', **options)
+        self.assertTrue(np.allclose(response[1], self.direct(self.curves[0, 1], 1.0, options, 'reflect')))
+
+    def test_kernel_spectrum_cached(self):
+        CCqo111_detector_response.clear_kernel_cache()
+        CCqo111_detector_response.calcqo111_detector_response(self.curves, 1.0, **self.options)
+        CCqo111_detector_response.calcqo111_detector_response(2*self.curves, 1.0, **self.options)
+        self.assertEqual(len(CCqo111_detector_response._kernelSpectra), 1)
+        CCqo111_detector_response.calcqo111_detector_response(self.curves, 1.0, sigma=1.0)
+        self.assertEqual(len(CCqo111_detector_response._kernelSpectra), 2)
+
+    def test_kernel_cache_bounded(self):
+        CCqo111_detector_response.clear_kernel_cache()
+        cap = CCqo111_detector_response._MAX_KERNEL_SPECTRA
+        for i in range(cap + 10):
+            CCqo111_detector_response.calcqo111_detector_response(self.curves[0], 1.0,
+                                                                  sigma=1.0 + 0.01*i)
+            # Keep the first kernel in use so that it is never the least recent
+            CCqo111_detector_response.calcqo111_detector_response(self.curves[0], 1.0, sigma=1.0)
+        self.assertEqual(len(CCqo111_detector_response._kernelSpectra), cap)
+        sigmas = [key[1] for key in CCqo111_detector_response._kernelSpectra]
+        self.assertEqual(sigmas[-1], 1.0)
+        self.assertTrue(1.0 + 0.01*(cap + 9) in sigmas and 1.01 not in sigmas)
+
+    def test_no_response_is_identity(self):
+        response = CCqo111_detector_response.calcqo111_detector_response(self.curves, 1.0)
+        self.assertTrue(np.array_equal(response, self.curves))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo111)
+unittest.TextTestRunner(verbosity=2).run(suite)
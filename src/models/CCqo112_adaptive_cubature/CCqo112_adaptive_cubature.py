@@ -0,0 +1,766 @@
+"""Adaptive cubature of pair-generation integrals over the biphoton spectrum
+
+The pair rate, binned joint spectral intensity (JSI), marginal spectra
+and heralding efficiency are 2-D integrals of
+  |f(w_s, w_i)|^2 = |pump(w_s + w_i)|^2 |rr(w_s)|^2 |rr(w_i)|^2
+with rr the CCqo103_spectral_pump ring response.  On a dense uniform
+grid most cells lie where the narrow ring resonances make the integrand
+negligible.  Here the domain is instead refined adaptively with the
+degree-7 Genz-Malik rule (17 points per rectangle in 2-D), which has an
+embedded degree-5 rule for the error estimate and a fourth-difference
+criterion for the axis to bisect.  Every refinement step evaluates all
+rectangles being split in a single vectorized integrand call, so the
+Python overhead is per step rather than per cell.  Refinement stops when
+the summed error estimate meets the requested relative (or absolute)
+tolerance, typically after orders of magnitude fewer integrand
+evaluations than a dense grid of the same accuracy.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo112_adaptive_cubature.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo112_adaptive_cubature
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo112_adaptive_cubature.py
+
+Calculations
+------------
+Pair rate of a ring (coupling 0.8, velocity 1, damping 0.5) pumped by a
+Gaussian of width 2 over the square [-50, 50]^2 to 1e-8 relative error::
+  python CCqo112_adaptive_cubature.py --couplings 0.8 --velocities 1 --ring-damping 0.5 --pump-width 2 --range -50 50 --rel-tol 1e-8
+Heralding efficiency with a square idler filter of half width 1::
+  python CCqo112_adaptive_cubature.py --couplings 0.8 --velocities 1 --ring-damping 0.5 --pump-width 2 --range -50 50 --idler-filter 1
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo103_spectral_pump,
+        CCqo105_joint_spectral_amplitude
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Batched Genz-Malik adaptive cubature, binned JSI and heralding
+1.0b2 [2026-10-18]
+    * Heralding efficiency raises ValueError for a zero heralding rate
+      and has a finite error bound when no idler passes its filter
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump', 'CCqo105_joint_spectral_amplitude']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo103_spectral_pump as ccqo103
+import CCqo105_joint_spectral_amplitude as ccqo105
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'signal_range':{
+        'desc':'integration limits for the signal frequency',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (2-element sequence)',
+        'units':'[wavevec]',
+        'flow':'input'
+        },
+    'idler_range':{
+        'desc':'integration limits for the idler frequency',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (2-element sequence)',
+        'units':'[wavevec]',
+        'flow':'input'
+        },
+    'rel_tol':{
+        'desc':'requested relative error of the integral',
+        'valrange':'(0, 1)',
+        'default': '1.0e-6',
+        'datatype':'float',
+        'units':'1',
+        'flow':'input'
+        },
+    'abs_tol':{
+        'desc':'requested absolute error of the integral',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'[integral]',
+        'flow':'input'
+        },
+    'max_evaluations':{
+        'desc':'budget of integrand evaluations',
+        'valrange':'[17, inf)',
+        'default': '10000000',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'rate':{
+        'desc':'pair rate, integral of |f|^2',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'[jsa]^2*[wavevec]^2',
+        'flow':'output'
+        },
+    'heralding':{
+        'desc':'probability that the idler passes its filter given a signal',
+        'valrange':'[0, 1]',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+# Genz-Malik degree-7 rule with embedded degree-5 rule in 2-D,
+# on [-1, 1]^2 with weights normalized to unit volume
+_L2 = np.sqrt(9.0/70.0)
+_L3 = np.sqrt(9.0/10.0)
+_L4 = np.sqrt(9.0/10.0)
+_L5 = np.sqrt(9.0/19.0)
+_GM_POINTS = np.array(
+    [[0.0, 0.0],
+     [_L2, 0.0], [-_L2, 0.0], [0.0, _L2], [0.0, -_L2],
+     [_L3, 0.0], [-_L3, 0.0], [0.0, _L3], [0.0, -_L3],
+     [_L4, _L4], [_L4, -_L4], [-_L4, _L4], [-_L4, -_L4],
+     [_L5, _L5], [_L5, -_L5], [-_L5, _L5], [-_L5, -_L5]])
+_GM_W7 = np.array([-3816.0/19683] + [980.0/6561]*4 + [1020.0/19683]*4
+                  + [200.0/19683]*4 + [6859.0/19683/4]*4)
+_GM_W5 = np.array([-971.0/729] + [245.0/486]*4 + [65.0/1458]*4 + [25.0/729]*4 + [0.0]*4)
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * ranges are increasing pairs
+      * rel_tol > 0 or abs_tol > 0
+      * max_evaluations >= 17
+    Warning checks:
+      * rel_tol below 1e-13 (round-off dominated)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(signal_range=(-1, 1), rel_tol=1e-6, max_evaluations=1000)
+    >>> validateParameters(signal_range=(1, -1))
+    Traceback (most recent call last):
+        ...
+    ValueError: Received signal_range = (1, -1)
+    Expected an increasing pair (low, high)
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    for name in ['signal_range', 'idler_range']:
+        val = kwargs.get(name)
+        if val is None: continue
+        if len(val) != 2 or not val[0] < val[1]:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected an increasing pair (low, high)' + os.linesep
+            err = True
+    rel = kwargs.get('rel_tol')
+    absTol = kwargs.get('abs_tol')
+    if rel is not None and absTol is not None and not (rel > 0 or absTol > 0):
+        eMsg += 'Expected rel_tol > 0 or abs_tol > 0' + os.linesep
+        err = True
+    if rel is not None and 0 < rel < 1e-13:
+        wMsg += 'Received rel_tol = {} below round-off'.format(rel) + os.linesep
+        wrn = True
+    maxEval = kwargs.get('max_evaluations')
+    if maxEval is not None and maxEval < 17:
+        eMsg += 'Received max_evaluations = {}'.format(maxEval) + os.linesep
+        eMsg += 'Expected max_evaluations >= 17' + os.linesep
+        err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def genz_malik(func, centers, halfwidths):
+    """Degree-7 estimates, error estimates and split axes for many rectangles.
+
+    Parameters
+    ----------
+    func : callable
+        func(ws, wi) on 1-D point arrays returning values of shape (P,)
+        or (P, K) for K integrands
+    centers, halfwidths : float arrays (R x 2)
+
+    Returns
+    -------
+    (estimates, errors, axes)
+
+    estimates, errors : float arrays (R x K)
+    axes : integer array (R)
+        Axis with the largest fourth difference
+
+    Examples
+    --------
+    The rule is exact for polynomials of degree 7
+    >>> f = lambda x, y: x**6*y + y**4 + 1.0
+    >>> est, err, ax = genz_malik(f, np.array([[0.5, 0.5]]), np.array([[0.5, 0.5]]))
+    >>> round(est[0, 0], 12), round(1/14.0 + 1/5.0 + 1.0, 12)
+    (1.271428571429, 1.271428571429)
+
+    """
+    R = centers.shape[0]
+    pts = centers[:, None, :] + halfwidths[:, None, :]*_GM_POINTS[None, :, :]
+    vals = np.asarray(func(pts[..., 0].ravel(), pts[..., 1].ravel()), dtype=float)
+    vals = vals.reshape(R, 17, -1)
+    vol = 4.0*halfwidths[:, 0]*halfwidths[:, 1]
+    est7 = vol[:, None]*np.einsum('p,rpk->rk', _GM_W7, vals)
+    est5 = vol[:, None]*np.einsum('p,rpk->rk', _GM_W5, vals)
+    f0 = 2.0*vals[:, 0]
+    r = (_L2/_L3)**2
+    d0 = np.abs(vals[:, 1] + vals[:, 2] - f0 - r*(vals[:, 5] + vals[:, 6] - f0)).sum(axis=1)
+    d1 = np.abs(vals[:, 3] + vals[:, 4] - f0 - r*(vals[:, 7] + vals[:, 8] - f0)).sum(axis=1)
+    return est7, np.abs(est7 - est5), (d1 > d0).astype(int)
+
+def _initialRegions(signal_edges, idler_edges):
+    s = np.asarray(signal_edges, dtype=float)
+    i = np.asarray(idler_edges, dtype=float)
+    cs, ci = np.meshgrid(0.5*(s[1:] + s[:-1]), 0.5*(i[1:] + i[:-1]), indexing='ij')
+    hs, hi = np.meshgrid(0.5*np.diff(s), 0.5*np.diff(i), indexing='ij')
+    cells = np.arange(cs.size)
+    return (np.column_stack((cs.ravel(), ci.ravel())),
+            np.column_stack((hs.ravel(), hi.ravel())), cells)
+
+def calcqo112_adaptive_cubature(func, signal_edges, idler_edges, rel_tol=1.0e-6, abs_tol=0.0,
+                                max_evaluations=10000000, max_batch=65536):
+
+    """Globally adaptive 2-D cubature with batched integrand calls.
+
+    The domain starts as the grid of rectangles given by the edges and
+    each rectangle only ever splits inside its starting cell, so the
+    result is also available per starting cell (e.g. a binned JSI).  Each
+    step bisects, along their fourth-difference axis, all rectangles
+    whose error exceeds an equal share of the tolerance (at most
+    max_batch, and at least the worst one), evaluating them in one call.
+
+    Parameters
+    ----------
+    func : callable
+        func(ws, wi) -> (P,) or (P, K) values, vectorized over points
+    signal_edges, idler_edges : float sequences
+        Cell edges along each axis; (low, high) integrates one rectangle
+    rel_tol, abs_tol : float
+        Stop when every integrand's summed error is within
+        max(abs_tol, rel_tol*|integral|) (Defaults=1.0e-6, 0.0)
+    max_evaluations : integer
+        Budget of integrand evaluations (Default=10000000)
+    max_batch : integer
+        Most rectangles split in one step (Default=65536)
+
+    Returns
+    -------
+    (integral, error, cells, evaluations)
+
+    integral, error : float arrays (K)
+    cells : float array (Ms x Mi x K)
+        Integral over each starting cell
+    evaluations : integer
+
+    See Also
+    --------
+    genz_malik, calcqo112_pair_rate
+
+    Exceptions
+    ----------
+    None; exhausting max_evaluations logs a warning and returns the
+    current estimate.
+
+    Examples
+    --------
+    >>> f = lambda x, y: 1.0/((x - 0.3)**2 + 1e-4) + 0.0*y
+    >>> I, err, cells, n = calcqo112_adaptive_cubature(f, (-1, 1), (0, 1), rel_tol=1e-9)
+    >>> exact = 100.0*(np.arctan(70.0) + np.arctan(130.0))
+    >>> abs(I[0] - exact) < 1e-8*exact, err[0] < 1e-9*I[0], n < 20000
+    (True, True, True)
+
+    """
+
+    centers, halves, cell = _initialRegions(signal_edges, idler_edges)
+    nCells = cell.size
+    shape = (len(signal_edges) - 1, len(idler_edges) - 1)
+    est, err, axes = genz_malik(func, centers, halves)
+    evaluations = 17*centers.shape[0]
+
+    while True:
+        total = est.sum(axis=0)
+        totalErr = err.sum(axis=0)
+        tol = np.maximum(abs_tol, rel_tol*np.abs(total))
+        if np.all(totalErr <= tol):
+            break
+        if evaluations + 34 > max_evaluations:
+            lgr.warning('adaptive cubature stopped at max_evaluations = {} with error {}'.format(
+                max_evaluations, totalErr))
+            break
+        # Error of each rectangle relative to its share of the tolerance
+        share = np.where(tol > 0, tol, np.finfo(float).tiny) / est.shape[0]
+        ratio = np.max(err/share, axis=1)
+        budget = min(max_batch, (max_evaluations - evaluations)//34)
+        split = np.flatnonzero(ratio > 1.0)
+        if split.size > budget or split.size == 0:
+            split = np.argsort(ratio)[::-1][:max(1, min(budget, split.size))]
+
+        c = centers[split]
+        h = halves[split].copy()
+        ax = axes[split]
+        rows = np.arange(split.size)
+        h[rows, ax] *= 0.5
+        lo = c.copy()
+        hi = c.copy()
+        lo[rows, ax] -= h[rows, ax]
+        hi[rows, ax] += h[rows, ax]
+        newC = np.vstack((lo, hi))
+        newH = np.vstack((h, h))
+        newE, newR, newA = genz_malik(func, newC, newH)
+        evaluations += 17*newC.shape[0]
+
+        keep = np.ones(centers.shape[0], dtype=bool)
+        keep[split] = False
+        centers = np.vstack((centers[keep], newC))
+        halves = np.vstack((halves[keep], newH))
+        est = np.vstack((est[keep], newE))
+        err = np.vstack((err[keep], newR))
+        axes = np.concatenate((axes[keep], newA))
+        cell = np.concatenate((cell[keep], cell[split], cell[split]))
+
+    cells = np.zeros((nCells, est.shape[1]))
+    for k in range(est.shape[1]):
+        cells[:, k] = np.bincount(cell, weights=est[:, k], minlength=nCells)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'adaptive cubature: {} rectangles, {} evaluations, error {}'.format(
+            centers.shape[0], evaluations, err.sum(axis=0)) + os.linesep
+        lgr.debug(msg)
+
+    return est.sum(axis=0), err.sum(axis=0), cells.reshape(shape + (-1,)), evaluations
+
+def pair_density(pump, couplings, velocities, ring_damping, couplings_idler=None,
+                 velocities_idler=None, ring_damping_idler=None):
+    """Vectorized |f(w_s, w_i)|^2 from a pump and scalar ring parameters.
+
+    Parameters
+    ----------
+    pump : callable or (sum_grid, values)
+        Two-photon pump amplitude at the sum frequency (see CCqo105)
+    couplings, velocities, ring_damping : float
+        Ring parameters (see CCqo103_spectral_pump); idler values default
+        to the signal values
+
+    Returns
+    -------
+    callable density(ws, wi)
+
+    Examples
+    --------
+    >>> d = pair_density(lambda w: np.ones_like(w), 1.0, 1.0, 1.0)
+    >>> d(np.array([0.0]), np.array([1.0])).round(12).tolist()
+    [0.5]
+
+    """
+    pumpAt = ccqo105._pumpEvaluator(pump)
+    if couplings_idler is None: couplings_idler = couplings
+    if velocities_idler is None: velocities_idler = velocities
+    if ring_damping_idler is None: ring_damping_idler = ring_damping
+
+    def density(ws, wi):
+        rrS = ccqo103.calcqo103_spectral_pump(ws, couplings, velocities, ring_damping, 1.0)[1]
+        rrI = ccqo103.calcqo103_spectral_pump(wi, couplings_idler, velocities_idler,
+                                              ring_damping_idler, 1.0)[1]
+        return np.abs(pumpAt(ws + wi))**2 * np.abs(rrS)**2 * np.abs(rrI)**2
+    return density
+
+def calcqo112_pair_rate(pump, couplings, velocities, ring_damping, signal_range, idler_range=None,
+                        signal_edges=None, idler_edges=None, rel_tol=1.0e-6, abs_tol=0.0,
+                        max_evaluations=10000000, **idler_params):
+
+    """Pair rate, binned JSI and marginal spectra by adaptive cubature.
+
+    Parameters
+    ----------
+    pump, couplings, velocities, ring_damping
+        See pair_density; idler ring parameters may be given as
+        couplings_idler, velocities_idler, ring_damping_idler
+    signal_range, idler_range : (low, high)
+        Integration domain; idler_range defaults to signal_range
+    signal_edges, idler_edges : float arrays or None
+        Bin edges for the binned JSI and marginals; None uses the range
+        as a single bin
+    rel_tol, abs_tol, max_evaluations
+        See calcqo112_adaptive_cubature
+
+    Returns
+    -------
+    (rate, error, jsi, evaluations)
+
+    rate, error : float
+    jsi : float array (Ms x Mi)
+        Integral over each (signal bin, idler bin); its row and column
+        sums are the marginal spectra
+    evaluations : integer
+
+    Examples
+    --------
+    Narrow ring resonances over a wide window: a dense 4001 x 4001 sum is
+    good to about 1e-5, while adaptive cubature reaches 1e-6 with under
+    1% of its integrand evaluations
+    >>> pump = lambda w: np.exp(-w**2/8.0)
+    >>> rate, err, jsi, n = calcqo112_pair_rate(pump, 0.8, 1.0, 0.05, (-50, 50), rel_tol=1e-6)
+    >>> w = np.linspace(-50, 50, 4001)
+    >>> dense = pair_density(pump, 0.8, 1.0, 0.05)(w[:, None], w[None, :]).sum()*(w[1] - w[0])**2
+    >>> abs(rate - dense)/rate < 1e-4, n < 4001**2 // 100
+    (True, True)
+
+    """
+
+    if idler_range is None: idler_range = signal_range
+    if signal_edges is None: signal_edges = signal_range
+    if idler_edges is None: idler_edges = idler_range
+    density = pair_density(pump, couplings, velocities, ring_damping, **idler_params)
+    integral, error, cells, evaluations = calcqo112_adaptive_cubature(
+        density, signal_edges, idler_edges, rel_tol, abs_tol, max_evaluations)
+    return integral[0], error[0], cells[..., 0], evaluations
+
+def calcqo112_heralding_efficiency(pump, couplings, velocities, ring_damping, signal_range,
+                                   idler_range=None, signal_filter=None, idler_filter=None,
+                                   rel_tol=1.0e-6, abs_tol=0.0, max_evaluations=10000000,
+                                   **idler_params):
+
+    """Probability that the idler passes its filter when the signal is detected.
+
+    eta = int |f|^2 T_s T_i / int |f|^2 T_s, with both integrals refined
+    together as one two-component integrand.
+
+    Parameters
+    ----------
+    signal_filter, idler_filter : callable or None
+        Power transmission T(w) of each filter (Default=None, unity)
+    Other parameters as in calcqo112_pair_rate
+
+    Returns
+    -------
+    (heralding, error, evaluations)
+
+    Exceptions
+    ----------
+    ValueError : no pair passes the signal filter (zero heralding rate)
+
+    Examples
+    --------
+    >>> pump = lambda w: np.exp(-w**2/8.0)
+    >>> eta, err, n = calcqo112_heralding_efficiency(pump, 0.8, 1.0, 0.5, (-50, 50),
+    ...                                              idler_filter=lambda w: np.ones_like(w))
+    >>> round(eta, 9)
+    1.0
+
+    """
+
+    if idler_range is None: idler_range = signal_range
+    density = pair_density(pump, couplings, velocities, ring_damping, **idler_params)
+    unity = lambda w: np.ones_like(w)
+    Ts = signal_filter if signal_filter is not None else unity
+    Ti = idler_filter if idler_filter is not None else unity
+
+    def heralded(ws, wi):
+        base = density(ws, wi)*Ts(ws)
+        return np.column_stack((base, base*Ti(wi)))
+
+    integral, error, cells, evaluations = calcqo112_adaptive_cubature(
+        heralded, signal_range, idler_range, rel_tol, abs_tol, max_evaluations)
+    if not integral[0] > 0:
+        raise ValueError('Expected a nonzero heralding (signal) rate, received {}'.format(
+            integral[0]))
+    eta = integral[1]/integral[0]
+    # eta*(e0/I0 + e1/I1), finite when no heralded idler passes (I1 = 0)
+    etaErr = (eta*error[0] + error[1])/integral[0]
+    return eta, etaErr, evaluations
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo112_adaptive_cubature as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Pair rate and heralding efficiency by adaptive cubature',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--couplings',
+        type=float, default=1.0,
+        dest='couplings', action='store',
+        help="Ring coupling constant",
+        metavar='g')
+    argp.add_argument(
+        '--velocities',
+        type=float, default=1.0,
+        dest='velocities', action='store',
+        help="Spectral velocity",
+        metavar='v')
+    argp.add_argument(
+        '--ring-damping',
+        type=float, default=1.0,
+        dest='ring_damping', action='store',
+        help="Ring damping",
+        metavar='G')
+    argp.add_argument(
+        '--pump-width',
+        type=float, default=1.0,
+        dest='pump_width', action='store',
+        help="rms width of the Gaussian two-photon pump intensity",
+        metavar='sigma')
+    argp.add_argument(
+        '--range',
+        type=float, nargs=2, required=True,
+        dest='range', action='store',
+        help="Integration limits for signal and idler",
+        metavar=('low', 'high'))
+    argp.add_argument(
+        '--idler-filter',
+        type=float, default=None,
+        dest='idler_filter', action='store',
+        help="Half width of a square idler filter; reports heralding efficiency",
+        metavar='halfWidth')
+    argp.add_argument(
+        '--rel-tol',
+        type=float, default=1.0e-6,
+        dest='rel_tol', action='store',
+        help="Relative tolerance",
+        metavar='tol')
+    argp.add_argument(
+        '--max-evaluations',
+        type=int, default=10000000,
+        dest='max_evaluations', action='store',
+        help="Budget of integrand evaluations",
+        metavar='n')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo112_adaptive_cubature.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    signal_range=args.range, rel_tol=args.rel_tol, abs_tol=0.0,
+                    max_evaluations=args.max_evaluations)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo112_adaptive_cubature.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo112_adaptive_cubature.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo112_adaptive_cubature.'
+                lgr.error(msg)
+                raise
+
+        width = args.pump_width
+        pump = lambda w: np.exp(-w**2/(4.0*width**2))
+        msg = ''
+        msg += ' CCqo112_adaptive_cubature outputs' + os.linesep
+        if args.idler_filter is None:
+            rate, error, jsi, evaluations = emr.calcqo112_pair_rate(
+                pump, args.couplings, args.velocities, args.ring_damping, args.range,
+                rel_tol = args.rel_tol,
+                max_evaluations = args.max_evaluations)
+            result = rate
+            msg += '  rate = {} +/- {}'.format(rate, error) + os.linesep
+        else:
+            half = args.idler_filter
+            eta, error, evaluations = emr.calcqo112_heralding_efficiency(
+                pump, args.couplings, args.velocities, args.ring_damping, args.range,
+                idler_filter = lambda w: (np.abs(w) <= half).astype(float),
+                rel_tol = args.rel_tol,
+                max_evaluations = args.max_evaluations)
+            result = eta
+            msg += '  heralding efficiency = {} +/- {}'.format(eta, error) + os.linesep
+        msg += '  evaluations = {}'.format(evaluations)
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import CCqo112_adaptive_cubature
+
+class TestCCqo112(unittest.TestCase):
+
+    def setUp(self):
+        self.pump = lambda w: np.exp(-w**2/8.0)
+        self.ring = (0.8, 1.0, 0.5)
+
+    def test_separable_gaussian(self):
+        f = lambda x, y: np.exp(-x**2 - 2.0*y**2)
+        I, err, cells, n = CCqo112_adaptive_cubature.calcqo112_adaptive_cubature(
+            f, np.linspace(-6.0, 6.0, 4), [-6.0, 0.0, 6.0], rel_tol=1e-10)
+        exact = np.pi/np.sqrt(2.0)
+        self.assertTrue(abs(I[0] - exact) < 1e-9*exact)
+        self.assertEqual(cells.shape, (3, 2, 1))
+        self.assertTrue(np.allclose(cells.sum(), I[0]))
+        self.assertTrue(np.allclose(cells[:, 0], cells[:, 1]))
+
+    def test_two_integrands_refined_together(self):
+        f = lambda x, y: np.column_stack((np.ones_like(x), 1.0/((x - 0.3)**2 + 1e-4) + 0.0*y))
+        I, err, cells, n = CCqo112_adaptive_cubature.calcqo112_adaptive_cubature(
+            f, (-1, 1), (0, 1), rel_tol=1e-9)
+        self.assertTrue(np.allclose(I, [2.0, 100.0*(np.arctan(70.0) + np.arctan(130.0))],
+                                    rtol=1e-8))
+        self.assertTrue(np.all(err <= 1e-9*I))
+
+    def test_evaluation_budget(self):
+        f = lambda x, y: 1.0/((x - 0.3)**2 + 1e-8) + 0.0*y
+        I, err, cells, n = CCqo112_adaptive_cubature.calcqo112_adaptive_cubature(
+            f, (-1, 1), (0, 1), rel_tol=1e-12, max_evaluations=2000)
+        self.assertTrue(n <= 2000)
+        self.assertTrue(err[0] > 1e-12*I[0])
+
+    def test_heralding_with_constant_filter(self):
+        eta, err, n = CCqo112_adaptive_cubature.calcqo112_heralding_efficiency(
+            self.pump, *self.ring, signal_range=(-30, 30),
+            idler_filter=lambda w: 0.3*np.ones_like(w))
+        self.assertTrue(abs(eta - 0.3) < 1e-9 and err < 1e-5)
+
+    def test_zero_heralded_idler(self):
+        eta, err, n = CCqo112_adaptive_cubature.calcqo112_heralding_efficiency(
+            self.pump, *self.ring, signal_range=(-30, 30), idler_filter=np.zeros_like)
+        self.assertEqual((eta, err), (0.0, 0.0))
+
+    def test_zero_heralding_integral(self):
+        self.assertRaises(ValueError, CCqo112_adaptive_cubature.calcqo112_heralding_efficiency,
+                          self.pump, *self.ring, signal_range=(-30, 30),
+                          signal_filter=np.zeros_like)
+        self.assertRaises(ValueError, CCqo112_adaptive_cubature.calcqo112_heralding_efficiency,
+                          self.pump, 0.0, 1.0, 0.5, (-30, 30))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo112)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,727 @@
+"""Gradient-based coupler design of ring resonators
+
+Coupler strengths g_c of the ring's external channels set the total
+damping through CCqo102_ring_damping,
+  G = sum_c |g_c|^2/(2 v_c) + G_0,
+with G_0 the fixed (intrinsic) damping, and the pump response through
+CCqo103_spectral_pump, rr = -1j conj(g_p)/(G - 1j*D) at detuning D.
+Two figures of merit compete:
+  E = |rr|^2 = g_p^2/(G^2 + D^2)     intracavity pump enhancement
+  R = E^2 G_d^2 / G^3                pair rate collected in channel d
+where G_d = g_d^2/(2 v_d) is the damping into the collection channel
+(R follows from integrating |rr_s|^2 |rr_i|^2 over the resonance).
+Designs are scalarized as w log E + (1 - w) log R and optimized in log
+coupling, with exact gradients through both formulas:
+  dG/dtheta_c = 2 G_c,   dlogE/dtheta_c = 2 [c = p] - 4 G G_c/(G^2 + D^2)
+  dlogR/dtheta_c = 2 dlogE/dtheta_c + 4 [c = d] - 6 G_c/G
+Box bounds on the couplings are built into a smooth reparameterization.
+A batch of weights times random starts is optimized together by a
+vectorized L-BFGS with backtracking line search, so every design
+advances in the same numpy operations.  The non-dominated designs in
+(E, R) form the Pareto front.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo113_ring_design_optimizer.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo113_ring_design_optimizer
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo113_ring_design_optimizer.py
+
+Calculations
+------------
+Bus and drop couplers (velocities 1 and 1.2) on a ring with intrinsic
+damping 0.1, couplings in [0.01, 5], 21 weights and 16 starts each::
+  python CCqo113_ring_design_optimizer.py --velocities 1 1.2 --fixed-damping 0.1 --bounds 0.01 5 --collect-channel 1 --weights 21 --starts 16 --seed 3
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo102_ring_damping,
+        CCqo103_spectral_pump
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Batched multi-start L-BFGS over scalarized (E, R) and Pareto front
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo102_ring_damping', 'CCqo103_spectral_pump']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo102_ring_damping as ccqo102
+import CCqo103_spectral_pump as ccqo103
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'velocities':{
+        'desc':'photon velocity in each coupled channel',
+        'valrange':'(0, inf)',
+        'default': '1.0',
+        'datatype':'float (C-element array)',
+        'units':'m s^(-1)',
+        'flow':'input'
+        },
+    'coupling_bounds':{
+        'desc':'lower and upper bound of every coupling',
+        'valrange':'(0, inf)',
+        'default': '(0.01, 10.0)',
+        'datatype':'float (2-element sequence or 2 x C array)',
+        'units':'rad^(1/2) m^(1/2) s^(-1)',
+        'flow':'input'
+        },
+    'fixed_damping':{
+        'desc':'damping not set by the couplers (intrinsic loss)',
+        'valrange':'[0, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'detuning':{
+        'desc':'pump detuning from resonance, k*v',
+        'valrange':'(-inf, inf)',
+        'default': '0.0',
+        'datatype':'float',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'couplings':{
+        'desc':'optimized couplings of each design',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float (B x C array)',
+        'units':'rad^(1/2) m^(1/2) s^(-1)',
+        'flow':'output'
+        },
+    'enhancement':{
+        'desc':'intracavity pump enhancement |rr|^2',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (B-element array)',
+        'units':'[ring_response]^2',
+        'flow':'output'
+        },
+    'pair_rate':{
+        'desc':'relative collected pair rate E^2 G_d^2/G^3',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (B-element array)',
+        'units':'relative',
+        'flow':'output'
+        },
+    'pareto':{
+        'desc':'designs not dominated in (enhancement, pair_rate)',
+        'valrange':'{False, True}',
+        'default': 'None',
+        'datatype':'boolean (B-element array)',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * velocities > 0
+      * 0 < lower coupling bound < upper coupling bound
+      * fixed_damping >= 0
+      * channel indices within the number of channels
+    Warning checks:
+      * fixed_damping == 0 with a zero lower coupling bound (unbounded E)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(velocities=[1.0, 2.0], coupling_bounds=(0.1, 1.0), collect_channel=1)
+    >>> validateParameters(velocities=[1.0], collect_channel=1)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received collect_channel = 1
+    Expected collect_channel < 1
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    v = kwargs.get('velocities')
+    if v is not None and not np.all(np.asarray(v) > 0):
+        eMsg += 'Received velocities = {}'.format(v) + os.linesep
+        eMsg += 'Expected velocities > 0' + os.linesep
+        err = True
+    bounds = kwargs.get('coupling_bounds')
+    if bounds is not None:
+        lo, hi = np.asarray(bounds, dtype=float)
+        if not (np.all(lo > 0) and np.all(lo < hi)):
+            eMsg += 'Received coupling_bounds = {}'.format(bounds) + os.linesep
+            eMsg += 'Expected 0 < lower < upper' + os.linesep
+            err = True
+    fixed = kwargs.get('fixed_damping')
+    if fixed is not None and fixed < 0:
+        eMsg += 'Received fixed_damping = {}'.format(fixed) + os.linesep
+        eMsg += 'Expected fixed_damping >= 0' + os.linesep
+        err = True
+    if v is not None:
+        for name in ['pump_channel', 'collect_channel']:
+            idx = kwargs.get(name)
+            if idx is not None and not 0 <= idx < np.size(v):
+                eMsg += 'Received {} = {}'.format(name, idx) + os.linesep
+                eMsg += 'Expected {} < {}'.format(name, np.size(v)) + os.linesep
+                err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def ring_objectives(log_couplings, velocities, fixed_damping=0.0, detuning=0.0,
+                    pump_channel=0, collect_channel=0):
+    """Enhancement, pair rate and their log-gradients for a batch of designs.
+
+    Parameters
+    ----------
+    log_couplings : float array (B x C)
+        theta = log(g) for each design and channel
+    velocities : float array (C)
+    fixed_damping, detuning : float
+    pump_channel, collect_channel : integer
+
+    Returns
+    -------
+    (E, R, dlogE, dlogR, damping)
+
+    E, R, damping : float arrays (B)
+    dlogE, dlogR : float arrays (B x C)
+        Gradients of log E and log R with respect to log_couplings
+
+    Examples
+    --------
+    Gradients agree with finite differences
+    >>> th = np.log([[0.7, 0.4]])
+    >>> E, R, dE, dR, G = ring_objectives(th, [1.0, 1.5], 0.1, 0.05, 0, 1)
+    >>> h = np.array([[1e-6, 0.0]])
+    >>> E2, R2 = ring_objectives(th + h, [1.0, 1.5], 0.1, 0.05, 0, 1)[:2]
+    >>> np.allclose([np.log(E2/E)[0]/1e-6, np.log(R2/R)[0]/1e-6], [dE[0, 0], dR[0, 0]], rtol=1e-4)
+    True
+
+    """
+    theta = np.asarray(log_couplings, dtype=float)
+    g = np.exp(theta)
+    damping, losses = ccqo102.calc_ring_damping(g, velocities, axis=-1)
+    G = damping + fixed_damping
+    rr = ccqo103.calcqo103_spectral_pump(detuning, g[:, pump_channel], 1.0, G, 1.0)[1]
+    E = np.abs(rr)**2
+    Gd = losses[:, collect_channel]
+    R = E**2 * Gd**2 / G**3
+
+    denom = G**2 + detuning**2
+    dG = 2.0*losses
+    dlogE = -(2.0*G/denom)[:, None]*dG
+    dlogE[:, pump_channel] += 2.0
+    dlogR = 2.0*dlogE - 3.0*dG/G[:, None]
+    dlogR[:, collect_channel] += 4.0
+    return E, R, dlogE, dlogR, G
+
+def lbfgs_batch(fun, x0, memory=10, gtol=1.0e-8, max_iter=500):
+    """Minimize a batch of independent smooth functions with L-BFGS.
+
+    Parameters
+    ----------
+    fun : callable
+        fun(X, rows) returns (f, grad) for the designs X (m x n) that are
+        rows 'rows' of the batch; f has shape (m), grad (m x n)
+    x0 : float array (B x n)
+    memory : integer
+        Number of stored correction pairs (Default=10)
+    gtol : float
+        Converged when max |grad| <= gtol (Default=1.0e-8)
+    max_iter : integer
+
+    Returns
+    -------
+    (x, f, converged, iterations)
+
+    Examples
+    --------
+    >>> A = np.array([1.0, 10.0, 100.0])
+    >>> quad = lambda X, rows: (0.5*np.sum(A*(X - 1)**2, axis=1), A*(X - 1))
+    >>> x, f, ok, it = lbfgs_batch(quad, np.array([[0.0, 0.0, 0.0], [5.0, -3.0, 2.0]]))
+    >>> np.allclose(x, 1.0), ok.tolist()
+    (True, [True, True])
+
+    """
+    x = np.array(x0, dtype=float)
+    B, n = x.shape
+    rows = np.arange(B)
+    f, g = fun(x, rows)
+    S = np.zeros((B, memory, n))
+    Y = np.zeros((B, memory, n))
+    rho = np.zeros((B, memory))
+    head = 0
+    gamma = np.ones(B)
+    done = np.max(np.abs(g), axis=1) <= gtol
+    it = 0
+    for it in range(1, max_iter + 1):
+        if done.all():
+            break
+        # Two-loop recursion, newest pair first; unused slots have rho = 0
+        q = g.copy()
+        alpha = np.zeros((B, memory))
+        order = [(head - 1 - j) % memory for j in range(memory)]
+        for j in order:
+            alpha[:, j] = rho[:, j]*np.sum(S[:, j]*q, axis=1)
+            q -= alpha[:, j, None]*Y[:, j]
+        r = gamma[:, None]*q
+        for j in reversed(order):
+            beta = rho[:, j]*np.sum(Y[:, j]*r, axis=1)
+            r += S[:, j]*(alpha[:, j] - beta)[:, None]
+        p = -r
+        slope = np.sum(p*g, axis=1)
+        # Fall back to steepest descent where p is not a descent direction
+        bad = slope >= 0
+        p[bad] = -g[bad]
+        slope[bad] = -np.sum(g[bad]**2, axis=1)
+
+        # Backtracking (Armijo) line search for all active designs at once
+        step = np.where(done, 0.0, 1.0)
+        active = ~done
+        xNew = x.copy()
+        fNew = f.copy()
+        gNew = g.copy()
+        pending = active.copy()
+        for ls in range(40):
+            idx = rows[pending]
+            if idx.size == 0:
+                break
+            xt = x[idx] + step[idx, None]*p[idx]
+            ft, gt = fun(xt, idx)
+            ok = np.isfinite(ft) & (ft <= f[idx] + 1e-4*step[idx]*slope[idx])
+            xNew[idx[ok]] = xt[ok]
+            fNew[idx[ok]] = ft[ok]
+            gNew[idx[ok]] = gt[ok]
+            pending[idx[ok]] = False
+            step[idx[~ok]] *= 0.5
+        # Designs whose line search failed cannot improve further
+        stalled = pending & active
+        done |= stalled
+
+        s = xNew - x
+        y = gNew - g
+        sy = np.sum(s*y, axis=1)
+        update = active & ~stalled & (sy > 1e-12)
+        S[update, head] = s[update]
+        Y[update, head] = y[update]
+        rho[update, head] = 1.0/sy[update]
+        rho[~update, head] = 0.0
+        gamma[update] = sy[update]/np.sum(y[update]**2, axis=1)
+        head = (head + 1) % memory
+
+        x, f, g = xNew, fNew, gNew
+        done |= np.max(np.abs(g), axis=1) <= gtol
+    converged = np.max(np.abs(g), axis=1) <= gtol
+    return x, f, converged, it
+
+def pareto_front(objectives):
+    """Mask of rows not dominated by any other row (all objectives maximized).
+
+    Examples
+    --------
+    >>> pareto_front(np.array([[1.0, 3.0], [2.0, 2.0], [1.5, 1.5], [3.0, 1.0]])).tolist()
+    [True, True, False, True]
+
+    """
+    obj = np.asarray(objectives, dtype=float)
+    geq = np.all(obj[:, None, :] >= obj[None, :, :], axis=2)
+    gt = np.any(obj[:, None, :] > obj[None, :, :], axis=2)
+    dominated = np.any(geq & gt, axis=0)
+    return ~dominated
+
+def calcqo113_ring_design_optimizer(velocities, coupling_bounds=(0.01, 10.0), fixed_damping=0.0,
+                                    detuning=0.0, pump_channel=0, collect_channel=None,
+                                    weights=11, starts=8, seed=None, gtol=1.0e-9, max_iter=500):
+
+    """Multi-start, multi-weight coupler optimization and its Pareto front.
+
+    Parameters
+    ----------
+    velocities : float array (C)
+        Velocity of each coupled channel
+    coupling_bounds : (low, high) or 2 x C array
+        Bounds of the couplings (Default=(0.01, 10.0))
+    fixed_damping : float
+        Damping not set by the couplers (Default=0.0)
+    detuning : float
+        Pump detuning k*v from resonance (Default=0.0)
+    pump_channel : integer
+        Channel carrying the pump (Default=0)
+    collect_channel : integer or None
+        Channel collecting pairs (Default=None, the pump channel)
+    weights : integer or float array
+        Scalarization weights w in [0, 1] on log E (1 - w on log R); an
+        integer gives that many evenly spaced weights (Default=11)
+    starts : integer
+        Random starts per weight (Default=8)
+    seed : integer or None
+        Seed for the starting points
+    gtol, max_iter
+        See lbfgs_batch
+
+    Returns
+    -------
+    (couplings, damping, enhancement, pair_rate, weights, pareto)
+
+    couplings : float array (B x C), B = len(weights)*starts
+    damping, enhancement, pair_rate : float arrays (B)
+    weights : float array (B)
+        Weight of each design
+    pareto : boolean array (B)
+        Designs on the (enhancement, pair_rate) Pareto front
+
+    See Also
+    --------
+    ring_objectives, lbfgs_batch, pareto_front
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    One bus coupler on a ring with damping 0.1: E peaks at critical
+    coupling (bus damping = 0.1) and R at bus damping 4/3 * 0.1
+    >>> out = calcqo113_ring_design_optimizer([1.0], fixed_damping=0.1, weights=[1.0, 0.0],
+    ...                                       starts=4, seed=1)
+    >>> g, G, E, R, w, front = out
+    >>> bus = g[:, 0]**2/2.0
+    >>> np.allclose(bus[w == 1.0], 0.1), np.allclose(bus[w == 0.0], 0.4/3)
+    (True, True)
+    >>> bool(front.any())
+    True
+
+    """
+
+    velocities = np.atleast_1d(np.asarray(velocities, dtype=float))
+    C = velocities.size
+    if collect_channel is None: collect_channel = pump_channel
+    lo, hi = np.log(np.broadcast_to(np.asarray(coupling_bounds, dtype=float).reshape(2, -1), (2, C)))
+    if np.isscalar(weights) or np.ndim(weights) == 0:
+        weights = np.linspace(0.0, 1.0, int(weights))
+    weights = np.repeat(np.asarray(weights, dtype=float), starts)
+    B = weights.size
+
+    def thetaOf(phi):
+        sig = 0.5*(1.0 + np.tanh(0.5*phi))
+        return lo + (hi - lo)*sig, (hi - lo)*sig*(1.0 - sig)
+
+    def objective(phi, w):
+        theta, dtheta = thetaOf(phi)
+        E, R, dE, dR, G = ring_objectives(theta, velocities, fixed_damping, detuning,
+                                          pump_channel, collect_channel)
+        f = -(w*np.log(E) + (1.0 - w)*np.log(R))
+        grad = -(w[:, None]*dE + (1.0 - w)[:, None]*dR)*dtheta
+        return f, grad
+
+    rng = np.random.RandomState(seed)
+    phi0 = rng.uniform(-3.0, 3.0, size=(B, C))
+    phi, f, converged, iterations = lbfgs_batch(
+        lambda phi, rows: objective(phi, weights[rows]), phi0, gtol=gtol, max_iter=max_iter)
+    theta = thetaOf(phi)[0]
+    E, R, dE, dR, G = ring_objectives(theta, velocities, fixed_damping, detuning,
+                                      pump_channel, collect_channel)
+    front = pareto_front(np.column_stack((E, R)))
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'ring design: {} designs, {} converged, {} iterations, {} on Pareto front'.format(
+            B, converged.sum(), iterations, front.sum()) + os.linesep
+        lgr.debug(msg)
+
+    return np.exp(theta), G, E, R, weights, front
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo113_ring_design_optimizer as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Gradient-based coupler design of ring resonators',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--velocities',
+        type=float, nargs='+', default=[1.0],
+        dest='velocities', action='store',
+        help="Velocity of each coupled channel",
+        metavar='v')
+    argp.add_argument(
+        '--bounds',
+        type=float, nargs=2, default=[0.01, 10.0],
+        dest='bounds', action='store',
+        help="Lower and upper bound of the couplings",
+        metavar=('low', 'high'))
+    argp.add_argument(
+        '--fixed-damping',
+        type=float, default=0.0,
+        dest='fixed_damping', action='store',
+        help="Damping not set by the couplers",
+        metavar='G0')
+    argp.add_argument(
+        '--detuning',
+        type=float, default=0.0,
+        dest='detuning', action='store',
+        help="Pump detuning from resonance",
+        metavar='kv')
+    argp.add_argument(
+        '--pump-channel',
+        type=int, default=0,
+        dest='pump_channel', action='store',
+        help="Channel carrying the pump",
+        metavar='c')
+    argp.add_argument(
+        '--collect-channel',
+        type=int, default=None,
+        dest='collect_channel', action='store',
+        help="Channel collecting pairs (default: pump channel)",
+        metavar='c')
+    argp.add_argument(
+        '--weights',
+        type=int, default=11,
+        dest='weights', action='store',
+        help="Number of scalarization weights in [0, 1]",
+        metavar='n')
+    argp.add_argument(
+        '--starts',
+        type=int, default=8,
+        dest='starts', action='store',
+        help="Random starts per weight",
+        metavar='n')
+    argp.add_argument(
+        '--seed',
+        type=int, default=None,
+        dest='seed', action='store',
+        help="Seed for the starting points",
+        metavar='seed')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo113_ring_design_optimizer.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    velocities=args.velocities, coupling_bounds=args.bounds,
+                    fixed_damping=args.fixed_damping, pump_channel=args.pump_channel,
+                    collect_channel=args.collect_channel)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo113_ring_design_optimizer.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo113_ring_design_optimizer.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo113_ring_design_optimizer.'
+                lgr.error(msg)
+                raise
+
+        couplings, damping, E, R, weights, front = emr.calcqo113_ring_design_optimizer(
+            args.velocities,
+            coupling_bounds = args.bounds,
+            fixed_damping = args.fixed_damping,
+            detuning = args.detuning,
+            pump_channel = args.pump_channel,
+            collect_channel = args.collect_channel,
+            weights = args.weights,
+            starts = args.starts,
+            seed = args.seed)
+        order = np.argsort(E[front])
+        result = np.column_stack((couplings[front], E[front], R[front]))[order]
+        msg = ''
+        msg += ' CCqo113_ring_design_optimizer outputs' + os.linesep
+        msg += '  Pareto front (couplings..., enhancement, pair_rate):' + os.linesep
+        msg += pp.pformat(result.tolist())
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
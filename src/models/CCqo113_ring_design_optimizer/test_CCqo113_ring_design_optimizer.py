@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import CCqo113_ring_design_optimizer
+
+class TestCCqo113(unittest.TestCase):
+
+    def setUp(self):
+        self.velocities = [1.0, 1.5, 0.7]
+
+    def test_gradients_match_finite_differences(self):
+        th = np.log(np.random.RandomState(2).uniform(0.1, 2.0, size=(5, 3)))
+        E, R, dE, dR, G = CCqo113_ring_design_optimizer.ring_objectives(
+            th, self.velocities, 0.1, 0.3, 0, 2)
+        h = 1e-5
+        for c in range(3):
+            step = np.zeros(3)
+            step[c] = h
+            Ep, Rp = CCqo113_ring_design_optimizer.ring_objectives(
+                th + step, self.velocities, 0.1, 0.3, 0, 2)[:2]
+            Em, Rm = CCqo113_ring_design_optimizer.ring_objectives(
+                th - step, self.velocities, 0.1, 0.3, 0, 2)[:2]
+            self.assertTrue(np.allclose(np.log(Ep/Em)/(2*h), dE[:, c], rtol=1e-6, atol=1e-8))
+            self.assertTrue(np.allclose(np.log(Rp/Rm)/(2*h), dR[:, c], rtol=1e-6, atol=1e-8))
+
+    def test_lbfgs_rosenbrock_batch(self):
+        def rosen(X, rows):
+            a, b = X[:, 0], X[:, 1]
+            f = (1 - a)**2 + 100*(b - a**2)**2
+            g = np.column_stack((-2*(1 - a) - 400*a*(b - a**2), 200*(b - a**2)))
+            return f, g
+        x0 = np.array([[-1.2, 1.0], [2.0, 2.0], [1.0, 1.0]])
+        x, f, ok, it = CCqo113_ring_design_optimizer.lbfgs_batch(rosen, x0, gtol=1e-8,
+                                                                 max_iter=1000)
+        self.assertTrue(np.allclose(x, 1.0, atol=1e-6))
+        self.assertEqual(ok.tolist(), [True, True, True])
+
+    def test_pareto_front_ties(self):
+        front = CCqo113_ring_design_optimizer.pareto_front(
+            [[1.0, 1.0], [1.0, 1.0], [1.0, 0.5], [0.5, 2.0]])
+        self.assertEqual(front.tolist(), [True, True, False, True])
+
+    def test_bound_active_optimum(self):
+        # Critical coupling (g^2/2 = 0.1) lies above the upper bound
+        g, G, E, R, w, front = CCqo113_ring_design_optimizer.calcqo113_ring_design_optimizer(
+            [1.0], coupling_bounds=(0.01, 0.2), fixed_damping=0.1, weights=[1.0],
+            starts=3, seed=4)
+        self.assertTrue(np.allclose(g[:, 0], 0.2, rtol=1e-3))
+
+    def test_front_trades_enhancement_for_rate(self):
+        g, G, E, R, w, front = CCqo113_ring_design_optimizer.calcqo113_ring_design_optimizer(
+            [1.0, 1.5], fixed_damping=0.05, collect_channel=1, weights=5, starts=4, seed=3)
+        self.assertEqual(g.shape, (20, 2))
+        best = [np.argmax(np.where(w == wi, wi*np.log(E) + (1 - wi)*np.log(R), -np.inf))
+                for wi in np.unique(w)]
+        self.assertTrue(np.all(front[best]))
+        self.assertTrue(np.all(np.diff(E[best]) >= -1e-9*E.max()))
+        self.assertTrue(np.all(np.diff(R[best]) <= 1e-9*R.max()))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo113)
+unittest.TextTestRunner(verbosity=2).run(suite)
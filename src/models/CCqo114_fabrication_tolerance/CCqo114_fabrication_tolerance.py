@@ -0,0 +1,747 @@
+"""Monte Carlo fabrication tolerance of ring damping and pump enhancement
+
+Fabrication scatters the coupling constants and channel velocities of
+a ring about their design values.  Samples are drawn as relative
+Gaussian perturbations,
+  g_c = g0_c (1 + sigma_g eps),  v_c = v0_c (1 + sigma_v eps'),
+and each batch is evaluated in one call of CCqo102_ring_damping
+(damping G, summed over channels) and CCqo103_spectral_pump (pump_ring
+at the given wave vector).  Batch results are folded into streaming
+accumulators and discarded, so memory is set by the batch size and
+histogram resolution, never by the number of samples:
+  * mean and variance by Welford's update with Chan's pairwise merge
+  * extrema
+  * a fixed-bin histogram whose cumulative counts give quantiles
+  * a yield counter for samples inside every specification window
+Runs with different worker numbers and the same histogram ranges
+merge exactly, so long runs can be split across processes.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo114_fabrication_tolerance.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo114_fabrication_tolerance
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo114_fabrication_tolerance.py
+
+Calculations
+------------
+Bus and drop couplers with 2% coupling and 0.5% velocity scatter,
+10^7 samples, yield for damping within [1.9, 2.3]::
+  python CCqo114_fabrication_tolerance.py --couplings 1.5 1.2 --velocities 1 1 --coupling-sigma 0.02 --velocity-sigma 0.005 --samples 10000000 --damping-limits 1.9 2.3 --seed 7
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo102_ring_damping,
+        CCqo103_spectral_pump
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Batched sampling with streaming statistics, quantiles and yield
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo102_ring_damping', 'CCqo103_spectral_pump']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo102_ring_damping as ccqo102
+import CCqo103_spectral_pump as ccqo103
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'couplings':{
+        'desc':'design coupling constant of each channel',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float (C-element array)',
+        'units':'(rad s^{-1})^{1/2}',
+        'flow':'input'
+        },
+    'velocities':{
+        'desc':'design photon velocity of each channel',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float (C-element array)',
+        'units':'m s^(-1)',
+        'flow':'input'
+        },
+    'coupling_sigma':{
+        'desc':'relative rms scatter of the couplings',
+        'valrange':'[0, 1)',
+        'default': '0.0',
+        'datatype':'float (scalar or C-element array)',
+        'units':'1',
+        'flow':'input'
+        },
+    'velocity_sigma':{
+        'desc':'relative rms scatter of the velocities',
+        'valrange':'[0, 1)',
+        'default': '0.0',
+        'datatype':'float (scalar or C-element array)',
+        'units':'1',
+        'flow':'input'
+        },
+    'num_samples':{
+        'desc':'number of Monte Carlo samples',
+        'valrange':'[1, inf)',
+        'default': '1000000',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'batch_size':{
+        'desc':'samples evaluated together; sets the memory in use',
+        'valrange':'[1, inf)',
+        'default': '65536',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'statistics':{
+        'desc':'streaming statistics of damping and pump_power',
+        'valrange':'N/A',
+        'default': 'None',
+        'datatype':'dict of StreamingStatistics',
+        'units':'N/A',
+        'flow':'output'
+        },
+    'yield':{
+        'desc':'fraction of samples inside every specification window',
+        'valrange':'[0, 1]',
+        'default': 'None',
+        'datatype':'float',
+        'units':'1',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * couplings > 0, velocities > 0
+      * 0 <= coupling_sigma, velocity_sigma
+      * num_samples >= 1, batch_size >= 1
+    Warning checks:
+      * coupling_sigma or velocity_sigma >= 0.2 (samples with a negative
+        coupling or velocity become likely)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(couplings=[1.0, 2.0], coupling_sigma=0.05, num_samples=10)
+    >>> validateParameters(velocity_sigma=0.3)
+    Traceback (most recent call last):
+        ...
+    RuntimeWarning: Received velocity_sigma = 0.3
+    Expected velocity_sigma < 0.2
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    for name in ['couplings', 'velocities']:
+        val = kwargs.get(name)
+        if val is not None and not np.all(np.asarray(val) > 0):
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} > 0'.format(name) + os.linesep
+            err = True
+    for name in ['coupling_sigma', 'velocity_sigma']:
+        val = kwargs.get(name)
+        if val is None: continue
+        if not np.all(np.asarray(val) >= 0):
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= 0'.format(name) + os.linesep
+            err = True
+        elif np.any(np.asarray(val) >= 0.2):
+            wMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            wMsg += 'Expected {} < 0.2'.format(name) + os.linesep
+            wrn = True
+    for name in ['num_samples', 'batch_size']:
+        val = kwargs.get(name)
+        if val is not None and val < 1:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= 1'.format(name) + os.linesep
+            err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+class StreamingStatistics(object):
+    """Constant-memory count, mean, variance, extrema and quantiles.
+
+    The histogram range is fixed by 'edges', or else spans the first
+    batch with half its width again on either side.  Later values outside
+    the range are only counted (underflow, overflow), so quantiles that
+    fall there are clamped to the observed extrema.
+
+    Parameters
+    ----------
+    bins : integer
+        Number of histogram bins (Default=2048)
+    edges : float array or None
+        Explicit bin edges (Default=None)
+
+    Examples
+    --------
+    >>> s = StreamingStatistics(bins=100)
+    >>> s.update([1.0, 2.0, 3.0])
+    >>> s.update([4.0])
+    >>> s.count, s.mean, s.variance
+    (4, 2.5, 1.6666666666666667)
+    >>> u = StreamingStatistics(bins=100)
+    >>> for start in range(10):
+    ...     u.update(np.linspace(0.0, 1.0, 10001)[start::10])
+    >>> np.allclose(u.quantile([0.25, 0.5, 0.9]), [0.25, 0.5, 0.9], atol=1e-3)
+    True
+
+    """
+
+    def __init__(self, bins=2048, edges=None):
+        self.bins = int(bins) if edges is None else len(edges) - 1
+        self.edges = None if edges is None else np.asarray(edges, dtype=float)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta*n/float(total)
+        self.m2 += m2 + delta**2*self.count*n/float(total)
+        self.count = total
+
+    def update(self, values):
+        """Fold a batch of values into the statistics."""
+        x = np.asarray(values, dtype=float).ravel()
+        if x.size == 0:
+            return
+        mean = x.mean()
+        self._combine(x.size, mean, np.sum((x - mean)**2))
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+        if self.edges is None:
+            lo, hi = x.min(), x.max()
+            pad = 0.5*(hi - lo) or 1.0e-6*abs(lo) or 1.0
+            self.edges = np.linspace(lo - pad, hi + pad, self.bins + 1)
+        idx = np.searchsorted(self.edges, x, side='right') - 1
+        under = idx < 0
+        over = idx >= self.bins
+        self.underflow += int(under.sum())
+        self.overflow += int(over.sum())
+        self.counts += np.bincount(idx[~(under | over)], minlength=self.bins)
+
+    def merge(self, other):
+        """Fold another accumulator with the same bin edges into this one."""
+        if other.count == 0:
+            return
+        if self.count == 0 and self.edges is None:
+            self.edges = other.edges
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError('Cannot merge histograms with different bin edges')
+        self._combine(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1)."""
+        return self.m2/(self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, q):
+        """Quantiles interpolated within histogram bins."""
+        cum = np.concatenate(([self.underflow], self.underflow + np.cumsum(self.counts)))
+        values = np.interp(np.asarray(q, dtype=float)*self.count, cum, self.edges)
+        return np.clip(values, self.min, self.max)
+
+def draw_parameters(rng, couplings, velocities, coupling_sigma, velocity_sigma, size):
+    """Draw 'size' perturbed (couplings, velocities), each of shape (size x C).
+
+    Each sample draws its coupling and velocity deviations together, so
+    the samples from a seeded generator do not depend on the batch size.
+
+    Examples
+    --------
+    >>> g, v = draw_parameters(np.random.RandomState(0), [1.0, 2.0], [1.0, 1.0], 0.1, 0.0, 5)
+    >>> g.shape, bool(np.all(v == 1.0))
+    ((5, 2), True)
+
+    """
+    g0 = np.atleast_1d(np.asarray(couplings, dtype=float))
+    v0 = np.atleast_1d(np.asarray(velocities, dtype=float))
+    eps = rng.standard_normal((size, g0.size + v0.size))
+    g = g0*(1.0 + coupling_sigma*eps[:, :g0.size])
+    v = v0*(1.0 + velocity_sigma*eps[:, g0.size:])
+    return g, v
+
+def evaluate_samples(couplings, velocities, wavevec=0.0, pump_input=1.0, pump_channel=0):
+    """Ring damping and pump power |pump_ring|^2 of a batch of sampled rings.
+
+    Parameters
+    ----------
+    couplings, velocities : float arrays (B x C)
+    wavevec : float
+    pump_input : complex
+    pump_channel : integer
+
+    Returns
+    -------
+    {'damping': float array (B), 'pump_power': float array (B)}
+
+    Examples
+    --------
+    Critically coupled pump (bus damping equals drop damping)
+    >>> out = evaluate_samples([[2.0, 2.0]], [[1.0, 1.0]])
+    >>> out['damping'].tolist(), out['pump_power'].tolist()
+    ([4.0], [0.25])
+
+    """
+    g = np.asarray(couplings, dtype=float)
+    v = np.asarray(velocities, dtype=float)
+    damping = ccqo102.calc_ring_damping(g, v, axis=-1)[0]
+    pump_ring = ccqo103.calcqo103_spectral_pump(
+        wavevec, g[:, pump_channel], v[:, pump_channel], damping, pump_input)[0]
+    return {'damping': damping, 'pump_power': np.abs(pump_ring)**2}
+
+def calcqo114_fabrication_tolerance(couplings, velocities, coupling_sigma=0.0, velocity_sigma=0.0,
+                                    wavevec=0.0, pump_input=1.0, pump_channel=0,
+                                    num_samples=1000000, batch_size=65536, seed=None, worker=0,
+                                    specs=None, bins=2048, ranges=None, statistics=None):
+
+    """Streaming Monte Carlo statistics of damping and pump power under fabrication scatter.
+
+    Parameters
+    ----------
+    couplings, velocities : float arrays (C)
+        Design values for each channel
+    coupling_sigma, velocity_sigma : float or float array (C)
+        Relative rms scatter (Default=0.0)
+    wavevec : float
+        Pump wave vector relative to resonance (Default=0.0)
+    pump_input : complex
+        Pump amplitude in the pump channel (Default=1.0)
+    pump_channel : integer
+        (Default=0)
+    num_samples : integer
+        (Default=1000000)
+    batch_size : integer
+        Samples evaluated at once (Default=65536)
+    seed : integer or None
+        Seed for the sampler; with 'worker' seeds RandomState([seed, worker])
+    worker : integer
+        Stream number, so workers sharing a seed draw distinct samples
+        (Default=0)
+    specs : dict or None
+        Specification windows {name: (low, high)} for 'damping' and/or
+        'pump_power'; None on either side means unbounded (Default=None)
+    bins : integer
+        Histogram bins per quantity (Default=2048)
+    ranges : dict or None
+        Histogram ranges {name: (low, high)}; fixed ranges let the
+        statistics of separate workers merge.  Unlisted quantities take
+        their range from the first batch (Default=None)
+    statistics : dict or None
+        Accumulators from a previous call to continue; the returned
+        yield then also counts only this call's samples (Default=None)
+
+    Returns
+    -------
+    (statistics, yield_fraction, yield_error)
+
+    statistics : dict of StreamingStatistics
+        Keys 'damping' and 'pump_power'
+    yield_fraction : float
+        Fraction of samples inside every window of 'specs' (1.0 without specs)
+    yield_error : float
+        Binomial standard error of yield_fraction
+
+    See Also
+    --------
+    StreamingStatistics, draw_parameters, evaluate_samples
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    For one channel G = g^2/(2v), so small coupling scatter sigma gives
+    damping scatter 2 sigma G
+    >>> stats, y, dy = calcqo114_fabrication_tolerance([2.0], [1.0], coupling_sigma=0.001,
+    ...                                                num_samples=200000, seed=4)
+    >>> abs(stats['damping'].mean - 2.0) < 1e-4, abs(stats['damping'].std/(2*0.001*2.0) - 1) < 0.01
+    (True, True)
+    >>> q = stats['damping'].quantile([0.1587, 0.8413])
+    >>> np.allclose(q, [2.0 - 0.004, 2.0 + 0.004], atol=1e-4)
+    True
+
+    Yield of a symmetric +/- 1 sigma window
+    >>> y = calcqo114_fabrication_tolerance([2.0], [1.0], coupling_sigma=0.001, num_samples=200000,
+    ...                                     seed=4, specs={'damping': (1.996, 2.004)})[1]
+    >>> abs(y - 0.6827) < 0.005
+    True
+
+    """
+
+    if statistics is None:
+        ranges = ranges or {}
+        statistics = {}
+        for name in ['damping', 'pump_power']:
+            edges = np.linspace(ranges[name][0], ranges[name][1], bins + 1) if name in ranges else None
+            statistics[name] = StreamingStatistics(bins, edges)
+    specs = specs or {}
+    rng = np.random.RandomState(None if seed is None else [seed, worker])
+    passed = 0
+    done = 0
+    while done < num_samples:
+        size = min(batch_size, num_samples - done)
+        g, v = draw_parameters(rng, couplings, velocities, coupling_sigma, velocity_sigma, size)
+        out = evaluate_samples(g, v, wavevec, pump_input, pump_channel)
+        inside = np.ones(size, dtype=bool)
+        for name, (low, high) in specs.items():
+            if low is not None: inside &= out[name] >= low
+            if high is not None: inside &= out[name] <= high
+        passed += int(inside.sum())
+        for name, acc in statistics.items():
+            acc.update(out[name])
+        done += size
+
+    yieldFraction = passed/float(num_samples)
+    yieldError = np.sqrt(yieldFraction*(1.0 - yieldFraction)/num_samples)
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'fabrication tolerance: {} samples in batches of {}, yield {} +/- {}'.format(
+            num_samples, batch_size, yieldFraction, yieldError) + os.linesep
+        lgr.debug(msg)
+
+    return statistics, yieldFraction, yieldError
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo114_fabrication_tolerance as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Monte Carlo fabrication tolerance of ring damping and pump enhancement',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--couplings',
+        type=float, nargs='+', required=True,
+        dest='couplings', action='store',
+        help="Design coupling of each channel",
+        metavar='g')
+    argp.add_argument(
+        '--velocities',
+        type=float, nargs='+', required=True,
+        dest='velocities', action='store',
+        help="Design velocity of each channel",
+        metavar='v')
+    argp.add_argument(
+        '--coupling-sigma',
+        type=float, default=0.0,
+        dest='coupling_sigma', action='store',
+        help="Relative rms scatter of the couplings",
+        metavar='sigma')
+    argp.add_argument(
+        '--velocity-sigma',
+        type=float, default=0.0,
+        dest='velocity_sigma', action='store',
+        help="Relative rms scatter of the velocities",
+        metavar='sigma')
+    argp.add_argument(
+        '--wavevec',
+        type=float, default=0.0,
+        dest='wavevec', action='store',
+        help="Pump wave vector relative to resonance",
+        metavar='k')
+    argp.add_argument(
+        '--pump-channel',
+        type=int, default=0,
+        dest='pump_channel', action='store',
+        help="Channel carrying the pump",
+        metavar='c')
+    argp.add_argument(
+        '--samples',
+        type=int, default=1000000,
+        dest='num_samples', action='store',
+        help="Number of Monte Carlo samples",
+        metavar='n')
+    argp.add_argument(
+        '--batch-size',
+        type=int, default=65536,
+        dest='batch_size', action='store',
+        help="Samples evaluated at once",
+        metavar='n')
+    argp.add_argument(
+        '--seed',
+        type=int, default=None,
+        dest='seed', action='store',
+        help="Seed for the sampler",
+        metavar='seed')
+    argp.add_argument(
+        '--worker',
+        type=int, default=0,
+        dest='worker', action='store',
+        help="Stream number for runs sharing a seed",
+        metavar='n')
+    argp.add_argument(
+        '--damping-limits',
+        type=float, nargs=2, default=None,
+        dest='damping_limits', action='store',
+        help="Specification window of the damping",
+        metavar=('low', 'high'))
+    argp.add_argument(
+        '--pump-power-limits',
+        type=float, nargs=2, default=None,
+        dest='pump_power_limits', action='store',
+        help="Specification window of the pump power",
+        metavar=('low', 'high'))
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo114_fabrication_tolerance.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    couplings=args.couplings, velocities=args.velocities,
+                    coupling_sigma=args.coupling_sigma, velocity_sigma=args.velocity_sigma,
+                    num_samples=args.num_samples, batch_size=args.batch_size)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo114_fabrication_tolerance.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo114_fabrication_tolerance.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo114_fabrication_tolerance.'
+                lgr.error(msg)
+                raise
+
+        specs = {}
+        if args.damping_limits is not None: specs['damping'] = args.damping_limits
+        if args.pump_power_limits is not None: specs['pump_power'] = args.pump_power_limits
+        stats, yieldFraction, yieldError = emr.calcqo114_fabrication_tolerance(
+            args.couplings, args.velocities,
+            coupling_sigma = args.coupling_sigma,
+            velocity_sigma = args.velocity_sigma,
+            wavevec = args.wavevec,
+            pump_channel = args.pump_channel,
+            num_samples = args.num_samples,
+            batch_size = args.batch_size,
+            seed = args.seed,
+            worker = args.worker,
+            specs = specs)
+        levels = [0.001, 0.5, 0.999]
+        result = {}
+        msg = ''
+        msg += ' CCqo114_fabrication_tolerance outputs' + os.linesep
+        for name in sorted(stats):
+            s = stats[name]
+            result[name] = [s.mean, s.std] + s.quantile(levels).tolist()
+            msg += '  {}: mean = {}, std = {}, quantiles {} = {}'.format(
+                name, s.mean, s.std, levels, s.quantile(levels).tolist()) + os.linesep
+        result['yield'] = [yieldFraction, yieldError]
+        msg += '  yield = {} +/- {}'.format(yieldFraction, yieldError)
+        if lgr.getEffectiveLevel() > logging.INFO: pp.pprint(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import CCqo114_fabrication_tolerance
+
+class TestCCqo114(unittest.TestCase):
+
+    def setUp(self):
+        self.design = dict(couplings=[1.5, 1.2], velocities=[1.0, 1.1],
+                           coupling_sigma=0.03, velocity_sigma=[0.01, 0.02])
+        self.specs = {'damping': (1.6, 1.8), 'pump_power': (0.6, None)}
+
+    def direct(self, num_samples, batch_size, seed):
+        rng = np.random.RandomState([seed, 0])
+        outs = []
+        done = 0
+        while done < num_samples:
+            size = min(batch_size, num_samples - done)
+            g, v = CCqo114_fabrication_tolerance.draw_parameters(
+                rng, size=size, **self.design)
+            outs.append(CCqo114_fabrication_tolerance.evaluate_samples(g, v))
+            done += size
+        return dict((k, np.concatenate([o[k] for o in outs])) for k in outs[0])
+
+    def test_matches_stored_samples(self):
+        stats, y, dy = CCqo114_fabrication_tolerance.calcqo114_fabrication_tolerance(
+            num_samples=50000, batch_size=7000, seed=11, specs=self.specs, **self.design)
+        samples = self.direct(50000, 7000, 11)
+        for name, x in samples.items():
+            self.assertEqual(stats[name].count, x.size)
+            self.assertTrue(np.allclose(stats[name].mean, x.mean()))
+            self.assertTrue(np.allclose(stats[name].variance, x.var(ddof=1)))
+            self.assertEqual((stats[name].min, stats[name].max), (x.min(), x.max()))
+            width = stats[name].edges[1] - stats[name].edges[0]
+            levels = [0.01, 0.25, 0.5, 0.75, 0.99]
+            self.assertTrue(np.all(np.abs(stats[name].quantile(levels)
+                                          - np.percentile(x, 100*np.array(levels))) < 2*width))
+        inside = ((samples['damping'] >= 1.6) & (samples['damping'] <= 1.8)
+                  & (samples['pump_power'] >= 0.6))
+        self.assertEqual(y, inside.mean())
+
+    def test_batch_size_does_not_change_moments(self):
+        a = CCqo114_fabrication_tolerance.calcqo114_fabrication_tolerance(
+            num_samples=20000, batch_size=20000, seed=3, **self.design)[0]
+        b = CCqo114_fabrication_tolerance.calcqo114_fabrication_tolerance(
+            num_samples=20000, batch_size=999, seed=3, **self.design)[0]
+        self.assertTrue(np.allclose(a['damping'].mean, b['damping'].mean))
+        self.assertTrue(np.allclose(a['damping'].variance, b['damping'].variance))
+
+    def test_worker_merge(self):
+        ranges = {'damping': (1.0, 2.5), 'pump_power': (0.0, 1.0)}
+        parts = [CCqo114_fabrication_tolerance.calcqo114_fabrication_tolerance(
+            num_samples=10000, seed=5, worker=w, ranges=ranges, **self.design)[0] for w in range(3)]
+        merged = CCqo114_fabrication_tolerance.StreamingStatistics(edges=parts[0]['damping'].edges)
+        for part in parts:
+            merged.merge(part['damping'])
+        x = np.concatenate([self.workerSamples(w) for w in range(3)])
+        self.assertEqual(merged.count, 30000)
+        self.assertTrue(np.allclose(merged.mean, x.mean()))
+        self.assertTrue(np.allclose(merged.variance, x.var(ddof=1)))
+        self.assertEqual(merged.counts.sum() + merged.underflow + merged.overflow, 30000)
+
+    def workerSamples(self, worker):
+        rng = np.random.RandomState([5, worker])
+        g, v = CCqo114_fabrication_tolerance.draw_parameters(rng, size=10000, **self.design)
+        return CCqo114_fabrication_tolerance.evaluate_samples(g, v)['damping']
+
+    def test_merge_rejects_different_edges(self):
+        a = CCqo114_fabrication_tolerance.StreamingStatistics(edges=[0.0, 1.0, 2.0])
+        b = CCqo114_fabrication_tolerance.StreamingStatistics(edges=[0.0, 0.5, 2.0])
+        a.update([0.5])
+        b.update([0.7])
+        self.assertRaises(ValueError, a.merge, b)
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo114)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,697 @@
+"""Batch Levenberg-Marquardt fitting of ring damping and coupling
+
+A ring's pump response from CCqo103_spectral_pump,
+  rr = -1j conj(g)/(G - 1j v (k - k0)),
+gives the Lorentzian power spectrum measured around a resonance k0,
+  y(k) = |rr|^2 + b = g^2/(G^2 + v^2 (k - k0)^2) + b,
+with couplings_pump g, ring_damping_pump G and an optional flat
+background b.  Thousands of spectra (one per ring on a wafer) are
+fitted together: parameters, residuals and Jacobians are stacked as
+(rings x points x parameters) arrays and every Levenberg-Marquardt
+iteration solves all rings' damped normal equations at once.  The
+Jacobian is analytic, with D = G^2 + v^2 (k - k0)^2,
+  dy/dg = 2g/D,  dy/dG = -2G g^2/D^2,  dy/dk0 = 2 v^2 (k - k0) g^2/D^2,
+  dy/db = 1.
+Each ring keeps its own damping factor and stops when its cost no
+longer decreases; converged rings are masked out of later iterations.
+Uncertainties come from the covariance s^2 (J^T W J)^-1, with s^2 the
+reduced chi-square when point sigmas are not given.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo115_batch_fitting.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo115_batch_fitting
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo115_batch_fitting.py
+
+Calculations
+------------
+Fit every row of spectra.npy (rings x points, NaN for missing points)
+sampled at the wave vectors in wavevec.npy, writing a CSV table::
+  python CCqo115_batch_fitting.py --spectra spectra.npy --wavevec wavevec.npy --velocity 1.0 --background --output fits.csv
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+fitColumns : list
+    Column names of the results table
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo103_spectral_pump
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Stacked Levenberg-Marquardt with analytic Jacobian and results table
+1.0b2 [2026-10-18]
+    * Rings with too few valid points are reported as NaN and not
+      converged instead of as fits of the starting values
+1.0b3 [2026-10-18]
+    * levenberg_marquardt_batch takes an 'active' mask; rings with too
+      few valid points are left out of the fit instead of iterated
+
+"""
+
+__version__ = '1.0b3'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo103_spectral_pump']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo103_spectral_pump as ccqo103
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'spectra':{
+        'desc':'measured power spectrum of each ring; NaN marks missing points',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (N x M array)',
+        'units':'[ring_response]^2',
+        'flow':'input'
+        },
+    'wavevec':{
+        'desc':'wave vector of each spectral point',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (M or N x M array)',
+        'units':'rad m^(-1)',
+        'flow':'input'
+        },
+    'velocities':{
+        'desc':'photon velocity of each ring',
+        'valrange':'(0, inf)',
+        'default': '1.0',
+        'datatype':'float (scalar or N-element array)',
+        'units':'m s^(-1)',
+        'flow':'input'
+        },
+    'couplings_pump':{
+        'desc':'fitted coupling constant (magnitude)',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (N-element array)',
+        'units':'(rad s^{-1})^{1/2}',
+        'flow':'output'
+        },
+    'ring_damping_pump':{
+        'desc':'fitted ring damping',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float (N-element array)',
+        'units':'rad s^(-1)',
+        'flow':'output'
+        }
+}
+
+fitColumns = ['ring', 'couplings_pump', 'couplings_pump_err', 'ring_damping_pump',
+              'ring_damping_pump_err', 'resonance', 'resonance_err', 'background',
+              'background_err', 'chi2_reduced', 'iterations', 'converged']
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * spectra has two dimensions
+      * wavevec matches the number of spectral points
+      * velocities > 0
+    Warning checks:
+      * fewer than 8 valid points in some spectrum
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(spectra=np.ones((3, 20)), wavevec=np.arange(20.0), velocities=2.0)
+    >>> validateParameters(spectra=np.ones((3, 20)), wavevec=np.arange(10.0))
+    Traceback (most recent call last):
+        ...
+    ValueError: Received wavevec with shape (10,)
+    Expected its last dimension to match 20 spectral points
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, np.shape(v) if np.size(v) > 8 else v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    spectra = kwargs.get('spectra')
+    if spectra is not None:
+        spectra = np.asarray(spectra)
+        if spectra.ndim != 2:
+            eMsg += 'Received spectra with shape {}'.format(spectra.shape) + os.linesep
+            eMsg += 'Expected rings x points' + os.linesep
+            err = True
+        else:
+            k = kwargs.get('wavevec')
+            if k is not None and np.shape(k)[-1] != spectra.shape[1]:
+                eMsg += 'Received wavevec with shape {}'.format(np.shape(k)) + os.linesep
+                eMsg += 'Expected its last dimension to match {} spectral points'.format(
+                    spectra.shape[1]) + os.linesep
+                err = True
+            valid = np.isfinite(spectra).sum(axis=1)
+            if np.any(valid < 8):
+                wMsg += 'Received {} spectra with fewer than 8 valid points'.format(
+                    np.sum(valid < 8)) + os.linesep
+                wMsg += 'Expected at least 8 points per ring' + os.linesep
+                wrn = True
+    v = kwargs.get('velocities')
+    if v is not None and not np.all(np.asarray(v) > 0):
+        eMsg += 'Received velocities = {}'.format(v) + os.linesep
+        eMsg += 'Expected velocities > 0' + os.linesep
+        err = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def lorentzian_model(params, wavevec, velocities):
+    """Lorentzian spectra and their analytic Jacobian for stacked rings.
+
+    Parameters
+    ----------
+    params : float array (N x P)
+        Columns (g, G, k0) or (g, G, k0, b)
+    wavevec : float array (M or N x M)
+    velocities : float array (N)
+
+    Returns
+    -------
+    (y, jac)
+
+    y : float array (N x M)
+    jac : float array (N x M x P)
+
+    Examples
+    --------
+    >>> p = np.array([[2.0, 1.0, 0.5, 0.1]])
+    >>> y, J = lorentzian_model(p, np.array([0.5, 1.5]), np.array([2.0]))
+    >>> y.round(6).tolist()
+    [[4.1, 0.9]]
+    >>> h = 1e-6
+    >>> yh = lorentzian_model(p + [[0.0, h, 0.0, 0.0]], np.array([0.5, 1.5]), np.array([2.0]))[0]
+    >>> np.allclose((yh - y)/h, J[..., 1], rtol=1e-5)
+    True
+
+    """
+    p = np.asarray(params, dtype=float)
+    g, G, k0 = p[:, 0:1], p[:, 1:2], p[:, 2:3]
+    v = np.asarray(velocities, dtype=float).reshape(-1, 1)
+    dk = wavevec - k0
+    rr = ccqo103.calcqo103_spectral_pump(dk, g, v, G, 1.0)[1]
+    y = np.abs(rr)**2
+    D = G**2 + (v*dk)**2
+    jac = np.empty(y.shape + (p.shape[1],))
+    jac[..., 0] = 2.0*g/D
+    jac[..., 1] = -2.0*G*y/D
+    jac[..., 2] = 2.0*v**2*dk*y/D
+    if p.shape[1] > 3:
+        y = y + p[:, 3:4]
+        jac[..., 3] = 1.0
+    return y, jac
+
+def initial_guess(spectra, wavevec, velocities, background=False):
+    """Starting values from each spectrum's peak and half-maximum width.
+
+    The resonance is the wave vector of the largest point, the width the
+    number of points above half height times the mean point spacing, so
+    G = v*width/2 and g = sqrt(height)*G.
+
+    Examples
+    --------
+    >>> k = np.linspace(-10.0, 10.0, 2001)
+    >>> y = 9.0/(1.0 + (k - 1.0)**2)
+    >>> np.allclose(initial_guess(y[None, :], k, np.array([1.0])), [[3.0, 1.0, 1.0]], atol=0.05)
+    True
+
+    """
+    y = np.where(np.isfinite(spectra), spectra, -np.inf)
+    k = np.broadcast_to(wavevec, y.shape)
+    v = np.asarray(velocities, dtype=float)
+    rows = np.arange(y.shape[0])
+    peak = np.argmax(y, axis=1)
+    floor = np.min(np.where(np.isfinite(spectra), spectra, np.inf), axis=1)
+    base = floor if background else np.zeros_like(floor)
+    height = y[rows, peak] - base
+    spacing = np.abs(k[:, -1] - k[:, 0])/(k.shape[1] - 1)
+    width = np.sum(y - base[:, None] >= 0.5*height[:, None], axis=1)*spacing
+    G = 0.5*v*width
+    guess = [np.sqrt(np.maximum(height, 0.0))*G, G, k[rows, peak]]
+    if background: guess.append(base)
+    return np.column_stack(guess)
+
+def levenberg_marquardt_batch(model, params, data, weights, ftol=1.0e-10, max_iter=200,
+                              damping=1.0e-3, active=None):
+    """Fit many independent least-squares problems with stacked LM steps.
+
+    Parameters
+    ----------
+    model : callable
+        model(params, rows) -> (y (n x M), jac (n x M x P)) for the rings 'rows'
+    params : float array (N x P)
+        Starting values
+    data : float array (N x M)
+        Values with weights 0 where missing (any finite filler)
+    weights : float array (N x M)
+        1/sigma^2 for each point
+    ftol : float
+        A ring converges when an accepted step lowers its cost by less
+        than ftol relative (Default=1.0e-10)
+    max_iter : integer
+    damping : float
+        Initial LM damping factor (Default=1.0e-3)
+    active : boolean array (N) or None
+        Rings to fit; the others keep their starting values and are
+        reported as not converged (Default=None, every ring)
+
+    Returns
+    -------
+    (params, cost, normal, iterations, converged)
+
+    cost : float array (N), weighted sum of squared residuals
+    normal : float array (N x P x P), J^T W J at the solution
+    iterations : integer array (N)
+    converged : boolean array (N)
+
+    """
+    p = np.array(params, dtype=float)
+    N, P = p.shape
+    allRows = np.arange(N)
+    active = np.ones(N, dtype=bool) if active is None else np.array(active, dtype=bool)
+    # Inactive rings are never evaluated; their model and Jacobian stay zero
+    y = np.zeros(np.shape(data))
+    J = np.zeros(y.shape + (P,))
+    y[active], J[active] = model(p[active], allRows[active])
+    r = (y - data)*np.sqrt(weights)
+    cost = np.sum(r**2, axis=1)
+    lam = np.full(N, damping)
+    iterations = np.zeros(N, dtype=int)
+    converged = np.zeros(N, dtype=bool)
+    eye = np.eye(P)
+
+    for it in range(max_iter):
+        rows = allRows[active]
+        if rows.size == 0:
+            break
+        Jw = J[rows]*np.sqrt(weights[rows])[..., None]
+        A = np.einsum('nmp,nmq->npq', Jw, Jw)
+        grad = np.einsum('nmp,nm->np', Jw, r[rows])
+        diag = np.einsum('npp->np', A)
+        Ad = A + (lam[rows, None]*np.maximum(diag, 1e-300))[:, :, None]*eye
+        step = -np.linalg.solve(Ad, grad[..., None])[..., 0]
+        trial = p[rows] + step
+        yt, Jt = model(trial, rows)
+        rt = (yt - data[rows])*np.sqrt(weights[rows])
+        ct = np.sum(rt**2, axis=1)
+        better = np.isfinite(ct) & (ct <= cost[rows])
+        iterations[rows] += 1
+
+        acc = rows[better]
+        small = better & (cost[rows] - ct <= ftol*cost[rows])
+        p[acc] = trial[better]
+        y[acc], J[acc], r[acc] = yt[better], Jt[better], rt[better]
+        cost[acc] = ct[better]
+        lam[acc] *= 0.1
+        lam[rows[~better]] *= 10.0
+        # Converged on a negligible decrease; stalled when no damping helps
+        converged[rows[small]] = True
+        stalled = rows[~better & (lam[rows] > 1e12)]
+        converged[stalled] = True
+        active[rows[small]] = False
+        active[stalled] = False
+
+    Jw = J*np.sqrt(weights)[..., None]
+    normal = np.einsum('nmp,nmq->npq', Jw, Jw)
+    return p, cost, normal, iterations, converged
+
+def calcqo115_batch_fitting(spectra, wavevec, velocities=1.0, sigma=None, background=False,
+                            initial=None, ftol=1.0e-10, max_iter=200):
+
+    """Fit couplings_pump and ring_damping_pump to a stack of measured spectra.
+
+    Parameters
+    ----------
+    spectra : float array (N x M)
+        One spectrum per ring; NaN marks missing points
+    wavevec : float array (M or N x M)
+        Wave vectors of the points, shared or per ring
+    velocities : float or float array (N)
+        Photon velocity of each ring (Default=1.0)
+    sigma : float array or None
+        Standard deviation of the points, broadcastable to (N x M).
+        None scales the covariance by the reduced chi-square (Default=None)
+    background : boolean
+        Also fit a flat background (Default=False)
+    initial : float array (N x P) or None
+        Starting values; None uses initial_guess (Default=None)
+    ftol, max_iter
+        See levenberg_marquardt_batch
+
+    Returns
+    -------
+    table : numpy record array (N)
+        Columns fitColumns; background columns are 0 unless fitted.
+        Rings with fewer valid points than parameters get NaN values
+        and converged False.
+
+    See Also
+    --------
+    lorentzian_model, levenberg_marquardt_batch, write_results
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    Noisy spectra of 300 rings with scattered g, G and k0
+    >>> rng = np.random.RandomState(40)
+    >>> k = np.linspace(-5.0, 5.0, 301)
+    >>> true = np.column_stack((rng.uniform(0.5, 2.0, 300), rng.uniform(0.3, 1.2, 300),
+    ...                         rng.uniform(-1.0, 1.0, 300)))
+    >>> clean = lorentzian_model(true, k, np.ones(300))[0]
+    >>> noisy = clean + 0.01*rng.standard_normal(clean.shape)
+    >>> noisy[0, 100:140] = np.nan
+    >>> fit = calcqo115_batch_fitting(noisy, k)
+    >>> bool(fit['converged'].all())
+    True
+    >>> z = (fit['ring_damping_pump'] - true[:, 1])/fit['ring_damping_pump_err']
+    >>> bool(abs(z.std() - 1.0) < 0.15), bool(np.abs(fit['resonance'] - true[:, 2]).max() < 0.05)
+    (True, True)
+
+    """
+
+    y = np.asarray(spectra, dtype=float)
+    N, M = y.shape
+    k = np.asarray(wavevec, dtype=float)
+    v = np.broadcast_to(np.asarray(velocities, dtype=float), (N,))
+    valid = np.isfinite(y)
+    weights = valid.astype(float)
+    if sigma is not None:
+        weights = weights/np.broadcast_to(np.asarray(sigma, dtype=float), (N, M))**2
+    data = np.where(valid, y, 0.0)
+    if initial is None:
+        initial = initial_guess(y, k, v, background)
+    kRows = (lambda rows: k[rows]) if k.ndim == 2 else (lambda rows: k)
+
+    def model(params, rows):
+        return lorentzian_model(params, kRows(rows), v[rows])
+
+    # Rings with fewer valid points than parameters have no fit
+    P = np.shape(initial)[1]
+    unfit = valid.sum(axis=1) < P
+    p, cost, normal, iterations, converged = levenberg_marquardt_batch(
+        model, initial, data, weights, ftol, max_iter, active=~unfit)
+    dof = np.maximum(valid.sum(axis=1) - P, 1)
+    chi2 = cost/dof
+    cov = np.linalg.pinv(normal)
+    if sigma is None:
+        cov = cov*chi2[:, None, None]
+    err = np.sqrt(np.maximum(np.einsum('npp->np', cov), 0.0))
+    p[unfit] = err[unfit] = chi2[unfit] = np.nan
+    converged[unfit] = False
+
+    table = np.zeros(N, dtype=[(name, 'i8' if name in ('ring', 'iterations') else
+                                ('?' if name == 'converged' else 'f8')) for name in fitColumns])
+    table['ring'] = np.arange(N)
+    table['couplings_pump'], table['couplings_pump_err'] = np.abs(p[:, 0]), err[:, 0]
+    table['ring_damping_pump'], table['ring_damping_pump_err'] = np.abs(p[:, 1]), err[:, 1]
+    table['resonance'], table['resonance_err'] = p[:, 2], err[:, 2]
+    if background:
+        table['background'], table['background_err'] = p[:, 3], err[:, 3]
+    table['chi2_reduced'] = chi2
+    table['iterations'] = iterations
+    table['converged'] = converged
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'batch fitting: {} rings, {} converged, at most {} iterations'.format(
+            N, converged.sum(), iterations.max()) + os.linesep
+        lgr.debug(msg)
+
+    return table.view(np.recarray)
+
+def write_results(fname, table):
+    """Write a results table from calcqo115_batch_fitting as CSV."""
+    fmt = ['%d' if name in ('ring', 'iterations', 'converged') else '%.10g'
+           for name in table.dtype.names]
+    rows = np.column_stack([table[name].astype(float) for name in table.dtype.names])
+    np.savetxt(fname, rows, fmt=fmt, delimiter=',', header=','.join(table.dtype.names), comments='')
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo115_batch_fitting as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Batch Levenberg-Marquardt fitting of ring damping and coupling',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--spectra',
+        required=True,
+        dest='spectra', action='store',
+        help="Spectra (.npy, rings x points; NaN for missing points)",
+        metavar='spectraFile')
+    argp.add_argument(
+        '--wavevec',
+        required=True,
+        dest='wavevec', action='store',
+        help="Wave vectors (.npy, points or rings x points)",
+        metavar='wavevecFile')
+    argp.add_argument(
+        '--velocity',
+        type=float, default=1.0,
+        dest='velocity', action='store',
+        help="Photon velocity of every ring",
+        metavar='v')
+    argp.add_argument(
+        '--sigma',
+        type=float, default=None,
+        dest='sigma', action='store',
+        help="Standard deviation of every point (default: from residuals)",
+        metavar='sigma')
+    argp.add_argument(
+        '--background',
+        default=False,
+        dest='background', action='store_true',
+        help="Also fit a flat background")
+    argp.add_argument(
+        '--output',
+        default='CCqo115_batch_fitting.csv',
+        dest='output', action='store',
+        help="CSV file for the results table",
+        metavar='csvFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo115_batch_fitting.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        spectra = np.load(args.spectra)
+        wavevec = np.load(args.wavevec)
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    spectra=spectra, wavevec=wavevec, velocities=args.velocity)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo115_batch_fitting.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo115_batch_fitting.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo115_batch_fitting.'
+                lgr.error(msg)
+                raise
+
+        table = emr.calcqo115_batch_fitting(
+            spectra, wavevec,
+            velocities = args.velocity,
+            sigma = args.sigma,
+            background = args.background)
+        emr.write_results(args.output, table)
+        result = '{} rings fitted, {} converged, table in {}'.format(
+            table.size, table['converged'].sum(), args.output)
+        msg = ''
+        msg += ' CCqo115_batch_fitting outputs' + os.linesep
+        msg += '  ' + result + os.linesep
+        msg += '  median ring_damping_pump = {}'.format(np.median(table['ring_damping_pump']))
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo115_batch_fitting
+
+class TestCCqo115(unittest.TestCase):
+
+    def setUp(self):
+        self.k = np.linspace(-5.0, 5.0, 201)
+        self.true = np.array([[1.0, 0.5, 0.2, 0.05], [2.0, 0.8, -0.3, 0.0], [0.7, 0.3, 1.1, 0.2]])
+        self.v = np.array([1.0, 1.5, 0.8])
+        self.clean = CCqo115_batch_fitting.lorentzian_model(self.true, self.k, self.v)[0]
+
+    def test_noiseless_with_background(self):
+        fit = CCqo115_batch_fitting.calcqo115_batch_fitting(self.clean, self.k, self.v,
+                                                            background=True)
+        self.assertTrue(fit['converged'].all())
+        self.assertTrue(np.allclose(fit['couplings_pump'], self.true[:, 0]))
+        self.assertTrue(np.allclose(fit['ring_damping_pump'], self.true[:, 1]))
+        self.assertTrue(np.allclose(fit['resonance'], self.true[:, 2]))
+        self.assertTrue(np.allclose(fit['background'], self.true[:, 3]))
+
+    def test_per_ring_grids_and_known_sigma(self):
+        rng = np.random.RandomState(8)
+        k = self.k[None, :] + rng.uniform(-0.02, 0.02, size=(3, 1))
+        truth = np.tile(self.true[:1, :3], (400, 1))
+        k = np.repeat(k[:1], 400, axis=0)
+        clean = CCqo115_batch_fitting.lorentzian_model(truth, k, np.ones(400))[0]
+        noisy = clean + 0.02*rng.standard_normal(clean.shape)
+        fit = CCqo115_batch_fitting.calcqo115_batch_fitting(noisy, k, sigma=0.02)
+        z = (fit['ring_damping_pump'] - truth[:, 1])/fit['ring_damping_pump_err']
+        self.assertTrue(abs(z.std() - 1.0) < 0.15)
+        self.assertTrue(abs(np.mean(fit['chi2_reduced']) - 1.0) < 0.05)
+
+    def test_missing_points(self):
+        spectra = self.clean.copy()
+        spectra[0, ::2] = np.nan
+        spectra[1, :] = np.nan
+        spectra[2, 2:] = np.nan
+        fit = CCqo115_batch_fitting.calcqo115_batch_fitting(spectra, self.k, self.v,
+                                                            background=True)
+        self.assertTrue(fit['converged'][0] and np.allclose(fit['resonance'][0], 0.2))
+        self.assertEqual(fit['converged'][1:].tolist(), [False, False])
+        self.assertTrue(np.isnan(fit['couplings_pump'][1]) and np.isnan(fit['chi2_reduced'][1]))
+        # Rings without enough points are not iterated at all
+        self.assertEqual(fit['iterations'][1:].tolist(), [0, 0])
+
+    def test_write_results(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'fit.csv')
+            fit = CCqo115_batch_fitting.calcqo115_batch_fitting(self.clean, self.k, self.v,
+                                                                background=True)
+            CCqo115_batch_fitting.write_results(fname, fit)
+            back = np.genfromtxt(fname, delimiter=',', names=True)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(list(back.dtype.names), CCqo115_batch_fitting.fitColumns)
+        self.assertTrue(np.allclose(back['resonance'], fit['resonance']))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo115)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,693 @@
+"""Streaming resonance peak detection and linewidths of long spectral sweeps
+
+Resonances of |ring_response|^2 (or dips of a through-port
+transmission, CCqo103_spectral_pump) are located in one pass over a
+sweep that may be far larger than memory, e.g. a memory-mapped .npy
+file.  The sweep is read in chunks; each chunk is extended by a halo
+of neighbouring points on both sides, so peaks, prominence bases and
+half-maximum crossings near chunk boundaries see the same data as in
+the interior, while every peak is reported only by the chunk that owns
+its index.  Within a chunk, all work is vectorized:
+  * local maxima by shifted comparisons
+  * a sliding-window minimum (doubling) bounds every candidate's
+    prominence from above, and a short probe on each side settles the
+    prominence of maxima riding on a flank, discarding noise cheaply
+  * prominence (as in scipy.signal.peak_prominences with a window of
+    'halo' points per side) and the crossings of the half-prominence
+    level from gathered windows of the surviving candidates
+  * crossings linearly interpolated and the peak position refined by
+    a parabola through the three highest samples
+For the Lorentzian |rr|^2 = g^2/(G^2 + v^2 (k - k0)^2) the full width at
+half maximum in wave vector is 2G/v, so each peak gives a damping
+  G = v * FWHM/2,  and  Q = position/FWHM,
+which is compared with the coupling-limited damping predicted by
+CCqo102_ring_damping.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo116_resonance_peaks.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo116_resonance_peaks
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo116_resonance_peaks.py
+
+Calculations
+------------
+Peaks of a sweep in sweep.npy on the grid 1000 + 1e-4*n, with the
+prediction for couplings 0.5 and 0.3 (velocity 1)::
+  python CCqo116_resonance_peaks.py --sweep sweep.npy --grid 1000 1e-4 --min-prominence 0.1 --couplings 0.5 0.3 --output peaks.csv
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+peakColumns : list
+    Column names of the peak table
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo102_ring_damping
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Chunked peak search with halos, prominence, FWHM, Q and damping
+1.0b2 [2026-10-18]
+    * No division warning for flat tops and prominence-only profiles
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo102_ring_damping']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo102_ring_damping as ccqo102
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'sweep':{
+        'desc':'sampled spectrum, e.g. |ring_response|^2 or transmission',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (N-element array, may be memory-mapped)',
+        'units':'arbitrary',
+        'flow':'input'
+        },
+    'grid':{
+        'desc':'start and step of a uniform wave vector grid',
+        'valrange':'step != 0',
+        'default': '(0.0, 1.0)',
+        'datatype':'float (2-element sequence)',
+        'units':'rad m^(-1)',
+        'flow':'input'
+        },
+    'min_prominence':{
+        'desc':'smallest prominence reported',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float',
+        'units':'[sweep]',
+        'flow':'input'
+        },
+    'halo':{
+        'desc':'points searched on each side of a peak',
+        'valrange':'[1, inf)',
+        'default': '4096',
+        'datatype':'integer',
+        'units':'1',
+        'flow':'input'
+        },
+    'damping':{
+        'desc':'ring damping from each linewidth, v*FWHM/2',
+        'valrange':'(0, inf)',
+        'default': 'None',
+        'datatype':'float (P-element array)',
+        'units':'rad s^(-1)',
+        'flow':'output'
+        }
+}
+
+peakColumns = ['index', 'position', 'height', 'prominence', 'fwhm', 'q_factor', 'damping',
+               'damping_predicted', 'damping_deviation']
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * grid step != 0
+      * min_prominence > 0
+      * halo >= 1, chunk_size >= 1
+      * velocity > 0
+    Warning checks:
+      * chunk_size < 2*halo (most of each read is halo)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(grid=(0.0, 0.1), min_prominence=0.5, halo=100, chunk_size=10**6)
+    >>> validateParameters(min_prominence=0.0)
+    Traceback (most recent call last):
+        ...
+    ValueError: Received min_prominence = 0.0
+    Expected min_prominence > 0
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    grid = kwargs.get('grid')
+    if grid is not None and grid[1] == 0:
+        eMsg += 'Received grid = {}'.format(grid) + os.linesep
+        eMsg += 'Expected a nonzero step' + os.linesep
+        err = True
+    for name in ['min_prominence', 'velocity']:
+        val = kwargs.get(name)
+        if val is not None and not val > 0:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} > 0'.format(name) + os.linesep
+            err = True
+    for name in ['halo', 'chunk_size']:
+        val = kwargs.get(name)
+        if val is not None and val < 1:
+            eMsg += 'Received {} = {}'.format(name, val) + os.linesep
+            eMsg += 'Expected {} >= 1'.format(name) + os.linesep
+            err = True
+    halo = kwargs.get('halo')
+    chunk = kwargs.get('chunk_size')
+    if halo is not None and chunk is not None and chunk < 2*halo:
+        wMsg += 'Received chunk_size = {} with halo = {}'.format(chunk, halo) + os.linesep
+        wMsg += 'Expected chunk_size >= 2*halo' + os.linesep
+        wrn = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def sliding_min(a, width):
+    """Minimum over the trailing window a[i-width+1 : i+1] (shorter at the start).
+
+    Examples
+    --------
+    >>> sliding_min(np.array([5.0, 3.0, 4.0, 1.0, 2.0, 6.0]), 3).tolist()
+    [5.0, 3.0, 3.0, 1.0, 1.0, 1.0]
+
+    """
+    m = np.array(a, dtype=float)
+    span = 1
+    while span < width:
+        step = min(span, width - span)
+        m[step:] = np.minimum(m[step:], m[:-step])
+        span += step
+    return m
+
+def _windows(buf, centers, halo, sign):
+    """Gather buf[centers + sign*(1..halo)] with NaN beyond the buffer."""
+    idx = centers[:, None] + sign*np.arange(1, halo + 1)
+    valid = (idx >= 0) & (idx < buf.size)
+    vals = buf.take(np.clip(idx, 0, buf.size - 1))
+    vals[~valid] = np.nan
+    return vals
+
+def _sideProfile(vals, height, level):
+    """Prominence base and half-level crossing distance on one side."""
+    rows = np.arange(vals.shape[0])
+    with np.errstate(invalid='ignore'):
+        higher = vals > height[:, None]
+        below = vals <= level[:, None]
+    # Prominence base: lowest point before the first higher sample
+    first = np.where(higher.any(axis=1), np.argmax(higher, axis=1), vals.shape[1])
+    before = np.arange(vals.shape[1]) < first[:, None]
+    base = np.where(before & ~np.isnan(vals), vals, np.inf).min(axis=1)
+    # Half-level crossing between distances j and j+1 (distance 0 is the peak)
+    j = np.argmax(below, axis=1)
+    found = below[rows, j]
+    prev = np.where(j > 0, vals[rows, np.maximum(j - 1, 0)], height)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frac = (prev - level)/(prev - vals[rows, j])
+    dist = np.where(found, j + frac, np.nan)
+    return base, dist
+
+def peaks_in_buffer(buf, own_start, own_stop, halo, min_prominence, block=4096):
+    """Peaks owned by buf[own_start:own_stop], using the rest of buf as halo.
+
+    Returns
+    -------
+    (index, offset, height, prominence, left, right)
+
+    index : integer array
+        Peak sample indices into buf
+    offset : float array
+        Parabolic refinement of the position, in samples
+    height, prominence : float arrays
+    left, right : float arrays
+        Distances (samples) from the peak sample to the half-prominence
+        crossings; NaN where not found within the halo
+
+    Examples
+    --------
+    >>> y = np.array([0.0, 1.0, 4.0, 1.0, 0.0, 0.5, 0.0])
+    >>> i, off, h, p, l, r = peaks_in_buffer(y, 0, y.size, 3, 1.0)
+    >>> i.tolist(), p.tolist(), (l + r).tolist()
+    ([2], [4.0], [1.3333333333333333])
+
+    """
+    lo = max(own_start, 1)
+    hi = min(own_stop, buf.size - 1)
+    empty = np.zeros(0)
+    if hi <= lo:
+        return np.zeros(0, dtype=np.intp), empty, empty, empty, empty, empty
+    c = buf[lo:hi]
+    cand = np.nonzero((c > buf[lo - 1:hi - 1]) & (c >= buf[lo + 1:hi + 1]))[0] + lo
+
+    # Upper bound on prominence from full-window minima on each side
+    winLo = max(lo - halo, 0)
+    winHi = min(hi + halo, buf.size)
+    seg = buf[winLo:winHi]
+    minLeft = sliding_min(seg, halo + 1)
+    minRight = sliding_min(seg[::-1], halo + 1)[::-1]
+    bound = buf[cand] - np.maximum(minLeft[cand - winLo], minRight[cand - winLo])
+    cand = cand[bound >= min_prominence]
+    # Maxima riding on a flank meet a higher sample within a few points
+    # without dropping by min_prominence; their prominence is final there
+    probe = min(32, halo)
+    h = buf[cand].astype(float)
+    blocked = np.zeros(cand.size, dtype=bool)
+    for sign in (-1, 1):
+        vals = _windows(buf, cand, probe, sign)
+        with np.errstate(invalid='ignore'):
+            higher = vals > h[:, None]
+        base = _sideProfile(vals, h, h)[0]
+        blocked |= higher.any(axis=1) & (h - base < min_prominence)
+    cand = cand[~blocked]
+
+    out = []
+    for b0 in range(0, cand.size, block):
+        ci = cand[b0:b0 + block]
+        h = buf[ci].astype(float)
+        left = _windows(buf, ci, halo, -1)
+        right = _windows(buf, ci, halo, 1)
+        # Prominence needs the bases before the half level is known
+        baseL = _sideProfile(left, h, h)[0]
+        baseR = _sideProfile(right, h, h)[0]
+        prom = h - np.maximum(baseL, baseR)
+        keep = prom >= min_prominence
+        ci, h, prom, left, right = ci[keep], h[keep], prom[keep], left[keep], right[keep]
+        level = h - 0.5*prom
+        dL = _sideProfile(left, h, level)[1]
+        dR = _sideProfile(right, h, level)[1]
+        ym, yp = left[:, 0], right[:, 0]
+        curv = ym - 2.0*h + yp
+        with np.errstate(invalid='ignore', divide='ignore'):
+            offset = np.where(curv < 0, 0.5*(ym - yp)/curv, 0.0)
+        offset = np.nan_to_num(offset)
+        out.append((ci, offset, h, prom, dL, dR))
+    if not out:
+        return np.zeros(0, dtype=np.intp), empty, empty, empty, empty, empty
+    return tuple(np.concatenate(parts) for parts in zip(*out))
+
+def calcqo116_resonance_peaks(sweep, grid=(0.0, 1.0), min_prominence=None, halo=4096,
+                              chunk_size=2**22, dips=False, velocity=1.0, couplings=None,
+                              coupling_velocities=1.0, intrinsic_damping=0.0):
+
+    """Resonances, linewidths, Q and damping of a sweep in one streaming pass.
+
+    Parameters
+    ----------
+    sweep : float array (N)
+        Spectrum on a uniform grid; a memory-mapped array is read one
+        chunk (plus halos) at a time
+    grid : (start, step)
+        Wave vector of sample n is start + n*step (Default=(0.0, 1.0))
+    min_prominence : float or None
+        Smallest reported prominence (Default=None, 10% of the range of
+        the first chunk)
+    halo : integer
+        Points per side searched for prominence bases and half-level
+        crossings; at least the half width of the broadest line
+        (Default=4096)
+    chunk_size : integer
+        Points owned per chunk (Default=2**22)
+    dips : boolean
+        Find minima (e.g. through-port transmission) (Default=False)
+    velocity : float
+        Photon velocity converting FWHM to damping (Default=1.0)
+    couplings : float array (C) or None
+        Ring couplings for the CCqo102_ring_damping prediction (Default=None)
+    coupling_velocities : float array (C)
+        Channel velocities for the prediction (Default=1.0)
+    intrinsic_damping : float
+        Damping added to the coupling-limited prediction (Default=0.0)
+
+    Returns
+    -------
+    peaks : numpy record array (P)
+        Columns peakColumns.  For dips, height is the sweep value at the
+        dip and prominence its depth.  Predicted damping and relative
+        deviation are NaN without couplings; fwhm and what follows from
+        it are NaN when a half-level crossing lies beyond the halo.
+
+    See Also
+    --------
+    peaks_in_buffer, CCqo102_ring_damping.calc_ring_damping
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    Twenty Lorentzian resonances of damping G = g^2/(2v) = 0.125 on a
+    200001-point grid, read in chunks of 7000 points so that lines
+    straddle chunk boundaries; the halo reaches the midpoints between lines
+    >>> k = np.linspace(0.0, 200.0, 200001)
+    >>> centers = 5.0 + 10.0*np.arange(20) + 0.00037
+    >>> y = sum(0.25/(0.125**2 + (k - c)**2) for c in centers)
+    >>> peaks = calcqo116_resonance_peaks(y, (0.0, 0.001), 1.0, halo=5000, chunk_size=7000,
+    ...                                   couplings=[0.5])
+    >>> peaks.size, np.allclose(peaks['position'], centers, atol=1e-5)
+    (20, True)
+    >>> bool(np.abs(peaks['damping_deviation']).max() < 2e-3)
+    True
+
+    The same resonances as transmission dips
+    >>> dips = calcqo116_resonance_peaks(1.0 - y/y.max(), (0.0, 0.001), 0.5, halo=5000,
+    ...                                  chunk_size=7000, dips=True)
+    >>> np.allclose(dips['fwhm'], peaks['fwhm'])
+    True
+
+    """
+
+    n = len(sweep)
+    start, step = float(grid[0]), float(grid[1])
+    sign = -1.0 if dips else 1.0
+    parts = []
+    for own in range(0, n, chunk_size):
+        ownStop = min(own + chunk_size, n)
+        lo = max(own - halo - 1, 0)
+        hi = min(ownStop + halo + 1, n)
+        buf = sign*np.asarray(sweep[lo:hi], dtype=float)
+        if min_prominence is None:
+            min_prominence = 0.1*(buf.max() - buf.min())
+        idx, offset, h, prom, dL, dR = peaks_in_buffer(buf, own - lo, ownStop - lo, halo,
+                                                       min_prominence)
+        parts.append((idx + lo, offset, sign*h, prom, dL + dR))
+    idx, offset, height, prom, width = [np.concatenate(p) for p in zip(*parts)]
+
+    peaks = np.zeros(idx.size, dtype=[(name, 'i8' if name == 'index' else 'f8')
+                                      for name in peakColumns])
+    peaks['index'] = idx
+    peaks['position'] = start + step*(idx + offset)
+    peaks['height'] = height
+    peaks['prominence'] = prom
+    peaks['fwhm'] = width*abs(step)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peaks['q_factor'] = np.abs(peaks['position'])/peaks['fwhm']
+    peaks['damping'] = 0.5*velocity*peaks['fwhm']
+    if couplings is None:
+        peaks['damping_predicted'] = np.nan
+    else:
+        predicted = ccqo102.calc_ring_damping(couplings, coupling_velocities, axis=-1)[0]
+        peaks['damping_predicted'] = predicted + intrinsic_damping
+    peaks['damping_deviation'] = peaks['damping']/peaks['damping_predicted'] - 1.0
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'resonance peaks: {} points in chunks of {} with halo {}, {} peaks'.format(
+            n, chunk_size, halo, idx.size) + os.linesep
+        lgr.debug(msg)
+
+    return peaks.view(np.recarray)
+
+def write_peaks(fname, peaks):
+    """Write a peak table from calcqo116_resonance_peaks as CSV."""
+    fmt = ['%d' if name == 'index' else '%.12g' for name in peaks.dtype.names]
+    rows = np.column_stack([peaks[name].astype(float) for name in peaks.dtype.names])
+    np.savetxt(fname, rows, fmt=fmt, delimiter=',', header=','.join(peaks.dtype.names), comments='')
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo116_resonance_peaks as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Streaming resonance peak detection and linewidths of long spectral sweeps',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--sweep',
+        required=True,
+        dest='sweep', action='store',
+        help="Sweep values (.npy, memory-mapped)",
+        metavar='sweepFile')
+    argp.add_argument(
+        '--grid',
+        type=float, nargs=2, default=[0.0, 1.0],
+        dest='grid', action='store',
+        help="Start and step of the wave vector grid",
+        metavar=('start', 'step'))
+    argp.add_argument(
+        '--min-prominence',
+        type=float, default=None,
+        dest='min_prominence', action='store',
+        help="Smallest reported prominence (default: 10%% of the first chunk's range)",
+        metavar='p')
+    argp.add_argument(
+        '--halo',
+        type=int, default=4096,
+        dest='halo', action='store',
+        help="Points searched on each side of a peak",
+        metavar='n')
+    argp.add_argument(
+        '--chunk-size',
+        type=int, default=2**22,
+        dest='chunk_size', action='store',
+        help="Points per chunk",
+        metavar='n')
+    argp.add_argument(
+        '--dips',
+        default=False,
+        dest='dips', action='store_true',
+        help="Find dips (transmission) instead of peaks")
+    argp.add_argument(
+        '--velocity',
+        type=float, default=1.0,
+        dest='velocity', action='store',
+        help="Photon velocity converting FWHM to damping",
+        metavar='v')
+    argp.add_argument(
+        '--couplings',
+        type=float, nargs='+', default=None,
+        dest='couplings', action='store',
+        help="Ring couplings for the CCqo102 damping prediction",
+        metavar='g')
+    argp.add_argument(
+        '--intrinsic-damping',
+        type=float, default=0.0,
+        dest='intrinsic_damping', action='store',
+        help="Damping added to the predicted coupling damping",
+        metavar='G0')
+    argp.add_argument(
+        '--output',
+        default='CCqo116_resonance_peaks.csv',
+        dest='output', action='store',
+        help="CSV file for the peak table",
+        metavar='csvFile')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo116_resonance_peaks.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    grid=args.grid, min_prominence=args.min_prominence, halo=args.halo,
+                    chunk_size=args.chunk_size, velocity=args.velocity)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo116_resonance_peaks.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo116_resonance_peaks.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo116_resonance_peaks.'
+                lgr.error(msg)
+                raise
+
+        sweep = np.load(args.sweep, mmap_mode='r')
+        peaks = emr.calcqo116_resonance_peaks(
+            sweep,
+            grid = args.grid,
+            min_prominence = args.min_prominence,
+            halo = args.halo,
+            chunk_size = args.chunk_size,
+            dips = args.dips,
+            velocity = args.velocity,
+            couplings = args.couplings,
+            intrinsic_damping = args.intrinsic_damping)
+        emr.write_peaks(args.output, peaks)
+        result = '{} peaks in {} points, table in {}'.format(peaks.size, sweep.size, args.output)
+        msg = ''
+        msg += ' CCqo116_resonance_peaks outputs' + os.linesep
+        msg += '  ' + result + os.linesep
+        msg += '  median damping = {}'.format(np.median(peaks['damping']))
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import CCqo116_resonance_peaks
+
+class TestCCqo116(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = (0.0, 0.01)
+        self.k = self.grid[0] + self.grid[1]*np.arange(6000)
+        # Lines on the first and last samples owned by chunks of 1000 points
+        self.index = [1000, 2999, 5000]
+        self.y = sum(0.01/(0.05**2 + (self.k - self.k[i])**2) for i in self.index)
+
+    def test_peaks_on_chunk_boundaries(self):
+        whole = CCqo116_resonance_peaks.calcqo116_resonance_peaks(
+            self.y, self.grid, 1.0, halo=300, chunk_size=self.y.size)
+        for chunk_size in (1000, 999, 1001):
+            peaks = CCqo116_resonance_peaks.calcqo116_resonance_peaks(
+                self.y, self.grid, 1.0, halo=300, chunk_size=chunk_size)
+            self.assertEqual(peaks['index'].tolist(), self.index)
+            for name in CCqo116_resonance_peaks.peakColumns[:-2]:
+                self.assertTrue(np.allclose(peaks[name], whole[name]))
+        self.assertTrue(np.allclose(whole['damping'], 0.05, rtol=1e-3))
+
+    def test_plateau_straddling_boundary(self):
+        y = np.zeros(40)
+        y[19] = y[20] = 1.0
+        peaks = CCqo116_resonance_peaks.calcqo116_resonance_peaks(y, min_prominence=0.5, halo=5,
+                                                                  chunk_size=20)
+        self.assertEqual(peaks['index'].tolist(), [19])
+        self.assertTrue(np.allclose(peaks['position'], 19.5))
+
+    def test_edges_and_no_peaks(self):
+        y = np.linspace(1.0, 0.0, 50)
+        peaks = CCqo116_resonance_peaks.calcqo116_resonance_peaks(y, min_prominence=0.1, halo=5,
+                                                                  chunk_size=7)
+        self.assertEqual(peaks.size, 0)
+        self.assertEqual(list(peaks.dtype.names), CCqo116_resonance_peaks.peakColumns)
+
+    def test_dips_from_memmap(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'sweep.npy')
+            np.save(fname, 1.0 - self.y/self.y.max())
+            sweep = np.load(fname, mmap_mode='r')
+            dips = CCqo116_resonance_peaks.calcqo116_resonance_peaks(
+                sweep, self.grid, 0.5, halo=300, chunk_size=1000, dips=True,
+                couplings=[np.sqrt(0.1)], velocity=1.0)
+            del sweep
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(dips['index'].tolist(), self.index)
+        self.assertTrue(np.all(dips['height'] < 0.01))
+        self.assertTrue(np.all(np.abs(dips['damping_deviation']) < 1e-2))
+
+    def test_validate_parameters(self):
+        self.assertRaises(ValueError, CCqo116_resonance_peaks.validateParameters, grid=(0.0, 0.0))
+        self.assertRaises(ValueError, CCqo116_resonance_peaks.validateParameters, halo=0)
+        self.assertRaises(RuntimeWarning, CCqo116_resonance_peaks.validateParameters, halo=10,
+                          chunk_size=15)
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo116)
+unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,541 @@
+"""Supermodes of coupled ring resonators for batches of designs
+
+Rings coupled to each other share their resonances: the amplitudes a_j
+of n rings obey da/dt = -1j M a with the non-Hermitian matrix
+  M_jj = w_j - 1j G_j,   M_jk = kappa_jk  (M_kj = conj(kappa_jk)),
+where w_j is the resonance (detuning) of ring j, G_j its damping from
+CCqo102_ring_damping (external channels) plus any intrinsic damping,
+and kappa_jk the ring-ring coupling.  Each eigenvalue
+  lambda_s = w_s - 1j g_s
+of M is a supermode with split frequency w_s and damping (half
+linewidth) g_s.  The matrices of every design variant are assembled as
+one stacked (batch, n, n) array and diagonalized by numpy's batched
+eig, so 10^5 designs need no Python loop; modes are sorted by
+frequency within each design.
+
+Command-line examples
+=====================
+Getting help
+------------
+Obtain the usage statement::
+  python CCqo117_coupled_ring_supermodes.py --help
+
+Obtain programmer-level documentation::
+  pydoc CCqo117_coupled_ring_supermodes
+
+Execute module tests that are embedded in docstrings (verbose)
+  python -m doctest -v CCqo117_coupled_ring_supermodes.py
+
+Calculations
+------------
+Three rings in a chain, the outer ones bus-coupled (g = 0.5, v = 1)::
+  python CCqo117_coupled_ring_supermodes.py --detunings 0 0 0 --couplings 0.5 0 0.5 --ring-coupling 1 1
+
+Data
+====
+lgr : object (logging)
+    A logging object for the entire module that is configured in the
+    method appl_setupLog().
+
+paramDefns : dict
+    Collection of calculation variables with descriptions, expected
+    ranges, defaults, units, data types, and placements in the flow.
+
+DEPENDENCIES
+============
+Module: os, sys, logging, numpy, CCqo102_ring_damping
+Command-line extras: argparse, traceback, pprint
+
+DEVELOPMENT METADATA
+====================
+Discrete data elements are captured in the module-level data
+immediately following this docstring.  Most are self-explanatory
+and identify information such as copyright, author, etc.
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Stacked coupling matrices and batched eigenvalues of supermodes
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import sys
+import os
+import traceback
+import logging
+import numpy as np
+
+# Sibling concept calculations live in their own directories
+_modelsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ccDir in ['CCqo102_ring_damping']:
+    _ccPath = os.path.join(_modelsDir, _ccDir)
+    if _ccPath not in sys.path: sys.path.append(_ccPath)
+import CCqo102_ring_damping as ccqo102
+
+lgr = logging.getLogger('__main__')
+
+paramDefns = {
+    'detunings':{
+        'desc':'resonance of each ring relative to a common reference',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (... x n array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'ring_damping':{
+        'desc':'damping of each uncoupled ring',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (... x n array)',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'ring_coupling':{
+        'desc':'ring-ring coupling, nearest neighbours (... x n-1) or full (... x n x n)',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'complex array',
+        'units':'rad s^(-1)',
+        'flow':'input'
+        },
+    'frequencies':{
+        'desc':'supermode frequencies, ascending per design',
+        'valrange':'(-inf, inf)',
+        'default': 'None',
+        'datatype':'float (... x n array)',
+        'units':'rad s^(-1)',
+        'flow':'output'
+        },
+    'dampings':{
+        'desc':'supermode damping (half linewidth)',
+        'valrange':'[0, inf)',
+        'default': 'None',
+        'datatype':'float (... x n array)',
+        'units':'rad s^(-1)',
+        'flow':'output'
+        }
+}
+
+def validateParameters(**kwargs):
+    """Validate input parameters, raising an exception for invalid and dubious values.
+
+    Error checks:
+      * ring_damping >= 0
+      * ring_coupling shaped (..., n-1) or (..., n, n) for n detunings
+    Warning checks:
+      * full ring_coupling that is not Hermitian (gain or loss in the
+        coupling itself)
+
+    Parameters
+    ----------
+    kwargs : dict
+        Dictionary of parameters (need not be complete).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeWarning, ValueError
+
+    Examples
+    --------
+    >>> validateParameters(detunings=[0.0, 1.0], ring_damping=[0.1, 0.2], ring_coupling=[0.5])
+    >>> validateParameters(detunings=[0.0, 1.0, 2.0], ring_coupling=[0.5])
+    Traceback (most recent call last):
+        ...
+    ValueError: Received ring_coupling with shape (1,)
+    Expected last dimension 2 (chain) or last two dimensions 3 x 3
+    <BLANKLINE>
+
+    """
+
+    # Log the inputs
+    msg = ''
+    msg += 'Inputs for validation:' + os.linesep
+    for k, v in sorted(kwargs.items()):
+        msg += '  {} = {}'.format(k, np.shape(v) if np.size(v) > 8 else v) + os.linesep
+    lgr.debug(msg)
+
+    # Set flag variables and messages for errors (err, eMsg) and warnings (wrn, wMsg)
+    err = False
+    wrn = False
+    eMsg = ''
+    wMsg = ''
+
+    G = kwargs.get('ring_damping')
+    if G is not None and not np.all(np.asarray(G) >= 0):
+        eMsg += 'Received ring_damping with negative values' + os.linesep
+        eMsg += 'Expected ring_damping >= 0' + os.linesep
+        err = True
+    w = kwargs.get('detunings')
+    K = kwargs.get('ring_coupling')
+    if w is not None and K is not None:
+        n = np.shape(w)[-1]
+        K = np.asarray(K)
+        chain = K.shape[-1:] == (n - 1,)
+        full = K.shape[-2:] == (n, n)
+        if not (chain or full):
+            eMsg += 'Received ring_coupling with shape {}'.format(K.shape) + os.linesep
+            eMsg += 'Expected last dimension {} (chain) or last two dimensions {} x {}'.format(
+                n - 1, n, n) + os.linesep
+            err = True
+        elif full and not chain and not np.allclose(K, np.conj(np.swapaxes(K, -1, -2))):
+            wMsg += 'Received a ring_coupling matrix that is not Hermitian' + os.linesep
+            wMsg += 'Expected kappa_kj = conj(kappa_jk)' + os.linesep
+            wrn = True
+
+    if wrn:
+        lgr.warn(wMsg)
+        raise RuntimeWarning(wMsg)
+    if err:
+        lgr.error(eMsg)
+        raise ValueError(eMsg)
+
+def appl_setupLog(level=logging.WARNING,
+                  msgFmt='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s',
+                  logFile=None):
+    """Set up logging level, format, and output file.
+
+    Log to STDOUT at the given 'level' in a certain 'msgFmt', and optionally write to 'logFile'.
+
+    Parameters
+    ----------
+    level : integer
+        Numeric value corresponds to logging levels described in the
+        logging package. (Default=30 <- logging.WARNING)
+    msgFmt : string
+        Format of each log entry. The default yields lines of the form
+        <dateTime><logLevel><module:method><logMessage>.
+        (Default='%(asctime)s %(levelname)s [%(module)s:%(funcName)s] %(message)s')
+    logFile : string
+        Filename in a writable location.  Value of None means log entries
+        will not be written to a file. (Default=None)
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    logging
+
+    Exceptions
+    ----------
+    None
+
+    """
+
+    formatter = logging.Formatter(msgFmt)
+
+    # Console output
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+
+    # File output
+    if logFile is not None:
+        fh = logging.FileHandler(logFile, mode='w')
+        fh.setFormatter(formatter)
+
+    # Set the (global) logger's level and handlers
+    lgr.setLevel(level)
+    lgr.addHandler(ch)
+    if logFile is not None: lgr.addHandler(fh)
+
+def coupling_matrices(detunings, ring_damping, ring_coupling):
+    """Stack the non-Hermitian matrices M = diag(w - 1j G) + K.
+
+    Parameters
+    ----------
+    detunings, ring_damping : float arrays (... x n)
+    ring_coupling : complex array (... x n-1) or (... x n x n)
+        Nearest-neighbour couplings of a chain (the lower diagonal gets
+        their conjugates) or full matrices used as given off the diagonal
+
+    Returns
+    -------
+    M : complex array (... x n x n)
+
+    Examples
+    --------
+    >>> coupling_matrices([1.0, 2.0], [0.5, 0.25], [0.5j]).tolist()
+    [[(1-0.5j), 0.5j], [-0.5j, (2-0.25j)]]
+
+    """
+    w = np.asarray(detunings, dtype=float)
+    G = np.asarray(ring_damping, dtype=float)
+    K = np.asarray(ring_coupling)
+    n = w.shape[-1]
+    if K.shape[-1:] == (n - 1,) and not K.shape[-2:] == (n, n):
+        batch = np.broadcast(w[..., 0], G[..., 0], K[..., 0]).shape
+        M = np.zeros(batch + (n, n), dtype=complex)
+        j = np.arange(n - 1)
+        M[..., j, j + 1] = K
+        M[..., j + 1, j] = np.conj(K)
+    else:
+        batch = np.broadcast(w[..., 0], G[..., 0], K[..., 0, 0]).shape
+        M = np.array(np.broadcast_to(K, batch + (n, n)), dtype=complex)
+    d = np.arange(n)
+    M[..., d, d] = w - 1j*G
+    return M
+
+def calcqo117_coupled_ring_supermodes(detunings, ring_coupling, ring_damping=None, couplings=None,
+                                      velocities=1.0, intrinsic_damping=0.0, modes=False,
+                                      block=65536):
+
+    """Split frequencies and dampings of coupled-ring supermodes for many designs.
+
+    Parameters
+    ----------
+    detunings : float array (... x n)
+        Resonance of each ring
+    ring_coupling : complex array (... x n-1) or (... x n x n)
+        Ring-ring coupling (see coupling_matrices)
+    ring_damping : float array (... x n) or None
+        Damping of each ring.  None derives it from 'couplings'
+    couplings : float array (... x n x C) or None
+        External channel couplings of each ring for
+        CCqo102_ring_damping.calc_ring_damping
+    velocities : float array (C)
+        Channel velocities (Default=1.0)
+    intrinsic_damping : float array (... x n)
+        Added to the damping (Default=0.0)
+    modes : boolean
+        Also return eigenvectors (Default=False)
+    block : integer
+        Designs diagonalized per eig call, bounding the LAPACK
+        workspace (Default=65536)
+
+    Returns
+    -------
+    (frequencies, dampings) or (frequencies, dampings, vectors)
+
+    frequencies, dampings : float arrays (... x n)
+        Re and -Im of the eigenvalues, ascending in frequency
+    vectors : complex array (... x n x n)
+        Column s is the supermode of frequencies[..., s]
+
+    See Also
+    --------
+    coupling_matrices, numpy.linalg.eig, CCqo102_ring_damping.calc_ring_damping
+
+    Exceptions
+    ----------
+    None
+
+    Examples
+    --------
+    Two rings, detunings +/- d, dampings G1 and G2 and coupling kappa:
+    lambda = -1j(G1 + G2)/2 +/- sqrt((d - 1j(G1 - G2)/2)^2 + kappa^2)
+    >>> rng = np.random.RandomState(43)
+    >>> d, G1, G2, kappa = rng.rand(4, 100000)
+    >>> w, g = calcqo117_coupled_ring_supermodes(np.column_stack((d, -d)), kappa[:, None],
+    ...                                          np.column_stack((G1, G2)))
+    >>> root = np.sqrt((d - 0.5j*(G1 - G2))**2 + kappa**2)
+    >>> lam = -0.5j*(G1 + G2)[:, None] + np.column_stack((-root, root))
+    >>> lam = np.where((lam.real[:, :1] > lam.real[:, 1:]), lam[:, ::-1], lam)
+    >>> np.allclose(w, lam.real), np.allclose(g, -lam.imag)
+    (True, True)
+
+    Damping from a bus coupler through CCqo102 (g = 0.5, v = 1 gives 0.125)
+    is shared by both supermodes, which split by 2 sqrt(kappa^2 - 0.0625^2)
+    >>> w, g = calcqo117_coupled_ring_supermodes([0.0, 0.0], [1.0], couplings=[[0.5], [0.0]])
+    >>> np.allclose(w, [-np.sqrt(1 - 0.0625**2), np.sqrt(1 - 0.0625**2)]), np.allclose(g, 0.0625)
+    (True, True)
+
+    """
+
+    w = np.asarray(detunings, dtype=float)
+    if ring_damping is None:
+        ring_damping = ccqo102.calc_ring_damping(couplings, velocities, axis=-1)[0]
+    G = np.asarray(ring_damping, dtype=float) + intrinsic_damping
+    M = coupling_matrices(w, G, ring_coupling)
+    batch, n = M.shape[:-2], M.shape[-1]
+    flat = M.reshape(-1, n, n)
+
+    lam = np.empty(flat.shape[:2], dtype=complex)
+    vec = np.empty(flat.shape, dtype=complex) if modes else None
+    for b0 in range(0, flat.shape[0], block):
+        if modes:
+            lam[b0:b0 + block], vec[b0:b0 + block] = np.linalg.eig(flat[b0:b0 + block])
+        else:
+            lam[b0:b0 + block] = np.linalg.eigvals(flat[b0:b0 + block])
+
+    # Ascending frequency within each design
+    order = np.argsort(lam.real, axis=1)
+    rows = np.arange(lam.shape[0])[:, None]
+    lam = lam[rows, order]
+    frequencies = lam.real.reshape(batch + (n,))
+    dampings = -lam.imag.reshape(batch + (n,))
+
+    if lgr.getEffectiveLevel() == logging.DEBUG:
+        msg = ''
+        msg += 'supermodes: {} designs of {} rings'.format(flat.shape[0], n) + os.linesep
+        lgr.debug(msg)
+
+    if modes:
+        vec = vec[rows[:, :, None], np.arange(n)[None, :, None], order[:, None, :]]
+        return frequencies, dampings, vec.reshape(batch + (n, n))
+    return frequencies, dampings
+
+if '__main__' == __name__:
+
+    import argparse
+    import pprint
+    pp = pprint.PrettyPrinter(indent=2)
+
+    import CCqo117_coupled_ring_supermodes as emr
+
+    # Create the option object
+    #  - Help option (-h, --help) included by default
+    #  - Usage statement included by default
+    argp = argparse.ArgumentParser(
+        description='Supermodes of coupled ring resonators',
+        epilog='Unambiguous option abbreviations are permitted.')
+    # Add options
+    # ===========
+    argp.add_argument(
+        '--detunings',
+        type=float, nargs='+', required=True,
+        dest='detunings', action='store',
+        help="Resonance of each ring",
+        metavar='w')
+    argp.add_argument(
+        '--ring-coupling',
+        type=float, nargs='+', required=True,
+        dest='ring_coupling', action='store',
+        help="Nearest-neighbour ring-ring couplings (n-1 values)",
+        metavar='kappa')
+    argp.add_argument(
+        '--ring-damping',
+        type=float, nargs='+', default=None,
+        dest='ring_damping', action='store',
+        help="Damping of each ring",
+        metavar='G')
+    argp.add_argument(
+        '--couplings',
+        type=float, nargs='+', default=None,
+        dest='couplings', action='store',
+        help="Bus coupling of each ring (damping from CCqo102 when --ring-damping is not given)",
+        metavar='g')
+    argp.add_argument(
+        '--velocity',
+        type=float, default=1.0,
+        dest='velocity', action='store',
+        help="Bus velocity",
+        metavar='v')
+    argp.add_argument(
+        '--intrinsic-damping',
+        type=float, default=0.0,
+        dest='intrinsic_damping', action='store',
+        help="Damping added to every ring",
+        metavar='G0')
+
+    argp.add_argument(
+        '--validate',
+        dest='validate', action='store_true',
+        help="Validate parameters"
+        )
+    argp.add_argument(
+        '--no-validate',
+        default=False,
+        dest='validate', action='store_false',
+        help="Do not validate parameters"
+        )
+
+    argp.add_argument(
+        '--log-file',
+        default='CCqo117_coupled_ring_supermodes.log',
+        dest='log_file', action='store',
+        help="File for log messages",
+        metavar = 'logFilename')
+    argp.add_argument(
+        '--log-entry-format',
+        default='%(asctime)s %(levelname)s [%(filename)s:%(funcName)s] %(message)s',
+        dest='log_entry_format', action='store',
+        help="Formate for log messages",
+        metavar = 'msgFmt')
+    argp.add_argument(
+        '-v', '--verbose',
+        dest='verbose', action='count',
+        help="Increase verbosity (-v=WARNING, -vv=INFO, -vvv=DEBUG, -vvv(v+)=DEBUG)")
+
+    vMsg = '{} version {}'.format(__file__, __version__)
+    argp.add_argument(
+        '--Version',
+        action='version', version=vMsg,
+        help="Print version and exit"
+        )
+
+    # Parse options and instantiate object
+    # ====================================
+    args = argp.parse_args()
+
+    # Initialize logging
+    logLevel = logging.CRITICAL
+    levelTranslation = {0:logging.CRITICAL, 1:logging.WARNING, 2:logging.INFO, 3:logging.DEBUG}
+
+    if args.verbose:
+        verbosity = min(logging.DEBUG, args.verbose)
+        logLevel = levelTranslation[verbosity]
+
+    appl_setupLog(logLevel, args.log_entry_format, args.log_file)
+    lgr.debug('Inputs and Defaults: ' + os.linesep + pp.pformat(args.__dict__))
+
+    # Act
+    try:
+        ringDamping = args.ring_damping
+        if ringDamping is None and args.couplings is None:
+            ringDamping = [0.0]*len(args.detunings)
+        if args.validate:
+            try:
+                emr.validateParameters(
+                    detunings=args.detunings, ring_damping=ringDamping,
+                    ring_coupling=args.ring_coupling)
+            except RuntimeWarning as e:
+                msg = 'Dubious inputs for CCqo117_coupled_ring_supermodes.'
+                lgr.warn(str(e))
+                pass
+            except ValueError as e:
+                msg = 'Invalid value for CCqo117_coupled_ring_supermodes.'
+                lgr.error(str(e))
+                raise
+            except Exception:
+                msg = 'Error in CCqo117_coupled_ring_supermodes.'
+                lgr.error(msg)
+                raise
+
+        couplings = None if args.couplings is None else np.asarray(args.couplings)[:, None]
+        frequencies, dampings = emr.calcqo117_coupled_ring_supermodes(
+            args.detunings, args.ring_coupling,
+            ring_damping = ringDamping,
+            couplings = couplings,
+            velocities = args.velocity,
+            intrinsic_damping = args.intrinsic_damping)
+        result = np.vstack((frequencies, dampings))
+        msg = ''
+        msg += ' CCqo117_coupled_ring_supermodes outputs' + os.linesep
+        msg += '  frequencies = {}'.format(frequencies) + os.linesep
+        msg += '  dampings = {}'.format(dampings)
+        if lgr.getEffectiveLevel() > logging.INFO: print(result)
+        else: lgr.info(msg)
+
+    except Exception:
+        ex_type, ex, tb = sys.exc_info()
+        print(ex_type)
+        print(ex)
+        lgr.error('<TRACEBACK>')
+        traceback.print_tb(tb)
+        lgr.error('</TRACEBACK>')
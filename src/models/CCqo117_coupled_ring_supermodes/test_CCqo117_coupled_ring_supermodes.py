@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import CCqo117_coupled_ring_supermodes
+
+class TestCCqo117(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(117)
+        self.w = rng.randn(6, 5, 4)
+        self.G = rng.rand(6, 5, 4)
+        self.kappa = rng.randn(6, 5, 3) + 1j*rng.randn(6, 5, 3)
+
+    def test_matches_loop_over_designs(self):
+        w, g = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, self.kappa, self.G, block=7)
+        self.assertEqual(w.shape, (6, 5, 4))
+        for idx in np.ndindex(6, 5):
+            M = np.diag(self.w[idx] - 1j*self.G[idx])
+            for j in range(3):
+                M[j, j + 1] = self.kappa[idx][j]
+                M[j + 1, j] = np.conj(self.kappa[idx][j])
+            lam = np.linalg.eigvals(M)
+            lam = lam[np.argsort(lam.real)]
+            self.assertTrue(np.allclose(w[idx], lam.real))
+            self.assertTrue(np.allclose(g[idx], -lam.imag))
+
+    def test_chain_equals_full_matrix(self):
+        M = CCqo117_coupled_ring_supermodes.coupling_matrices(self.w, 0*self.G, self.kappa)
+        d = np.arange(4)
+        M[..., d, d] = 0.0
+        chain = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, self.kappa, self.G)
+        full = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, M, self.G)
+        self.assertTrue(np.allclose(chain[0], full[0]))
+        self.assertTrue(np.allclose(chain[1], full[1]))
+
+    def test_modes_are_eigenvectors(self):
+        w, g, vec = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, self.kappa, self.G, modes=True)
+        M = CCqo117_coupled_ring_supermodes.coupling_matrices(self.w, self.G, self.kappa)
+        lam = w - 1j*g
+        self.assertTrue(np.allclose(np.matmul(M, vec), vec*lam[..., None, :]))
+
+    def test_damping_from_couplings(self):
+        couplings = np.abs(np.random.RandomState(5).randn(6, 5, 4, 2))
+        velocities = np.array([1.0, 2.0])
+        G = (couplings**2/(2*velocities)).sum(axis=-1)
+        a = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, self.kappa, couplings=couplings, velocities=velocities, intrinsic_damping=0.1)
+        b = CCqo117_coupled_ring_supermodes.calcqo117_coupled_ring_supermodes(
+            self.w, self.kappa, G + 0.1)
+        self.assertTrue(np.allclose(a[0], b[0]))
+        self.assertTrue(np.allclose(a[1], b[1]))
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCCqo117)
+unittest.TextTestRunner(verbosity=2).run(suite)
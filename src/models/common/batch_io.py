@@ -0,0 +1,185 @@
+"""Block-wise JSONL/CSV parameter records for the --batch mode of models.
+
+Models that evaluate streams of parameter records (CCqo101_FWM_detuning,
+CCqo102_ring_damping) read them in blocks with read_batches and write
+their outputs with write_records.  A record is a dict of paramDefns
+names to numbers or lists of numbers.
+
+Models import this module by appending this directory to sys.path, as
+they do for sibling concept calculations.
+
+Data
+====
+batchFormats : list
+    Formats understood by read_batches and write_records
+
+DEPENDENCIES
+============
+Module: re, csv, json
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * read_batches and write_records moved here from CCqo101 and CCqo102;
+      JSONL output serializes each record on its own line
+1.0b2 [2026-10-18]
+    * JSONL lines are parsed one at a time; a line that is not a single
+      JSON object is a ValueError naming its line number
+
+"""
+
+__version__ = '1.0b2'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = []
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import re
+import csv
+import json
+
+batchFormats = ['jsonl', 'csv']
+
+def read_batches(stream, fmt='jsonl', block_size=4096):
+    """Read parameter records from a JSONL or CSV stream in blocks.
+
+    JSONL lines are objects keyed by paramDefns names.  CSV starts with
+    a header of paramDefns names; a column named name[i] holds element
+    i of a list-valued parameter, and empty cells are left out of the
+    record.  Lines are read only as blocks are requested, so the stream
+    may be a pipe.  Each record is parsed on its own, so every output
+    record belongs to exactly one input line.
+
+    Parameters
+    ----------
+    stream : file object
+        Text stream of records
+    fmt : string
+        One of batchFormats (Default='jsonl')
+    block_size : integer
+        Records per block (Default=4096)
+
+    Returns
+    -------
+    (header, blocks)
+
+    header : list of strings or None
+        CSV column names (None for JSONL)
+    blocks : generator of lists of dicts
+        Records in input order
+
+    Examples
+    --------
+    >>> import io
+    >>> text = u'couplings[0],couplings[1],velocities\\n12.0,20.0,2.0\\n12.0,,3.0\\n'
+    >>> header, blocks = read_batches(io.StringIO(text), 'csv', block_size=1)
+    >>> [sorted(block[0].items()) for block in blocks]
+    [[('couplings', [12.0, 20.0]), ('velocities', 2.0)], [('couplings', [12.0]), ('velocities', 3.0)]]
+    >>> header, blocks = read_batches(io.StringIO(u'{"velocities": 1.0}\\n\\n[1, 2]\\n'))
+    >>> next(blocks)
+    Traceback (most recent call last):
+        ...
+    ValueError: line 3: expected a JSON object, received [1, 2]
+
+    """
+
+    lineNumber = [0]
+
+    def nonblank():
+        for n, line in enumerate(iter(stream.readline, ''), 1):
+            if line.strip():
+                lineNumber[0] = n
+                yield line
+
+    lines = nonblank()
+    if fmt == 'jsonl':
+        header = None
+
+        def parse(line):
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError('expected a JSON object, received {}'.format(line.strip()))
+            return record
+    elif fmt == 'csv':
+        reader = csv.reader(lines)
+        header = [name.strip() for name in next(reader)]
+        fields = [re.match(r'^(\w+)(?:\[(\d+)\])?$', name) for name in header]
+        if not all(fields):
+            raise ValueError('Bad CSV column names: {}'.format(
+                [n for n, m in zip(header, fields) if not m]))
+        fields = [(m.group(1), None if m.group(2) is None else int(m.group(2))) for m in fields]
+        lines = reader
+
+        def parse(row):
+            record = {}
+            for (name, idx), cell in zip(fields, row):
+                if not cell.strip():
+                    continue
+                if idx is None:
+                    record[name] = float(cell)
+                else:
+                    record.setdefault(name, {})[idx] = float(cell)
+            for name, value in record.items():
+                if isinstance(value, dict):
+                    record[name] = [value[i] for i in sorted(value)]
+            return record
+    else:
+        raise ValueError('Unknown batch format {} (expected one of {})'.format(fmt, batchFormats))
+
+    def blocks():
+        block = []
+        for line in lines:
+            try:
+                block.append(parse(line))
+            except ValueError as e:
+                raise ValueError('line {}: {}'.format(lineNumber[0], e))
+            if len(block) == block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    return header, blocks()
+
+def write_records(stream, fmt, records, names, header=False):
+    """Write output records as JSONL objects or CSV rows of 'names'.
+
+    Missing CSV values are written as empty cells; list values of a
+    name fill the columns name[0], name[1], ... listed in 'names'.
+
+    Examples
+    --------
+    >>> import sys
+    >>> write_records(sys.stdout, 'jsonl', [{'a': [{'b': 1}, {'b': 2}]}, {'a': []}], ['a'])
+    {"a":[{"b":1},{"b":2}]}
+    {"a":[]}
+    >>> write_records(sys.stdout, 'csv', [{'a': [1.5], 'c': 2.0}, {'c': 3.0}],
+    ...               ['a[0]', 'a[1]', 'c'], header=True)
+    a[0],a[1],c
+    1.5,,2.0
+    ,,3.0
+
+    """
+
+    if fmt == 'jsonl':
+        if records:
+            stream.write(''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in records))
+        return
+    if header:
+        stream.write(','.join(names) + '\n')
+    rows = []
+    for r in records:
+        cells = []
+        for name in names:
+            base, _, idx = name.partition('[')
+            value = r.get(base)
+            if idx and value is not None:
+                i = int(idx[:-1])
+                value = value[i] if i < len(value) else None
+            cells.append('' if value is None else repr(value))
+        rows.append(','.join(cells) + '\n')
+    stream.write(''.join(rows))
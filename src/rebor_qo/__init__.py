@@ -0,0 +1,241 @@
+"""Registry and lazy-import runner for the CCqo model catalog.
+
+Models live in src/models/CCqo<ddd>_<concept>/CCqo<ddd>_<concept>.py and
+each is a self-contained script.  The registry finds them by reading
+their source with the ast module (docstring summary, __version__,
+paramDefns and calc* functions), so listing the catalog imports no
+model and no numpy.  Only the model that is run is imported.
+
+Command-line examples
+=====================
+
+List the catalog (from the src directory)::
+  python -m rebor_qo list
+Show the parameters of one model::
+  python -m rebor_qo info CCqo103
+Run a model with its own command-line options::
+  python -m rebor_qo run CCqo102 --couplings 1.0 2.0 --velocities 3.0 4.0
+Measure interpreter startup and import cost of every model::
+  python -m rebor_qo profile
+
+Data
+====
+modelsDir : string
+    Default directory searched for models (src/models)
+
+DEPENDENCIES
+============
+Module: os, re, sys, ast, time, json, subprocess, runpy, importlib
+Command-line extras: argparse
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Registry of models from source metadata; run, list, info and
+      profile subcommands
+
+"""
+
+__version__ = '1.0b1'
+
+__copyright__ = "Copyright Timothy C. Burt, 2016"
+__author__ = "Timothy C. Burt"
+__credits__ = ["Timothy C. Burt"]
+__license__ = "MIT"
+__maintainer__ = "Timothy C. Burt"
+__email__ = "rketburt@gmail.com"
+__status__ = "Development"
+
+import os
+import re
+import sys
+import ast
+import time
+import json
+import runpy
+import importlib
+import subprocess
+from collections import OrderedDict
+
+modelsDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+# Model metadata precedes the first top-level def or class
+_bodyStart = re.compile(r'^(def|class) ', re.MULTILINE)
+_calcDef = re.compile(r'^def (calc\w*)\(', re.MULTILINE)
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+def read_metadata(path):
+    """Metadata of a model module read from its source, without importing it.
+
+    Only the module header (up to the first top-level def or class) is
+    parsed; calc* functions are found by pattern.
+
+    Parameters
+    ----------
+    path : string
+        Model source file
+
+    Returns
+    -------
+    dict with keys 'name', 'id', 'path', 'summary', 'version',
+    'paramDefns' (None when not a literal) and 'functions' (public
+    top-level calc* functions)
+
+    Examples
+    --------
+    >>> info = read_metadata(os.path.join(modelsDir, 'CCqo102_ring_damping',
+    ...                                   'CCqo102_ring_damping.py'))
+    >>> print(info['id'])
+    CCqo102
+    >>> print(sorted(info['paramDefns'])[0])
+    couplings
+
+    """
+    with open(path) as f:
+        source = f.read()
+    start = _bodyStart.search(source)
+    try:
+        tree = ast.parse(source[:start.start()] if start else source, path)
+    except SyntaxError:
+        tree = ast.parse(source, path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    info = OrderedDict([('name', name), ('id', name.split('_')[0]), ('path', path),
+                        ('summary', (ast.get_docstring(tree) or '').strip().split('\n')[0]),
+                        ('version', None), ('paramDefns', None), ('functions', [])])
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+           and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id == '__version__':
+                info['version'] = _literal(node.value)
+            elif node.targets[0].id == 'paramDefns':
+                info['paramDefns'] = _literal(node.value)
+    info['functions'] = _calcDef.findall(source)
+    return info
+
+def discover(directory=None):
+    """Catalog of models in 'directory' (Default=modelsDir), keyed by model id.
+
+    Examples
+    --------
+    >>> registry = discover()
+    >>> print(registry['CCqo101']['name'])
+    CCqo101_FWM_detuning
+
+    """
+    directory = modelsDir if directory is None else directory
+    registry = OrderedDict()
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry, entry + '.py')
+        if entry.startswith('CCqo') and os.path.isfile(path):
+            info = read_metadata(path)
+            registry[info['id']] = info
+    return registry
+
+def find(model, registry=None):
+    """Registry entry for a model id (CCqo103), full name or unique prefix.
+
+    Raises
+    ------
+    KeyError for unknown or ambiguous names
+
+    """
+    registry = discover() if registry is None else registry
+    if model in registry:
+        return registry[model]
+    matches = [info for info in registry.values()
+               if info['name'] == model or info['name'].lower().startswith(model.lower())]
+    if len(matches) != 1:
+        raise KeyError('{} model {}: {}'.format('Ambiguous' if matches else 'Unknown', model,
+                                              ', '.join(info['name'] for info in matches)))
+    return matches[0]
+
+def _addPath(info):
+    modelDir = os.path.dirname(info['path'])
+    if modelDir not in sys.path: sys.path.insert(0, modelDir)
+
+def load(model, registry=None):
+    """Import a model module (and only that one) by id or name."""
+    info = find(model, registry)
+    _addPath(info)
+    return importlib.import_module(info['name'])
+
+def run(model, argv=(), registry=None):
+    """Run a model's command line with arguments 'argv' as if it were __main__.
+
+    Returns
+    -------
+    Seconds spent running the model, including its imports
+
+    """
+    info = find(model, registry)
+    _addPath(info)
+    savedArgv = sys.argv
+    sys.argv = [info['path']] + list(argv)
+    t0 = time.time()
+    try:
+        runpy.run_path(info['path'], run_name='__main__')
+    finally:
+        sys.argv = savedArgv
+    return time.time() - t0
+
+_importProbe = '''
+import sys, time, json
+t0 = time.time()
+import numpy
+t1 = time.time()
+sys.path.insert(0, sys.argv[1])
+import {name}
+t2 = time.time()
+print(json.dumps([t1 - t0, t2 - t1]))
+'''
+
+def profile(models=None, registry=None, repeat=3, python=None):
+    """Measure interpreter startup and import cost of models in fresh interpreters.
+
+    Each measurement starts a new interpreter, so nothing is shared
+    through sys.modules; the minimum over 'repeat' runs is reported.
+
+    Parameters
+    ----------
+    models : list of strings
+        Model ids or names (Default=all)
+    repeat : integer
+        Runs per measurement (Default=3)
+    python : string
+        Interpreter (Default=sys.executable)
+
+    Returns
+    -------
+    (startup, rows)
+
+    startup : float
+        Seconds to start an interpreter that does nothing
+    rows : list of (id, numpy_import, model_import, total) tuples
+        Seconds to import numpy, to import the model once numpy is
+        loaded, and the wall time of the whole interpreter run
+
+    """
+    registry = discover() if registry is None else registry
+    python = sys.executable if python is None else python
+    infos = [find(m, registry) for m in models] if models else list(registry.values())
+
+    def timed(args):
+        t0 = time.time()
+        out = subprocess.check_output([python] + args)
+        return time.time() - t0, out
+
+    startup = min(timed(['-c', 'pass'])[0] for _ in range(repeat))
+    rows = []
+    for info in infos:
+        runs = []
+        for _ in range(repeat):
+            wall, out = timed(['-c', _importProbe.format(name=info['name']),
+                               os.path.dirname(info['path'])])
+            runs.append(json.loads(out.decode().strip().split('\n')[-1]) + [wall])
+        rows.append((info['id'],) + tuple(min(r[i] for r in runs) for i in range(3)))
+    return startup, rows
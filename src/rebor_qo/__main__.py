@@ -0,0 +1,147 @@
+"""Command line for the CCqo model registry: list, info, run and profile.
+
+Run from the src directory (or with src on PYTHONPATH)::
+  python -m rebor_qo --help
+
+"""
+
+import sys
+import time
+import argparse
+
+t0 = time.time()
+import rebor_qo
+tImport = time.time() - t0
+
+def cmd_list(args):
+    for info in args.registry.values():
+        print('{:<36} {:<8} {}'.format(info['name'], info['version'] or '', info['summary']))
+    if args.timing:
+        print('discovered {} models in {:.4f} s'.format(len(args.registry), args.tDiscover))
+
+def cmd_info(args):
+    info = args.info
+    print('{} {}'.format(info['name'], info['version'] or ''))
+    print('  {}'.format(info['summary']))
+    print('  path: {}'.format(info['path']))
+    print('  functions: {}'.format(', '.join(info['functions'])))
+    for name, defn in (info['paramDefns'] or {}).items():
+        print('  {:<24} {:<14} {:<24} {}'.format(
+            name, defn.get('flow', ''), defn.get('units', ''), defn.get('desc', '')))
+
+def cmd_run(args):
+    tRun = rebor_qo.run(args.info['name'], args.model_args, args.registry)
+    if args.timing:
+        sys.stderr.write('registry import {:.4f} s, discovery {:.4f} s, model {:.4f} s\n'.format(
+            tImport, args.tDiscover, tRun))
+
+def cmd_profile(args):
+    startup, rows = rebor_qo.profile([info['id'] for info in args.infos], args.registry,
+                                     repeat=args.repeat)
+    print('interpreter startup: {:.4f} s'.format(startup))
+    print('{:<8} {:>12} {:>12} {:>12}'.format('model', 'numpy [s]', 'import [s]', 'total [s]'))
+    for row in rows:
+        print('{:<8} {:>12.4f} {:>12.4f} {:>12.4f}'.format(*row))
+
+def cmd_serve(args):
+    import signal
+    from rebor_qo import serve
+    server = serve.Server(args.workers, [info['name'] for info in args.infos],
+                          cache=args.cache, cache_bytes=args.cache_size*2**20)
+    # Clean up the socket on termination as well as on interrupt
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        if args.socket is None:
+            server.serve_stdio()
+        else:
+            server.serve_socket(args.socket)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+def cmd_cache(args):
+    from rebor_qo.cache import ResultCache
+    cache = ResultCache(args.directory)
+    if args.clear:
+        print('removed {} entries'.format(cache.clear()))
+    elif args.max_size is not None:
+        print('removed {} entries'.format(cache.evict(args.max_size*2**20)))
+    stats = cache.stats()
+    print('{} entries, {} bytes'.format(stats['entries'], stats['bytes']))
+
+if '__main__' == __name__:
+
+    argp = argparse.ArgumentParser(
+        prog='python -m rebor_qo',
+        description='Discover, describe, run and profile CCqo models',
+        epilog='Models are found from their source without importing them')
+    argp.add_argument(
+        '--models-dir',
+        dest='models_dir', action='store',
+        default=None,
+        help="Directory of CCqo model directories (default: src/models)",
+        metavar='dir')
+    argp.add_argument(
+        '--Version',
+        action='version', version='rebor_qo version {}'.format(rebor_qo.__version__),
+        help="Print version and exit")
+    subs = argp.add_subparsers(dest='command')
+
+    subp = subs.add_parser('list', help="List models")
+    subp.add_argument('--timing', action='store_true', help="Report discovery time")
+    subp.set_defaults(act=cmd_list)
+
+    subp = subs.add_parser('info', help="Show model metadata and parameters")
+    subp.add_argument('model', help="Model id (CCqo103), name or unique prefix")
+    subp.set_defaults(act=cmd_info)
+
+    subp = subs.add_parser('run', help="Run a model's command line",
+                           description="Arguments after the model are passed to it unchanged")
+    subp.add_argument('--timing', action='store_true',
+                      help="Report registry, discovery and model times on stderr")
+    subp.add_argument('model', help="Model id (CCqo103), name or unique prefix")
+    subp.add_argument('model_args', nargs=argparse.REMAINDER, help="Model arguments")
+    subp.set_defaults(act=cmd_run)
+
+    subp = subs.add_parser('profile', help="Measure startup and import cost per model")
+    subp.add_argument('models', nargs='*', help="Model ids or names (default: all)")
+    subp.add_argument('--repeat', type=int, default=3,
+                      help="Fresh interpreters per measurement; the minimum is reported")
+    subp.set_defaults(act=cmd_profile)
+
+    subp = subs.add_parser('serve', help="Serve model functions over JSON-RPC 2.0",
+                           description="One JSON-RPC request per line on stdin/stdout or a Unix socket; methods are <model>.<function>")
+    subp.add_argument('--socket', default=None, metavar='path',
+                      help="Unix socket to listen on (default: stdin/stdout)")
+    subp.add_argument('--workers', type=int, default=0, metavar='N',
+                      help="Worker processes (default: 0, serve in the server process)")
+    subp.add_argument('--preload', dest='models', nargs='*', default=[], metavar='model',
+                      help="Models to import before the first request")
+    subp.add_argument('--cache', default=None, metavar='dir',
+                      help="Result cache directory (default: no cache)")
+    subp.add_argument('--cache-size', type=int, default=1024, metavar='MiB',
+                      help="Size bound of the result cache")
+    subp.set_defaults(act=cmd_serve)
+
+    subp = subs.add_parser('cache', help="Show or clear a result cache")
+    subp.add_argument('directory', help="Result cache directory")
+    subp.add_argument('--clear', action='store_true', help="Remove every entry")
+    subp.add_argument('--max-size', type=int, default=None, metavar='MiB',
+                      help="Evict least recently used entries down to this size")
+    subp.set_defaults(act=cmd_cache)
+
+    args = argp.parse_args()
+    if getattr(args, 'act', None) is None:
+        argp.print_help()
+        sys.exit(2)
+    t0 = time.time()
+    args.registry = rebor_qo.discover(args.models_dir)
+    args.tDiscover = time.time() - t0
+    try:
+        if hasattr(args, 'model'):
+            args.info = rebor_qo.find(args.model, args.registry)
+        args.infos = [rebor_qo.find(m, args.registry) for m in getattr(args, 'models', [])]
+    except KeyError as e:
+        argp.error(e.args[0])
+    args.act(args)
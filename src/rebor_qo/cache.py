@@ -0,0 +1,273 @@
+"""Content-addressed on-disk cache of model results.
+
+A result is stored under the SHA-256 of the model module name, the
+function name, every argument (bound by name, with defaults filled in,
+arrays hashed by dtype, shape and bytes) and the __version__ of the
+model and of every CCqo model it imports, directly or through other
+models, so upgrading any of them invalidates its entries.  Each
+entry is a directory of .npy files, one per output, that are loaded
+memory-mapped copy-on-write: a hit returns plain writable arrays, like
+a freshly computed result, and writes to them never reach the cache.
+
+Entries are written into a temporary directory and renamed into place,
+so concurrent processes never see a partial entry; when two processes
+store the same key, the first rename wins.  Eviction removes the least
+recently used entries (by directory mtime, refreshed on every hit) once
+the cache exceeds its size bound, under an fcntl lock on the cache
+directory.  Evicted entries are renamed away before removal, and
+arrays already mapped by readers stay valid.
+
+Results that contain objects other than arrays, numbers and strings
+(e.g. callables or class instances), calls with such arguments, and
+calls whose 'seed' argument is None (fresh random draws every time)
+are computed but not cached.
+
+DEPENDENCIES
+============
+Module: os, sys, json, errno, shutil, hashlib, inspect, tempfile,
+        fcntl, numpy
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * ResultCache with LRU eviction, atomic entries and statistics
+1.0b2 [2026-10-18]
+    * Unseeded calls (seed=None) are not cached
+    * Hits are writable ndarrays (copy-on-write maps) instead of
+      read-only memmaps, the same type as a computed result
+1.0b3 [2026-10-18]
+    * Keys include the __version__ of the CCqo models a model imports
+
+"""
+
+import os
+import sys
+import json
+import errno
+import fcntl
+import shutil
+import hashlib
+import inspect
+import tempfile
+
+import numpy as np
+
+class Uncacheable(TypeError):
+    """Raised for arguments or results the cache cannot store."""
+
+def _argBytes(value):
+    if value is None:
+        return b'N'
+    a = np.asarray(value)
+    if a.dtype == object:
+        raise Uncacheable('Cannot hash argument of type {}'.format(type(value).__name__))
+    return b''.join([a.dtype.str.encode(), repr(a.shape).encode(),
+                     np.ascontiguousarray(a).tobytes()])
+
+def _modelVersions(module):
+    """(name, __version__) of module and of the CCqo modules it imports, sorted."""
+    seen = {}
+    todo = [module]
+    while todo:
+        m = todo.pop()
+        if m is None or m.__name__ in seen:
+            continue
+        seen[m.__name__] = getattr(m, '__version__', '')
+        todo.extend(v for v in vars(m).values()
+                    if isinstance(v, type(sys)) and v.__name__.startswith('CCqo'))
+    return sorted(seen.items())
+
+def _dirSize(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+class ResultCache(object):
+    """Size-bounded, content-addressed store of model results.
+
+    Parameters
+    ----------
+    directory : string
+        Cache directory, created if needed; may be shared by processes
+        and users with write access
+    max_bytes : integer
+        Size bound of the stored arrays (Default=1 GiB)
+
+    Attributes
+    ----------
+    hits, misses, stores, evictions, uncacheable : integers
+        Counts for this instance (see stats)
+
+    Examples
+    --------
+    >>> import CCqo102_ring_damping  # doctest: +SKIP
+    >>> cache = ResultCache('/tmp/ccqo-cache')  # doctest: +SKIP
+    >>> damping, losses = cache.call(CCqo102_ring_damping.calc_ring_damping,
+    ...                              [12.0, 20.0], [3.0, 4.0])  # doctest: +SKIP
+
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        for sub in ('entries', 'tmp'):
+            try:
+                os.makedirs(os.path.join(self.directory, sub))
+            except OSError as e:
+                if e.errno != errno.EEXIST: raise
+        self.hits = self.misses = self.stores = self.evictions = self.uncacheable = 0
+        # Bytes stored since the last size check; eviction scans the cache
+        # only after an eighth of the bound has been written
+        self._written = max_bytes
+
+    def key(self, fun, *args, **kwargs):
+        """Hex key for fun(*args, **kwargs) and the model versions it depends on.
+
+        Raises
+        ------
+        Uncacheable for arguments that are not arrays, numbers or strings,
+        and for a 'seed' argument of None
+
+        """
+        h = hashlib.sha256()
+        h.update('{}:{}'.format(fun.__module__, fun.__name__).encode())
+        for name, version in _modelVersions(sys.modules.get(fun.__module__)):
+            h.update('\0{}:{}'.format(name, version).encode())
+        bound = inspect.getcallargs(fun, *args, **kwargs)
+        if 'seed' in bound and bound['seed'] is None:
+            raise Uncacheable('Unseeded call of {}'.format(fun.__name__))
+        for name in sorted(bound):
+            h.update(b'\0' + name.encode() + b'\0')
+            h.update(_argBytes(bound[name]))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, 'entries', key[:2], key)
+
+    def get(self, key):
+        """Stored result for 'key' (copy-on-write mapped arrays), or None."""
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            outputs = []
+            for i, recarray in enumerate(meta['recarray']):
+                a = np.asarray(np.load(os.path.join(path, '{}.npy'.format(i)), mmap_mode='c'))
+                outputs.append(a.view(np.recarray) if recarray else a[()] if a.ndim == 0 else a)
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tuple(outputs) if meta['tuple'] else outputs[0]
+
+    def put(self, key, result):
+        """Store 'result' (an array, number or tuple of them) under 'key'.
+
+        Raises
+        ------
+        Uncacheable for results holding other objects
+
+        """
+        outputs = list(result) if isinstance(result, tuple) else [result]
+        arrays = [np.asanyarray(a) for a in outputs]
+        if any(a.dtype == object for a in arrays):
+            raise Uncacheable('Cannot store result with objects')
+        path = self._path(key)
+        if os.path.isdir(path):
+            return
+        tmp = tempfile.mkdtemp(dir=os.path.join(self.directory, 'tmp'))
+        try:
+            for i, a in enumerate(arrays):
+                np.save(os.path.join(tmp, '{}.npy'.format(i)), np.asarray(a))
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump({'tuple': isinstance(result, tuple),
+                           'recarray': [isinstance(a, np.recarray) for a in arrays]}, f)
+            size = _dirSize(tmp)
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError as e:
+                if e.errno != errno.EEXIST: raise
+            os.rename(tmp, path)
+        except OSError as e:
+            # Another process stored the same key first
+            if e.errno not in (errno.EEXIST, errno.ENOTEMPTY): raise
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.stores += 1
+        self._written += size
+        if self._written > self.max_bytes // 8:
+            self.evict()
+
+    def call(self, fun, *args, **kwargs):
+        """fun(*args, **kwargs), from the cache when stored and stored otherwise."""
+        try:
+            key = self.key(fun, *args, **kwargs)
+        except Uncacheable:
+            self.uncacheable += 1
+            return fun(*args, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = fun(*args, **kwargs)
+            try:
+                self.put(key, result)
+            except Uncacheable:
+                self.uncacheable += 1
+        return result
+
+    def _entries(self):
+        root = os.path.join(self.directory, 'entries')
+        entries = []
+        for prefix in os.listdir(root):
+            for key in os.listdir(os.path.join(root, prefix)):
+                path = os.path.join(root, prefix, key)
+                try:
+                    entries.append((os.path.getmtime(path), _dirSize(path), path))
+                except OSError:
+                    pass
+        return entries
+
+    def evict(self, max_bytes=None):
+        """Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns
+        -------
+        Number of entries removed
+
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = sorted(self._entries())
+                total = sum(size for _, size, _ in entries)
+                removed = 0
+                for _, size, path in entries:
+                    if total <= max_bytes:
+                        break
+                    doomed = tempfile.mkdtemp(dir=os.path.join(self.directory, 'tmp'))
+                    try:
+                        os.rename(path, os.path.join(doomed, 'entry'))
+                    except OSError:
+                        continue
+                    finally:
+                        shutil.rmtree(doomed, ignore_errors=True)
+                    total -= size
+                    removed += 1
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.evictions += removed
+        self._written = 0
+        return removed
+
+    def clear(self):
+        """Remove every entry."""
+        return self.evict(0)
+
+    def stats(self):
+        """Counts for this instance with the entries and bytes on disk."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': float(self.hits)/lookups if lookups else 0.0,
+                'stores': self.stores, 'evictions': self.evictions,
+                'uncacheable': self.uncacheable, 'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
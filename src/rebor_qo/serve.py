@@ -0,0 +1,378 @@
+"""Long-lived JSON-RPC 2.0 server for CCqo model functions.
+
+Requests and responses are JSON objects, one per line, read from stdin
+and written to stdout or exchanged over a Unix socket.  A model is
+imported on its first request and then stays loaded, so each further
+call costs a JSON round trip plus the calculation instead of a new
+interpreter, the numpy import and argparse setup.
+
+Methods are named <model>.<function>, where model is anything
+rebor_qo.find accepts and function is a calc* function or
+validateParameters of that model, e.g.::
+
+  {"jsonrpc": "2.0", "id": 1, "method": "CCqo102.calc_ring_damping",
+   "params": {"couplings": [12.0, 20.0], "velocities": [3.0, 4.0]}}
+
+Positional (list) or keyword (object) params are passed to the function.
+Arrays are returned as nested lists, tuples as lists, structured arrays
+as an object of columns, and complex numbers in either direction as
+{"real": x, "imag": y}.  Params that do not match the function's
+signature are INVALID_PARAMS; any exception raised by the calculation,
+and results that cannot be encoded (e.g. generators), are SERVER_ERROR.  The methods 'ping' and 'models' need no model;
+'cache' returns the result-cache statistics of the process serving it
+(null without a cache).  With a cache directory, results are looked up
+in and stored to a rebor_qo.cache.ResultCache.
+Batches (JSON arrays) and notifications (no id) follow JSON-RPC 2.0.
+
+Command-line examples
+=====================
+
+Serve on stdin/stdout::
+  python -m rebor_qo serve
+Serve on a Unix socket with four worker processes::
+  python -m rebor_qo serve --socket /tmp/ccqo.sock --workers 4
+Serve with a shared 4 GiB result cache::
+  python -m rebor_qo serve --cache ~/.cache/ccqo --cache-size 4096
+
+DEPENDENCIES
+============
+Module: os, sys, stat, errno, json, numbers, inspect, socket, socketserver,
+        multiprocessing, numpy (when a model is called)
+
+HISTORY
+=======
+1.0b1 [2026-10-18]
+    * Stdio and Unix-socket JSON-RPC server with an optional process pool
+1.1b1 [2026-10-18]
+    * Optional on-disk result cache (--cache, --cache-size) and the
+      'cache' statistics method
+1.1b2 [2026-10-18]
+    * Unencodable results are a SERVER_ERROR response instead of an
+      exception in the serving loop; INVALID_PARAMS only for params that
+      do not bind to the function's signature
+1.1b3 [2026-10-18]
+    * --socket replaces only a stale socket, never another kind of file,
+      and shutdown removes only the socket this server bound
+
+"""
+
+import os
+import sys
+import stat
+import errno
+import json
+import numbers
+import inspect
+import socket
+import multiprocessing
+
+import rebor_qo
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+_registry = None
+_functions = {}
+_cache = None
+_strings = (str, type(u''))
+
+def _decode(obj):
+    if isinstance(obj, dict):
+        if set(obj) == set(['real', 'imag']):
+            return complex(obj['real'], obj['imag'])
+        return dict((k, _decode(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    return obj
+
+def encode(obj):
+    """Result converted to JSON-compatible types.
+
+    Raises
+    ------
+    TypeError for objects other than None, numbers, strings, lists,
+    tuples, dicts and numpy arrays or scalars of those
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> print(json.dumps(encode((np.arange(2.0), 1 - 2j)), sort_keys=True))
+    [[0.0, 1.0], {"imag": -2.0, "real": 1.0}]
+    >>> encode(x for x in [])
+    Traceback (most recent call last):
+        ...
+    TypeError: Cannot encode a result of type generator
+
+    """
+    if isinstance(obj, complex):
+        return {'real': obj.real, 'imag': obj.imag}
+    if isinstance(obj, (list, tuple)):
+        return [encode(v) for v in obj]
+    if isinstance(obj, dict):
+        return dict((str(k), encode(v)) for k, v in obj.items())
+    if hasattr(obj, 'dtype'):
+        import numpy as np
+        obj = np.asarray(obj)
+        if obj.dtype.names:
+            return dict((name, encode(obj[name])) for name in obj.dtype.names)
+        if obj.dtype.kind == 'c':
+            return _complexList(obj.tolist())
+        if obj.dtype.kind == 'O':
+            return encode(obj.tolist())
+        return obj.tolist()
+    if obj is None or isinstance(obj, (bool, numbers.Number) + _strings):
+        return obj
+    raise TypeError('Cannot encode a result of type {}'.format(type(obj).__name__))
+
+def _complexList(obj):
+    if isinstance(obj, list):
+        return [_complexList(v) for v in obj]
+    return {'real': obj.real, 'imag': obj.imag}
+
+def registry():
+    """Model registry, discovered on first use."""
+    global _registry
+    if _registry is None:
+        _registry = rebor_qo.discover()
+    return _registry
+
+def lookup(method):
+    """Function for a method name '<model>.<function>', importing the model once.
+
+    Raises
+    ------
+    KeyError for unknown models or functions
+
+    """
+    if method not in _functions:
+        model, _, name = method.rpartition('.')
+        info = rebor_qo.find(model, registry())
+        if name not in info['functions'] + ['validateParameters']:
+            raise KeyError('Unknown function {} of {}'.format(name, info['name']))
+        _functions[method] = getattr(rebor_qo.load(info['name'], _registry), name)
+    return _functions[method]
+
+def set_cache(directory, max_bytes=2**30):
+    """Cache results of this process in 'directory' (None disables the cache)."""
+    global _cache
+    if directory is None:
+        _cache = None
+    else:
+        from rebor_qo.cache import ResultCache
+        _cache = ResultCache(directory, max_bytes)
+    return _cache
+
+def _error(rid, code, message):
+    return {'jsonrpc': '2.0', 'id': rid, 'error': {'code': code, 'message': message}}
+
+def call(request):
+    """Response to one decoded JSON-RPC request object, or None for a notification."""
+    if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+       or not isinstance(request.get('method'), _strings):
+        return _error(request.get('id') if isinstance(request, dict) else None,
+                      INVALID_REQUEST, 'Invalid Request')
+    rid = request.get('id')
+    method = request['method']
+    params = _decode(request.get('params', []))
+    if method == 'ping':
+        response = {'jsonrpc': '2.0', 'id': rid, 'result': 'pong'}
+    elif method == 'cache':
+        response = {'jsonrpc': '2.0', 'id': rid,
+                    'result': None if _cache is None else _cache.stats()}
+    elif method == 'models':
+        response = {'jsonrpc': '2.0', 'id': rid, 'result':
+                    dict((info['id'], info['functions']) for info in registry().values())}
+    elif not isinstance(params, (dict, list)):
+        response = _error(rid, INVALID_PARAMS, 'params must be an array or object')
+    else:
+        try:
+            fun = lookup(method)
+        except KeyError as e:
+            fun = None
+            response = _error(rid, METHOD_NOT_FOUND, str(e.args[0]))
+        if fun is not None:
+            args = () if isinstance(params, dict) else params
+            kwargs = dict((str(k), v) for k, v in params.items()) \
+                if isinstance(params, dict) else {}
+            try:
+                inspect.getcallargs(fun, *args, **kwargs)
+            except TypeError as e:
+                fun = None
+                response = _error(rid, INVALID_PARAMS, str(e))
+        if fun is not None:
+            try:
+                if _cache is None:
+                    result = fun(*args, **kwargs)
+                else:
+                    result = _cache.call(fun, *args, **kwargs)
+                response = {'jsonrpc': '2.0', 'id': rid, 'result': encode(result)}
+            except Exception as e:
+                response = _error(rid, SERVER_ERROR, '{}: {}'.format(type(e).__name__, e))
+    return response if 'id' in request else None
+
+def _dumps(response):
+    try:
+        return json.dumps(response)
+    except Exception as e:
+        return json.dumps(_error(response.get('id'), SERVER_ERROR,
+                                 '{}: {}'.format(type(e).__name__, e)))
+
+def handle_line(line):
+    """Serialized response to one line of input ('' when nothing is to be sent)."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return json.dumps(_error(None, PARSE_ERROR, 'Parse error'))
+    if isinstance(request, list):
+        if not request:
+            return json.dumps(_error(None, INVALID_REQUEST, 'Invalid Request'))
+        responses = [r for r in (call(req) for req in request) if r is not None]
+        return '[' + ', '.join(_dumps(r) for r in responses) + ']' if responses else ''
+    response = call(request)
+    return '' if response is None else _dumps(response)
+
+class Server(object):
+    """Serve JSON-RPC lines in-process or through a pool of worker processes.
+
+    Parameters
+    ----------
+    workers : integer
+        Worker processes; 0 serves in the calling process (Default=0)
+    preload : list of strings
+        Models to import before the first request (Default=None)
+    cache : string
+        Result cache directory shared by all workers (Default=None, no cache)
+    cache_bytes : integer
+        Size bound of the result cache (Default=1 GiB)
+
+    """
+
+    def __init__(self, workers=0, preload=None, cache=None, cache_bytes=2**30):
+        for model in preload or []:
+            rebor_qo.load(model)
+        set_cache(cache, cache_bytes)
+        self.pool = multiprocessing.Pool(workers, _initWorker, (preload or [], cache, cache_bytes)) \
+            if workers else None
+
+    def handle(self, line):
+        if self.pool is None:
+            return handle_line(line)
+        return self.pool.apply(handle_line, (line,))
+
+    def serve_stdio(self, stdin=None, stdout=None):
+        """Serve lines from stdin until EOF; model output on stdout goes to stderr."""
+        stdin = sys.stdin if stdin is None else stdin
+        stdout = sys.stdout if stdout is None else stdout
+        savedStdout, sys.stdout = sys.stdout, sys.stderr
+        try:
+            lines = (line for line in iter(stdin.readline, '') if line.strip())
+            responses = (self.handle(line) for line in lines) if self.pool is None else \
+                self.pool.imap(handle_line, lines)
+            for response in responses:
+                if response:
+                    stdout.write(response + '\n')
+                    stdout.flush()
+        finally:
+            sys.stdout = savedStdout
+
+    def serve_socket(self, path):
+        """Serve connections on a Unix socket at 'path' until interrupted."""
+        server = self.socket_server(path)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            # Leave the path alone if another server has replaced our socket
+            try:
+                st = os.lstat(path)
+                if (st.st_dev, st.st_ino) == server.bound: os.remove(path)
+            except OSError:
+                pass
+
+    def socket_server(self, path):
+        """Threaded Unix-socket server bound to 'path' (not yet serving).
+
+        A stale socket at 'path' is replaced; any other file is an error.
+
+        Raises
+        ------
+        OSError (EEXIST) when 'path' exists and is not a socket
+
+        """
+        handle = self.handle
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in iter(self.rfile.readline, b''):
+                    if line.strip():
+                        response = handle(line.decode('utf-8'))
+                        if response:
+                            self.wfile.write((response + '\n').encode('utf-8'))
+                            self.wfile.flush()
+
+        class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        try:
+            mode = os.lstat(path).st_mode
+        except OSError:
+            mode = None
+        if mode is not None:
+            if not stat.S_ISSOCK(mode):
+                raise OSError(errno.EEXIST, 'Not a socket, refusing to replace', path)
+            os.remove(path)
+        server = UnixServer(path, Handler)
+        st = os.lstat(path)
+        server.bound = (st.st_dev, st.st_ino)
+        return server
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+def _initWorker(models, cache, cache_bytes):
+    # Worker output must not mix with stdio responses
+    sys.stdout = sys.stderr
+    set_cache(cache, cache_bytes)
+    for model in models:
+        rebor_qo.load(model)
+
+class Client(object):
+    """Minimal client for a Unix-socket server.
+
+    Examples
+    --------
+    client = Client('/tmp/ccqo.sock')
+    damping, losses = client.call('CCqo102.calc_ring_damping', [12.0, 20.0], [3.0, 4.0])
+
+    """
+
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile('rb')
+        self.nextId = 0
+
+    def call(self, method, *args, **kwargs):
+        """Result of a method call; raises RuntimeError for error responses."""
+        self.nextId += 1
+        request = {'jsonrpc': '2.0', 'id': self.nextId, 'method': method,
+                   'params': encode(kwargs if kwargs else list(args))}
+        self.sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        response = json.loads(self.rfile.readline().decode('utf-8'))
+        if 'error' in response:
+            raise RuntimeError('{code}: {message}'.format(**response['error']))
+        return _decode(response['result'])
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
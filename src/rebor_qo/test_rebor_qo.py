@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+import shutil
+import socket
+import threading
+import tempfile
+import subprocess
+import unittest
+import multiprocessing
+import numpy as np
+srcDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if srcDir not in sys.path: sys.path.insert(0, srcDir)
+import rebor_qo
+from rebor_qo import serve
+from rebor_qo.cache import ResultCache
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = rebor_qo.discover()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def cli(self, *args):
+        return subprocess.check_output([sys.executable, '-m', 'rebor_qo'] + list(args),
+                                       cwd=srcDir).decode()
+
+    def test_discovers_every_model(self):
+        dirs = [d for d in os.listdir(rebor_qo.modelsDir) if d.startswith('CCqo')]
+        self.assertEqual(len(self.registry), len(dirs))
+        info = self.registry['CCqo103']
+        self.assertIn('calcqo103_spectral_pump', info['functions'])
+        self.assertEqual(info['paramDefns']['pump_ring']['flow'], 'output')
+
+    def test_find_by_prefix(self):
+        self.assertEqual(rebor_qo.find('CCqo102_ring', self.registry)['id'], 'CCqo102')
+        self.assertRaises(KeyError, rebor_qo.find, 'CCqo1', self.registry)
+        self.assertRaises(KeyError, rebor_qo.find, 'CCqo999', self.registry)
+
+    def test_discovery_imports_no_model(self):
+        code = ('import sys; import rebor_qo; rebor_qo.discover(); '
+                'print(any(m == "numpy" or m.startswith("CCqo") for m in sys.modules))')
+        out = subprocess.check_output([sys.executable, '-c', code], cwd=srcDir)
+        self.assertEqual(out.decode().strip(), 'False')
+
+    def test_run_model_command_line(self):
+        out = self.cli('run', 'CCqo102', '--couplings', '12.0', '--velocities', '3.0',
+                       '--log-file', os.path.join(self.tmp, 'run.log'))
+        self.assertEqual(float(out.strip().strip('[]')), 24.0)
+
+    def test_profile_reports_import_cost(self):
+        startup, rows = rebor_qo.profile(['CCqo102'], self.registry, repeat=1)
+        self.assertGreater(startup, 0.0)
+        self.assertEqual(rows[0][0], 'CCqo102')
+        self.assertTrue(all(t >= 0.0 for t in rows[0][1:]))
+
+class TestServe(unittest.TestCase):
+
+    def request(self, method, params, rid=1):
+        line = json.dumps({'jsonrpc': '2.0', 'id': rid, 'method': method, 'params': params})
+        return json.loads(serve.handle_line(line))
+
+    def test_call_by_position_and_keyword(self):
+        a = self.request('CCqo102.calc_ring_damping', [[12.0, 20.0], [3.0, 4.0]])
+        b = self.request('CCqo102.calc_ring_damping',
+                         {'couplings': [12.0, 20.0], 'velocities': [3.0, 4.0]})
+        self.assertEqual(a['result'], [74.0, [24.0, 50.0]])
+        self.assertEqual(a['result'], b['result'])
+
+    def test_complex_values(self):
+        response = self.request('CCqo103.calcqo103_spectral_pump',
+                                [[0.0], {'real': 1.0, 'imag': 0.0}, 1.0, 0.5, 1.0])
+        self.assertEqual(response['result'][1], [{'real': 0.0, 'imag': -2.0}])
+
+    def test_errors(self):
+        self.assertEqual(self.request('CCqo102.nope', [])['error']['code'],
+                         serve.METHOD_NOT_FOUND)
+        self.assertEqual(self.request('CCqo102.calc_ring_damping', [1.0])['error']['code'],
+                         serve.INVALID_PARAMS)
+        self.assertEqual(json.loads(serve.handle_line('{'))['error']['code'], serve.PARSE_ERROR)
+
+    def test_unencodable_result(self):
+        w = np.linspace(-1.0, 1.0, 5).tolist()
+        response = self.request('CCqo109.calcqo109_pair_sampler',
+                                {'jsa': np.ones((5, 5)).tolist(), 'signal': w, 'idler': w})
+        self.assertEqual(response['error']['code'], serve.SERVER_ERROR)
+        self.assertTrue('generator' in response['error']['message'])
+        self.assertEqual(self.request('ping', [])['result'], 'pong')
+
+    def test_internal_type_error(self):
+        response = self.request('CCqo102.calc_ring_damping', [[1.0], [{'a': 1}]])
+        self.assertEqual(response['error']['code'], serve.SERVER_ERROR)
+        self.assertTrue(response['error']['message'].startswith('TypeError'))
+        response = self.request('CCqo102.calc_ring_damping', {'couplings': [1.0], 'bogus': 1})
+        self.assertEqual(response['error']['code'], serve.INVALID_PARAMS)
+
+    def test_batch_and_notification(self):
+        line = json.dumps([{'jsonrpc': '2.0', 'id': 7, 'method': 'ping'},
+                           {'jsonrpc': '2.0', 'method': 'ping'}])
+        self.assertEqual(json.loads(serve.handle_line(line)),
+                         [{'jsonrpc': '2.0', 'id': 7, 'result': 'pong'}])
+        self.assertEqual(serve.handle_line('{"jsonrpc": "2.0", "method": "ping"}'), '')
+
+    def test_unix_socket_round_trip(self):
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, 'ccqo.sock')
+        # Import the model here; the server thread must not wait on the import lock
+        server = serve.Server(preload=['CCqo102']).socket_server(path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            client = serve.Client(path)
+            damping, losses = client.call('CCqo102.calc_ring_damping', [12.0], [3.0])
+            self.assertEqual(damping, 24.0)
+            self.assertEqual(client.call('ping'), 'pong')
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            shutil.rmtree(tmp)
+
+    def test_socket_path_not_clobbered(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'precious.txt')
+            with open(path, 'w') as f:
+                f.write('keep')
+            self.assertRaises(OSError, serve.Server().socket_server, path)
+            with open(path) as f:
+                self.assertEqual(f.read(), 'keep')
+            # A stale socket left by a dead server is replaced
+            path = os.path.join(tmp, 'ccqo.sock')
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            serve.Server().socket_server(path).server_close()
+        finally:
+            shutil.rmtree(tmp)
+
+def _storeSpectrum(directory):
+    # Forked from a parent that already imported the model; no import in the worker
+    ccqo103 = sys.modules['CCqo103_spectral_pump']
+    cache = ResultCache(directory)
+    k = np.linspace(-5.0, 5.0, 1001)
+    return cache.call(ccqo103.calcqo103_spectral_pump, k, 1.0, 1.0, 0.5, 1.0)[1].sum()
+
+def _draw(size, seed=None):
+    return np.random.RandomState(seed).standard_normal(size)
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.ccqo102 = rebor_qo.load('CCqo102')
+        self.ccqo103 = rebor_qo.load('CCqo103')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_hit_returns_mapped_copy(self):
+        cache = ResultCache(self.tmp)
+        fun = self.ccqo102.calc_ring_damping
+        first = cache.call(fun, [12.0, 20.0], [3.0, 4.0])
+        second = cache.call(fun, couplings=[12.0, 20.0], velocities=[3.0, 4.0])
+        self.assertEqual((cache.hits, cache.misses, cache.stores), (1, 1, 1))
+        self.assertEqual(second[0], first[0])
+        self.assertTrue(type(second[1]) is type(first[1]) is np.ndarray)
+        self.assertEqual(second[1].tolist(), first[1].tolist())
+        # Writes to a hit stay private to the caller
+        second[1][:] = 0.0
+        self.assertEqual(cache.call(fun, [12.0, 20.0], [3.0, 4.0])[1].tolist(),
+                         first[1].tolist())
+        cache.call(fun, [12.0, 20.0], [3.0, 4.5])
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_unseeded_calls_are_computed(self):
+        cache = ResultCache(self.tmp)
+        draws = [cache.call(_draw, 4) for i in range(2)]
+        self.assertNotEqual(draws[0].tolist(), draws[1].tolist())
+        self.assertEqual((cache.uncacheable, cache.stats()['entries']), (2, 0))
+        seeded = [cache.call(_draw, 4, seed=3) for i in range(2)]
+        self.assertEqual(seeded[0].tolist(), seeded[1].tolist())
+        self.assertEqual((cache.hits, cache.stores), (1, 1))
+
+    def test_lru_eviction(self):
+        k = np.linspace(-5.0, 5.0, 1001)
+        fun = self.ccqo103.calcqo103_spectral_pump
+        cache = ResultCache(self.tmp, max_bytes=10**9)
+        for G in (0.5, 0.6, 0.7):
+            cache.call(fun, k, 1.0, 1.0, G, 1.0)
+            os.utime(cache._path(cache.key(fun, k, 1.0, 1.0, G, 1.0)), (G, G))
+        cache.call(fun, k, 1.0, 1.0, 0.5, 1.0)
+        size = cache.stats()['bytes'] // 3
+        self.assertEqual(cache.evict(2*size), 1)
+        cache.call(fun, k, 1.0, 1.0, 0.6, 1.0)
+        self.assertEqual(cache.misses, 4)
+        cache.call(fun, k, 1.0, 1.0, 0.5, 1.0)
+        self.assertEqual(cache.hits, 2)
+
+    def test_uncacheable_arguments_are_computed(self):
+        cache = ResultCache(self.tmp)
+        pump = self.ccqo103.PumpSpectrum('gaussian', 0.0, 1.0, 1.0)
+        k = np.linspace(-1.0, 1.0, 11)
+        result = cache.call(self.ccqo103.calcqo103_spectral_pump, k, 1.0, 1.0, 0.5, pump)
+        self.assertEqual(result[0].shape, k.shape)
+        self.assertEqual((cache.uncacheable, cache.stats()['entries']), (1, 0))
+
+    def test_key_covers_imported_models(self):
+        cache = ResultCache(self.tmp)
+        fun = rebor_qo.load('CCqo105').calcqo105_ring_responses
+        args = ([0.0, 1.0], [0.0, 1.0], 1.0, 1.0, 0.5)
+        key = cache.key(fun, *args)
+        version = self.ccqo103.__version__
+        try:
+            self.ccqo103.__version__ = version + '.test'
+            self.assertNotEqual(cache.key(fun, *args), key)
+        finally:
+            self.ccqo103.__version__ = version
+        self.assertEqual(cache.key(fun, *args), key)
+
+    def test_concurrent_stores(self):
+        rebor_qo.load('CCqo103')
+        pool = multiprocessing.Pool(4)
+        sums = pool.map(_storeSpectrum, [self.tmp]*8)
+        pool.close()
+        pool.join()
+        self.assertEqual(len(set(sums)), 1)
+        self.assertEqual(ResultCache(self.tmp).stats()['entries'], 1)
+        self.assertEqual(os.listdir(os.path.join(self.tmp, 'tmp')), [])
+
+    def test_serve_with_cache(self):
+        serve.set_cache(self.tmp)
+        try:
+            line = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'CCqo102.calc_ring_damping',
+                               'params': [[12.0, 20.0], [3.0, 4.0]]})
+            first, second = serve.handle_line(line), serve.handle_line(line)
+            self.assertEqual(first, second)
+            stats = json.loads(serve.handle_line(
+                '{"jsonrpc": "2.0", "id": 2, "method": "cache"}'))['result']
+            self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        finally:
+            serve.set_cache(None)
+
+if __name__ == '__main__':
+    suite = unittest.TestSuite([unittest.TestLoader().loadTestsFromTestCase(TestRegistry),
+                                unittest.TestLoader().loadTestsFromTestCase(TestServe),
+                                unittest.TestLoader().loadTestsFromTestCase(TestCache)])
+    unittest.TextTestRunner(verbosity=2).run(suite)